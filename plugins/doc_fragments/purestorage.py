@@ -44,6 +44,48 @@ options:
       - Access token for Fusion Service
       - Defaults to the set environment variable under FUSION_ACCESS_TOKEN
     type: str
+  operation_journal:
+    description:
+      - Path to a local operation journal file, enables the journal if set.
+      - Every submitted operation is recorded in the journal. If the module is run again
+        with the same request while its operation is still in progress (e.g. the previous
+        run was interrupted), it waits for the recorded operation instead of submitting a new one.
+      - Entries are removed once their operations finish.
+      - The journal may be shared by several modules and hosts running on the same machine.
+      - Defaults to the set environment variable under FUSION_OPERATION_JOURNAL
+    type: path
+  operation_metrics:
+    description:
+      - If set to true, timing of every awaited operation is returned in I(operation_metrics).
+      - Reported per operation are submit time, time to first poll, number of polls
+        and total completion latency (in seconds), aggregated as a completion latency histogram.
+      - Times are measured from submitting the request which started the operation.
+      - "The returned I(operation_metrics) dictionary contains: C(operations), a list with
+        C(id), C(request_type), C(status), C(submitted_at) (UNIX time), C(time_to_first_poll),
+        C(polls) and C(latency) of every operation (C(latency) is null while it runs);
+        C(count) of finished operations; C(polls) in total; C(latency_min), C(latency_max)
+        and C(latency_mean); C(latency_histogram), a list of buckets with C(le), the upper
+        bound of the bucket in seconds, and C(count) of operations which finished within it
+        but not within any lower bound; C(latency_overflow), the number of operations
+        which took longer than the highest bound."
+    type: bool
+    default: false
+  index_cache:
+    description:
+      - Path to a local index cache file, enables the cache if set.
+      - Modules which need to search through all resources of a kind (e.g. to find
+        the host access policy using an IQN) keep the search index in the cache,
+        so that following runs do not need to list all the resources again.
+      - Cached indexes are dropped once they are older than I(index_cache_ttl)
+        or when a module changes the indexed resources.
+      - The cache may be shared by several modules and hosts running on the same machine.
+      - Defaults to the set environment variable under FUSION_INDEX_CACHE
+    type: path
+  index_cache_ttl:
+    description:
+      - Maximum age of a cached index in seconds.
+    type: int
+    default: 300
 notes:
   - This module requires the I(purefusion) Python library
   - You must set C(FUSION_ISSUER_ID) and C(FUSION_PRIVATE_KEY_FILE) environment variables
@@ -54,3 +96,30 @@ requirements:
   - python >= 3.8
   - purefusion
 """
+
+    # Documentation fragment for modules supporting optimistic creation
+    OPTIMISTIC_CREATE = r"""
+options:
+  optimistic_create:
+    description:
+      - Submit the create request without checking whether the resource exists first.
+      - If the resource already exists, the module falls back to reading and updating it.
+      - Saves one request per newly created resource. All parameters required for
+        creation must be provided, even if the resource exists.
+      - Has no effect in check mode or if I(state=absent).
+    type: bool
+    default: false
+"""
+
+    # Documentation fragment for modules managing many resources at once
+    CONCURRENCY = r"""
+options:
+  concurrency:
+    description:
+      - Maximum number of resources processed at the same time.
+      - Operations of all resources processed at the same time are polled
+        together, with a single request per tenant space, tenant or the whole
+        organization they were requested in.
+    type: int
+    default: 8
+"""
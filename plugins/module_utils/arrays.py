@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+
+# (c) 2023, Pure Storage, Inc.
+# GNU General Public License v3.0+ (see COPYING.GPLv3 or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+try:
+    import fusion as purefusion
+except ImportError:
+    pass
+
+from ansible_collections.purestorage.fusion.plugins.module_utils.parallel import (
+    DEFAULT_CONCURRENCY,
+    run_concurrently,
+)
+
+
+def list_arrays(module, fusion, azs, concurrency=DEFAULT_CONCURRENCY):
+    """Returns arrays of availability zones `azs` of `module.params["region"]`
+    keyed by (availability zone, name), fails if any of them cannot be listed
+    """
+    array_api_instance = purefusion.ArraysApi(fusion)
+    results = run_concurrently(
+        fusion,
+        lambda az: array_api_instance.list_arrays(
+            region_name=module.params["region"], availability_zone_name=az
+        ).items,
+        azs,
+        concurrency,
+    )
+    arrays = {}
+    for result in results:
+        if not result.ok:
+            module.fail_json(
+                msg="Listing arrays of availability zone '{0}' failed: {1}".format(
+                    result.item, result.error_message
+                )
+            )
+        for array in result.result:
+            arrays[(result.item, array.name)] = array
+    return arrays
@@ -17,6 +17,7 @@ import sys
 import json
 import re
 import traceback as trace
+from http import HTTPStatus
 
 
 class OperationException(Exception):
@@ -35,6 +36,35 @@ class OperationException(Exception):
         return self._http_error
 
 
+class DependencyException(Exception):
+    """Raised instead of running a task whose dependency failed."""
+
+    def __init__(self, dependency):
+        super(DependencyException, self).__init__(
+            "Skipped because '{0}' failed".format(dependency)
+        )
+        self.dependency = dependency
+
+
+def is_already_exists_error(exception):
+    """Returns True if `exception` raised by a create request (`fusion.rest.ApiException`)
+    or by awaiting its operation (`OperationException`) reports that the resource
+    already exists."""
+    code = None
+    http_code = None
+    try:
+        if isinstance(exception, OperationException):
+            error = exception.op.error
+            http_code = error.http_code
+            code = error.pure_code
+        else:
+            http_code = exception.status
+            code = json.loads(exception.body)["error"].get("pure_code")
+    except Exception:
+        pass
+    return code == "ALREADY_EXISTS" or http_code == HTTPStatus.CONFLICT
+
+
 def _get_verbosity(module):
     # verbosity is a private member and Ansible does not really allow
     # providing extra information only if the user wants it due to ideological
@@ -223,6 +253,19 @@ def format_http_exception(exception, traceback):
     return output
 
 
+def format_exception(exception):
+    """Formats an exception raised while processing one of many resources into
+    the same short form the exception hook uses. Returns a `str`."""
+    traceback = exception.__traceback__
+    if isinstance(exception, purefusion.rest.ApiException):
+        return format_fusion_api_exception(exception, traceback)[0]
+    if isinstance(exception, OperationException):
+        return format_failed_fusion_operation_exception(exception)
+    if isinstance(exception, urllib3.exceptions.HTTPError):
+        return format_http_exception(exception, traceback)
+    return str(exception)
+
+
 def _handle_api_exception(
     module,
     exception,
@@ -49,11 +49,17 @@ PARAM_ISSUER_ID = "issuer_id"
 PARAM_PRIVATE_KEY_FILE = "private_key_file"
 PARAM_PRIVATE_KEY_PASSWORD = "private_key_password"
 PARAM_ACCESS_TOKEN = "access_token"
+PARAM_OPERATION_JOURNAL = "operation_journal"
+PARAM_OPERATION_METRICS = "operation_metrics"
+PARAM_INDEX_CACHE = "index_cache"
+PARAM_INDEX_CACHE_TTL = "index_cache_ttl"
 ENV_ISSUER_ID = "FUSION_ISSUER_ID"
 ENV_API_HOST = "FUSION_API_HOST"
 ENV_PRIVATE_KEY_FILE = "FUSION_PRIVATE_KEY_FILE"
 ENV_TOKEN_ENDPOINT = "FUSION_TOKEN_ENDPOINT"
 ENV_ACCESS_TOKEN = "FUSION_ACCESS_TOKEN"
+ENV_OPERATION_JOURNAL = "FUSION_OPERATION_JOURNAL"
+ENV_INDEX_CACHE = "FUSION_INDEX_CACHE"
 
 # will be deprecated in 2.0.0
 PARAM_APP_ID = "app_id"  # replaced by PARAM_ISSUER_ID
@@ -180,4 +186,18 @@ def fusion_argument_spec():
         PARAM_ACCESS_TOKEN: {
             "no_log": True,
         },
+        PARAM_OPERATION_JOURNAL: {
+            "type": "path",
+        },
+        PARAM_OPERATION_METRICS: {
+            "type": "bool",
+            "default": False,
+        },
+        PARAM_INDEX_CACHE: {
+            "type": "path",
+        },
+        PARAM_INDEX_CACHE_TTL: {
+            "type": "int",
+            "default": 300,
+        },
     }
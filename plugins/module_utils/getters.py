@@ -7,93 +7,183 @@ from __future__ import absolute_import, division, print_function
 
 __metaclass__ = type
 
+import threading
+
 try:
     import fusion as purefusion
 except ImportError:
     pass
 
+# objects fetched during the module run, keyed by id() of the module instance;
+# the module is kept referenced by its entry so that its id() is not reused
+_cache = {}
+_cache_lock = threading.Lock()
+# bumped on every invalidation so that fetches racing with it are not cached
+_cache_generation = 0
+
+
+def invalidate_cache():
+    """Forgets all fetched objects, called whenever an operation finishes
+    since it might have changed any of them."""
+    global _cache_generation
+    with _cache_lock:
+        _cache.clear()
+        _cache_generation += 1
+
+
+def get_cached(module, key, fetch):
+    """
+    Returns the object identified by `key` (a tuple of object kind and names)
+    if it was already fetched during this module run, otherwise returns
+    the result of `fetch()` and remembers it. Not-found (None) results are
+    remembered as well.
+    """
+    with _cache_lock:
+        _, entries = _cache.get(id(module), (module, {}))
+        if key in entries:
+            return entries[key]
+        generation = _cache_generation
+
+    obj = fetch()
+
+    with _cache_lock:
+        if generation == _cache_generation:
+            _cache.setdefault(id(module), (module, {}))[1][key] = obj
+    return obj
+
+
+def _is_paginated(list_method):
+    """Whether the list method takes `offset`. The generated SDK documents every
+    parameter a method accepts and rejects any other one with TypeError, callables
+    which do not document their parameters are assumed to be paginated."""
+    doc = getattr(list_method, "__doc__", None) or ""
+    return ":param" not in doc or ":param int offset:" in doc
+
+
+def list_all(list_method, **kwargs):
+    """
+    Returns items of all pages returned by `list_method` (a `list_*` or `query_*`
+    API method). Only some of the SDK list methods are paginated (e.g. those of
+    tenants, tenant spaces, placement groups, volumes and snapshots), the others
+    (e.g. those of arrays, availability zones, network interface groups, storage
+    classes or protection policies) do not accept `offset` and return all items
+    at once, so they are called just once.
+    """
+    if not _is_paginated(list_method):
+        return list(list_method(**kwargs).items)
+    items = []
+    while True:
+        page = list_method(offset=len(items), **kwargs)
+        items.extend(page.items)
+        if page.more_items_remaining is not True or not page.items:
+            return items
+
 
 def get_array(module, fusion, array_name=None):
     """Return Array or None"""
-    array_api_instance = purefusion.ArraysApi(fusion)
-    try:
-        if array_name is None:
-            array_name = module.params["array"]
-
-        return array_api_instance.get_array(
-            array_name=array_name,
-            availability_zone_name=module.params["availability_zone"],
-            region_name=module.params["region"],
-        )
-    except purefusion.rest.ApiException:
-        return None
+    if array_name is None:
+        array_name = module.params["array"]
+    region_name = module.params["region"]
+    availability_zone_name = module.params["availability_zone"]
+
+    def _fetch():
+        array_api_instance = purefusion.ArraysApi(fusion)
+        try:
+            return array_api_instance.get_array(
+                array_name=array_name,
+                availability_zone_name=availability_zone_name,
+                region_name=region_name,
+            )
+        except purefusion.rest.ApiException:
+            return None
+
+    return get_cached(
+        module, ("array", region_name, availability_zone_name, array_name), _fetch
+    )
 
 
 def get_az(module, fusion, availability_zone_name=None):
     """Get Availability Zone or None"""
-    az_api_instance = purefusion.AvailabilityZonesApi(fusion)
-    try:
-        if availability_zone_name is None:
-            availability_zone_name = module.params["availability_zone"]
+    if availability_zone_name is None:
+        availability_zone_name = module.params["availability_zone"]
+    region_name = module.params["region"]
+
+    def _fetch():
+        az_api_instance = purefusion.AvailabilityZonesApi(fusion)
+        try:
+            return az_api_instance.get_availability_zone(
+                region_name=region_name,
+                availability_zone_name=availability_zone_name,
+            )
+        except purefusion.rest.ApiException:
+            return None
 
-        return az_api_instance.get_availability_zone(
-            region_name=module.params["region"],
-            availability_zone_name=availability_zone_name,
-        )
-    except purefusion.rest.ApiException:
-        return None
+    return get_cached(module, ("az", region_name, availability_zone_name), _fetch)
 
 
 def get_region(module, fusion, region_name=None):
     """Get Region or None"""
-    region_api_instance = purefusion.RegionsApi(fusion)
-    try:
-        if region_name is None:
-            region_name = module.params["region"]
+    if region_name is None:
+        region_name = module.params["region"]
 
-        return region_api_instance.get_region(
-            region_name=region_name,
-        )
-    except purefusion.rest.ApiException:
-        return None
+    def _fetch():
+        region_api_instance = purefusion.RegionsApi(fusion)
+        try:
+            return region_api_instance.get_region(
+                region_name=region_name,
+            )
+        except purefusion.rest.ApiException:
+            return None
+
+    return get_cached(module, ("region", region_name), _fetch)
 
 
 def get_ss(module, fusion, storage_service_name=None):
     """Return Storage Service or None"""
-    ss_api_instance = purefusion.StorageServicesApi(fusion)
-    try:
-        if storage_service_name is None:
-            storage_service_name = module.params["storage_service"]
+    if storage_service_name is None:
+        storage_service_name = module.params["storage_service"]
+
+    def _fetch():
+        ss_api_instance = purefusion.StorageServicesApi(fusion)
+        try:
+            return ss_api_instance.get_storage_service(
+                storage_service_name=storage_service_name
+            )
+        except purefusion.rest.ApiException:
+            return None
 
-        return ss_api_instance.get_storage_service(
-            storage_service_name=storage_service_name
-        )
-    except purefusion.rest.ApiException:
-        return None
+    return get_cached(module, ("ss", storage_service_name), _fetch)
 
 
 def get_tenant(module, fusion, tenant_name=None):
     """Return Tenant or None"""
-    api_instance = purefusion.TenantsApi(fusion)
-    try:
-        if tenant_name is None:
-            tenant_name = module.params["tenant"]
+    if tenant_name is None:
+        tenant_name = module.params["tenant"]
+
+    def _fetch():
+        api_instance = purefusion.TenantsApi(fusion)
+        try:
+            return api_instance.get_tenant(tenant_name=tenant_name)
+        except purefusion.rest.ApiException:
+            return None
 
-        return api_instance.get_tenant(tenant_name=tenant_name)
-    except purefusion.rest.ApiException:
-        return None
+    return get_cached(module, ("tenant", tenant_name), _fetch)
 
 
 def get_ts(module, fusion, tenant_space_name=None):
     """Tenant Space or None"""
-    ts_api_instance = purefusion.TenantSpacesApi(fusion)
-    try:
-        if tenant_space_name is None:
-            tenant_space_name = module.params["tenant_space"]
-
-        return ts_api_instance.get_tenant_space(
-            tenant_name=module.params["tenant"],
-            tenant_space_name=tenant_space_name,
-        )
-    except purefusion.rest.ApiException:
-        return None
+    if tenant_space_name is None:
+        tenant_space_name = module.params["tenant_space"]
+    tenant_name = module.params["tenant"]
+
+    def _fetch():
+        ts_api_instance = purefusion.TenantSpacesApi(fusion)
+        try:
+            return ts_api_instance.get_tenant_space(
+                tenant_name=tenant_name,
+                tenant_space_name=tenant_space_name,
+            )
+        except purefusion.rest.ApiException:
+            return None
+
+    return get_cached(module, ("ts", tenant_name, tenant_space_name), _fetch)
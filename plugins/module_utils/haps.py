@@ -0,0 +1,28 @@
+# -*- coding: utf-8 -*-
+
+# (c) 2023, Pure Storage, Inc.
+# GNU General Public License v3.0+ (see COPYING.GPLv3 or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import re
+
+HAP_PATTERN = re.compile("^[a-zA-Z0-9]([a-zA-Z0-9-_]{0,61}[a-zA-Z0-9])?$")
+IQN_PATTERN = re.compile(
+    r"^iqn\.\d{4}-\d{2}((?<!-)\.(?!-)[a-zA-Z0-9\-]+){1,63}(?<!-)(?<!\.)(:(?!:)[^,\s'\"]+)?$"
+)
+
+# host personalities accepted by host access policies
+PERSONALITIES = [
+    "linux",
+    "windows",
+    "hpux",
+    "vms",
+    "aix",
+    "esxi",
+    "solaris",
+    "hitachi-vsp",
+    "oracle-vm-server",
+]
@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+
+# (c) 2023, Pure Storage, Inc.
+# GNU General Public License v3.0+ (see COPYING.GPLv3 or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import json
+import os
+import tempfile
+import time
+from os import environ
+
+from ansible_collections.purestorage.fusion.plugins.module_utils.fusion import (
+    ENV_INDEX_CACHE,
+    PARAM_INDEX_CACHE,
+    PARAM_INDEX_CACHE_TTL,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.journal import (
+    _FileLock,
+)
+
+INDEX_CACHE_VERSION = 1
+
+# names of the cached indexes
+HAP_IQN_INDEX = "host_access_policies_by_iqn"
+
+
+class IndexCache:
+    """
+    Local file-backed cache of search indexes (dicts of str -> JSON value),
+    each stored together with the time it was built. Several processes may
+    share the same cache file, all access is serialized by a lock file.
+    """
+
+    def __init__(self, path):
+        self._path = path
+        self._lock_path = path + ".lock"
+
+    @property
+    def path(self):
+        return self._path
+
+    def get(self, key, ttl):
+        """Returns index stored under `key` if it is not older than `ttl` seconds, otherwise None."""
+        with self._locked():
+            entry = self._load()["indexes"].get(key)
+        if entry is None or time.time() - entry.get("built_at", 0) > ttl:
+            return None
+        return entry["entries"]
+
+    def store(self, key, entries):
+        with self._locked():
+            cache = self._load()
+            cache["indexes"][key] = {"built_at": time.time(), "entries": entries}
+            self._store(cache)
+
+    def invalidate(self, key):
+        with self._locked():
+            cache = self._load()
+            if cache["indexes"].pop(key, None) is not None:
+                self._store(cache)
+
+    def _locked(self):
+        return _FileLock(self._lock_path)
+
+    def _load(self):
+        try:
+            with open(self._path, "r") as f:
+                cache = json.load(f)
+            if cache.get("version") == INDEX_CACHE_VERSION and isinstance(
+                cache.get("indexes"), dict
+            ):
+                return cache
+        except (IOError, OSError, ValueError):
+            pass
+        # missing, corrupted or incompatible cache is treated as empty
+        return {"version": INDEX_CACHE_VERSION, "indexes": {}}
+
+    def _store(self, cache):
+        directory = os.path.dirname(os.path.abspath(self._path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".fusion-index-")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(cache, f)
+            os.replace(tmp_path, self._path)
+        except Exception:
+            os.unlink(tmp_path)
+            raise
+
+
+def get_index_cache(module):
+    """Returns `IndexCache` if the cache was requested by the user, otherwise None."""
+    path = module.params.get(PARAM_INDEX_CACHE) or environ.get(ENV_INDEX_CACHE)
+    if not path:
+        return None
+    return IndexCache(path)
+
+
+def _cache_key(fusion, name):
+    # the same cache may be used with several Fusion instances
+    return "{0}@{1}".format(name, fusion.configuration.host)
+
+
+def get_index(module, fusion, name, build, refresh=False):
+    """
+    Returns index `name` from the index cache or, if the cache is disabled, cold
+    or stale, the result of `build()` (a dict with str keys) which is then cached.
+    If `refresh` is true, the index is always built again.
+    """
+    cache = get_index_cache(module)
+    key = _cache_key(fusion, name)
+    if cache is not None and not refresh:
+        entries = cache.get(key, module.params.get(PARAM_INDEX_CACHE_TTL) or 0)
+        if entries is not None:
+            return entries
+    entries = build()
+    if cache is not None:
+        cache.store(key, entries)
+    return entries
+
+
+def invalidate_index(module, fusion, name):
+    """Drops cached index `name`, called after the indexed resources were changed."""
+    cache = get_index_cache(module)
+    if cache is not None:
+        cache.invalidate(_cache_key(fusion, name))
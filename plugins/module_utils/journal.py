@@ -0,0 +1,280 @@
+# -*- coding: utf-8 -*-
+
+# (c) 2023, Pure Storage, Inc.
+# GNU General Public License v3.0+ (see COPYING.GPLv3 or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+try:
+    import fusion as purefusion
+except ImportError:
+    pass
+
+import fcntl
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from os import environ
+
+from ansible_collections.purestorage.fusion.plugins.module_utils.fusion import (
+    PARAM_OPERATION_JOURNAL,
+    ENV_OPERATION_JOURNAL,
+)
+
+# only requests with these methods may result in a new Operation being submitted
+MUTATING_METHODS = ("POST", "PATCH", "DELETE")
+TERMINAL_STATUSES = ("Succeeded", "Failed")
+
+JOURNAL_VERSION = 1
+# entries which were never seen reaching a terminal state (e.g. the operation
+# expired on the backend) are dropped after this many seconds
+JOURNAL_ENTRY_MAX_AGE = 7 * 24 * 60 * 60
+
+# journals installed on fusion clients, keyed by id() of the client; the client
+# is kept referenced by its entry so that its id() is not reused
+_installed_journals = {}
+_installed_journals_lock = threading.Lock()
+
+
+def get_journal(fusion):
+    """Returns `OperationJournal` installed on `fusion` client or None."""
+    with _installed_journals_lock:
+        entry = _installed_journals.get(id(fusion))
+    return entry[1] if entry else None
+
+
+class OperationJournal:
+    """
+    Local file-backed record of submitted operations, keyed by a fingerprint
+    of the request that submitted them. Several processes (e.g. Ansible forks)
+    may share the same journal file, all access is serialized by a lock file.
+
+    Changes made concurrently by threads of the process are written together,
+    a thread whose change was written by another thread does not rewrite the file.
+    """
+
+    def __init__(self, path):
+        self._path = path
+        self._lock_path = path + ".lock"
+        # changes not written yet, guarded by _pending_lock
+        self._pending_records = {}
+        self._pending_compactions = set()
+        self._pending_lock = threading.Lock()
+        # serializes writers of this process, so that one of them writes all changes
+        self._write_lock = threading.Lock()
+
+    @property
+    def path(self):
+        return self._path
+
+    @staticmethod
+    def fingerprint(
+        method, resource_path, path_params=None, query_params=None, body=None
+    ):
+        """Returns a stable hash of a request. `body` must already be serialized to
+        plain python types (see `ApiClient.sanitize_for_serialization()`)."""
+        request = {
+            "method": method,
+            "resource_path": resource_path,
+            "path_params": path_params or {},
+            "query_params": sorted([list(p) for p in query_params or []]),
+            "body": body,
+        }
+        serialized = json.dumps(request, sort_keys=True, default=str)
+        return hashlib.sha256(serialized.encode("utf-8")).hexdigest()
+
+    def lookup(self, fingerprint):
+        """Returns operation id recorded for `fingerprint` or None."""
+        with self._locked():
+            entry = self._load()["operations"].get(fingerprint)
+        return entry["id"] if entry else None
+
+    def record(self, fingerprint, operation_id, request=None):
+        """Records operation with `operation_id` as submitted by request with `fingerprint`."""
+        with self._pending_lock:
+            self._pending_records[fingerprint] = {
+                "id": operation_id,
+                "request": request,
+                "submitted_at": int(time.time()),
+            }
+        self._write()
+
+    def compact(self, *operation_ids):
+        """Removes all entries of operations with `operation_ids` as well as expired entries."""
+        with self._pending_lock:
+            self._pending_compactions.update(operation_ids)
+        self._write()
+
+    def _write(self):
+        """Writes all pending changes, returns once the caller's change is written."""
+        with self._write_lock:
+            with self._pending_lock:
+                records = self._pending_records
+                compactions = self._pending_compactions
+                self._pending_records = {}
+                self._pending_compactions = set()
+            if not records and not compactions:
+                # written by the thread which held the lock before
+                return
+
+            with self._locked():
+                journal = self._load()
+                now = int(time.time())
+                operations = dict(journal["operations"])
+                operations.update(records)
+                if compactions:
+                    operations = {
+                        fingerprint: entry
+                        for fingerprint, entry in operations.items()
+                        if entry["id"] not in compactions
+                        and now - entry.get("submitted_at", now) < JOURNAL_ENTRY_MAX_AGE
+                    }
+                if operations != journal["operations"]:
+                    journal["operations"] = operations
+                    self._store(journal)
+
+    def _locked(self):
+        return _FileLock(self._lock_path)
+
+    def _load(self):
+        try:
+            with open(self._path, "r") as f:
+                journal = json.load(f)
+            if journal.get("version") == JOURNAL_VERSION and isinstance(
+                journal.get("operations"), dict
+            ):
+                return journal
+        except (IOError, OSError, ValueError):
+            pass
+        # missing, corrupted or incompatible journal is treated as empty
+        return {"version": JOURNAL_VERSION, "operations": {}}
+
+    def _store(self, journal):
+        directory = os.path.dirname(os.path.abspath(self._path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".fusion-journal-")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(journal, f)
+            os.replace(tmp_path, self._path)
+        except Exception:
+            os.unlink(tmp_path)
+            raise
+
+
+class _FileLock:
+    def __init__(self, path):
+        self._path = path
+        self._file = None
+
+    def __enter__(self):
+        self._file = open(self._path, "a")
+        fcntl.flock(self._file.fileno(), fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, *args):
+        fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+        self._file.close()
+        self._file = None
+
+
+def _resume_operation(fusion, journal, fingerprint):
+    """Returns recorded in-flight operation for `fingerprint` or None if the
+    request should be submitted."""
+    operation_id = journal.lookup(fingerprint)
+    if operation_id is None:
+        return None
+    try:
+        op = purefusion.OperationsApi(fusion).get_operation(operation_id)
+    except purefusion.rest.ApiException:
+        # the operation is not known to the backend anymore
+        journal.compact(operation_id)
+        return None
+    if op.status in TERMINAL_STATUSES:
+        # the previous run finished but the module decided to send the same
+        # request again, so the result of the previous operation is not relevant
+        journal.compact(operation_id)
+        return None
+    return op
+
+
+def _returns_operation(call_api_kwargs):
+    # only synchronous calls returning the deserialized Operation are journaled
+    return (
+        call_api_kwargs.get("response_type") == "Operation"
+        and call_api_kwargs.get("_return_http_data_only")
+        and not call_api_kwargs.get("async_req")
+    )
+
+
+def install_operation_journal(module, fusion):
+    """
+    Makes `fusion` client record every submitted operation in a local journal
+    if the journal was requested by the user. When the same request is sent
+    again while its operation is still in flight (e.g. the previous run was
+    interrupted), the recorded operation is returned instead of submitting
+    a duplicate one.
+    """
+    path = module.params.get(PARAM_OPERATION_JOURNAL) or environ.get(
+        ENV_OPERATION_JOURNAL
+    )
+    if not path:
+        return None
+
+    journal = OperationJournal(path)
+    with _installed_journals_lock:
+        _installed_journals[id(fusion)] = (fusion, journal)
+    original_call_api = fusion.call_api
+
+    def _call_api(
+        resource_path,
+        method,
+        path_params=None,
+        query_params=None,
+        header_params=None,
+        body=None,
+        **kwargs
+    ):
+        returns_operation = _returns_operation(kwargs)
+
+        fingerprint = None
+        if method in MUTATING_METHODS and returns_operation:
+            fingerprint = OperationJournal.fingerprint(
+                method,
+                resource_path,
+                fusion.sanitize_for_serialization(path_params),
+                fusion.sanitize_for_serialization(query_params),
+                fusion.sanitize_for_serialization(body),
+            )
+            op = _resume_operation(fusion, journal, fingerprint)
+            if op is not None:
+                module.warn(
+                    "Resuming operation '{0}' submitted by a previous run".format(op.id)
+                )
+                return op
+
+        result = original_call_api(
+            resource_path,
+            method,
+            path_params,
+            query_params,
+            header_params,
+            body=body,
+            **kwargs
+        )
+
+        if returns_operation and result is not None:
+            if result.status in TERMINAL_STATUSES:
+                journal.compact(result.id)
+            elif fingerprint is not None:
+                journal.record(
+                    fingerprint, result.id, "{0} {1}".format(method, resource_path)
+                )
+        return result
+
+    fusion.call_api = _call_api
+    return journal
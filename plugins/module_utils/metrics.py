@@ -0,0 +1,181 @@
+# -*- coding: utf-8 -*-
+
+# (c) 2023, Pure Storage, Inc.
+# GNU General Public License v3.0+ (see COPYING.GPLv3 or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import threading
+import time
+
+from ansible_collections.purestorage.fusion.plugins.module_utils.fusion import (
+    PARAM_OPERATION_METRICS,
+)
+
+# upper bounds (in seconds) of operation completion latency histogram buckets
+LATENCY_BUCKETS = [1, 2, 5, 10, 30, 60, 120, 300, 600]
+
+# only requests with these methods may result in a new Operation being submitted
+MUTATING_METHODS = ("POST", "PATCH", "DELETE")
+
+# collectors currently gathering metrics, keyed by the fusion client awaiting operations
+_active_collectors = {}
+_active_collectors_lock = threading.Lock()
+
+
+def get_collector(fusion):
+    """Returns `OperationMetrics` collecting for `fusion` client or None."""
+    with _active_collectors_lock:
+        return _active_collectors.get(id(fusion))
+
+
+def _round(seconds):
+    return round(seconds, 3) if seconds is not None else None
+
+
+class OperationTiming:
+    """
+    Timing of a single awaited operation. `submitted` is (wall clock time, monotonic
+    time) of submitting the request which returned the operation, the time the wait
+    starts is used if it is not known.
+    """
+
+    def __init__(self, operation, submitted=None):
+        self.operation_id = operation.id
+        self.request_type = getattr(operation, "request_type", None)
+        if submitted is None:
+            submitted = (time.time(), time.monotonic())
+        self.submitted_at, self._start = submitted
+        self.status = None
+        self.polls = 0
+        self._first_poll = None
+        self._end = None
+
+    def polled(self, operation):
+        """Called after every poll of the operation"""
+        if self._first_poll is None:
+            self._first_poll = time.monotonic()
+        self.polls += 1
+        self.status = operation.status
+        if self.request_type is None:
+            self.request_type = getattr(operation, "request_type", None)
+
+    def finished(self):
+        self._end = time.monotonic()
+
+    @property
+    def time_to_first_poll(self):
+        if self._first_poll is None:
+            return None
+        return self._first_poll - self._start
+
+    @property
+    def latency(self):
+        if self._end is None:
+            return None
+        return self._end - self._start
+
+    def to_dict(self):
+        return {
+            "id": self.operation_id,
+            "request_type": self.request_type,
+            "status": self.status,
+            "submitted_at": self.submitted_at,
+            "time_to_first_poll": _round(self.time_to_first_poll),
+            "polls": self.polls,
+            "latency": _round(self.latency),
+        }
+
+
+class OperationMetrics:
+    """Collects `OperationTiming` of all operations awaited during module run."""
+
+    def __init__(self):
+        self._timings = []
+        # (wall clock, monotonic) submission time of operations not awaited yet
+        self._submitted = {}
+        self._lock = threading.Lock()
+
+    def submitted(self, operation, submitted):
+        """Remembers submission time of `operation` until it is awaited."""
+        with self._lock:
+            self._submitted[operation.id] = submitted
+
+    def start(self, operation):
+        """Returns new `OperationTiming` for `operation` tracked by this collector."""
+        with self._lock:
+            timing = OperationTiming(operation, self._submitted.pop(operation.id, None))
+            self._timings.append(timing)
+        return timing
+
+    def summary(self):
+        """Returns per-operation timings and completion latency histogram."""
+        with self._lock:
+            timings = list(self._timings)
+        latencies = sorted(t.latency for t in timings if t.latency is not None)
+
+        buckets = [{"le": bound, "count": 0} for bound in LATENCY_BUCKETS]
+        overflow = 0
+        for latency in latencies:
+            for bucket in buckets:
+                if latency <= bucket["le"]:
+                    bucket["count"] += 1
+                    break
+            else:
+                overflow += 1
+
+        return {
+            "operations": [t.to_dict() for t in timings],
+            "count": len(latencies),
+            "polls": sum(t.polls for t in timings),
+            "latency_min": _round(latencies[0]) if latencies else None,
+            "latency_max": _round(latencies[-1]) if latencies else None,
+            "latency_mean": (
+                _round(sum(latencies) / len(latencies)) if latencies else None
+            ),
+            "latency_histogram": buckets,
+            "latency_overflow": overflow,
+        }
+
+
+def install_operation_metrics(module, fusion):
+    """
+    Starts collecting timing of operations submitted and awaited with `fusion`
+    client if requested by the user and adds the summary to the module result
+    as `operation_metrics`.
+    """
+    if not module.params.get(PARAM_OPERATION_METRICS):
+        return None
+
+    collector = OperationMetrics()
+    with _active_collectors_lock:
+        _active_collectors[id(fusion)] = collector
+
+    original_call_api = fusion.call_api
+
+    def _call_api(resource_path, method, *args, **kwargs):
+        submitted = (time.time(), time.monotonic())
+        result = original_call_api(resource_path, method, *args, **kwargs)
+        if (
+            method in MUTATING_METHODS
+            and kwargs.get("response_type") == "Operation"
+            and kwargs.get("_return_http_data_only")
+            and result is not None
+        ):
+            collector.submitted(result, submitted)
+        return result
+
+    fusion.call_api = _call_api
+
+    def _wrap(original):
+        def _with_metrics(*args, **kwargs):
+            kwargs[PARAM_OPERATION_METRICS] = collector.summary()
+            return original(*args, **kwargs)
+
+        return _with_metrics
+
+    module.exit_json = _wrap(module.exit_json)
+    module.fail_json = _wrap(module.fail_json)
+    return collector
@@ -68,9 +68,10 @@ def is_valid_address(addr):
 
 def is_address_in_network(addr, network):
     """Returns True if `addr` and `network` are a valid IPv4 address and
-    IPv4 network respectively and if `addr` is in `network`, False otherwise."""
+    IPv4 network respectively and if `addr` is in `network`, False otherwise.
+    `network` may have host bits set (e.g. an interface address like '10.0.0.5/24')."""
     if not is_valid_address(addr) or not is_valid_network(network):
         return False
     parsed_addr = ipaddress.ip_address(addr)
-    parsed_net = ipaddress.ip_network(network)
+    parsed_net = ipaddress.ip_network(network, strict=False)
     return parsed_addr in parsed_net
@@ -18,6 +18,16 @@ except ImportError:
 
 from ansible_collections.purestorage.fusion.plugins.module_utils.errors import (
     OperationException,
+    is_already_exists_error,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.getters import (
+    invalidate_cache,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.metrics import (
+    get_collector,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.watcher import (
+    get_watcher,
 )
 
 
@@ -25,12 +35,32 @@ def await_operation(fusion, operation, fail_playbook_if_operation_fails=True):
     """
     Waits for given operation to finish.
     Throws an exception by default if the operation fails.
+    If an `OperationWatcher` runs for `fusion`, waits for it to report the result instead.
+    Objects cached by `getters.get_cached()` are invalidated once the operation finishes.
     """
+    collector = get_collector(fusion)
+    timing = collector.start(operation) if collector is not None else None
+    try:
+        watcher = get_watcher(fusion)
+        if watcher is not None:
+            return watcher.wait(operation, fail_playbook_if_operation_fails, timing)
+        return _poll_operation(
+            fusion, operation, fail_playbook_if_operation_fails, timing
+        )
+    finally:
+        invalidate_cache()
+        if timing is not None:
+            timing.finished()
+
+
+def _poll_operation(fusion, operation, fail_playbook_if_operation_fails, timing):
     op_api = purefusion.OperationsApi(fusion)
     operation_get = None
     while True:
         try:
             operation_get = op_api.get_operation(operation.id)
+            if timing is not None:
+                timing.polled(operation_get)
             if operation_get.status == "Succeeded":
                 return operation_get
             if operation_get.status == "Failed":
@@ -40,3 +70,27 @@ def await_operation(fusion, operation, fail_playbook_if_operation_fails=True):
         except HTTPError as err:
             raise OperationException(operation, http_error=err)
         time.sleep(int(math.ceil(operation_get.retry_in / 1000)))
+
+
+def should_create_optimistically(module):
+    """Returns True if the resource should be created without reading it first."""
+    return (
+        module.params["state"] == "present"
+        and module.params.get("optimistic_create")
+        and not module.check_mode
+    )
+
+
+def create_optimistically(create, *args):
+    """
+    Calls `create(*args)`, which submits a create request and awaits its operation,
+    without checking whether the resource exists first.
+    Returns True if the resource was created, False if it already exists.
+    """
+    try:
+        create(*args)
+        return True
+    except (purefusion.rest.ApiException, OperationException) as err:
+        if is_already_exists_error(err):
+            return False
+        raise
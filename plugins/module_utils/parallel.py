@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+
+# (c) 2023, Pure Storage, Inc.
+# GNU General Public License v3.0+ (see COPYING.GPLv3 or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+from concurrent.futures import ThreadPoolExecutor
+
+from ansible_collections.purestorage.fusion.plugins.module_utils.errors import (
+    DependencyException,
+    format_exception,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.watcher import (
+    OperationWatcher,
+    get_watcher,
+)
+
+DEFAULT_CONCURRENCY = 8
+
+
+class TaskResult:
+    """Outcome of `run_concurrently()` for a single item."""
+
+    def __init__(self, item, result=None, error=None):
+        self.item = item
+        self.result = result
+        self.error = error
+
+    @property
+    def ok(self):
+        return self.error is None
+
+    @property
+    def error_message(self):
+        return format_exception(self.error) if self.error is not None else None
+
+
+class _SharedWatcher:
+    """Starts an `OperationWatcher` for `fusion` unless one is already running."""
+
+    def __init__(self, fusion):
+        self._fusion = fusion
+        self._watcher = None
+
+    def __enter__(self):
+        # nested calls share the watcher started by the outermost one
+        if get_watcher(self._fusion) is None:
+            self._watcher = OperationWatcher(self._fusion).start()
+        return self
+
+    def __exit__(self, *args):
+        if self._watcher is not None:
+            self._watcher.stop()
+
+
+def run_concurrently(fusion, func, items, concurrency=DEFAULT_CONCURRENCY):
+    """
+    Calls `func(item)` for every item of `items` from at most `concurrency`
+    threads and returns a list of `TaskResult` in the order of `items`.
+    Exceptions raised by `func` are stored in the results instead of being raised.
+    Operations awaited by `func` are polled in batches by an `OperationWatcher`.
+    """
+    items = list(items)
+    if not items:
+        return []
+
+    def _call(item):
+        try:
+            return TaskResult(item, result=func(item))
+        except Exception as err:
+            return TaskResult(item, error=err)
+
+    with _SharedWatcher(fusion):
+        workers = max(1, min(concurrency, len(items)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(_call, items))
+
+
+def get_levels(dependencies):
+    """
+    Splits keys of `dependencies` (dict of key -> iterable of keys the key
+    depends on) into levels, every key is placed one level after the last of
+    its dependencies. Dependencies which are not keys of `dependencies` are
+    ignored. Raises `ValueError` if the dependencies contain a cycle.
+    """
+    remaining = dict(
+        (key, set(deps) & set(dependencies)) for key, deps in dependencies.items()
+    )
+    levels = []
+    done = set()
+    while remaining:
+        level = [key for key, deps in remaining.items() if deps <= done]
+        if not level:
+            raise ValueError(
+                "Dependency cycle between {0}".format(
+                    ", ".join(sorted(str(key) for key in remaining))
+                )
+            )
+        for key in level:
+            del remaining[key]
+        done.update(level)
+        levels.append(level)
+    return levels
+
+
+def run_graph(fusion, tasks, dependencies=None, concurrency=DEFAULT_CONCURRENCY):
+    """
+    Runs `tasks` (dict of key -> callable without arguments) level by level
+    as given by `get_levels(dependencies)`, all tasks of a level at once with
+    at most `concurrency` threads. A task whose dependency failed is not run,
+    its result holds `DependencyException` instead.
+    Returns dict of key -> `TaskResult` whose item is the key.
+    """
+    dependencies = dependencies or {}
+    graph = dict((key, dependencies.get(key, ())) for key in tasks)
+    results = {}
+
+    def _run(key):
+        for dependency in graph[key]:
+            if dependency in results and not results[dependency].ok:
+                raise DependencyException(dependency)
+        return tasks[key]()
+
+    with _SharedWatcher(fusion):
+        for level in get_levels(graph):
+            for result in run_concurrently(fusion, _run, level, concurrency):
+                results[result.item] = result
+    return results
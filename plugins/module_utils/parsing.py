@@ -13,6 +13,9 @@ METRIC_SUFFIXES = ["K", "M", "G", "T", "P"]
 duration_pattern = re.compile(
     r"^((?P<Y>\d+)Y)?((?P<W>\d+)W)?((?P<D>\d+)D)?(((?P<H>\d+)H)?((?P<M>\d+)M)?)?$"
 )
+iso_duration_pattern = re.compile(
+    r"^P((?P<W>\d+)W)?((?P<D>\d+)D)?(T((?P<H>\d+)H)?((?P<M>\d+)M)?((?P<S>\d+)S)?)?$"
+)
 duration_transformation = {
     "Y": 365 * 24 * 60,
     "W": 7 * 24 * 60,
@@ -73,3 +76,21 @@ def parse_minutes(module, period):
                 "e.g. 4W3D5H, 5D8H5M, 3D, 5W, 1Y5W..."
             ).format(period)
         )
+
+
+def parse_iso_minutes(duration):
+    """Given an ISO 8601 duration returned by the API (e.g. PT103M, P1DT2H),
+    return the number of minutes or None if it cannot be parsed or is not
+    a whole number of minutes.
+    """
+    match = iso_duration_pattern.match(duration or "")
+    if not match or duration in ("P", "PT"):
+        return None
+    seconds = int(match.group("S") or 0)
+    if seconds % 60:
+        return None
+    return seconds // 60 + sum(
+        int(match.group(key)) * duration_transformation[key]
+        for key in ("W", "D", "H", "M")
+        if match.group(key)
+    )
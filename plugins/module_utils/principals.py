@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+
+# (c) 2023, Pure Storage, Inc.
+# GNU General Public License v3.0+ (see COPYING.GPLv3 or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import threading
+from collections import OrderedDict
+
+try:
+    import fusion as purefusion
+except ImportError:
+    pass
+
+from ansible_collections.purestorage.fusion.plugins.module_utils.index_cache import (
+    get_index,
+    get_index_cache,
+    invalidate_index,
+)
+
+# maximum number of principals remembered by the in-process cache
+PRINCIPAL_CACHE_SIZE = 4096
+
+USER_INDEX = "principals_by_user_name"
+# API clients are looked up one by one, each has its own cached index
+API_CLIENT_INDEX = "principals_by_api_client_key/{0}"
+
+# (Fusion host, index name, name) -> principal, least recently used first;
+# keyed by the host so that every client and module of the process shares it
+_principals = OrderedDict()
+_principals_lock = threading.Lock()
+
+
+def _remember(fusion, index_name, entries):
+    host = fusion.configuration.host
+    with _principals_lock:
+        for name, principal in entries.items():
+            key = (host, index_name, name)
+            _principals.pop(key, None)
+            _principals[key] = principal
+        while len(_principals) > PRINCIPAL_CACHE_SIZE:
+            _principals.popitem(last=False)
+
+
+def _recall(fusion, index_name, name):
+    key = (fusion.configuration.host, index_name, name)
+    with _principals_lock:
+        if key not in _principals:
+            return None
+        _principals.move_to_end(key)
+        return _principals[key]
+
+
+def _forget(fusion, index_name):
+    host = fusion.configuration.host
+    with _principals_lock:
+        for key in [k for k in _principals if k[:2] == (host, index_name)]:
+            del _principals[key]
+
+
+def _resolve(module, fusion, index_name, name, build):
+    principal = _recall(fusion, index_name, name)
+    if principal is not None:
+        return principal
+    index = get_index(module, fusion, index_name, build)
+    if name not in index and get_index_cache(module) is not None:
+        # the cached index might be older than the principal
+        index = get_index(module, fusion, index_name, build, refresh=True)
+    _remember(fusion, index_name, index)
+    return index.get(name)
+
+
+def _build_user_index(fusion):
+    id_api_instance = purefusion.IdentityManagerApi(fusion)
+    return dict((user.name, user.id) for user in id_api_instance.list_users())
+
+
+def resolve_user(module, fusion, user_name):
+    """Given a human-readable Fusion user, such as a Pure 1 App ID,
+    return the associated principal or None.
+    """
+    return _resolve(
+        module, fusion, USER_INDEX, user_name, lambda: _build_user_index(fusion)
+    )
+
+
+def resolve_api_client(module, fusion, api_client_key):
+    """Given an API client issuer ID, such as "pure1:apikey:123xXxyYyzYzASDF",
+    return the associated principal or None.
+    """
+
+    def _build():
+        id_api_instance = purefusion.IdentityManagerApi(fusion)
+        api_clients = id_api_instance.list_users(name=api_client_key)
+        return {api_client_key: api_clients[0].id} if api_clients else {}
+
+    return _resolve(
+        module, fusion, API_CLIENT_INDEX.format(api_client_key), api_client_key, _build
+    )
+
+
+def remember_users(module, fusion, users):
+    """Caches principals of `users` (a full listing of users) for later lookups"""
+    index = dict((user.name, user.id) for user in users)
+    get_index(module, fusion, USER_INDEX, lambda: index, refresh=True)
+    _remember(fusion, USER_INDEX, index)
+
+
+def forget_api_client(module, fusion, api_client_key):
+    """Drops cached principal of the API client, called after it is deleted"""
+    for index_name in (API_CLIENT_INDEX.format(api_client_key), USER_INDEX):
+        invalidate_index(module, fusion, index_name)
+        _forget(fusion, index_name)
@@ -10,6 +10,10 @@ except ImportError:
 from ansible_collections.purestorage.fusion.plugins.module_utils.operations import (
     await_operation,
 )
+from ansible_collections.purestorage.fusion.plugins.module_utils.parallel import (
+    DEFAULT_CONCURRENCY,
+    run_concurrently,
+)
 
 
 def delete_snapshot(fusion, snap, snapshots_api):
@@ -27,3 +31,61 @@ def delete_snapshot(fusion, snap, snapshots_api):
         snapshot_name=snap.name,
     )
     await_operation(fusion, op)
+
+
+def delete_snapshots(module, fusion, snapshots):
+    """
+    Destroys and deletes all `snapshots` in two pipelined phases: all destroy
+    patches are submitted concurrently first, then deletes of all destroyed
+    snapshots. Returns progress of the teardown, fails the module with it if
+    any snapshot could not be deleted.
+    """
+    snapshots_api = purefusion.SnapshotsApi(fusion)
+    concurrency = module.params.get("concurrency") or DEFAULT_CONCURRENCY
+
+    def _destroy(snap):
+        """Returns whether the snapshot had to be destroyed"""
+        if snap.destroyed:
+            return False
+        patch = purefusion.SnapshotPatch(destroyed=purefusion.NullableBoolean(True))
+        op = snapshots_api.update_snapshot(
+            body=patch,
+            tenant_name=snap.tenant.name,
+            tenant_space_name=snap.tenant_space.name,
+            snapshot_name=snap.name,
+        )
+        await_operation(fusion, op)
+        return True
+
+    def _delete(snap):
+        op = snapshots_api.delete_snapshot(
+            tenant_name=snap.tenant.name,
+            tenant_space_name=snap.tenant_space.name,
+            snapshot_name=snap.name,
+        )
+        await_operation(fusion, op)
+
+    destroyed = run_concurrently(fusion, _destroy, snapshots, concurrency)
+    deleted = run_concurrently(
+        fusion, _delete, [r.item for r in destroyed if r.ok], concurrency
+    )
+
+    errors = dict(
+        (r.item.name, r.error_message) for r in destroyed + deleted if not r.ok
+    )
+    progress = {
+        "total": len(snapshots),
+        "destroyed": len([r for r in destroyed if r.ok and r.result]),
+        "deleted": len([r for r in deleted if r.ok]),
+        "failed": len(errors),
+        "errors": errors,
+    }
+    if errors:
+        module.fail_json(
+            msg="Failed to delete {0} of {1} snapshots, first error: {2}".format(
+                len(errors), len(snapshots), next(iter(errors.values()))
+            ),
+            changed=bool(progress["destroyed"] or progress["deleted"]),
+            snapshots=progress,
+        )
+    return progress
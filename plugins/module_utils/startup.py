@@ -19,8 +19,19 @@ from ansible_collections.purestorage.fusion.plugins.module_utils.fusion import (
     get_fusion,
 )
 
+from ansible_collections.purestorage.fusion.plugins.module_utils.journal import (
+    install_operation_journal,
+)
+
+from ansible_collections.purestorage.fusion.plugins.module_utils.metrics import (
+    install_operation_metrics,
+)
+
 
 def setup_fusion(module):
     check_dependencies(module)
     install_fusion_exception_hook(module)
-    return get_fusion(module)
+    fusion = get_fusion(module)
+    install_operation_journal(module, fusion)
+    install_operation_metrics(module, fusion)
+    return fusion
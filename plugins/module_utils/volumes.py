@@ -0,0 +1,236 @@
+# -*- coding: utf-8 -*-
+
+# (c) 2023, Pure Storage, Inc.
+# GNU General Public License v3.0+ (see COPYING.GPLv3 or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+try:
+    import fusion as purefusion
+except ImportError:
+    pass
+
+from ansible_collections.purestorage.fusion.plugins.module_utils.parsing import (
+    parse_number_with_metric_suffix,
+)
+
+
+def get_wanted_haps(params):
+    """Return set of host access policies to assign"""
+    if not params["host_access_policies"]:
+        return set()
+    # looks like yaml parsing can leave in some spaces if coma-delimited .so strip() the names
+    return set([hap.strip() for hap in params["host_access_policies"]])
+
+
+def extract_current_haps(volume):
+    """Return set of host access policies that volume currently has"""
+    if not volume.host_access_policies:
+        return set()
+    return set([hap.name for hap in volume.host_access_policies])
+
+
+def volume_snapshot_link(tenant, tenant_space, snapshot, volume_snapshot):
+    """Returns link to the volume snapshot"""
+    return "/tenants/{0}/tenant-spaces/{1}/snapshots/{2}/volume-snapshots/{3}".format(
+        tenant, tenant_space, snapshot, volume_snapshot
+    )
+
+
+def get_source_link(params):
+    """Returns link to the volume or volume snapshot the volume should be copied from or None"""
+    tenant = params["tenant"]
+    tenant_space = params["tenant_space"]
+    volume = params["source_volume"]
+    snapshot = params["source_snapshot"]
+    volume_snapshot = params["source_volume_snapshot"]
+    if (
+        tenant is None or tenant_space is None
+    ):  # should not happen as those parameters are always required by the ansible module
+        return None
+    if volume is not None:
+        return f"/tenants/{tenant}/tenant-spaces/{tenant_space}/volumes/{volume}"
+    if snapshot is not None and volume_snapshot is not None:
+        return volume_snapshot_link(tenant, tenant_space, snapshot, volume_snapshot)
+    return None
+
+
+def validate_volume(module, params, volume, name=None):
+    """
+    Validates most argument conditions and possible unacceptable argument combinations
+    of volume `params` against the existing `volume` (None if it does not exist).
+    `name` is mentioned in the error messages when validating one of many volumes.
+    """
+    if name is None:
+        volume_ref, subject, suffix = "a volume", "Volume", ""
+    else:
+        volume_ref = "volume '{0}'".format(name)
+        subject = "Volume '{0}'".format(name)
+        suffix = " (volume '{0}')".format(name)
+
+    if params["state"] == "present" and not volume:
+        missing = [
+            param
+            for param in ("placement_group", "storage_class")
+            if params[param] is None
+        ]
+        if missing:
+            module.fail_json(
+                msg="missing required arguments: {0}{1}".format(
+                    ", ".join(missing), suffix
+                )
+            )
+
+        if (
+            params["size"] is None
+            and params["source_volume"] is None
+            and params["source_snapshot"] is None
+        ):
+            module.fail_json(
+                msg="Either `size`, `source_volume` or `source_snapshot` parameter is required when creating {0}.".format(
+                    volume_ref
+                )
+            )
+
+    if params["state"] == "absent" and (
+        params["host_access_policies"] or (volume and volume.host_access_policies)
+    ):
+        module.fail_json(
+            msg=(
+                "{0} must have no host access policies when destroyed, either revert the delete "
+                "by setting 'state: present' or remove all HAPs by 'host_access_policies: []'"
+            ).format(subject)
+        )
+
+    if params["state"] == "present" and params["eradicate"]:
+        module.fail_json(
+            msg="'eradicate: true' cannot be used together with 'state: present'{0}".format(
+                suffix
+            )
+        )
+
+    if params["size"] is not None:
+        size = parse_number_with_metric_suffix(module, params["size"])
+        if size < 1048576 or size > 4503599627370496:  # 1MB to 4PB
+            module.fail_json(
+                msg="Size{0} is not within the required range, size must be between 1MB and 4PB".format(
+                    " of " + volume_ref if name is not None else ""
+                )
+            )
+
+
+def update_host_access_policies(module, params, current, patches):
+    # 'params[...] is not None' to differentiate between empty list and no list
+    if params["host_access_policies"] is not None:
+        wanted_haps = get_wanted_haps(params)
+        if wanted_haps != extract_current_haps(current):
+            patch = purefusion.VolumePatch(
+                host_access_policies=purefusion.NullableString(",".join(wanted_haps))
+            )
+            patches.append(patch)
+
+
+def update_destroyed(module, params, current, patches):
+    destroyed = params["state"] != "present"
+    if destroyed != current.destroyed:
+        patch = purefusion.VolumePatch(destroyed=purefusion.NullableBoolean(destroyed))
+        patches.append(patch)
+        if destroyed and not params["eradicate"]:
+            module.warn(
+                (
+                    "Volume '{0}' is being soft deleted to prevent data loss, "
+                    "if you want to wipe it immediately to reclaim used space, add 'eradicate: true'"
+                ).format(current.name)
+            )
+
+
+def update_display_name(module, params, current, patches):
+    if params["display_name"] and params["display_name"] != current.display_name:
+        patch = purefusion.VolumePatch(
+            display_name=purefusion.NullableString(params["display_name"])
+        )
+        patches.append(patch)
+
+
+def update_storage_class(module, params, current, patches):
+    if (
+        params["storage_class"]
+        and params["storage_class"] != current.storage_class.name
+    ):
+        patch = purefusion.VolumePatch(
+            storage_class=purefusion.NullableString(params["storage_class"])
+        )
+        patches.append(patch)
+
+
+def update_placement_group(module, params, current, patches):
+    if (
+        params["placement_group"]
+        and params["placement_group"] != current.placement_group.name
+    ):
+        patch = purefusion.VolumePatch(
+            placement_group=purefusion.NullableString(params["placement_group"])
+        )
+        patches.append(patch)
+
+
+def update_size(module, params, current, patches):
+    if params["size"]:
+        wanted_size = parse_number_with_metric_suffix(module, params["size"])
+        if wanted_size != current.size:
+            patch = purefusion.VolumePatch(size=purefusion.NullableSize(wanted_size))
+            patches.append(patch)
+
+
+def update_protection_policy(module, params, current, patches):
+    current_policy = current.protection_policy.name if current.protection_policy else ""
+    if (
+        params["protection_policy"] is not None
+        and params["protection_policy"] != current_policy
+    ):
+        patch = purefusion.VolumePatch(
+            protection_policy=purefusion.NullableString(params["protection_policy"])
+        )
+        patches.append(patch)
+
+
+def update_source_link(module, params, current, patches):
+    source_link = get_source_link(params)
+    if source_link is not None and (
+        current.source is None or current.source.self_link != source_link
+    ):
+        patch = purefusion.VolumePatch(
+            source_link=purefusion.NullableString(source_link)
+        )
+        patches.append(patch)
+
+
+PROPERTY_UPDATES = (
+    update_size,
+    update_protection_policy,
+    update_display_name,
+    update_storage_class,
+    update_placement_group,
+    update_host_access_policies,
+    update_source_link,
+)
+
+
+def get_volume_patches(module, params, current):
+    """Returns list of `VolumePatch`es which make the existing volume `current`
+    match volume `params`, in the order they have to be applied"""
+    patches = []
+    # volumes with 'destroyed' flag are kinda special because we can't change
+    # most of their properties while in this state, so we need to set it last
+    # and unset it first if changed, respectively
+    if params["state"] == "present":
+        update_destroyed(module, params, current, patches)
+        for update in PROPERTY_UPDATES:
+            update(module, params, current, patches)
+    elif params["state"] == "absent" and not current.destroyed:
+        for update in PROPERTY_UPDATES:
+            update(module, params, current, patches)
+        update_destroyed(module, params, current, patches)
+    return patches
@@ -0,0 +1,223 @@
+# -*- coding: utf-8 -*-
+
+# (c) 2023, Pure Storage, Inc.
+# GNU General Public License v3.0+ (see COPYING.GPLv3 or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import math
+import threading
+
+try:
+    import fusion as purefusion
+    from urllib3.exceptions import HTTPError
+except ImportError:
+    pass
+
+from ansible_collections.purestorage.fusion.plugins.module_utils.errors import (
+    OperationException,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.journal import (
+    get_journal,
+)
+
+TERMINAL_STATUSES = ("Succeeded", "Failed")
+DEFAULT_POLL_INTERVAL = 1.0
+
+# watchers currently running, keyed by the fusion client they poll with
+_active_watchers = {}
+_active_watchers_lock = threading.Lock()
+
+
+def get_watcher(fusion):
+    """Returns running `OperationWatcher` for `fusion` client or None."""
+    with _active_watchers_lock:
+        return _active_watchers.get(id(fusion))
+
+
+def _request_collection(operation):
+    # operations are listed per collection, the default one does not show
+    # operations requested within tenants or tenant spaces
+    return getattr(operation, "request_collection", None) or "/"
+
+
+def _build_filter(operation_ids):
+    return "id in ({0})".format(
+        ",".join("'{0}'".format(operation_id) for operation_id in operation_ids)
+    )
+
+
+class _Waiter:
+    def __init__(self, operation, timing):
+        self.operation = operation
+        self.timing = timing
+        self.result = None
+        self.error = None
+        self.done = threading.Event()
+
+
+class OperationWatcher:
+    """
+    Background thread which polls all outstanding operations of the process
+    with a single `list_operations` request per request collection and tick
+    (operations missing from the listing are polled one by one) and wakes up
+    every waiter once its operation finishes. While the watcher runs, `await_operation()`
+    calls using the same `fusion` client are served by it, so any number of
+    threads waiting on operations produce a single stream of requests.
+
+    Use as a context manager:
+
+        with OperationWatcher(fusion):
+            ... # await_operation(fusion, op) calls from any thread
+    """
+
+    def __init__(self, fusion, poll_interval=None):
+        self._fusion = fusion
+        self._poll_interval = poll_interval
+        self._waiters = {}
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def start(self):
+        with _active_watchers_lock:
+            if id(self._fusion) in _active_watchers:
+                raise RuntimeError("BUG: operation watcher is already running")
+            _active_watchers[id(self._fusion)] = self
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, name="fusion-op-watcher")
+        self._thread.daemon = True
+        self._thread.start()
+        return self
+
+    def stop(self):
+        with _active_watchers_lock:
+            if _active_watchers.get(id(self._fusion)) is self:
+                del _active_watchers[id(self._fusion)]
+        self._stopped.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        # nobody is going to poll for the remaining waiters anymore
+        with self._lock:
+            remaining = list(self._waiters.keys())
+        for op_id in remaining:
+            self._finish(op_id, error=RuntimeError("operation watcher was stopped"))
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *args):
+        self.stop()
+
+    def wait(self, operation, fail_playbook_if_operation_fails=True, timing=None):
+        """
+        Blocks until given operation finishes, same semantics as `await_operation()`.
+        `timing` is an optional `OperationTiming` to report polls to.
+        """
+        if self._stopped.is_set():
+            raise RuntimeError("BUG: operation watcher is not running")
+        waiter = _Waiter(operation, timing)
+        with self._lock:
+            self._waiters.setdefault(operation.id, []).append(waiter)
+        self._wakeup.set()
+        waiter.done.wait()
+
+        if waiter.error is not None:
+            raise waiter.error
+        if waiter.result.status == "Failed" and fail_playbook_if_operation_fails:
+            raise OperationException(waiter.result)
+        return waiter.result
+
+    def _run(self):
+        while not self._stopped.is_set():
+            with self._lock:
+                outstanding = dict(
+                    (op_id, waiters[0].operation)
+                    for op_id, waiters in self._waiters.items()
+                )
+            if not outstanding:
+                self._wakeup.wait()
+                self._wakeup.clear()
+                continue
+
+            try:
+                retry_in = self._poll(outstanding)
+            except Exception as err:
+                # never leave the waiters hanging, let them report the problem
+                for op_id in outstanding.keys():
+                    self._finish(op_id, error=err)
+                continue
+            self._stopped.wait(retry_in)
+
+    def _poll(self, outstanding):
+        """Polls `outstanding` operations, wakes up finished waiters and
+        returns number of seconds until the next poll."""
+        op_api = purefusion.OperationsApi(self._fusion)
+        polled = {}
+        collections = {}
+        for op_id, operation in outstanding.items():
+            collections.setdefault(_request_collection(operation), []).append(op_id)
+        try:
+            for collection, op_ids in collections.items():
+                try:
+                    ops = op_api.list_operations(
+                        filter=_build_filter(op_ids),
+                        limit=len(op_ids),
+                        request_collection=collection,
+                    )
+                except purefusion.rest.ApiException:
+                    # might be transient, the operations are polled one by one this time
+                    continue
+                polled.update((op.id, op) for op in ops.items if op.id in outstanding)
+            for op_id in outstanding.keys():
+                if op_id in polled:
+                    continue
+                try:
+                    polled[op_id] = op_api.get_operation(op_id)
+                except purefusion.rest.ApiException as err:
+                    self._finish(op_id, error=err)
+        except HTTPError as err:
+            for op_id, operation in outstanding.items():
+                self._finish(op_id, error=OperationException(operation, http_error=err))
+            return 0
+
+        finished = [op for op in polled.values() if op.status in TERMINAL_STATUSES]
+        journal = get_journal(self._fusion)
+        if finished and journal is not None:
+            # batch polls are not seen by the journal, which compacts single polls only
+            journal.compact(*[op.id for op in finished])
+
+        retry_in = None
+        for op_id, op in polled.items():
+            self._record_poll(op_id, op)
+            if op.status in TERMINAL_STATUSES:
+                self._finish(op_id, result=op)
+            elif op.retry_in is not None:
+                retry_in = (
+                    op.retry_in if retry_in is None else min(retry_in, op.retry_in)
+                )
+
+        if self._poll_interval is not None:
+            return self._poll_interval
+        if retry_in is None:
+            return DEFAULT_POLL_INTERVAL
+        return int(math.ceil(retry_in / 1000))
+
+    def _record_poll(self, op_id, op):
+        with self._lock:
+            timings = [w.timing for w in self._waiters.get(op_id, []) if w.timing]
+        for timing in timings:
+            timing.polled(op)
+
+    def _finish(self, op_id, result=None, error=None):
+        with self._lock:
+            waiters = self._waiters.pop(op_id, [])
+        for waiter in waiters:
+            waiter.result = result
+            waiter.error = error
+            waiter.done.set()
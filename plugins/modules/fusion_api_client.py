@@ -17,14 +17,12 @@ description:
 - Create or delete an API Client in Pure Storage Fusion.
 author:
 - Pure Storage Ansible Team (@sdodsley) <pure-ansible-team@purestorage.com>
-notes:
-- Supports C(check mode).
 options:
   name:
     description:
     - The name of the client.
+    - Required unless I(clients) is used.
     type: str
-    required: true
   state:
     description:
     - Define whether the client should exist or not.
@@ -35,10 +33,42 @@ options:
     description:
     - The API clients PEM formatted (Base64 encoded) RSA public key.
     - Include the C(—–BEGIN PUBLIC KEY—–) and C(—–END PUBLIC KEY—–) lines.
+    - Required together with I(name).
     type: str
-    required: true
+  clients:
+    description:
+    - Manage many API clients at once instead of the single one given by I(name) and I(public_key).
+    - Existing API clients are listed once and the missing ones are created
+      (or, if I(state=absent), the existing ones deleted) concurrently.
+    type: list
+    elements: dict
+    version_added: '1.6.0'
+    suboptions:
+      name:
+        description:
+        - The name of the client.
+        type: str
+        required: true
+      public_key:
+        description:
+        - The API clients PEM formatted (Base64 encoded) RSA public key.
+        type: str
+        required: true
+  rotate:
+    description:
+    - Used with I(clients) and I(state=present).
+    - Delete other API clients with the same names as I(clients) but different public keys,
+      once the clients with the new keys are created.
+    type: bool
+    default: false
+    version_added: '1.6.0'
+notes:
+- Supports C(check mode).
+- API clients are found through an index keyed by fingerprints of their public keys,
+  which is kept in the index cache if I(index_cache) is set.
 extends_documentation_fragment:
 - purestorage.fusion.purestorage.fusion
+- purestorage.fusion.purestorage.concurrency
 """
 
 EXAMPLES = r"""
@@ -48,11 +78,42 @@ EXAMPLES = r"""
     public_key: "{{lookup('file', 'public_pem_file') }}"
     issuer_id: key_name
     private_key_file: "az-admin-private-key.pem"
+
+- name: Rotate keys of many API clients
+  purestorage.fusion.fusion_api_client:
+    clients:
+      - name: "backup client"
+        public_key: "{{ lookup('file', 'backup_public_pem_file') }}"
+      - name: "monitoring client"
+        public_key: "{{ lookup('file', 'monitoring_public_pem_file') }}"
+    rotate: true
+    issuer_id: key_name
+    private_key_file: "az-admin-private-key.pem"
 """
 
 RETURN = r"""
+clients:
+  description: Result for every API client created or deleted by the bulk mode.
+  returned: when I(clients) is used
+  type: list
+  elements: dict
+  contains:
+    name:
+      description: The name of the API client.
+      type: str
+    action:
+      description: C(create) or C(delete).
+      type: str
+    issuer:
+      description: The issuer ID of the API client, null for clients not created (yet).
+      type: str
+    error:
+      description: Error message if the action failed, null otherwise.
+      type: str
 """
 
+import hashlib
+
 try:
     import fusion as purefusion
 except ImportError:
@@ -62,34 +123,93 @@ from ansible.module_utils.basic import AnsibleModule
 from ansible_collections.purestorage.fusion.plugins.module_utils.fusion import (
     fusion_argument_spec,
 )
+from ansible_collections.purestorage.fusion.plugins.module_utils.index_cache import (
+    get_index,
+    get_index_cache,
+    invalidate_index,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.parallel import (
+    DEFAULT_CONCURRENCY,
+    run_concurrently,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.principals import (
+    forget_api_client,
+)
 from ansible_collections.purestorage.fusion.plugins.module_utils.startup import (
     setup_fusion,
 )
 
+API_CLIENT_KEY_INDEX = "api_clients_by_public_key"
+
+
+def fingerprint(public_key):
+    return hashlib.sha256(public_key.encode("utf-8")).hexdigest()
+
+
+def build_key_index(clients):
+    """Returns API clients (as dicts) with the same public key keyed by fingerprint of the key"""
+    index = {}
+    for client in clients:
+        index.setdefault(fingerprint(client.public_key), []).append(
+            {
+                "id": client.id,
+                "display_name": client.display_name,
+                "issuer": client.issuer,
+            }
+        )
+    return index
+
+
+def _find_in_index(module, index):
+    for client in index.get(fingerprint(module.params["public_key"]), []):
+        if client["display_name"] == module.params["name"]:
+            return client
+    return None
+
 
-def get_client_id(module, fusion):
-    """Get API Client ID, or None if not available"""
+def get_client(module, fusion):
+    """Get API Client (as dict of id, display_name and issuer), or None if not available"""
     id_api_instance = purefusion.IdentityManagerApi(fusion)
+
+    # API clients cannot be filtered by the server, they are found through
+    # an index of all of them keyed by fingerprint of their public keys
+    def _build():
+        return build_key_index(id_api_instance.list_api_clients())
+
     try:
-        clients = id_api_instance.list_api_clients()
-        for client in clients:
-            if (
-                client.public_key == module.params["public_key"]
-                and client.display_name == module.params["name"]
-            ):
-                return client.id
-        return None
+        client = _find_in_index(
+            module, get_index(module, fusion, API_CLIENT_KEY_INDEX, _build)
+        )
+        if get_index_cache(module) is None:
+            return client
+        if client is not None:
+            # the cached index might be stale, the client is confirmed by a cheap get
+            try:
+                current = id_api_instance.get_api_client(api_client_id=client["id"])
+                if (
+                    current.public_key == module.params["public_key"]
+                    and current.display_name == module.params["name"]
+                ):
+                    return client
+            except purefusion.rest.ApiException:
+                pass
+        return _find_in_index(
+            module,
+            get_index(module, fusion, API_CLIENT_KEY_INDEX, _build, refresh=True),
+        )
     except purefusion.rest.ApiException:
         return None
 
 
-def delete_client(module, fusion, client_id):
+def delete_client(module, fusion, client):
     """Delete API Client"""
     id_api_instance = purefusion.IdentityManagerApi(fusion)
 
     changed = True
     if not module.check_mode:
-        id_api_instance.delete_api_client(api_client_id=client_id)
+        id_api_instance.delete_api_client(api_client_id=client["id"])
+        invalidate_index(module, fusion, API_CLIENT_KEY_INDEX)
+        forget_api_client(module, fusion, client["issuer"])
     module.exit_json(changed=changed)
 
 
@@ -105,30 +225,172 @@ def create_client(module, fusion):
             display_name=module.params["name"],
         )
         id_api_instance.create_api_client(client)
+        invalidate_index(module, fusion, API_CLIENT_KEY_INDEX)
 
     module.exit_json(changed=changed)
 
 
+def plan_clients(module, clients):
+    """Returns (specs to create, clients to delete) for the bulk mode"""
+    by_name = {}
+    for client in clients:
+        by_name.setdefault(client.display_name, []).append(client)
+
+    to_create = []
+    to_delete = []
+    seen = set()
+    for spec in module.params["clients"]:
+        key = (spec["name"], fingerprint(spec["public_key"]))
+        if key in seen:
+            continue
+        seen.add(key)
+        existing = by_name.get(spec["name"], [])
+        same_key = [c for c in existing if fingerprint(c.public_key) == key[1]]
+        if module.params["state"] == "absent":
+            to_delete.extend(same_key)
+            continue
+        if not same_key:
+            to_create.append(spec)
+        if module.params["rotate"]:
+            # old keys of the client are removed once the new key is in place
+            wanted = set(
+                fingerprint(s["public_key"])
+                for s in module.params["clients"]
+                if s["name"] == spec["name"]
+            )
+            to_delete.extend(
+                c
+                for c in existing
+                if fingerprint(c.public_key) not in wanted and c not in to_delete
+            )
+    return to_create, to_delete
+
+
+def sync_clients(module, fusion):
+    """Creates, rotates or deletes all API clients given by `clients`"""
+    id_api_instance = purefusion.IdentityManagerApi(fusion)
+    clients = id_api_instance.list_api_clients()
+    # the full listing is needed anyway, so the cached index is refreshed as well
+    get_index(
+        module,
+        fusion,
+        API_CLIENT_KEY_INDEX,
+        lambda: build_key_index(clients),
+        refresh=True,
+    )
+    to_create, to_delete = plan_clients(module, clients)
+
+    report = []
+    if module.check_mode:
+        report = [
+            {"name": spec["name"], "action": "create", "issuer": None, "error": None}
+            for spec in to_create
+        ] + [
+            {
+                "name": client.display_name,
+                "action": "delete",
+                "issuer": client.issuer,
+                "error": None,
+            }
+            for client in to_delete
+        ]
+        module.exit_json(changed=len(report) != 0, clients=report)
+
+    failed_names = set()
+    for result in run_concurrently(
+        fusion,
+        lambda spec: id_api_instance.create_api_client(
+            purefusion.APIClientPost(
+                public_key=spec["public_key"], display_name=spec["name"]
+            )
+        ),
+        to_create,
+        module.params["concurrency"],
+    ):
+        if not result.ok:
+            failed_names.add(result.item["name"])
+        report.append(
+            {
+                "name": result.item["name"],
+                "action": "create",
+                "issuer": result.result.issuer if result.ok else None,
+                "error": result.error_message,
+            }
+        )
+
+    # old keys are kept if their replacement could not be created
+    to_delete = [c for c in to_delete if c.display_name not in failed_names]
+    for result in run_concurrently(
+        fusion,
+        lambda client: id_api_instance.delete_api_client(api_client_id=client.id),
+        to_delete,
+        module.params["concurrency"],
+    ):
+        if result.ok:
+            forget_api_client(module, fusion, result.item.issuer)
+        report.append(
+            {
+                "name": result.item.display_name,
+                "action": "delete",
+                "issuer": result.item.issuer,
+                "error": result.error_message,
+            }
+        )
+    if report:
+        invalidate_index(module, fusion, API_CLIENT_KEY_INDEX)
+
+    errors = [entry["error"] for entry in report if entry["error"] is not None]
+    changed = len(report) - len(errors) != 0
+    if errors:
+        module.fail_json(
+            msg="{0} of {1} API client changes failed, first error: {2}".format(
+                len(errors), len(report), errors[0]
+            ),
+            changed=changed,
+            clients=report,
+        )
+    module.exit_json(changed=changed, clients=report)
+
+
 def main():
     """Main code"""
     argument_spec = fusion_argument_spec()
     argument_spec.update(
         dict(
-            name=dict(type="str", required=True),
-            public_key=dict(type="str", required=True),
+            name=dict(type="str"),
+            public_key=dict(type="str"),
+            clients=dict(
+                type="list",
+                elements="dict",
+                options=dict(
+                    name=dict(type="str", required=True),
+                    public_key=dict(type="str", required=True),
+                ),
+            ),
+            rotate=dict(type="bool", default=False),
             state=dict(type="str", default="present", choices=["present", "absent"]),
+            concurrency=dict(type="int", default=DEFAULT_CONCURRENCY),
         )
     )
 
-    module = AnsibleModule(argument_spec, supports_check_mode=True)
+    module = AnsibleModule(
+        argument_spec,
+        supports_check_mode=True,
+        required_one_of=[("name", "clients")],
+        required_together=[("name", "public_key")],
+        mutually_exclusive=[("name", "clients"), ("public_key", "clients")],
+    )
     fusion = setup_fusion(module)
 
+    if module.params["clients"] is not None:
+        sync_clients(module, fusion)
+
     state = module.params["state"]
-    client_id = get_client_id(module, fusion)
-    if client_id is None and state == "present":
+    client = get_client(module, fusion)
+    if client is None and state == "present":
         create_client(module, fusion)
-    elif client_id is not None and state == "absent":
-        delete_client(module, fusion, client_id)
+    elif client is not None and state == "absent":
+        delete_client(module, fusion, client)
     else:
         module.exit_json(changed=False)
 
@@ -0,0 +1,379 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# (c) 2023, Pure Storage, Inc.
+# GNU General Public License v3.0+ (see COPYING.GPLv3 or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+DOCUMENTATION = r"""
+---
+module: fusion_array_maintenance
+version_added: '1.6.0'
+short_description: Roll maintenance mode over many arrays in Pure Storage Fusion
+description:
+- Put many arrays of a region into maintenance mode, or take them out of it,
+  in waves.
+- Every wave takes at most I(az_concurrency) arrays of every availability zone.
+  Arrays of a wave are updated concurrently and the next wave starts once all
+  their operations finish.
+- Before every wave a health gate is evaluated on the arrays of the affected
+  availability zones which stay in service. If any of them exceeds the limits
+  given by I(max_read_latency_us), I(max_write_latency_us) or I(max_physical_space),
+  or if any array of the previous wave failed, no further wave is started.
+author:
+- Pure Storage Ansible Team (@sdodsley) <pure-ansible-team@purestorage.com>
+notes:
+- Supports C(check mode). In check mode only the planned waves are returned,
+  the health gate is not evaluated.
+options:
+  region:
+    description:
+    - The name of the region the arrays are in.
+    type: str
+    required: true
+  arrays:
+    description:
+    - Arrays to update.
+    type: list
+    elements: dict
+    required: true
+    suboptions:
+      name:
+        description:
+        - The name of the array.
+        type: str
+        required: true
+      availability_zone:
+        aliases: [ az ]
+        description:
+        - The name of the availability zone of the array.
+        type: str
+        required: true
+  maintenance_mode:
+    description:
+    - Whether the arrays should be in maintenance mode or not.
+    type: bool
+    default: true
+  az_concurrency:
+    description:
+    - Maximum number of arrays of a single availability zone updated in one wave.
+    type: int
+    default: 1
+  max_read_latency_us:
+    description:
+    - Health gate fails if read latency of an array in service exceeds this value in microseconds.
+    type: int
+  max_write_latency_us:
+    description:
+    - Health gate fails if write latency of an array in service exceeds this value in microseconds.
+    type: int
+  max_physical_space:
+    description:
+    - Health gate fails if total physical space used by an array in service exceeds this value.
+    - Accepts human readable values, for example C(800G) or C(2T).
+    type: str
+"""
+
+EXAMPLES = r"""
+- name: Put arrays into maintenance, one per availability zone at a time
+  purestorage.fusion.fusion_array_maintenance:
+    region: us-west
+    arrays:
+      - name: array0
+        availability_zone: az1
+      - name: array1
+        availability_zone: az1
+      - name: array2
+        availability_zone: az2
+    max_read_latency_us: 2000
+    max_write_latency_us: 2000
+    issuer_id: key_name
+    private_key_file: "az-admin-private-key.pem"
+
+- name: Take the arrays out of maintenance
+  purestorage.fusion.fusion_array_maintenance:
+    region: us-west
+    arrays:
+      - name: array0
+        availability_zone: az1
+      - name: array1
+        availability_zone: az1
+      - name: array2
+        availability_zone: az2
+    maintenance_mode: false
+    az_concurrency: 2
+    issuer_id: key_name
+    private_key_file: "az-admin-private-key.pem"
+"""
+
+RETURN = r"""
+waves:
+  description:
+  - Arrays of every wave, in the order the waves are (or would be in check mode) run.
+  - Every wave is a list of dicts with the I(name) and I(availability_zone) of the array,
+    arrays in different availability zones can share a name.
+  returned: always
+  type: list
+  elements: list
+arrays:
+  description: Result for every array.
+  returned: always
+  type: list
+  elements: dict
+  contains:
+    name:
+      description: The name of the array.
+      type: str
+    availability_zone:
+      description: The name of the availability zone of the array.
+      type: str
+    wave:
+      description: Number (starting at 1) of the wave the array belongs to, null if the array is already in the requested mode.
+      type: int
+    status:
+      description:
+      - C(changed) if the array was (or would be in check mode) updated,
+        C(unchanged) if it already was in the requested mode, C(failed) if
+        updating it failed and C(skipped) if its wave was not started.
+      type: str
+    error:
+      description: Error message if updating the array failed, null otherwise.
+      type: str
+"""
+
+try:
+    import fusion as purefusion
+except ImportError:
+    pass
+
+from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.purestorage.fusion.plugins.module_utils.arrays import (
+    list_arrays,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.fusion import (
+    fusion_argument_spec,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.operations import (
+    await_operation,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.parallel import (
+    DEFAULT_CONCURRENCY,
+    run_concurrently,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.parsing import (
+    parse_number_with_metric_suffix,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.startup import (
+    setup_fusion,
+)
+
+
+def plan_waves(module, arrays):
+    """Returns waves (lists of (availability zone, name)) of arrays to update"""
+    missing = []
+    pending = {}
+    for spec in module.params["arrays"]:
+        key = (spec["availability_zone"], spec["name"])
+        if key not in arrays:
+            missing.append("{1} (availability zone {0})".format(*key))
+        elif arrays[key].maintenance_mode != module.params["maintenance_mode"]:
+            if key not in pending.setdefault(key[0], []):
+                pending[key[0]].append(key)
+    if missing:
+        module.fail_json(msg="Arrays {0} do not exist".format(", ".join(missing)))
+
+    size = module.params["az_concurrency"]
+    waves = []
+    for az_keys in pending.values():
+        for index, start in enumerate(range(0, len(az_keys), size)):
+            if index == len(waves):
+                waves.append([])
+            waves[index].extend(az_keys[start : start + size])
+    return waves
+
+
+def get_health_problems(module, fusion, array_key, limits):
+    """Returns list of limits exceeded by the array"""
+    az, name = array_key
+    array_api_instance = purefusion.ArraysApi(fusion)
+    location = dict(
+        region_name=module.params["region"],
+        availability_zone_name=az,
+        array_name=name,
+    )
+    problems = []
+    if limits["read_latency_us"] is not None or limits["write_latency_us"] is not None:
+        performance = array_api_instance.get_array_performance(**location)
+        for metric in ("read_latency_us", "write_latency_us"):
+            value = getattr(performance, metric)
+            if (
+                limits[metric] is not None
+                and value is not None
+                and value > limits[metric]
+            ):
+                problems.append(
+                    "{0} of array '{1}' is {2}, limit is {3}".format(
+                        metric, name, value, limits[metric]
+                    )
+                )
+    if limits["physical_space"] is not None:
+        space = array_api_instance.get_array_space(**location)
+        value = space.total_physical_space
+        if value is not None and value > limits["physical_space"]:
+            problems.append(
+                "total_physical_space of array '{0}' is {1}, limit is {2}".format(
+                    name, value, limits["physical_space"]
+                )
+            )
+    return problems
+
+
+def check_health(module, fusion, arrays, wave, in_maintenance, limits):
+    """Returns problems of arrays in service in availability zones of the wave"""
+    if all(limit is None for limit in limits.values()):
+        return []
+    wave_azs = set(az for az, _ in wave)
+    peers = [
+        key
+        for key in arrays
+        if key[0] in wave_azs and key not in wave and not in_maintenance[key]
+    ]
+    problems = []
+    for result in run_concurrently(
+        fusion,
+        lambda key: get_health_problems(module, fusion, key, limits),
+        peers,
+        DEFAULT_CONCURRENCY,
+    ):
+        if result.ok:
+            problems.extend(result.result)
+        else:
+            problems.append(
+                "cannot read health of array '{0}': {1}".format(
+                    result.item[1], result.error_message
+                )
+            )
+    return problems
+
+
+def update_maintenance_mode(module, fusion, array_key):
+    az, name = array_key
+    array_api_instance = purefusion.ArraysApi(fusion)
+    patch = purefusion.ArrayPatch(
+        maintenance_mode=purefusion.NullableBoolean(module.params["maintenance_mode"])
+    )
+    op = array_api_instance.update_array(
+        patch,
+        region_name=module.params["region"],
+        availability_zone_name=az,
+        array_name=name,
+    )
+    await_operation(fusion, op)
+
+
+def main():
+    """Main code"""
+    argument_spec = fusion_argument_spec()
+    argument_spec.update(
+        dict(
+            region=dict(type="str", required=True),
+            arrays=dict(
+                type="list",
+                elements="dict",
+                required=True,
+                options=dict(
+                    name=dict(type="str", required=True),
+                    availability_zone=dict(type="str", required=True, aliases=["az"]),
+                ),
+            ),
+            maintenance_mode=dict(type="bool", default=True),
+            az_concurrency=dict(type="int", default=1),
+            max_read_latency_us=dict(type="int"),
+            max_write_latency_us=dict(type="int"),
+            max_physical_space=dict(type="str"),
+        )
+    )
+
+    module = AnsibleModule(argument_spec, supports_check_mode=True)
+    if module.params["az_concurrency"] < 1:
+        module.fail_json(msg="az_concurrency must be at least 1")
+    limits = {
+        "read_latency_us": module.params["max_read_latency_us"],
+        "write_latency_us": module.params["max_write_latency_us"],
+        "physical_space": None,
+    }
+    if module.params["max_physical_space"] is not None:
+        limits["physical_space"] = parse_number_with_metric_suffix(
+            module, module.params["max_physical_space"]
+        )
+    fusion = setup_fusion(module)
+
+    azs = []
+    for spec in module.params["arrays"]:
+        if spec["availability_zone"] not in azs:
+            azs.append(spec["availability_zone"])
+    arrays = list_arrays(module, fusion, azs)
+    waves = plan_waves(module, arrays)
+
+    in_maintenance = dict(
+        (key, array.maintenance_mode) for key, array in arrays.items()
+    )
+    wave_of = dict((key, index + 1) for index, wave in enumerate(waves) for key in wave)
+    status = {}
+    errors = {}
+    failure = None
+    for index, wave in enumerate(waves):
+        if module.check_mode:
+            status.update((key, "changed") for key in wave)
+            continue
+        problems = check_health(module, fusion, arrays, wave, in_maintenance, limits)
+        if problems:
+            failure = "Health gate failed before wave {0} of {1}: {2}".format(
+                index + 1, len(waves), "; ".join(problems)
+            )
+            break
+        for result in run_concurrently(
+            fusion,
+            lambda key: update_maintenance_mode(module, fusion, key),
+            wave,
+            len(wave),
+        ):
+            if result.ok:
+                status[result.item] = "changed"
+                in_maintenance[result.item] = module.params["maintenance_mode"]
+            else:
+                status[result.item] = "failed"
+                errors[result.item] = result.error_message
+        if errors:
+            failure = "{0} of {1} arrays of wave {2} failed, first error: {3}".format(
+                len(errors), len(wave), index + 1, next(iter(errors.values()))
+            )
+            break
+
+    report = []
+    for spec in module.params["arrays"]:
+        key = (spec["availability_zone"], spec["name"])
+        report.append(
+            {
+                "name": spec["name"],
+                "availability_zone": spec["availability_zone"],
+                "wave": wave_of.get(key),
+                "status": status.get(key, "skipped" if key in wave_of else "unchanged"),
+                "error": errors.get(key),
+            }
+        )
+    wave_report = [
+        [{"name": name, "availability_zone": az} for az, name in wave] for wave in waves
+    ]
+    changed = "changed" in status.values()
+
+    if failure is not None:
+        module.fail_json(msg=failure, changed=changed, waves=wave_report, arrays=report)
+    module.exit_json(changed=changed, waves=wave_report, arrays=report)
+
+
+if __name__ == "__main__":
+    main()
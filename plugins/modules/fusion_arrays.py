@@ -0,0 +1,360 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# (c) 2023, Pure Storage, Inc.
+# GNU General Public License v3.0+ (see COPYING.GPLv3 or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+DOCUMENTATION = r"""
+---
+module: fusion_arrays
+version_added: '1.6.0'
+short_description: Register many arrays in Pure Storage Fusion
+description:
+- Register many arrays of a region at once and update their settings.
+- Arrays of every availability zone are listed once. Missing arrays are then created
+  concurrently, afterwards display names, host names, maintenance and unavailable modes
+  of all arrays are updated concurrently where they differ.
+- Availability zones with newly created arrays are listed once more before the updates,
+  so that settings which cannot be given on creation are applied as well.
+author:
+- Pure Storage Ansible Team (@sdodsley) <pure-ansible-team@purestorage.com>
+notes:
+- Supports C(check mode). In check mode only creations and updates of existing
+  arrays are reported, updates of arrays which would be created are not.
+- Use M(purestorage.fusion.fusion_array) to delete arrays.
+options:
+  region:
+    description:
+    - The region the availability zones are in.
+    type: str
+    required: true
+  arrays:
+    description:
+    - Arrays to register.
+    type: list
+    elements: dict
+    required: true
+    suboptions:
+      name:
+        description:
+        - The name of the array.
+        type: str
+        required: true
+      availability_zone:
+        aliases: [ az ]
+        description:
+        - The availability zone the array is located in.
+        type: str
+        required: true
+      display_name:
+        description:
+        - The human name of the array.
+        - If not provided, defaults to I(name).
+        type: str
+      hardware_type:
+        description:
+        - Hardware type to which the storage class applies.
+        - Required when the array is created.
+        choices: [ flash-array-x, flash-array-c, flash-array-x-optane, flash-array-xl ]
+        type: str
+      host_name:
+        description:
+        - Management IP address of the array, or FQDN.
+        - Required when the array is created.
+        type: str
+      appliance_id:
+        description:
+        - Appliance ID of the array.
+        - Required when the array is created.
+        type: str
+      apartment_id:
+        description:
+        - The Apartment ID of the Array.
+        type: str
+      maintenance_mode:
+        description:
+        - Switch the array into maintenance mode or back.
+        type: bool
+      unavailable_mode:
+        description:
+        - Switch the array into unavailable mode or back.
+        type: bool
+extends_documentation_fragment:
+- purestorage.fusion.purestorage.fusion
+- purestorage.fusion.purestorage.concurrency
+"""
+
+EXAMPLES = r"""
+- name: Register arrays of a new region, in maintenance mode until configured
+  purestorage.fusion.fusion_arrays:
+    region: pure-us-west
+    arrays:
+      - name: array0
+        availability_zone: az1
+        hardware_type: flash-array-x
+        host_name: flasharray0
+        appliance_id: 1187351-242133817-5976825671211737520
+        maintenance_mode: true
+      - name: array1
+        availability_zone: az2
+        hardware_type: flash-array-c
+        host_name: flasharray1
+        appliance_id: 1187351-242133817-5976825671211737521
+        maintenance_mode: true
+    issuer_id: key_name
+    private_key_file: "az-admin-private-key.pem"
+"""
+
+RETURN = r"""
+arrays:
+  description: Result for every created or updated array.
+  returned: always
+  type: list
+  elements: dict
+  contains:
+    name:
+      description: The name of the array.
+      type: str
+    availability_zone:
+      description: The name of the availability zone of the array.
+      type: str
+    created:
+      description: Whether the array was (or would be in check mode) created.
+      type: bool
+    updated:
+      description: Names of the updated settings.
+      type: list
+      elements: str
+    error:
+      description: Error message if creating or updating the array failed, null otherwise.
+      type: str
+"""
+
+try:
+    import fusion as purefusion
+except ImportError:
+    pass
+
+from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.purestorage.fusion.plugins.module_utils.arrays import (
+    list_arrays,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.fusion import (
+    fusion_argument_spec,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.operations import (
+    await_operation,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.parallel import (
+    DEFAULT_CONCURRENCY,
+    run_concurrently,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.startup import (
+    setup_fusion,
+)
+
+# settings which can be updated -> type of their patch value
+PATCHABLE = {
+    "display_name": "NullableString",
+    "host_name": "NullableString",
+    "maintenance_mode": "NullableBoolean",
+    "unavailable_mode": "NullableBoolean",
+}
+
+
+def get_specs(module):
+    """Returns array specs keyed by (availability zone, name), fails on duplicates"""
+    specs = {}
+    duplicates = []
+    for spec in module.params["arrays"]:
+        key = (spec["availability_zone"], spec["name"])
+        if key in specs:
+            duplicates.append("{1} (availability zone {0})".format(*key))
+        specs[key] = spec
+    if duplicates:
+        module.fail_json(
+            msg="Arrays {0} are specified more than once".format(", ".join(duplicates))
+        )
+    return specs
+
+
+def plan_creations(module, specs, arrays):
+    """Returns keys of arrays to create, fails if any of them is missing parameters"""
+    to_create = []
+    problems = []
+    for key, spec in specs.items():
+        if key in arrays:
+            continue
+        missing = [
+            param
+            for param in ("hardware_type", "host_name", "appliance_id")
+            if not spec[param]
+        ]
+        if missing:
+            problems.append(
+                "{1} (availability zone {0}) is missing {2}".format(
+                    key[0], key[1], ", ".join(missing)
+                )
+            )
+        to_create.append(key)
+    if problems:
+        module.fail_json(msg="Invalid arrays: {0}".format("; ".join(problems)))
+    return to_create
+
+
+def get_patches(spec, array):
+    """Returns names of settings of the array which differ from the spec"""
+    return [
+        param
+        for param in PATCHABLE
+        if spec[param] is not None and spec[param] != getattr(array, param)
+    ]
+
+
+def create_array(module, fusion, spec):
+    array_api_instance = purefusion.ArraysApi(fusion)
+    array = purefusion.ArrayPost(
+        hardware_type=spec["hardware_type"],
+        display_name=spec["display_name"] or spec["name"],
+        host_name=spec["host_name"],
+        name=spec["name"],
+        appliance_id=spec["appliance_id"],
+        apartment_id=spec["apartment_id"],
+    )
+    op = array_api_instance.create_array(
+        array,
+        availability_zone_name=spec["availability_zone"],
+        region_name=module.params["region"],
+    )
+    await_operation(fusion, op)
+
+
+def update_array(module, fusion, spec, params):
+    array_api_instance = purefusion.ArraysApi(fusion)
+    for param in params:
+        value = getattr(purefusion, PATCHABLE[param])(spec[param])
+        op = array_api_instance.update_array(
+            purefusion.ArrayPatch(**{param: value}),
+            availability_zone_name=spec["availability_zone"],
+            region_name=module.params["region"],
+            array_name=spec["name"],
+        )
+        await_operation(fusion, op)
+
+
+def main():
+    """Main code"""
+    argument_spec = fusion_argument_spec()
+    argument_spec.update(
+        dict(
+            region=dict(type="str", required=True),
+            arrays=dict(
+                type="list",
+                elements="dict",
+                required=True,
+                options=dict(
+                    name=dict(type="str", required=True),
+                    availability_zone=dict(type="str", required=True, aliases=["az"]),
+                    display_name=dict(type="str"),
+                    apartment_id=dict(type="str"),
+                    appliance_id=dict(type="str"),
+                    host_name=dict(type="str"),
+                    hardware_type=dict(
+                        type="str",
+                        choices=[
+                            "flash-array-x",
+                            "flash-array-c",
+                            "flash-array-x-optane",
+                            "flash-array-xl",
+                        ],
+                    ),
+                    maintenance_mode=dict(type="bool"),
+                    unavailable_mode=dict(type="bool"),
+                ),
+            ),
+            concurrency=dict(type="int", default=DEFAULT_CONCURRENCY),
+        )
+    )
+
+    module = AnsibleModule(argument_spec, supports_check_mode=True)
+    fusion = setup_fusion(module)
+
+    specs = get_specs(module)
+    azs = []
+    for az, _name in specs:
+        if az not in azs:
+            azs.append(az)
+    arrays = list_arrays(module, fusion, azs, module.params["concurrency"])
+    to_create = plan_creations(module, specs, arrays)
+
+    errors = {}
+    if not module.check_mode and to_create:
+        for result in run_concurrently(
+            fusion,
+            lambda key: create_array(module, fusion, specs[key]),
+            to_create,
+            module.params["concurrency"],
+        ):
+            if not result.ok:
+                errors[result.item] = result.error_message
+        # settings of new arrays which could not be given on creation got defaults
+        created_azs = [az for az in azs if any(key[0] == az for key in to_create)]
+        arrays.update(
+            list_arrays(module, fusion, created_azs, module.params["concurrency"])
+        )
+
+    patches = {}
+    for key, spec in specs.items():
+        if key in errors or key not in arrays:
+            continue
+        params = get_patches(spec, arrays[key])
+        if params:
+            patches[key] = params
+
+    if not module.check_mode and patches:
+        for result in run_concurrently(
+            fusion,
+            lambda key: update_array(module, fusion, specs[key], patches[key]),
+            patches,
+            module.params["concurrency"],
+        ):
+            if not result.ok:
+                errors[result.item] = result.error_message
+
+    report = [
+        {
+            "name": key[1],
+            "availability_zone": key[0],
+            "created": key in to_create,
+            "updated": patches.get(key, []),
+            "error": errors.get(key),
+        }
+        for key in specs
+        if key in to_create or key in patches
+    ]
+    if module.check_mode:
+        changed = len(report) != 0
+    else:
+        # a created array whose update failed was still created
+        changed = any(
+            key not in errors or (key in to_create and key in arrays)
+            for key in set(to_create) | set(patches)
+        )
+
+    if errors:
+        module.fail_json(
+            msg="{0} of {1} arrays failed, first error: {2}".format(
+                len(errors), len(report), next(iter(errors.values()))
+            ),
+            changed=changed,
+            arrays=report,
+        )
+    module.exit_json(changed=changed, arrays=report)
+
+
+if __name__ == "__main__":
+    main()
@@ -43,6 +43,7 @@ options:
     required: true
 extends_documentation_fragment:
 - purestorage.fusion.purestorage.fusion
+- purestorage.fusion.purestorage.optimistic_create
 """
 
 EXAMPLES = r"""
@@ -79,6 +80,8 @@ from ansible_collections.purestorage.fusion.plugins.module_utils.fusion import (
 from ansible_collections.purestorage.fusion.plugins.module_utils import getters
 from ansible_collections.purestorage.fusion.plugins.module_utils.operations import (
     await_operation,
+    create_optimistically,
+    should_create_optimistically,
 )
 from ansible_collections.purestorage.fusion.plugins.module_utils.startup import (
     setup_fusion,
@@ -139,6 +142,7 @@ def main():
             display_name=dict(type="str"),
             region=dict(type="str", required=True),
             state=dict(type="str", default="present", choices=["present", "absent"]),
+            optimistic_create=dict(type="bool", default=False),
         )
     )
 
@@ -146,6 +150,10 @@ def main():
     fusion = setup_fusion(module)
 
     state = module.params["state"]
+    if should_create_optimistically(module):
+        # exits the module unless the availability zone already exists
+        create_optimistically(create_az, module, fusion)
+
     azone = get_az(module, fusion)
 
     if not azone and state == "present":
@@ -0,0 +1,508 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# (c) 2023, Pure Storage, Inc.
+# GNU General Public License v3.0+ (see COPYING.GPLv3 or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+DOCUMENTATION = r"""
+---
+module: fusion_az_network
+version_added: '1.6.0'
+short_description: Provision network of an availability zone in Pure Storage Fusion
+description:
+- Create network interface groups and iSCSI storage endpoints of an availability zone
+  from a single network plan.
+- Existing network interface groups and storage endpoints are listed once and the whole
+  plan is validated in one pass (address formats, gateways within their subnets, iSCSI
+  addresses within the prefixes of their network interface groups, duplicates).
+- Missing network interface groups are then created concurrently, followed by missing
+  storage endpoints, also concurrently.
+author:
+- Pure Storage Ansible Team (@sdodsley) <pure-ansible-team@purestorage.com>
+notes:
+- Supports C(check mode).
+- Existing network interface groups and storage endpoints are not modified.
+- Storage endpoints which use a network interface group that failed to be created
+  are not created.
+options:
+  region:
+    description:
+    - The name of the region the availability zone is in.
+    type: str
+    required: true
+  availability_zone:
+    aliases: [ az ]
+    description:
+    - The name of the availability zone.
+    type: str
+    required: true
+  network_interface_groups:
+    description:
+    - Network interface groups of the availability zone.
+    type: list
+    elements: dict
+    default: []
+    suboptions:
+      name:
+        description:
+        - The name of the network interface group.
+        type: str
+        required: true
+      display_name:
+        description:
+        - The human name of the network interface group.
+        - If not provided, defaults to I(name).
+        type: str
+      prefix:
+        description:
+        - Network prefix in CIDR notation.
+        type: str
+        required: true
+      gateway:
+        description:
+        - Address of the subnet gateway.
+        type: str
+      mtu:
+        description:
+        - MTU setting for the subnet.
+        default: 1500
+        type: int
+  storage_endpoints:
+    description:
+    - iSCSI storage endpoints of the availability zone.
+    type: list
+    elements: dict
+    default: []
+    suboptions:
+      name:
+        description:
+        - The name of the storage endpoint.
+        type: str
+        required: true
+      display_name:
+        description:
+        - The human name of the storage endpoint.
+        - If not provided, defaults to I(name).
+        type: str
+      iscsi:
+        description:
+        - List of discovery interfaces.
+        type: list
+        elements: dict
+        required: true
+        suboptions:
+          address:
+            description:
+            - IP address to be used in the subnet of the storage endpoint.
+            - IP address must include a CIDR notation.
+            type: str
+            required: true
+          gateway:
+            description:
+            - Address of the subnet gateway.
+            type: str
+          network_interface_groups:
+            description:
+            - List of network interface groups to assign to the address.
+            - The network interface groups must be in I(network_interface_groups)
+              or already exist.
+            type: list
+            elements: str
+extends_documentation_fragment:
+- purestorage.fusion.purestorage.fusion
+- purestorage.fusion.purestorage.concurrency
+"""
+
+EXAMPLES = r"""
+- name: Bring up network of availability zone az1
+  purestorage.fusion.fusion_az_network:
+    region: pure-us-west
+    availability_zone: az1
+    network_interface_groups:
+      - name: nig1
+        prefix: 10.21.200.0/24
+        gateway: 10.21.200.1
+        mtu: 9000
+      - name: nig2
+        prefix: 10.21.201.0/24
+        gateway: 10.21.201.1
+    storage_endpoints:
+      - name: se1
+        iscsi:
+          - address: 10.21.200.5/24
+            gateway: 10.21.200.1
+            network_interface_groups: [ nig1 ]
+          - address: 10.21.201.5/24
+            gateway: 10.21.201.1
+            network_interface_groups: [ nig2 ]
+    issuer_id: key_name
+    private_key_file: "az-admin-private-key.pem"
+"""
+
+RETURN = r"""
+network_interface_groups:
+  description: Result for every created network interface group.
+  returned: always
+  type: list
+  elements: dict
+  contains:
+    name:
+      description: The name of the network interface group.
+      type: str
+    error:
+      description: Error message if creating the network interface group failed, null otherwise.
+      type: str
+storage_endpoints:
+  description: Result for every created storage endpoint.
+  returned: always
+  type: list
+  elements: dict
+  contains:
+    name:
+      description: The name of the storage endpoint.
+      type: str
+    error:
+      description: Error message if creating the storage endpoint failed, null otherwise.
+      type: str
+timing:
+  description: Duration of every phase in seconds.
+  returned: always
+  type: dict
+  contains:
+    discovery:
+      description: Listing of existing network interface groups and storage endpoints.
+      type: float
+    validation:
+      description: Validation of the network plan.
+      type: float
+    network_interface_groups:
+      description: Creation of network interface groups.
+      type: float
+    storage_endpoints:
+      description: Creation of storage endpoints.
+      type: float
+"""
+
+import time
+
+try:
+    import fusion as purefusion
+except ImportError:
+    pass
+
+from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.purestorage.fusion.plugins.module_utils.fusion import (
+    fusion_argument_spec,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.networking import (
+    is_address_in_network,
+    is_valid_address,
+    is_valid_network,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.operations import (
+    await_operation,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.parallel import (
+    DEFAULT_CONCURRENCY,
+    run_concurrently,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.startup import (
+    setup_fusion,
+)
+
+
+class PhaseTimer:
+    """Measures duration of the phases of the module run"""
+
+    def __init__(self):
+        self.timing = {}
+        self._start = time.monotonic()
+
+    def finished(self, phase):
+        now = time.monotonic()
+        self.timing[phase] = round(now - self._start, 3)
+        self._start = now
+
+
+def list_existing(module, fusion):
+    """Returns (network interface groups, storage endpoints) of the availability zone keyed by name"""
+    location = dict(
+        region_name=module.params["region"],
+        availability_zone_name=module.params["availability_zone"],
+    )
+    nig_api_instance = purefusion.NetworkInterfaceGroupsApi(fusion)
+    se_api_instance = purefusion.StorageEndpointsApi(fusion)
+    results = run_concurrently(
+        fusion,
+        lambda list_method: list_method(**location).items,
+        [
+            nig_api_instance.list_network_interface_groups,
+            se_api_instance.list_storage_endpoints,
+        ],
+    )
+    for result, kind in zip(results, ("network interface groups", "storage endpoints")):
+        if not result.ok:
+            module.fail_json(
+                msg="Listing {0} of availability zone '{1}' failed: {2}".format(
+                    kind, module.params["availability_zone"], result.error_message
+                )
+            )
+    nigs, ses = [dict((item.name, item) for item in r.result) for r in results]
+    return nigs, ses
+
+
+def validate_gateway(problems, what, gateway, network):
+    if gateway is None:
+        return
+    if not is_valid_address(gateway):
+        problems.append(
+            "gateway {0} of {1} is not a valid address".format(gateway, what)
+        )
+    elif is_valid_network(network) and not is_address_in_network(gateway, network):
+        problems.append(
+            "gateway {0} of {1} is not in subnet {2}".format(gateway, what, network)
+        )
+
+
+def plan(module, nigs, ses):
+    """Returns (network interface groups to create, storage endpoints to create),
+    fails if the network plan is invalid
+    """
+    problems = []
+    prefixes = dict(
+        (name, nig.eth.prefix if nig.eth else None) for name, nig in nigs.items()
+    )
+    nigs_to_create = []
+    seen_names = set()
+    for spec in module.params["network_interface_groups"]:
+        name = spec["name"]
+        what = "network interface group '{0}'".format(name)
+        if name in seen_names:
+            problems.append("{0} is specified more than once".format(what))
+            continue
+        seen_names.add(name)
+        if not is_valid_network(spec["prefix"]):
+            problems.append(
+                "prefix {0} of {1} is not a valid address in CIDR notation".format(
+                    spec["prefix"], what
+                )
+            )
+        validate_gateway(problems, what, spec["gateway"], spec["prefix"])
+        if name in nigs:
+            if prefixes[name] != spec["prefix"]:
+                problems.append(
+                    "{0} already exists with prefix {1}".format(what, prefixes[name])
+                )
+            continue
+        prefixes[name] = spec["prefix"]
+        nigs_to_create.append(name)
+
+    ses_to_create = []
+    seen_names = set()
+    address_owners = {}
+    for spec in module.params["storage_endpoints"]:
+        name = spec["name"]
+        if name in seen_names:
+            problems.append(
+                "storage endpoint '{0}' is specified more than once".format(name)
+            )
+            continue
+        seen_names.add(name)
+        for iface in spec["iscsi"]:
+            address = iface["address"]
+            what = "address {0} of storage endpoint '{1}'".format(address, name)
+            if not is_valid_network(address):
+                problems.append(
+                    "{0} is not a valid address in CIDR notation".format(what)
+                )
+                continue
+            ip = address.split("/")[0]
+            if ip in address_owners:
+                problems.append(
+                    "{0} is already used by '{1}'".format(what, address_owners[ip])
+                )
+            address_owners[ip] = name
+            validate_gateway(problems, what, iface["gateway"], address)
+            for nig in iface["network_interface_groups"] or []:
+                if nig not in prefixes:
+                    problems.append(
+                        "network interface group '{0}' of {1} does not exist".format(
+                            nig, what
+                        )
+                    )
+                elif prefixes[nig] and not is_address_in_network(ip, prefixes[nig]):
+                    problems.append(
+                        "{0} is not in prefix {1} of network interface group '{2}'".format(
+                            what, prefixes[nig], nig
+                        )
+                    )
+        if name not in ses:
+            ses_to_create.append(name)
+
+    if problems:
+        module.fail_json(msg="Invalid network plan: {0}".format("; ".join(problems)))
+    return nigs_to_create, ses_to_create
+
+
+def create_nig(module, fusion, spec):
+    nig_api_instance = purefusion.NetworkInterfaceGroupsApi(fusion)
+    eth = dict(prefix=spec["prefix"], mtu=spec["mtu"])
+    if spec["gateway"]:
+        eth["gateway"] = spec["gateway"]
+    nig = purefusion.NetworkInterfaceGroupPost(
+        group_type="eth",
+        eth=purefusion.NetworkInterfaceGroupEthPost(**eth),
+        name=spec["name"],
+        display_name=spec["display_name"] or spec["name"],
+    )
+    op = nig_api_instance.create_network_interface_group(
+        nig,
+        availability_zone_name=module.params["availability_zone"],
+        region_name=module.params["region"],
+    )
+    await_operation(fusion, op)
+
+
+def create_se(module, fusion, spec):
+    se_api_instance = purefusion.StorageEndpointsApi(fusion)
+    op = se_api_instance.create_storage_endpoint(
+        purefusion.StorageEndpointPost(
+            name=spec["name"],
+            display_name=spec["display_name"] or spec["name"],
+            endpoint_type="iscsi",
+            iscsi=purefusion.StorageEndpointIscsiPost(
+                discovery_interfaces=[
+                    purefusion.StorageEndpointIscsiDiscoveryInterfacePost(**iface)
+                    for iface in spec["iscsi"]
+                ]
+            ),
+        ),
+        region_name=module.params["region"],
+        availability_zone_name=module.params["availability_zone"],
+    )
+    await_operation(fusion, op)
+
+
+def main():
+    """Main code"""
+    argument_spec = fusion_argument_spec()
+    argument_spec.update(
+        dict(
+            region=dict(type="str", required=True),
+            availability_zone=dict(type="str", required=True, aliases=["az"]),
+            network_interface_groups=dict(
+                type="list",
+                elements="dict",
+                default=[],
+                options=dict(
+                    name=dict(type="str", required=True),
+                    display_name=dict(type="str"),
+                    prefix=dict(type="str", required=True),
+                    gateway=dict(type="str"),
+                    mtu=dict(type="int", default=1500),
+                ),
+            ),
+            storage_endpoints=dict(
+                type="list",
+                elements="dict",
+                default=[],
+                options=dict(
+                    name=dict(type="str", required=True),
+                    display_name=dict(type="str"),
+                    iscsi=dict(
+                        type="list",
+                        elements="dict",
+                        required=True,
+                        options=dict(
+                            address=dict(type="str", required=True),
+                            gateway=dict(type="str"),
+                            network_interface_groups=dict(type="list", elements="str"),
+                        ),
+                    ),
+                ),
+            ),
+            concurrency=dict(type="int", default=DEFAULT_CONCURRENCY),
+        )
+    )
+
+    module = AnsibleModule(argument_spec, supports_check_mode=True)
+    fusion = setup_fusion(module)
+    timer = PhaseTimer()
+
+    nigs, ses = list_existing(module, fusion)
+    timer.finished("discovery")
+    nigs_to_create, ses_to_create = plan(module, nigs, ses)
+    timer.finished("validation")
+
+    nig_specs = dict(
+        (spec["name"], spec) for spec in module.params["network_interface_groups"]
+    )
+    se_specs = dict((spec["name"], spec) for spec in module.params["storage_endpoints"])
+    errors = {}
+    if not module.check_mode:
+        for result in run_concurrently(
+            fusion,
+            lambda name: create_nig(module, fusion, nig_specs[name]),
+            nigs_to_create,
+            module.params["concurrency"],
+        ):
+            if not result.ok:
+                errors[("nig", result.item)] = result.error_message
+    timer.finished("network_interface_groups")
+
+    failed_nigs = set(name for _kind, name in errors)
+    to_create = []
+    for name in ses_to_create:
+        missing = [
+            nig
+            for iface in se_specs[name]["iscsi"]
+            for nig in iface["network_interface_groups"] or []
+            if nig in failed_nigs
+        ]
+        if missing:
+            errors[("se", name)] = (
+                "network interface group '{0}' was not created".format(missing[0])
+            )
+        else:
+            to_create.append(name)
+    if not module.check_mode:
+        for result in run_concurrently(
+            fusion,
+            lambda name: create_se(module, fusion, se_specs[name]),
+            to_create,
+            module.params["concurrency"],
+        ):
+            if not result.ok:
+                errors[("se", result.item)] = result.error_message
+    timer.finished("storage_endpoints")
+
+    result = dict(
+        network_interface_groups=[
+            {"name": name, "error": errors.get(("nig", name))}
+            for name in nigs_to_create
+        ],
+        storage_endpoints=[
+            {"name": name, "error": errors.get(("se", name))} for name in ses_to_create
+        ],
+        timing=timer.timing,
+    )
+    total = len(nigs_to_create) + len(ses_to_create)
+    changed = total - len(errors) != 0
+
+    if errors:
+        module.fail_json(
+            msg="{0} of {1} network resources failed, first error: {2}".format(
+                len(errors), total, next(iter(errors.values()))
+            ),
+            changed=changed,
+            **result
+        )
+    module.exit_json(changed=changed, **result)
+
+
+if __name__ == "__main__":
+    main()
@@ -118,12 +118,22 @@ try:
 except ImportError:
     pass
 
-import re
 from ansible.module_utils.basic import AnsibleModule
 from ansible_collections.purestorage.fusion.plugins.module_utils.fusion import (
     fusion_argument_spec,
 )
+from ansible_collections.purestorage.fusion.plugins.module_utils.haps import (
+    HAP_PATTERN,
+    IQN_PATTERN,
+    PERSONALITIES,
+)
 
+from ansible_collections.purestorage.fusion.plugins.module_utils.index_cache import (
+    HAP_IQN_INDEX,
+    get_index,
+    get_index_cache,
+    invalidate_index,
+)
 from ansible_collections.purestorage.fusion.plugins.module_utils.startup import (
     setup_fusion,
 )
@@ -132,16 +142,33 @@ from ansible_collections.purestorage.fusion.plugins.module_utils.operations impo
 )
 
 
-def _check_iqn(module, fusion):
+def _build_iqn_index(fusion):
+    """Returns names of host access policies keyed by their IQN"""
     hap_api_instance = purefusion.HostAccessPoliciesApi(fusion)
     hosts = hap_api_instance.list_host_access_policies().items
-    for host in hosts:
-        if host.iqn == module.params["iqn"] and host.name != module.params["name"]:
-            module.fail_json(
-                msg="Supplied IQN {0} already used by host access policy {1}".format(
-                    module.params["iqn"], host.name
-                )
+    return dict((host.iqn, host.name) for host in hosts if host.iqn)
+
+
+def _check_iqn(module, fusion):
+    iqn = module.params["iqn"]
+    owner = get_index(
+        module, fusion, HAP_IQN_INDEX, lambda: _build_iqn_index(fusion)
+    ).get(iqn)
+    if owner is not None and owner != module.params["name"] and get_index_cache(module):
+        # cached index might be stale, confirm the conflict with a fresh one
+        owner = get_index(
+            module,
+            fusion,
+            HAP_IQN_INDEX,
+            lambda: _build_iqn_index(fusion),
+            refresh=True,
+        ).get(iqn)
+    if owner is not None and owner != module.params["name"]:
+        module.fail_json(
+            msg="Supplied IQN {0} already used by host access policy {1}".format(
+                iqn, owner
             )
+        )
 
 
 def get_host(module, fusion):
@@ -171,6 +198,7 @@ def create_hap(module, fusion):
             )
         )
         await_operation(fusion, op)
+        invalidate_index(module, fusion, HAP_IQN_INDEX)
     module.exit_json(changed=changed)
 
 
@@ -183,6 +211,7 @@ def delete_hap(module, fusion):
             host_access_policy_name=module.params["name"]
         )
         await_operation(fusion, op)
+        invalidate_index(module, fusion, HAP_IQN_INDEX)
     module.exit_json(changed=changed)
 
 
@@ -230,17 +259,7 @@ def main():
             personality=dict(
                 type="str",
                 default="linux",
-                choices=[
-                    "linux",
-                    "windows",
-                    "hpux",
-                    "vms",
-                    "aix",
-                    "esxi",
-                    "solaris",
-                    "hitachi-vsp",
-                    "oracle-vm-server",
-                ],
+                choices=PERSONALITIES,
             ),
         )
     )
@@ -279,28 +298,24 @@ def main():
             "`target_user` parameter is deprecated and will be removed in version 2.0.0"
         )
 
-    hap_pattern = re.compile("^[a-zA-Z0-9]([a-zA-Z0-9-_]{0,61}[a-zA-Z0-9])?$")
-    iqn_pattern = re.compile(
-        r"^iqn\.\d{4}-\d{2}((?<!-)\.(?!-)[a-zA-Z0-9\-]+){1,63}(?<!-)(?<!\.)(:(?!:)[^,\s'\"]+)?$"
-    )
-
-    if not hap_pattern.match(module.params["name"]):
+    if not HAP_PATTERN.match(module.params["name"]):
         module.fail_json(
             msg="Host Access Policy {0} does not conform to naming convention".format(
                 module.params["name"]
             )
         )
 
-    if module.params["iqn"] is not None and not iqn_pattern.match(module.params["iqn"]):
+    if module.params["iqn"] is not None and not IQN_PATTERN.match(module.params["iqn"]):
         module.fail_json(
             msg="IQN {0} is not a valid iSCSI IQN".format(module.params["name"])
         )
 
     state = module.params["state"]
     host = get_host(module, fusion)
-    _check_iqn(module, fusion)
 
     if host is None and state == "present":
+        # host access policies cannot be updated, so only a new one may clash
+        _check_iqn(module, fusion)
         create_hap(module, fusion)
     elif host is not None and state == "absent":
         delete_hap(module, fusion)
@@ -0,0 +1,284 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# (c) 2023, Pure Storage, Inc.
+# GNU General Public License v3.0+ (see COPYING.GPLv3 or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+DOCUMENTATION = r"""
+---
+module: fusion_hap_volumes
+version_added: '1.6.0'
+short_description: Attach or detach a host access policy to many volumes in Pure Storage Fusion
+description:
+- Attach a host access policy to, or detach it from, many volumes of a tenant space at once.
+- Volumes are selected by an explicit list, a placement group or a name pattern,
+  at least one of them is required. Use I(name_pattern=*) to select all volumes
+  of the tenant space.
+- Volumes are listed once, new host access policy sets are computed in memory
+  and the volumes are then updated concurrently.
+author:
+- Pure Storage Ansible Team (@sdodsley) <pure-ansible-team@purestorage.com>
+notes:
+- Supports C(check mode).
+- Destroyed volumes are never selected by I(placement_group) or I(name_pattern).
+options:
+  host_access_policy:
+    description:
+    - The name of the host access policy.
+    type: str
+    required: true
+  state:
+    description:
+    - Define whether the host access policy should be attached to the selected volumes or not.
+    type: str
+    default: present
+    choices: [ absent, present ]
+  tenant:
+    description:
+    - The name of the tenant.
+    type: str
+    required: true
+  tenant_space:
+    description:
+    - The name of the tenant space.
+    type: str
+    required: true
+  volumes:
+    description:
+    - Names of the volumes to select.
+    - All of them must exist.
+    type: list
+    elements: str
+  placement_group:
+    description:
+    - Select volumes of the placement group.
+    type: str
+  name_pattern:
+    description:
+    - Select volumes with names matching the shell-style pattern, for example C(db-*).
+    type: str
+extends_documentation_fragment:
+- purestorage.fusion.purestorage.fusion
+- purestorage.fusion.purestorage.concurrency
+"""
+
+EXAMPLES = r"""
+- name: Attach host access policy host1 to all volumes of placement group pg1
+  purestorage.fusion.fusion_hap_volumes:
+    host_access_policy: host1
+    tenant: test
+    tenant_space: space_1
+    placement_group: pg1
+    issuer_id: key_name
+    private_key_file: "az-admin-private-key.pem"
+
+- name: Detach host access policy host1 from volumes named db-*
+  purestorage.fusion.fusion_hap_volumes:
+    host_access_policy: host1
+    state: absent
+    tenant: test
+    tenant_space: space_1
+    name_pattern: db-*
+    issuer_id: key_name
+    private_key_file: "az-admin-private-key.pem"
+"""
+
+RETURN = r"""
+volumes:
+  description: Result for every selected volume.
+  returned: always
+  type: list
+  elements: dict
+  contains:
+    name:
+      description: The name of the volume.
+      type: str
+    changed:
+      description: Whether the host access policies of the volume were (or would be in check mode) changed.
+      type: bool
+    error:
+      description: Error message if changing the volume failed, null otherwise.
+      type: str
+"""
+
+import fnmatch
+
+try:
+    import fusion as purefusion
+except ImportError:
+    pass
+
+from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.purestorage.fusion.plugins.module_utils.fusion import (
+    fusion_argument_spec,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.getters import (
+    list_all,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.operations import (
+    await_operation,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.parallel import (
+    DEFAULT_CONCURRENCY,
+    run_concurrently,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.startup import (
+    setup_fusion,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.volumes import (
+    extract_current_haps,
+)
+
+
+def select_volumes(module, volumes):
+    """Returns volumes matching the selectors given by the user"""
+    if module.params["volumes"] is not None:
+        by_name = dict((volume.name, volume) for volume in volumes)
+        missing = [name for name in module.params["volumes"] if name not in by_name]
+        if missing:
+            module.fail_json(
+                msg="Volumes {0} do not exist".format(", ".join(sorted(missing)))
+            )
+        selected = [by_name[name] for name in module.params["volumes"]]
+        destroyed = [v.name for v in selected if v.destroyed]
+        if destroyed and module.params["state"] == "present":
+            module.fail_json(
+                msg="Cannot attach host access policy to destroyed volumes {0}".format(
+                    ", ".join(destroyed)
+                )
+            )
+        return selected
+
+    selected = [volume for volume in volumes if not volume.destroyed]
+    if module.params["placement_group"] is not None:
+        selected = [
+            volume
+            for volume in selected
+            if volume.placement_group
+            and volume.placement_group.name == module.params["placement_group"]
+        ]
+    if module.params["name_pattern"] is not None:
+        selected = [
+            volume
+            for volume in selected
+            if fnmatch.fnmatchcase(volume.name, module.params["name_pattern"])
+        ]
+    return selected
+
+
+def plan_volume_haps(module, volume):
+    """Returns host access policies the volume should have or None if they are unchanged"""
+    hap = module.params["host_access_policy"]
+    current_haps = extract_current_haps(volume)
+    if module.params["state"] == "present":
+        wanted_haps = current_haps | {hap}
+    else:
+        wanted_haps = current_haps - {hap}
+    if wanted_haps == current_haps:
+        return None
+    return wanted_haps
+
+
+def update_haps(module, fusion, volume, wanted_haps):
+    volume_api_instance = purefusion.VolumesApi(fusion)
+    patch = purefusion.VolumePatch(
+        host_access_policies=purefusion.NullableString(",".join(sorted(wanted_haps)))
+    )
+    op = volume_api_instance.update_volume(
+        patch,
+        volume_name=volume.name,
+        tenant_name=module.params["tenant"],
+        tenant_space_name=module.params["tenant_space"],
+    )
+    await_operation(fusion, op)
+
+
+def main():
+    """Main code"""
+    argument_spec = fusion_argument_spec()
+    argument_spec.update(
+        dict(
+            host_access_policy=dict(type="str", required=True),
+            state=dict(type="str", default="present", choices=["absent", "present"]),
+            tenant=dict(type="str", required=True),
+            tenant_space=dict(type="str", required=True),
+            volumes=dict(type="list", elements="str"),
+            placement_group=dict(type="str"),
+            name_pattern=dict(type="str"),
+            concurrency=dict(type="int", default=DEFAULT_CONCURRENCY),
+        )
+    )
+
+    mutually_exclusive = [
+        # explicit list of volumes cannot be narrowed down
+        ("volumes", "placement_group"),
+        ("volumes", "name_pattern"),
+    ]
+
+    # acting on the whole tenant space must be asked for explicitly
+    required_one_of = [("volumes", "placement_group", "name_pattern")]
+
+    module = AnsibleModule(
+        argument_spec,
+        mutually_exclusive=mutually_exclusive,
+        required_one_of=required_one_of,
+        supports_check_mode=True,
+    )
+    fusion = setup_fusion(module)
+
+    volume_api_instance = purefusion.VolumesApi(fusion)
+    volumes = list_all(
+        volume_api_instance.list_volumes,
+        tenant_name=module.params["tenant"],
+        tenant_space_name=module.params["tenant_space"],
+    )
+    selected = select_volumes(module, volumes)
+
+    updates = []
+    for volume in selected:
+        wanted_haps = plan_volume_haps(module, volume)
+        if wanted_haps is not None:
+            updates.append((volume, wanted_haps))
+
+    errors = {}
+    if not module.check_mode:
+        results = run_concurrently(
+            fusion,
+            lambda update: update_haps(module, fusion, *update),
+            updates,
+            module.params["concurrency"],
+        )
+        errors = dict(
+            (result.item[0].name, result.error_message)
+            for result in results
+            if not result.ok
+        )
+
+    changed_names = set(volume.name for volume, _ in updates)
+    report = [
+        {
+            "name": volume.name,
+            "changed": volume.name in changed_names,
+            "error": errors.get(volume.name),
+        }
+        for volume in selected
+    ]
+    changed = len(updates) != 0
+
+    if errors:
+        module.fail_json(
+            msg="{0} of {1} volumes failed, first error: {2}".format(
+                len(errors), len(updates), next(iter(errors.values()))
+            ),
+            changed=changed,
+            volumes=report,
+        )
+    module.exit_json(changed=changed, volumes=report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,305 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# (c) 2023, Pure Storage, Inc.
+# GNU General Public License v3.0+ (see COPYING.GPLv3 or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+DOCUMENTATION = r"""
+---
+module: fusion_haps
+version_added: '1.6.0'
+short_description: Manage many host access policies in Pure Storage Fusion
+description:
+- Create or delete many host access policies at once, for example all hosts of an inventory.
+- Existing host access policies are listed once, all policies are validated together
+  (including IQN conflicts) and the differences are then applied concurrently.
+author:
+- Pure Storage Ansible Team (@sdodsley) <pure-ansible-team@purestorage.com>
+notes:
+- Supports C(check mode).
+- Host access policies cannot be updated, existing policies whose IQN or personality
+  differ from I(policies) are reported as invalid.
+options:
+  policies:
+    description:
+    - Host access policies to create or delete.
+    type: list
+    elements: dict
+    required: true
+    suboptions:
+      name:
+        description:
+        - The name of the host access policy.
+        type: str
+        required: true
+      display_name:
+        description:
+        - The human name of the host access policy.
+        type: str
+      iqn:
+        description:
+        - The iSCSI qualified name (IQN) associated with the host.
+        - Required if I(state=present).
+        type: str
+      personality:
+        description:
+        - Define which operating system the host is.
+        default: linux
+        choices: ['linux', 'windows', 'hpux', 'vms', 'aix', 'esxi', 'solaris', 'hitachi-vsp', 'oracle-vm-server']
+        type: str
+  state:
+    description:
+    - Define whether the host access policies should exist or not.
+    type: str
+    default: present
+    choices: [ absent, present ]
+  purge:
+    description:
+    - Delete all other host access policies.
+    - Only used if I(state=present).
+    type: bool
+    default: false
+extends_documentation_fragment:
+- purestorage.fusion.purestorage.fusion
+- purestorage.fusion.purestorage.concurrency
+"""
+
+EXAMPLES = r"""
+- name: Create two host access policies
+  purestorage.fusion.fusion_haps:
+    policies:
+      - name: host1
+        iqn: "iqn.2005-03.com.RedHat:linux-host1"
+      - name: host2
+        iqn: "iqn.2005-03.com.RedHat:linux-host2"
+        personality: windows
+    issuer_id: key_name
+    private_key_file: "az-admin-private-key.pem"
+
+- name: Keep exactly the host access policies of the inventory (list of name, iqn and personality)
+  purestorage.fusion.fusion_haps:
+    policies: "{{ iscsi_hosts }}"
+    purge: true
+    issuer_id: key_name
+    private_key_file: "az-admin-private-key.pem"
+"""
+
+RETURN = r"""
+policies:
+  description: Result for every created or deleted host access policy.
+  returned: always
+  type: list
+  elements: dict
+  contains:
+    name:
+      description: The name of the host access policy.
+      type: str
+    action:
+      description: C(create) or C(delete).
+      type: str
+    error:
+      description: Error message if the action failed, null otherwise.
+      type: str
+"""
+
+try:
+    import fusion as purefusion
+except ImportError:
+    pass
+
+from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.purestorage.fusion.plugins.module_utils.fusion import (
+    fusion_argument_spec,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.haps import (
+    HAP_PATTERN,
+    IQN_PATTERN,
+    PERSONALITIES,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.index_cache import (
+    HAP_IQN_INDEX,
+    invalidate_index,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.operations import (
+    await_operation,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.parallel import (
+    DEFAULT_CONCURRENCY,
+    run_concurrently,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.startup import (
+    setup_fusion,
+)
+
+
+def plan_present(module, existing):
+    """Returns (names to create, names to delete), fails on invalid policies"""
+    specs = module.params["policies"]
+    to_delete = set()
+    if module.params["purge"]:
+        wanted = set(spec["name"] for spec in specs)
+        to_delete = set(name for name in existing if name not in wanted)
+
+    # IQNs of the policies which stay, the hash index makes conflicts O(1)
+    iqn_owners = dict(
+        (hap.iqn, hap.name)
+        for hap in existing.values()
+        if hap.iqn and hap.name not in to_delete
+    )
+    problems = []
+    seen_names = set()
+    to_create = []
+    for spec in specs:
+        name = spec["name"]
+        iqn = spec["iqn"]
+        if name in seen_names:
+            problems.append("'{0}' is specified more than once".format(name))
+            continue
+        seen_names.add(name)
+        if not HAP_PATTERN.match(name):
+            problems.append("'{0}' does not conform to naming convention".format(name))
+            continue
+        if iqn is None:
+            problems.append("'{0}' is missing iqn".format(name))
+            continue
+        if not IQN_PATTERN.match(iqn):
+            problems.append(
+                "IQN {0} of '{1}' is not a valid iSCSI IQN".format(iqn, name)
+            )
+            continue
+
+        if name in existing:
+            hap = existing[name]
+            if hap.iqn != iqn or hap.personality != spec["personality"]:
+                problems.append(
+                    "'{0}' already exists with IQN {1} and personality {2}".format(
+                        name, hap.iqn, hap.personality
+                    )
+                )
+            continue
+        owner = iqn_owners.get(iqn)
+        if owner is not None:
+            problems.append(
+                "IQN {0} of '{1}' is already used by '{2}'".format(iqn, name, owner)
+            )
+            continue
+        iqn_owners[iqn] = name
+        to_create.append(name)
+
+    if problems:
+        module.fail_json(
+            msg="Invalid host access policies: {0}".format("; ".join(problems))
+        )
+    return to_create, sorted(to_delete)
+
+
+def create_hap(fusion, spec):
+    hap_api_instance = purefusion.HostAccessPoliciesApi(fusion)
+    op = hap_api_instance.create_host_access_policy(
+        purefusion.HostAccessPoliciesPost(
+            iqn=spec["iqn"],
+            personality=spec["personality"],
+            name=spec["name"],
+            display_name=spec["display_name"] or spec["name"],
+        )
+    )
+    await_operation(fusion, op)
+
+
+def delete_hap(fusion, name):
+    hap_api_instance = purefusion.HostAccessPoliciesApi(fusion)
+    op = hap_api_instance.delete_host_access_policy(host_access_policy_name=name)
+    await_operation(fusion, op)
+
+
+def main():
+    """Main code"""
+    argument_spec = fusion_argument_spec()
+    argument_spec.update(
+        dict(
+            policies=dict(
+                type="list",
+                elements="dict",
+                required=True,
+                options=dict(
+                    name=dict(type="str", required=True),
+                    display_name=dict(type="str"),
+                    iqn=dict(type="str"),
+                    personality=dict(
+                        type="str",
+                        default="linux",
+                        choices=PERSONALITIES,
+                    ),
+                ),
+            ),
+            state=dict(type="str", default="present", choices=["absent", "present"]),
+            purge=dict(type="bool", default=False),
+            concurrency=dict(type="int", default=DEFAULT_CONCURRENCY),
+        )
+    )
+
+    module = AnsibleModule(argument_spec, supports_check_mode=True)
+    fusion = setup_fusion(module)
+
+    hap_api_instance = purefusion.HostAccessPoliciesApi(fusion)
+    existing = dict(
+        (hap.name, hap) for hap in hap_api_instance.list_host_access_policies().items
+    )
+
+    if module.params["state"] == "present":
+        to_create, to_delete = plan_present(module, existing)
+    else:
+        to_create = []
+        to_delete = []
+        for spec in module.params["policies"]:
+            if spec["name"] in existing and spec["name"] not in to_delete:
+                to_delete.append(spec["name"])
+
+    errors = {}
+    if not module.check_mode and (to_create or to_delete):
+        # deletions go first so that their IQNs can be reused
+        for result in run_concurrently(
+            fusion,
+            lambda name: delete_hap(fusion, name),
+            to_delete,
+            module.params["concurrency"],
+        ):
+            if not result.ok:
+                errors[("delete", result.item)] = result.error_message
+        specs = dict((spec["name"], spec) for spec in module.params["policies"])
+        for result in run_concurrently(
+            fusion,
+            lambda name: create_hap(fusion, specs[name]),
+            to_create,
+            module.params["concurrency"],
+        ):
+            if not result.ok:
+                errors[("create", result.item)] = result.error_message
+        invalidate_index(module, fusion, HAP_IQN_INDEX)
+
+    report = [
+        {"name": name, "action": "delete", "error": errors.get(("delete", name))}
+        for name in to_delete
+    ] + [
+        {"name": name, "action": "create", "error": errors.get(("create", name))}
+        for name in to_create
+    ]
+    changed = len(report) - len(errors) != 0
+
+    if errors:
+        module.fail_json(
+            msg="{0} of {1} host access policies failed, first error: {2}".format(
+                len(errors), len(report), next(iter(errors.values()))
+            ),
+            changed=changed,
+            policies=report,
+        )
+    module.exit_json(changed=changed, policies=report)
+
+
+if __name__ == "__main__":
+    main()
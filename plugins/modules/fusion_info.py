@@ -78,6 +78,9 @@ from ansible.module_utils.basic import AnsibleModule
 from ansible_collections.purestorage.fusion.plugins.module_utils.fusion import (
     fusion_argument_spec,
 )
+from ansible_collections.purestorage.fusion.plugins.module_utils.principals import (
+    remember_users,
+)
 from ansible_collections.purestorage.fusion.plugins.module_utils.startup import (
     setup_fusion,
 )
@@ -768,6 +771,7 @@ def generate_users_dict(module, fusion):
     users_info = {}
     api_instance = purefusion.IdentityManagerApi(fusion)
     users = api_instance.list_users()
+    remember_users(module, fusion, users)
     for user in users:
         users_info[user.name] = {
             "display_name": user.display_name,
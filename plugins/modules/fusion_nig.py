@@ -72,6 +72,7 @@ options:
     type: str
 extends_documentation_fragment:
 - purestorage.fusion.purestorage.fusion
+- purestorage.fusion.purestorage.optimistic_create
 """
 
 EXAMPLES = r"""
@@ -119,6 +120,8 @@ from ansible_collections.purestorage.fusion.plugins.module_utils.startup import
 )
 from ansible_collections.purestorage.fusion.plugins.module_utils.operations import (
     await_operation,
+    create_optimistically,
+    should_create_optimistically,
 )
 
 
@@ -237,6 +240,7 @@ def main():
             mtu=dict(type="int", default=1500),
             group_type=dict(type="str", default="eth", choices=["eth"]),
             state=dict(type="str", default="present", choices=["absent", "present"]),
+            optimistic_create=dict(type="bool", default=False),
         )
     )
 
@@ -257,6 +261,11 @@ def main():
             )
         )
 
+    if should_create_optimistically(module):
+        module.fail_on_missing_params(["prefix"])
+        # exits the module unless the network interface group already exists
+        create_optimistically(create_nig, module, fusion)
+
     nig = get_nig(module, fusion)
 
     if state == "present" and not nig:
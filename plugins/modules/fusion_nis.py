@@ -0,0 +1,355 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# (c) 2023, Pure Storage, Inc.
+# GNU General Public License v3.0+ (see COPYING.GPLv3 or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+DOCUMENTATION = r"""
+---
+module: fusion_nis
+version_added: '1.6.0'
+short_description: Manage many network interfaces of an array in Pure Storage Fusion
+description:
+- Update parameters of many network interfaces of a single array at once.
+- Network interfaces of the array and network interface groups of the availability
+  zone are listed once, all interfaces are validated together and the changed
+  interfaces are then updated concurrently.
+author:
+- Pure Storage Ansible Team (@sdodsley) <pure-ansible-team@purestorage.com>
+notes:
+- Supports C(check mode).
+options:
+  region:
+    description:
+    - The name of the region the availability zone is in.
+    type: str
+    required: true
+  availability_zone:
+    aliases: [ az ]
+    description:
+    - The name of the availability zone of the array.
+    type: str
+    required: true
+  array:
+    description:
+    - The name of the array the network interfaces belong to.
+    type: str
+    required: true
+  interfaces:
+    description:
+    - Network interfaces to update.
+    type: list
+    elements: dict
+    required: true
+    suboptions:
+      name:
+        description:
+        - The name of the network interface.
+        type: str
+        required: true
+      display_name:
+        description:
+        - The human name of the network interface.
+        type: str
+      eth:
+        description:
+        - The IP address associated with the network interface.
+        - IP address must include a CIDR notation and must be in the prefix of
+          I(network_interface_group).
+        - Only IPv4 is supported at the moment.
+        - Required together with I(network_interface_group) parameter.
+        type: str
+      enabled:
+        description:
+        - True if network interface is in use.
+        type: bool
+      network_interface_group:
+        description:
+        - The name of the network interface group this network interface belongs to.
+        type: str
+extends_documentation_fragment:
+- purestorage.fusion.purestorage.fusion
+- purestorage.fusion.purestorage.concurrency
+"""
+
+EXAMPLES = r"""
+- name: Configure ports of a new array
+  purestorage.fusion.fusion_nis:
+    region: us-west
+    availability_zone: bar
+    array: array0
+    interfaces:
+      - name: ct0.eth4
+        eth: 10.21.200.124/24
+        enabled: true
+        network_interface_group: subnet-0
+      - name: ct1.eth4
+        eth: 10.21.200.125/24
+        enabled: true
+        network_interface_group: subnet-0
+    issuer_id: key_name
+    private_key_file: "az-admin-private-key.pem"
+"""
+
+RETURN = r"""
+interfaces:
+  description: Result for every network interface.
+  returned: always
+  type: list
+  elements: dict
+  contains:
+    name:
+      description: The name of the network interface.
+      type: str
+    changed:
+      description: Whether the network interface was (or would be in check mode) changed.
+      type: bool
+    error:
+      description: Error message if updating the network interface failed, null otherwise.
+      type: str
+"""
+
+try:
+    import fusion as purefusion
+except ImportError:
+    pass
+
+from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.purestorage.fusion.plugins.module_utils.fusion import (
+    fusion_argument_spec,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.networking import (
+    is_address_in_network,
+    is_valid_network,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.operations import (
+    await_operation,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.parallel import (
+    DEFAULT_CONCURRENCY,
+    run_concurrently,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.startup import (
+    setup_fusion,
+)
+
+
+def list_nis(module, fusion):
+    """Returns network interfaces of the array keyed by name"""
+    ni_api_instance = purefusion.NetworkInterfacesApi(fusion)
+    return dict(
+        (ni.name, ni)
+        for ni in ni_api_instance.list_network_interfaces(
+            region_name=module.params["region"],
+            availability_zone_name=module.params["availability_zone"],
+            array_name=module.params["array"],
+        ).items
+    )
+
+
+def list_nigs(module, fusion):
+    """Returns network interface groups of the availability zone keyed by name"""
+    nig_api_instance = purefusion.NetworkInterfaceGroupsApi(fusion)
+    return dict(
+        (nig.name, nig)
+        for nig in nig_api_instance.list_network_interface_groups(
+            region_name=module.params["region"],
+            availability_zone_name=module.params["availability_zone"],
+        ).items
+    )
+
+
+def validate_interfaces(module, nis, nigs):
+    """Fails the module with all problems of all interface specs at once"""
+    problems = []
+    seen_names = set()
+    seen_addresses = {}
+    for spec in module.params["interfaces"]:
+        name = spec["name"]
+        if name in seen_names:
+            problems.append("'{0}' is specified more than once".format(name))
+        seen_names.add(name)
+        if name not in nis:
+            problems.append("'{0}' does not exist".format(name))
+
+        nig_name = spec["network_interface_group"]
+        if nig_name is not None and nig_name not in nigs:
+            problems.append(
+                "network interface group '{0}' of '{1}' does not exist".format(
+                    nig_name, name
+                )
+            )
+
+        eth = spec["eth"]
+        if eth is None:
+            continue
+        if not is_valid_network(eth):
+            problems.append(
+                "`eth` '{0}' of '{1}' is not a valid address in CIDR notation".format(
+                    eth, name
+                )
+            )
+            continue
+        address = eth.split("/")[0]
+        if address in seen_addresses:
+            problems.append(
+                "address {0} is used by both '{1}' and '{2}'".format(
+                    address, seen_addresses[address], name
+                )
+            )
+        seen_addresses[address] = name
+        if nig_name in nigs and nigs[nig_name].eth is not None:
+            prefix = nigs[nig_name].eth.prefix
+            if not is_address_in_network(address, prefix):
+                problems.append(
+                    "`eth` '{0}' of '{1}' is not in prefix {2} of network interface group '{3}'".format(
+                        eth, name, prefix, nig_name
+                    )
+                )
+
+    if problems:
+        module.fail_json(
+            msg="Invalid network interfaces: {0}".format("; ".join(problems))
+        )
+
+
+def get_patches(spec, ni):
+    """Returns patches needed to bring network interface `ni` to `spec`, same as in fusion_ni"""
+    patches = []
+    if spec["display_name"] and spec["display_name"] != ni.display_name:
+        patches.append(
+            purefusion.NetworkInterfacePatch(
+                display_name=purefusion.NullableString(spec["display_name"]),
+            )
+        )
+
+    if spec["enabled"] is not None and spec["enabled"] != ni.enabled:
+        patches.append(
+            purefusion.NetworkInterfacePatch(
+                enabled=purefusion.NullableBoolean(spec["enabled"]),
+            )
+        )
+
+    current_nig = (
+        ni.network_interface_group.name if ni.network_interface_group else None
+    )
+    current_eth = ni.eth.address if ni.eth else None
+    nig_changed = (
+        spec["network_interface_group"]
+        and spec["network_interface_group"] != current_nig
+    )
+    eth_changed = spec["eth"] and spec["eth"] != current_eth
+    if nig_changed or eth_changed:
+        # address is always changed together with its group
+        patches.append(
+            purefusion.NetworkInterfacePatch(
+                eth=(
+                    purefusion.NetworkInterfacePatchEth(
+                        purefusion.NullableString(spec["eth"])
+                    )
+                    if eth_changed
+                    else None
+                ),
+                network_interface_group=purefusion.NullableString(
+                    spec["network_interface_group"]
+                ),
+            )
+        )
+    return patches
+
+
+def update_ni(module, fusion, name, patches):
+    ni_api_instance = purefusion.NetworkInterfacesApi(fusion)
+    for patch in patches:
+        op = ni_api_instance.update_network_interface(
+            patch,
+            region_name=module.params["region"],
+            availability_zone_name=module.params["availability_zone"],
+            array_name=module.params["array"],
+            net_intf_name=name,
+        )
+        await_operation(fusion, op)
+
+
+def main():
+    """Main code"""
+    argument_spec = fusion_argument_spec()
+    argument_spec.update(
+        dict(
+            region=dict(type="str", required=True),
+            availability_zone=dict(type="str", required=True, aliases=["az"]),
+            array=dict(type="str", required=True),
+            interfaces=dict(
+                type="list",
+                elements="dict",
+                required=True,
+                options=dict(
+                    name=dict(type="str", required=True),
+                    display_name=dict(type="str"),
+                    eth=dict(type="str"),
+                    enabled=dict(type="bool"),
+                    network_interface_group=dict(type="str"),
+                ),
+                required_by={"eth": "network_interface_group"},
+            ),
+            concurrency=dict(type="int", default=DEFAULT_CONCURRENCY),
+        )
+    )
+
+    module = AnsibleModule(argument_spec, supports_check_mode=True)
+    fusion = setup_fusion(module)
+
+    nis = list_nis(module, fusion)
+    nigs = {}
+    if any(spec["network_interface_group"] for spec in module.params["interfaces"]):
+        nigs = list_nigs(module, fusion)
+    validate_interfaces(module, nis, nigs)
+
+    updates = []
+    for spec in module.params["interfaces"]:
+        patches = get_patches(spec, nis[spec["name"]])
+        if patches:
+            updates.append((spec["name"], patches))
+
+    errors = {}
+    if not module.check_mode:
+        results = run_concurrently(
+            fusion,
+            lambda update: update_ni(module, fusion, *update),
+            updates,
+            module.params["concurrency"],
+        )
+        errors = dict(
+            (result.item[0], result.error_message)
+            for result in results
+            if not result.ok
+        )
+
+    changed_names = set(name for name, _ in updates)
+    report = [
+        {
+            "name": spec["name"],
+            "changed": spec["name"] in changed_names,
+            "error": errors.get(spec["name"]),
+        }
+        for spec in module.params["interfaces"]
+    ]
+    changed = len(updates) != 0
+
+    if errors:
+        module.fail_json(
+            msg="{0} of {1} network interfaces failed, first error: {2}".format(
+                len(errors), len(updates), next(iter(errors.values()))
+            ),
+            changed=changed,
+            interfaces=report,
+        )
+    module.exit_json(changed=changed, interfaces=report)
+
+
+if __name__ == "__main__":
+    main()
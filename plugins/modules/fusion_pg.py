@@ -77,6 +77,8 @@ options:
     choices: [ heuristics, pure1meta ]
 extends_documentation_fragment:
 - purestorage.fusion.purestorage.fusion
+- purestorage.fusion.purestorage.concurrency
+- purestorage.fusion.purestorage.optimistic_create
 """
 
 EXAMPLES = r"""
@@ -103,6 +105,28 @@ EXAMPLES = r"""
 """
 
 RETURN = r"""
+snapshots:
+  description:
+  - Progress of deleting the snapshots of the placement group.
+  - Returned only when I(destroy_snapshots_on_delete) is set and the placement group is deleted.
+  returned: when snapshots were deleted
+  type: dict
+  contains:
+    total:
+      description: Number of snapshots found.
+      type: int
+    destroyed:
+      description: Number of snapshots destroyed, already destroyed snapshots are not counted.
+      type: int
+    deleted:
+      description: Number of snapshots deleted.
+      type: int
+    failed:
+      description: Number of snapshots that could not be destroyed or deleted.
+      type: int
+    errors:
+      description: Error messages keyed by the name of the snapshot.
+      type: dict
 """
 
 try:
@@ -118,25 +142,44 @@ from ansible_collections.purestorage.fusion.plugins.module_utils.fusion import (
 from ansible_collections.purestorage.fusion.plugins.module_utils.startup import (
     setup_fusion,
 )
+from ansible_collections.purestorage.fusion.plugins.module_utils.getters import (
+    get_cached,
+    list_all,
+)
 from ansible_collections.purestorage.fusion.plugins.module_utils.operations import (
     await_operation,
+    create_optimistically,
+    should_create_optimistically,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.parallel import (
+    DEFAULT_CONCURRENCY,
 )
 from ansible_collections.purestorage.fusion.plugins.module_utils.snapshots import (
-    delete_snapshot,
+    delete_snapshots,
 )
 
 
 def get_pg(module, fusion):
     """Return Placement Group or None"""
-    pg_api_instance = purefusion.PlacementGroupsApi(fusion)
-    try:
-        return pg_api_instance.get_placement_group(
-            tenant_name=module.params["tenant"],
-            tenant_space_name=module.params["tenant_space"],
-            placement_group_name=module.params["name"],
-        )
-    except purefusion.rest.ApiException:
-        return None
+
+    def _fetch():
+        pg_api_instance = purefusion.PlacementGroupsApi(fusion)
+        try:
+            return pg_api_instance.get_placement_group(
+                tenant_name=module.params["tenant"],
+                tenant_space_name=module.params["tenant_space"],
+                placement_group_name=module.params["name"],
+            )
+        except purefusion.rest.ApiException:
+            return None
+
+    key = (
+        "placement_group",
+        module.params["tenant"],
+        module.params["tenant_space"],
+        module.params["name"],
+    )
+    return get_cached(module, key, _fetch)
 
 
 def create_pg(module, fusion):
@@ -217,19 +260,19 @@ def update_pg(module, fusion, pg):
     return changed
 
 
-def delete_pg(module, fusion):
+def delete_pg(module, fusion, result):
     """Delete Placement Group"""
     pg_api_instance = purefusion.PlacementGroupsApi(fusion)
     if not module.check_mode:
         if module.params["destroy_snapshots_on_delete"]:
             snapshots_api = purefusion.SnapshotsApi(fusion)
-            snapshots = snapshots_api.list_snapshots(
+            snapshots = list_all(
+                snapshots_api.list_snapshots,
                 placement_group=module.params["name"],
                 tenant_name=module.params["tenant"],
                 tenant_space_name=module.params["tenant_space"],
             )
-            for snap in snapshots.items:
-                delete_snapshot(fusion, snap, snapshots_api)
+            result["snapshots"] = delete_snapshots(module, fusion, snapshots)
 
         op = pg_api_instance.delete_placement_group(
             placement_group_name=module.params["name"],
@@ -248,6 +291,7 @@ def main():
         dict(
             name=dict(type="str", required=True),
             destroy_snapshots_on_delete=dict(type="bool"),
+            concurrency=dict(type="int", default=DEFAULT_CONCURRENCY),
             display_name=dict(type="str"),
             tenant=dict(type="str", required=True),
             tenant_space=dict(type="str", required=True),
@@ -255,6 +299,7 @@ def main():
             availability_zone=dict(type="str", aliases=["az"]),
             storage_service=dict(type="str"),
             state=dict(type="str", default="present", choices=["absent", "present"]),
+            optimistic_create=dict(type="bool", default=False),
             array=dict(type="str"),
             placement_engine=dict(
                 type="str",
@@ -272,8 +317,19 @@ def main():
         module.warn("placement_engine parameter will be deprecated in version 2.0.0")
 
     changed = False
+    result = {}
 
     state = module.params["state"]
+    if should_create_optimistically(module):
+        module.fail_on_missing_params(
+            ["region", "availability_zone", "storage_service"]
+        )
+        if create_optimistically(create_pg, module, fusion):
+            if module.params["array"]:
+                # changing placement requires additional update
+                update_pg(module, fusion, get_pg(module, fusion))
+            module.exit_json(changed=True)
+
     pgroup = get_pg(module, fusion)
 
     if state == "present" and not pgroup:
@@ -288,9 +344,9 @@ def main():
     elif state == "present" and pgroup:
         changed = update_pg(module, fusion, pgroup) or changed
     elif state == "absent" and pgroup:
-        changed = delete_pg(module, fusion) or changed
+        changed = delete_pg(module, fusion, result) or changed
 
-    module.exit_json(changed=changed)
+    module.exit_json(changed=changed, **result)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,486 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# (c) 2023, Pure Storage, Inc.
+# GNU General Public License v3.0+ (see COPYING.GPLv3 or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+DOCUMENTATION = r"""
+---
+module: fusion_pg_rebalance
+version_added: '1.6.0'
+short_description: Rebalance placement groups between arrays in Pure Storage Fusion
+description:
+- Move placement groups between arrays of an availability zone to even out
+  the used space or the load of the arrays.
+- Placement groups of every array are listed once and the space (or performance)
+  of all arrays and placement groups is read concurrently.
+- A move plan is then computed greedily, every move takes a placement group from
+  the most utilized array to the least utilized array it can run on, choosing the
+  placement group which halves the difference of the two arrays most closely.
+  Planning stops when I(max_moves) is reached or no move improves the balance.
+- The planned moves are applied concurrently.
+author:
+- Pure Storage Ansible Team (@sdodsley) <pure-ansible-team@purestorage.com>
+notes:
+- Supports C(check mode), the move plan is returned without applying it.
+- Arrays in maintenance or unavailable mode are not considered.
+- A placement group is moved only to arrays whose hardware type is supported
+  by its storage service.
+options:
+  region:
+    description:
+    - The name of the region the availability zone is in.
+    type: str
+    required: true
+  availability_zone:
+    aliases: [ az ]
+    description:
+    - The name of the availability zone.
+    type: str
+    required: true
+  arrays:
+    description:
+    - Names of the arrays to rebalance.
+    - If not provided, all arrays of the availability zone are rebalanced.
+    type: list
+    elements: str
+  metric:
+    description:
+    - Utilization to even out.
+    - C(space) is the total physical space used, C(iops) is the sum of reads
+      and writes per second.
+    - Absolute values are balanced, not a ratio of the capacity of the array,
+      so arrays of different sizes end up holding about the same number of bytes.
+    type: str
+    default: space
+    choices: [ space, iops ]
+  max_moves:
+    description:
+    - Maximum number of placement groups moved.
+    type: int
+    default: 10
+  max_moves_per_array:
+    description:
+    - Maximum number of moves from or to a single array.
+    type: int
+    default: 2
+  max_latency_us:
+    description:
+    - Arrays whose read or write latency exceeds this value in microseconds
+      do not receive any placement group.
+    type: int
+extends_documentation_fragment:
+- purestorage.fusion.purestorage.fusion
+- purestorage.fusion.purestorage.concurrency
+"""
+
+EXAMPLES = r"""
+- name: Show how used space of arrays in az1 would be evened out
+  purestorage.fusion.fusion_pg_rebalance:
+    region: pure-us-west
+    availability_zone: az1
+    max_moves: 5
+    issuer_id: key_name
+    private_key_file: "az-admin-private-key.pem"
+  check_mode: true
+  register: rebalance
+
+- name: Even out load of two arrays, moving at most one placement group to or from each
+  purestorage.fusion.fusion_pg_rebalance:
+    region: pure-us-west
+    availability_zone: az1
+    arrays: [ array0, array1 ]
+    metric: iops
+    max_moves_per_array: 1
+    max_latency_us: 2000
+    issuer_id: key_name
+    private_key_file: "az-admin-private-key.pem"
+"""
+
+RETURN = r"""
+moves:
+  description: Planned moves, in the order they were planned.
+  returned: always
+  type: list
+  elements: dict
+  contains:
+    tenant:
+      description: The tenant of the placement group.
+      type: str
+    tenant_space:
+      description: The tenant space of the placement group.
+      type: str
+    placement_group:
+      description: The name of the placement group.
+      type: str
+    source:
+      description: The array the placement group is moved from.
+      type: str
+    target:
+      description: The array the placement group is moved to.
+      type: str
+    weight:
+      description:
+      - Utilization of the placement group.
+      - Total physical space in bytes for I(metric=space), reads and writes per
+        second for I(metric=iops).
+      type: int
+    error:
+      description: Error message if the move failed, null otherwise.
+      type: str
+arrays:
+  description: Utilization of every considered array before and after the planned moves.
+  returned: always
+  type: list
+  elements: dict
+  contains:
+    name:
+      description: The name of the array.
+      type: str
+    before:
+      description:
+      - Utilization before the moves.
+      - Absolute total physical space in bytes for I(metric=space), not normalized
+        by the capacity of the array.
+      type: int
+    after:
+      description:
+      - Utilization after the planned moves, in the same unit as I(before).
+      type: int
+"""
+
+try:
+    import fusion as purefusion
+except ImportError:
+    pass
+
+from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.purestorage.fusion.plugins.module_utils.arrays import (
+    list_arrays as list_az_arrays,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.fusion import (
+    fusion_argument_spec,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.getters import (
+    get_ss,
+    list_all,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.operations import (
+    await_operation,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.parallel import (
+    DEFAULT_CONCURRENCY,
+    run_concurrently,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.startup import (
+    setup_fusion,
+)
+
+
+def _run_or_fail(module, fusion, func, items, what):
+    """Returns results of `func` for all `items` keyed by item, fails on the first error"""
+    results = {}
+    for result in run_concurrently(fusion, func, items, module.params["concurrency"]):
+        if not result.ok:
+            module.fail_json(
+                msg="Reading {0} of '{1}' failed: {2}".format(
+                    what, result.item, result.error_message
+                )
+            )
+        results[result.item] = result.result
+    return results
+
+
+def _weight(metric, telemetry):
+    if metric == "space":
+        return telemetry.total_physical_space or 0
+    return (telemetry.reads_per_sec or 0) + (telemetry.writes_per_sec or 0)
+
+
+def list_arrays(module, fusion):
+    """Returns arrays in service keyed by name"""
+    arrays = dict(
+        (name, array)
+        for (_az, name), array in list_az_arrays(
+            module,
+            fusion,
+            [module.params["availability_zone"]],
+            module.params["concurrency"],
+        ).items()
+        if not array.maintenance_mode and not array.unavailable_mode
+    )
+    if module.params["arrays"]:
+        missing = [name for name in module.params["arrays"] if name not in arrays]
+        if missing:
+            module.fail_json(
+                msg="Arrays {0} do not exist or are not in service".format(
+                    ", ".join(missing)
+                )
+            )
+        arrays = dict((name, arrays[name]) for name in module.params["arrays"])
+    return arrays
+
+
+def read_arrays(module, fusion, arrays):
+    """Returns (utilization keyed by array name, names of arrays which may receive
+    placement groups)
+    """
+    array_api_instance = purefusion.ArraysApi(fusion)
+    location = dict(
+        region_name=module.params["region"],
+        availability_zone_name=module.params["availability_zone"],
+    )
+    metric = module.params["metric"]
+    max_latency = module.params["max_latency_us"]
+
+    loads = {}
+    if metric == "space":
+        spaces = _run_or_fail(
+            module,
+            fusion,
+            lambda name: array_api_instance.get_array_space(
+                array_name=name, **location
+            ),
+            arrays,
+            "space of array",
+        )
+        loads = dict((name, _weight(metric, space)) for name, space in spaces.items())
+
+    targets = set(arrays)
+    if metric == "iops" or max_latency is not None:
+        performances = _run_or_fail(
+            module,
+            fusion,
+            lambda name: array_api_instance.get_array_performance(
+                array_name=name, **location
+            ),
+            arrays,
+            "performance of array",
+        )
+        if metric == "iops":
+            loads = dict(
+                (name, _weight(metric, performance))
+                for name, performance in performances.items()
+            )
+        if max_latency is not None:
+            targets = set(
+                name
+                for name, performance in performances.items()
+                if (performance.read_latency_us or 0) <= max_latency
+                and (performance.write_latency_us or 0) <= max_latency
+            )
+    return loads, targets
+
+
+def read_placement_groups(module, fusion, arrays):
+    """Returns placement groups keyed by (tenant, tenant space, name)
+    -> (array name, placement group, weight)
+    """
+    pg_api_instance = purefusion.PlacementGroupsApi(fusion)
+    listings = _run_or_fail(
+        module,
+        fusion,
+        lambda name: list_all(
+            pg_api_instance.query_placement_groups,
+            region_name=module.params["region"],
+            availability_zone_name=module.params["availability_zone"],
+            array_name=name,
+        ),
+        arrays,
+        "placement groups of array",
+    )
+    placements = {}
+    for array_name, pgs in listings.items():
+        for pg in pgs:
+            key = (pg.tenant.name, pg.tenant_space.name, pg.name)
+            placements[key] = (array_name, pg)
+
+    if module.params["metric"] == "space":
+        read = pg_api_instance.get_placement_groups_space
+    else:
+        read = pg_api_instance.get_placement_groups_performance
+    telemetry = _run_or_fail(
+        module,
+        fusion,
+        lambda key: read(
+            tenant_name=key[0], tenant_space_name=key[1], placement_group_name=key[2]
+        ),
+        placements,
+        "utilization of placement group",
+    )
+    return dict(
+        (key, (array_name, pg, _weight(module.params["metric"], telemetry[key])))
+        for key, (array_name, pg) in placements.items()
+    )
+
+
+def get_compatibility(module, fusion, arrays, placements):
+    """Returns function telling whether a placement group can be placed on an array"""
+    hardware_types = {}
+    for _array_name, pg, _pg_weight in placements.values():
+        name = pg.storage_service.name
+        if name not in hardware_types:
+            ss = get_ss(module, fusion, name)
+            hardware_types[name] = (
+                set(hw.name for hw in ss.hardware_types or [])
+                if ss is not None
+                else None
+            )
+
+    def _compatible(key, array_name):
+        supported = hardware_types[placements[key][1].storage_service.name]
+        hardware_type = arrays[array_name].hardware_type
+        return (
+            supported is None
+            or hardware_type is None
+            or hardware_type.name in supported
+        )
+
+    return _compatible
+
+
+def plan_moves(loads, placements, targets, compatible, max_moves, max_per_array):
+    """
+    Greedily plans moves of placement groups from the most to the least utilized
+    arrays. `loads` is utilization keyed by array name, `placements` is
+    (array name, _, weight) keyed by placement group. Returns list of
+    (placement group key, source, target) and utilization after the moves.
+    """
+    loads = dict(loads)
+    location = dict((key, value[0]) for key, value in placements.items())
+    counts = dict((name, 0) for name in loads)
+    moved = set()
+    moves = []
+    while len(moves) < max_moves:
+        available = [name for name in loads if counts[name] < max_per_array]
+        sources = sorted(available, key=lambda name: (-loads[name], name))
+        receivers = sorted(
+            (name for name in available if name in targets),
+            key=lambda name: (loads[name], name),
+        )
+        move = None
+        for source in sources:
+            for target in receivers:
+                gap = loads[source] - loads[target]
+                if gap <= 0:
+                    break
+                # the best move halves the gap, any move lighter than the gap improves it
+                candidates = [
+                    (abs(gap - 2 * placements[key][2]), key)
+                    for key in location
+                    if location[key] == source
+                    and key not in moved
+                    and 0 < placements[key][2] < gap
+                    and compatible(key, target)
+                ]
+                if candidates:
+                    move = (min(candidates)[1], source, target)
+                    break
+            if move is not None:
+                break
+        if move is None:
+            break
+
+        key, source, target = move
+        weight = placements[key][2]
+        loads[source] -= weight
+        loads[target] += weight
+        counts[source] += 1
+        counts[target] += 1
+        location[key] = target
+        moved.add(key)
+        moves.append(move)
+    return moves, loads
+
+
+def move_pg(fusion, key, target):
+    pg_api_instance = purefusion.PlacementGroupsApi(fusion)
+    op = pg_api_instance.update_placement_group(
+        purefusion.PlacementGroupPatch(array=purefusion.NullableString(target)),
+        tenant_name=key[0],
+        tenant_space_name=key[1],
+        placement_group_name=key[2],
+    )
+    await_operation(fusion, op)
+
+
+def main():
+    """Main code"""
+    argument_spec = fusion_argument_spec()
+    argument_spec.update(
+        dict(
+            region=dict(type="str", required=True),
+            availability_zone=dict(type="str", required=True, aliases=["az"]),
+            arrays=dict(type="list", elements="str"),
+            metric=dict(type="str", default="space", choices=["space", "iops"]),
+            max_moves=dict(type="int", default=10),
+            max_moves_per_array=dict(type="int", default=2),
+            max_latency_us=dict(type="int"),
+            concurrency=dict(type="int", default=DEFAULT_CONCURRENCY),
+        )
+    )
+
+    module = AnsibleModule(argument_spec, supports_check_mode=True)
+    fusion = setup_fusion(module)
+
+    arrays = list_arrays(module, fusion)
+    loads, targets = read_arrays(module, fusion, arrays)
+    placements = read_placement_groups(module, fusion, arrays)
+    compatible = get_compatibility(module, fusion, arrays, placements)
+    moves, after = plan_moves(
+        loads,
+        placements,
+        targets,
+        compatible,
+        module.params["max_moves"],
+        module.params["max_moves_per_array"],
+    )
+
+    errors = {}
+    if not module.check_mode and moves:
+        # every array takes part in at most max_moves_per_array of the moves
+        for result in run_concurrently(
+            fusion,
+            lambda move: move_pg(fusion, move[0], move[2]),
+            moves,
+            module.params["concurrency"],
+        ):
+            if not result.ok:
+                errors[result.item[0]] = result.error_message
+
+    report = [
+        {
+            "tenant": key[0],
+            "tenant_space": key[1],
+            "placement_group": key[2],
+            "source": source,
+            "target": target,
+            "weight": placements[key][2],
+            "error": errors.get(key),
+        }
+        for key, source, target in moves
+    ]
+    utilization = [
+        {"name": name, "before": loads[name], "after": after[name]}
+        for name in sorted(loads)
+    ]
+    changed = len(moves) - len(errors) != 0
+
+    if errors:
+        module.fail_json(
+            msg="{0} of {1} placement group moves failed, first error: {2}".format(
+                len(errors), len(moves), next(iter(errors.values()))
+            ),
+            changed=changed,
+            moves=report,
+            arrays=utilization,
+        )
+    module.exit_json(changed=changed, moves=report, arrays=utilization)
+
+
+if __name__ == "__main__":
+    main()
@@ -59,6 +59,7 @@ options:
     type: str
 extends_documentation_fragment:
 - purestorage.fusion.purestorage.fusion
+- purestorage.fusion.purestorage.concurrency
 """
 
 EXAMPLES = r"""
@@ -80,6 +81,28 @@ EXAMPLES = r"""
 """
 
 RETURN = r"""
+snapshots:
+  description:
+  - Progress of deleting the snapshots of the protection policy.
+  - Returned only when I(destroy_snapshots_on_delete) is set and the protection policy is deleted.
+  returned: when snapshots were deleted
+  type: dict
+  contains:
+    total:
+      description: Number of snapshots found.
+      type: int
+    destroyed:
+      description: Number of snapshots destroyed, already destroyed snapshots are not counted.
+      type: int
+    deleted:
+      description: Number of snapshots deleted.
+      type: int
+    failed:
+      description: Number of snapshots that could not be destroyed or deleted.
+      type: int
+    errors:
+      description: Error messages keyed by the name of the snapshot.
+      type: dict
 """
 
 try:
@@ -92,6 +115,9 @@ from ansible_collections.purestorage.fusion.plugins.module_utils.fusion import (
     fusion_argument_spec,
 )
 
+from ansible_collections.purestorage.fusion.plugins.module_utils.getters import (
+    list_all,
+)
 from ansible_collections.purestorage.fusion.plugins.module_utils.parsing import (
     parse_minutes,
 )
@@ -102,8 +128,11 @@ from ansible_collections.purestorage.fusion.plugins.module_utils.startup import
 from ansible_collections.purestorage.fusion.plugins.module_utils.operations import (
     await_operation,
 )
+from ansible_collections.purestorage.fusion.plugins.module_utils.parallel import (
+    DEFAULT_CONCURRENCY,
+)
 from ansible_collections.purestorage.fusion.plugins.module_utils.snapshots import (
-    delete_snapshot,
+    delete_snapshots,
 )
 
 
@@ -155,22 +184,23 @@ def delete_pp(module, fusion):
     """Delete Protection Policy"""
     pp_api_instance = purefusion.ProtectionPoliciesApi(fusion)
     changed = True
+    result = {}
     if not module.check_mode:
         if module.params["destroy_snapshots_on_delete"]:
             protection_policy = get_pp(module, fusion)
             snapshots_api = purefusion.SnapshotsApi(fusion)
-            snapshots = snapshots_api.query_snapshots(
-                protection_policy_id=protection_policy.id
+            snapshots = list_all(
+                snapshots_api.query_snapshots,
+                protection_policy_id=protection_policy.id,
             )
-            for snap in snapshots.items:
-                delete_snapshot(fusion, snap, snapshots_api)
+            result["snapshots"] = delete_snapshots(module, fusion, snapshots)
 
         op = pp_api_instance.delete_protection_policy(
             protection_policy_name=module.params["name"],
         )
         await_operation(fusion, op)
 
-    module.exit_json(changed=changed)
+    module.exit_json(changed=changed, **result)
 
 
 def main():
@@ -180,6 +210,7 @@ def main():
         dict(
             name=dict(type="str", required=True),
             destroy_snapshots_on_delete=dict(type="bool"),
+            concurrency=dict(type="int", default=DEFAULT_CONCURRENCY),
             display_name=dict(type="str"),
             local_rpo=dict(type="str"),
             local_retention=dict(type="str"),
@@ -0,0 +1,428 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# (c) 2023, Pure Storage, Inc.
+# GNU General Public License v3.0+ (see COPYING.GPLv3 or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+DOCUMENTATION = r"""
+---
+module: fusion_pps
+version_added: '1.6.0'
+short_description: Manage the catalog of protection policies in Pure Storage Fusion
+description:
+- Create, replace or delete many protection policies at once.
+- Existing protection policies are listed once and compared with the desired ones.
+  Protection policies cannot be updated, so a policy whose objectives (or display name,
+  if given) differ is replaced, i.e. deleted and created again with the same name.
+- Deletions (including those of replaced policies) are applied concurrently first,
+  creations concurrently afterwards.
+author:
+- Pure Storage Ansible Team (@sdodsley) <pure-ansible-team@purestorage.com>
+notes:
+- Supports C(check mode).
+- Unless I(destroy_snapshots_on_delete=true), protection policies which still have
+  snapshots are neither deleted nor replaced. They are reported with action C(preserve)
+  and a warning is emitted.
+options:
+  policies:
+    description:
+    - Protection policies to create, replace or delete.
+    type: list
+    elements: dict
+    required: true
+    suboptions:
+      name:
+        description:
+        - The name of the protection policy.
+        type: str
+        required: true
+      display_name:
+        description:
+        - The human name of the protection policy.
+        - If not provided, defaults to I(name).
+        type: str
+      local_rpo:
+        description:
+        - Recovery Point Objective for snapshots.
+        - Minimum value is 10 minutes.
+        - Value can be provided as m(inutes), h(ours),
+          d(ays), w(eeks), or y(ears).
+        - If no unit is provided, minutes are assumed.
+        - Required if I(state=present).
+        type: str
+      local_retention:
+        description:
+        - Retention Duration for periodic snapshots.
+        - Minimum value is 1 minute.
+        - Value can be provided as m(inutes), h(ours),
+          d(ays), w(eeks), or y(ears).
+        - If no unit is provided, minutes are assumed.
+        - Required if I(state=present).
+        type: str
+  state:
+    description:
+    - Define whether the protection policies should exist or not.
+    default: present
+    choices: [ present, absent ]
+    type: str
+  purge:
+    description:
+    - Delete all other protection policies.
+    - Only used if I(state=present).
+    type: bool
+    default: false
+  destroy_snapshots_on_delete:
+    description:
+    - Destroy and delete snapshots of the protection policies which are deleted or replaced.
+    - If C(false), protection policies which still have snapshots are kept untouched.
+    type: bool
+    default: false
+extends_documentation_fragment:
+- purestorage.fusion.purestorage.fusion
+- purestorage.fusion.purestorage.concurrency
+"""
+
+EXAMPLES = r"""
+- name: Make protection policies match the RPO tiers
+  purestorage.fusion.fusion_pps:
+    policies:
+      - name: gold
+        local_rpo: 10M
+        local_retention: 1D
+      - name: silver
+        local_rpo: 1H
+        local_retention: 1W
+      - name: bronze
+        display_name: "Bronze tier"
+        local_rpo: 1D
+        local_retention: 4W
+    purge: true
+    issuer_id: key_name
+    private_key_file: "az-admin-private-key.pem"
+
+- name: Delete protection policies together with their snapshots
+  purestorage.fusion.fusion_pps:
+    policies:
+      - name: gold
+      - name: silver
+    state: absent
+    destroy_snapshots_on_delete: true
+    issuer_id: key_name
+    private_key_file: "az-admin-private-key.pem"
+"""
+
+RETURN = r"""
+policies:
+  description: Result for every created, replaced, deleted or preserved protection policy.
+  returned: always
+  type: list
+  elements: dict
+  contains:
+    name:
+      description: The name of the protection policy.
+      type: str
+    action:
+      description:
+      - C(create), C(replace) or C(delete).
+      - C(preserve) if the policy should be replaced or deleted but it still has snapshots.
+      type: str
+    error:
+      description: Error message if the action failed, null otherwise.
+      type: str
+snapshots:
+  description: Progress of the snapshot teardown, see M(purestorage.fusion.fusion_pp).
+  returned: when snapshots were deleted
+  type: dict
+"""
+
+try:
+    import fusion as purefusion
+except ImportError:
+    pass
+
+from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.purestorage.fusion.plugins.module_utils.fusion import (
+    fusion_argument_spec,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.getters import (
+    list_all,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.operations import (
+    await_operation,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.parallel import (
+    DEFAULT_CONCURRENCY,
+    run_concurrently,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.parsing import (
+    parse_iso_minutes,
+    parse_minutes,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.snapshots import (
+    delete_snapshots,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.startup import (
+    setup_fusion,
+)
+
+
+def get_objectives(policy):
+    """Returns (RPO, retention) of the protection policy in minutes,
+    either is None if the API returned a duration that could not be parsed
+    """
+    rpo = None
+    retention = None
+    for objective in policy.objectives or []:
+        if objective.type == "RPO":
+            rpo = parse_iso_minutes(objective.rpo)
+        elif objective.type == "Retention":
+            retention = parse_iso_minutes(objective.after)
+    return rpo, retention
+
+
+def plan_present(module, existing):
+    """Returns (desired policies keyed by name, names to create, names to replace,
+    names to delete), fails on invalid protection policies
+    """
+    problems = []
+    desired = {}
+    to_create = []
+    to_replace = []
+    unparsed = []
+    for spec in module.params["policies"]:
+        name = spec["name"]
+        if name in desired:
+            problems.append("'{0}' is specified more than once".format(name))
+            continue
+        if spec["local_rpo"] is None or spec["local_retention"] is None:
+            problems.append(
+                "'{0}' is missing local_rpo or local_retention".format(name)
+            )
+            continue
+        local_rpo = parse_minutes(module, spec["local_rpo"])
+        local_retention = parse_minutes(module, spec["local_retention"])
+        if local_rpo < 10:
+            problems.append(
+                "local RPO of '{0}' must be a minimum of 10 minutes".format(name)
+            )
+        if local_retention < 1:
+            problems.append(
+                "local retention of '{0}' must be a minimum of 1 minutes".format(name)
+            )
+        display_name = spec["display_name"] or name
+        desired[name] = (display_name, local_rpo, local_retention)
+
+        policy = existing.get(name)
+        if policy is None:
+            to_create.append(name)
+            continue
+        objectives = get_objectives(policy)
+        if None in objectives:
+            # replacing it on every run would not make it any more comparable
+            unparsed.append(name)
+        elif (
+            objectives != (local_rpo, local_retention)
+            or spec["display_name"]
+            and policy.display_name != spec["display_name"]
+        ):
+            to_replace.append(name)
+
+    if problems:
+        module.fail_json(
+            msg="Invalid protection policies: {0}".format("; ".join(problems))
+        )
+    if unparsed:
+        module.warn(
+            "Objectives of protection policies {0} could not be parsed, they were "
+            "left unchanged".format(", ".join(unparsed))
+        )
+
+    to_delete = []
+    if module.params["purge"]:
+        to_delete = sorted(name for name in existing if name not in desired)
+    return desired, to_create, to_replace, to_delete
+
+
+def get_snapshots(module, fusion, existing, names):
+    """Returns snapshots of protection policies `names` keyed by policy name,
+    only the first snapshot of every policy unless snapshots are to be deleted
+    """
+    snapshots_api = purefusion.SnapshotsApi(fusion)
+
+    def _query(name):
+        policy_id = existing[name].id
+        if module.params["destroy_snapshots_on_delete"]:
+            return list_all(
+                snapshots_api.query_snapshots, protection_policy_id=policy_id
+            )
+        # existence is all the safe mode needs to know
+        return snapshots_api.query_snapshots(
+            protection_policy_id=policy_id, limit=1
+        ).items
+
+    snapshots = {}
+    for result in run_concurrently(fusion, _query, names, module.params["concurrency"]):
+        if not result.ok:
+            module.fail_json(
+                msg="Listing snapshots of protection policy '{0}' failed: {1}".format(
+                    result.item, result.error_message
+                )
+            )
+        snapshots[result.item] = result.result
+    return snapshots
+
+
+def create_pp(fusion, name, display_name, local_rpo, local_retention):
+    pp_api_instance = purefusion.ProtectionPoliciesApi(fusion)
+    op = pp_api_instance.create_protection_policy(
+        purefusion.ProtectionPolicyPost(
+            name=name,
+            display_name=display_name,
+            objectives=[
+                purefusion.RPO(type="RPO", rpo="PT" + str(local_rpo) + "M"),
+                purefusion.Retention(
+                    type="Retention", after="PT" + str(local_retention) + "M"
+                ),
+            ],
+        )
+    )
+    await_operation(fusion, op)
+
+
+def delete_pp(fusion, name):
+    pp_api_instance = purefusion.ProtectionPoliciesApi(fusion)
+    op = pp_api_instance.delete_protection_policy(protection_policy_name=name)
+    await_operation(fusion, op)
+
+
+def main():
+    """Main code"""
+    argument_spec = fusion_argument_spec()
+    argument_spec.update(
+        dict(
+            policies=dict(
+                type="list",
+                elements="dict",
+                required=True,
+                options=dict(
+                    name=dict(type="str", required=True),
+                    display_name=dict(type="str"),
+                    local_rpo=dict(type="str"),
+                    local_retention=dict(type="str"),
+                ),
+            ),
+            state=dict(type="str", default="present", choices=["present", "absent"]),
+            purge=dict(type="bool", default=False),
+            destroy_snapshots_on_delete=dict(type="bool", default=False),
+            concurrency=dict(type="int", default=DEFAULT_CONCURRENCY),
+        )
+    )
+
+    module = AnsibleModule(argument_spec, supports_check_mode=True)
+    fusion = setup_fusion(module)
+
+    pp_api_instance = purefusion.ProtectionPoliciesApi(fusion)
+    existing = dict(
+        (policy.name, policy)
+        for policy in pp_api_instance.list_protection_policies().items
+    )
+
+    if module.params["state"] == "present":
+        desired, to_create, to_replace, to_delete = plan_present(module, existing)
+    else:
+        desired = {}
+        to_create = []
+        to_replace = []
+        to_delete = []
+        for spec in module.params["policies"]:
+            if spec["name"] in existing and spec["name"] not in to_delete:
+                to_delete.append(spec["name"])
+
+    snapshots = {}
+    if not (module.params["destroy_snapshots_on_delete"] and module.check_mode):
+        snapshots = get_snapshots(module, fusion, existing, to_replace + to_delete)
+    preserved = []
+    if not module.params["destroy_snapshots_on_delete"]:
+        preserved = [name for name, snaps in snapshots.items() if snaps]
+        if preserved:
+            module.warn(
+                "Protection policies {0} still have snapshots, they were not "
+                "deleted or replaced".format(", ".join(sorted(preserved)))
+            )
+    to_replace = [name for name in to_replace if name not in preserved]
+    to_delete = [name for name in to_delete if name not in preserved]
+
+    result = {}
+    errors = {}
+    deleted = set()
+    if not module.check_mode and (to_create or to_replace or to_delete):
+        if module.params["destroy_snapshots_on_delete"]:
+            doomed = [snap for name in snapshots for snap in snapshots[name]]
+            if doomed:
+                result["snapshots"] = delete_snapshots(module, fusion, doomed)
+
+        deletions = [("replace", name) for name in to_replace] + [
+            ("delete", name) for name in to_delete
+        ]
+        for task in run_concurrently(
+            fusion,
+            lambda item: delete_pp(fusion, item[1]),
+            deletions,
+            module.params["concurrency"],
+        ):
+            if task.ok:
+                deleted.add(task.item[1])
+            else:
+                errors[task.item] = task.error_message
+
+        # replaced policy is created again only if its old version is gone
+        creations = [("create", name) for name in to_create] + [
+            ("replace", name) for name in to_replace if ("replace", name) not in errors
+        ]
+        for task in run_concurrently(
+            fusion,
+            lambda item: create_pp(fusion, item[1], *desired[item[1]]),
+            creations,
+            module.params["concurrency"],
+        ):
+            if not task.ok:
+                errors[task.item] = task.error_message
+
+    report = [
+        {"name": name, "action": action, "error": errors.get((action, name))}
+        for action, names in (
+            ("create", to_create),
+            ("replace", to_replace),
+            ("delete", to_delete),
+        )
+        for name in names
+    ]
+    # a replaced policy which failed to be created again was still deleted
+    changed = len(report) - len(errors) != 0 or any(
+        name in deleted for name in to_replace
+    )
+    report.extend(
+        {"name": name, "action": "preserve", "error": None}
+        for name in sorted(preserved)
+    )
+
+    if errors:
+        module.fail_json(
+            msg="{0} of {1} protection policy changes failed, first error: {2}".format(
+                len(errors),
+                len(to_create) + len(to_replace) + len(to_delete),
+                next(iter(errors.values())),
+            ),
+            changed=changed,
+            policies=report,
+            **result
+        )
+    module.exit_json(changed=changed, policies=report, **result)
+
+
+if __name__ == "__main__":
+    main()
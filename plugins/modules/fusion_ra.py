@@ -100,6 +100,10 @@ from ansible_collections.purestorage.fusion.plugins.module_utils.fusion import (
 from ansible_collections.purestorage.fusion.plugins.module_utils.operations import (
     await_operation,
 )
+from ansible_collections.purestorage.fusion.plugins.module_utils.principals import (
+    resolve_api_client,
+    resolve_user,
+)
 from ansible_collections.purestorage.fusion.plugins.module_utils.startup import (
     setup_fusion,
 )
@@ -109,14 +113,14 @@ def get_principal(module, fusion):
     if module.params["principal"]:
         return module.params["principal"]
     if module.params["user"]:
-        principal = user_to_principal(fusion, module.params["user"])
+        principal = resolve_user(module, fusion, module.params["user"])
         if not principal:
             module.fail_json(
                 msg="User {0} does not exist".format(module.params["user"])
             )
         return principal
     if module.params["api_client_key"]:
-        principal = apiclient_to_principal(fusion, module.params["api_client_key"])
+        principal = resolve_api_client(module, fusion, module.params["api_client_key"])
         if not principal:
             module.fail_json(
                 msg="API Client with key {0} does not exist".format(
@@ -126,29 +130,6 @@ def get_principal(module, fusion):
         return principal
 
 
-def user_to_principal(fusion, user_id):
-    """Given a human-readable Fusion user, such as a Pure 1 App ID
-    return the associated principal
-    """
-    id_api_instance = purefusion.IdentityManagerApi(fusion)
-    users = id_api_instance.list_users()
-    for user in users:
-        if user.name == user_id:
-            return user.id
-    return None
-
-
-def apiclient_to_principal(fusion, api_client_key):
-    """Given an API client issuer ID, such as "pure1:apikey:123xXxyYyzYzASDF",
-    return the associated principal
-    """
-    id_api_instance = purefusion.IdentityManagerApi(fusion)
-    api_clients = id_api_instance.list_users(name=api_client_key)
-    if len(api_clients) > 0:
-        return api_clients[0].id
-    return None
-
-
 def get_scope(params):
     """Given a scope type and associated tenant
     and tenant_space, return the scope_link
@@ -0,0 +1,344 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# (c) 2023, Pure Storage, Inc.
+# GNU General Public License v3.0+ (see COPYING.GPLv3 or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+DOCUMENTATION = r"""
+---
+module: fusion_ra_sync
+version_added: '1.6.0'
+short_description: Synchronize role assignments in Pure Storage Fusion
+description:
+- Make role assignments of the managed roles match the desired set of assignments.
+- Principals of users and API clients are resolved through the same cache as
+  M(purestorage.fusion.fusion_ra) does, so users are listed at most once, and role
+  assignments are listed once per managed role. Missing assignments are then
+  created and superfluous ones deleted concurrently.
+author:
+- Pure Storage Ansible Team (@sdodsley) <pure-ansible-team@purestorage.com>
+notes:
+- Supports C(check mode).
+options:
+  assignments:
+    description:
+    - The desired role assignments.
+    type: list
+    elements: dict
+    required: true
+    suboptions:
+      role:
+        description:
+        - The name of the role.
+        type: str
+        required: true
+      user:
+        description:
+        - The username to assign the role to.
+        - This should be provide in the same format as I(issuer_id).
+        type: str
+      api_client_key:
+        description:
+        - The issuer ID of the API client to assign the role to.
+        type: str
+      principal:
+        description:
+        - The unique ID of the principal (User or API Client) to assign to the role.
+        type: str
+      scope:
+        description:
+        - The level to which the role is assigned.
+        choices: [ organization, tenant, tenant_space ]
+        default: organization
+        type: str
+      tenant:
+        description:
+        - The name of the tenant the role is applied to.
+        - Must be provided if I(scope) is set to either C(tenant) or C(tenant_space).
+        type: str
+      tenant_space:
+        description:
+        - The name of the tenant space the role is applied to.
+        - Must be provided if I(scope) is set to C(tenant_space).
+        type: str
+  roles:
+    description:
+    - Names of the managed roles, in addition to the roles used in I(assignments).
+    - Use it to delete all assignments of a role which is not used in I(assignments).
+    type: list
+    elements: str
+  purge:
+    description:
+    - Delete assignments of the managed roles which are not in I(assignments).
+    type: bool
+    default: true
+extends_documentation_fragment:
+- purestorage.fusion.purestorage.fusion
+- purestorage.fusion.purestorage.concurrency
+"""
+
+EXAMPLES = r"""
+- name: Synchronize tenant administrators
+  purestorage.fusion.fusion_ra_sync:
+    roles:
+      - tenant-admin
+    assignments:
+      - role: tenant-admin
+        user: alice
+        scope: tenant
+        tenant: tenant1
+      - role: tenant-admin
+        api_client_key: "pure1:apikey:123xXxyYyzYzASDF"
+        scope: tenant
+        tenant: tenant2
+    issuer_id: key_name
+    private_key_file: "az-admin-private-key.pem"
+"""
+
+RETURN = r"""
+added:
+  description: Role assignments created (or to be created in check mode).
+  returned: always
+  type: list
+  elements: dict
+  contains:
+    role:
+      description: The name of the role.
+      type: str
+    principal:
+      description: The ID of the principal.
+      type: str
+    scope:
+      description: The link of the scope of the assignment.
+      type: str
+    error:
+      description: Error message if creating the assignment failed, null otherwise.
+      type: str
+removed:
+  description: Role assignments deleted (or to be deleted in check mode).
+  returned: always
+  type: list
+  elements: dict
+  contains:
+    role:
+      description: The name of the role.
+      type: str
+    principal:
+      description: The ID of the principal.
+      type: str
+    scope:
+      description: The link of the scope of the assignment.
+      type: str
+    error:
+      description: Error message if deleting the assignment failed, null otherwise.
+      type: str
+"""
+
+try:
+    import fusion as purefusion
+except ImportError:
+    pass
+
+from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.purestorage.fusion.plugins.module_utils.fusion import (
+    fusion_argument_spec,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.operations import (
+    await_operation,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.parallel import (
+    DEFAULT_CONCURRENCY,
+    run_concurrently,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.principals import (
+    resolve_api_client,
+    resolve_user,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.startup import (
+    setup_fusion,
+)
+
+
+def get_scope(spec):
+    """Given a scope type and associated tenant
+    and tenant_space, return the scope_link
+    """
+    if spec["scope"] == "tenant":
+        return "/tenants/" + spec["tenant"]
+    if spec["scope"] == "tenant_space":
+        return "/tenants/" + spec["tenant"] + "/tenant-spaces/" + spec["tenant_space"]
+    return "/"
+
+
+def get_desired(module, fusion):
+    """Returns set of desired (role, principal, scope link)"""
+    desired = set()
+    problems = []
+    for spec in module.params["assignments"]:
+        principal = spec["principal"]
+        if spec["user"]:
+            principal = resolve_user(module, fusion, spec["user"])
+            if principal is None:
+                problems.append("user {0} does not exist".format(spec["user"]))
+        elif spec["api_client_key"]:
+            principal = resolve_api_client(module, fusion, spec["api_client_key"])
+            if principal is None:
+                problems.append(
+                    "API client with key {0} does not exist".format(
+                        spec["api_client_key"]
+                    )
+                )
+        if principal is not None:
+            desired.add((spec["role"], principal, get_scope(spec)))
+
+    if problems:
+        module.fail_json(
+            msg="Invalid role assignments: {0}".format("; ".join(problems))
+        )
+    return desired
+
+
+def list_current(module, fusion, roles):
+    """Returns current assignments of `roles` keyed by (role, principal, scope link)"""
+    ra_api_instance = purefusion.RoleAssignmentsApi(fusion)
+    results = run_concurrently(
+        fusion,
+        lambda role: ra_api_instance.list_role_assignments(role_name=role),
+        roles,
+        module.params["concurrency"],
+    )
+    current = {}
+    for result in results:
+        if not result.ok:
+            module.fail_json(
+                msg="Listing assignments of role '{0}' failed: {1}".format(
+                    result.item, result.error_message
+                )
+            )
+        for assignment in result.result:
+            key = (result.item, assignment.principal, assignment.scope.self_link)
+            current[key] = assignment.name
+    return current
+
+
+def create_assignment(fusion, role, principal, scope):
+    ra_api_instance = purefusion.RoleAssignmentsApi(fusion)
+    assignment = purefusion.RoleAssignmentPost(scope=scope, principal=principal)
+    op = ra_api_instance.create_role_assignment(assignment, role_name=role)
+    await_operation(fusion, op)
+
+
+def delete_assignment(fusion, role, assignment_name):
+    ra_api_instance = purefusion.RoleAssignmentsApi(fusion)
+    op = ra_api_instance.delete_role_assignment(
+        role_name=role, role_assignment_name=assignment_name
+    )
+    await_operation(fusion, op)
+
+
+def main():
+    """Main code"""
+    argument_spec = fusion_argument_spec()
+    argument_spec.update(
+        dict(
+            assignments=dict(
+                type="list",
+                elements="dict",
+                required=True,
+                options=dict(
+                    role=dict(type="str", required=True),
+                    user=dict(type="str"),
+                    api_client_key=dict(type="str", no_log=True),
+                    principal=dict(type="str"),
+                    scope=dict(
+                        type="str",
+                        default="organization",
+                        choices=["organization", "tenant", "tenant_space"],
+                    ),
+                    tenant=dict(type="str"),
+                    tenant_space=dict(type="str"),
+                ),
+                required_if=[
+                    ["scope", "tenant", ["tenant"]],
+                    ["scope", "tenant_space", ["tenant", "tenant_space"]],
+                ],
+                mutually_exclusive=[("user", "principal", "api_client_key")],
+                required_one_of=[("user", "principal", "api_client_key")],
+            ),
+            roles=dict(type="list", elements="str"),
+            purge=dict(type="bool", default=True),
+            concurrency=dict(type="int", default=DEFAULT_CONCURRENCY),
+        )
+    )
+
+    module = AnsibleModule(argument_spec, supports_check_mode=True)
+    fusion = setup_fusion(module)
+
+    desired = get_desired(module, fusion)
+    roles = list(module.params["roles"] or [])
+    for spec in module.params["assignments"]:
+        if spec["role"] not in roles:
+            roles.append(spec["role"])
+    current = list_current(module, fusion, roles)
+
+    additions = sorted(key for key in desired if key not in current)
+    removals = []
+    if module.params["purge"]:
+        removals = sorted(
+            key for key in current if key[0] in roles and key not in desired
+        )
+
+    errors = {}
+    if not module.check_mode:
+        changes = [("add", key) for key in additions] + [
+            ("remove", key) for key in removals
+        ]
+
+        def _apply(change):
+            action, key = change
+            if action == "add":
+                create_assignment(fusion, *key)
+            else:
+                delete_assignment(fusion, key[0], current[key])
+
+        results = run_concurrently(
+            fusion, _apply, changes, module.params["concurrency"]
+        )
+        errors = dict(
+            (result.item, result.error_message) for result in results if not result.ok
+        )
+
+    def _report(action, keys):
+        return [
+            {
+                "role": role,
+                "principal": principal,
+                "scope": scope,
+                "error": errors.get((action, (role, principal, scope))),
+            }
+            for role, principal, scope in keys
+        ]
+
+    added = _report("add", additions)
+    removed = _report("remove", removals)
+    total = len(additions) + len(removals)
+    changed = total - len(errors) != 0
+
+    if errors:
+        module.fail_json(
+            msg="{0} of {1} role assignment changes failed, first error: {2}".format(
+                len(errors), total, next(iter(errors.values()))
+            ),
+            changed=changed,
+            added=added,
+            removed=removed,
+        )
+    module.exit_json(changed=changed, added=added, removed=removed)
+
+
+if __name__ == "__main__":
+    main()
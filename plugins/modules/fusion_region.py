@@ -38,6 +38,7 @@ options:
     type: str
 extends_documentation_fragment:
 - purestorage.fusion.purestorage.fusion
+- purestorage.fusion.purestorage.optimistic_create
 """
 
 EXAMPLES = r"""
@@ -78,6 +79,8 @@ from ansible_collections.purestorage.fusion.plugins.module_utils.fusion import (
 
 from ansible_collections.purestorage.fusion.plugins.module_utils.operations import (
     await_operation,
+    create_optimistically,
+    should_create_optimistically,
 )
 from ansible_collections.purestorage.fusion.plugins.module_utils.startup import (
     setup_fusion,
@@ -155,6 +158,7 @@ def main():
             name=dict(type="str", required=True),
             display_name=dict(type="str"),
             state=dict(type="str", default="present", choices=["present", "absent"]),
+            optimistic_create=dict(type="bool", default=False),
         )
     )
 
@@ -162,6 +166,10 @@ def main():
     fusion = setup_fusion(module)
 
     state = module.params["state"]
+    if should_create_optimistically(module):
+        # exits the module unless the region already exists
+        create_optimistically(create_region, module, fusion)
+
     region = get_region(module, fusion)
 
     if not region and state == "present":
@@ -67,6 +67,7 @@ options:
     required: true
 extends_documentation_fragment:
 - purestorage.fusion.purestorage.fusion
+- purestorage.fusion.purestorage.optimistic_create
 """
 
 EXAMPLES = r"""
@@ -119,6 +120,8 @@ from ansible_collections.purestorage.fusion.plugins.module_utils.startup import
 )
 from ansible_collections.purestorage.fusion.plugins.module_utils.operations import (
     await_operation,
+    create_optimistically,
+    should_create_optimistically,
 )
 
 
@@ -230,6 +233,7 @@ def main():
             size_limit=dict(type="str"),
             storage_service=dict(type="str", required=True),
             state=dict(type="str", default="present", choices=["present", "absent"]),
+            optimistic_create=dict(type="bool", default=False),
         )
     )
 
@@ -237,6 +241,10 @@ def main():
     fusion = setup_fusion(module)
 
     state = module.params["state"]
+    if should_create_optimistically(module):
+        # exits the module unless the storage class already exists
+        create_optimistically(create_sc, module, fusion)
+
     s_class = get_sc(module, fusion)
 
     if not s_class and state == "present":
@@ -0,0 +1,354 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# (c) 2023, Pure Storage, Inc.
+# GNU General Public License v3.0+ (see COPYING.GPLv3 or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+DOCUMENTATION = r"""
+---
+module: fusion_scs
+version_added: '1.6.0'
+short_description: Manage the catalog of storage classes of a storage service in Pure Storage Fusion
+description:
+- Create, update or delete many storage classes of a storage service at once.
+- Existing storage classes of the storage service are listed once, all storage classes
+  are validated together and the differences are then applied concurrently.
+author:
+- Pure Storage Ansible Team (@sdodsley) <pure-ansible-team@purestorage.com>
+notes:
+- Supports C(check mode).
+- It is not currently possible to update bw_limit, iops_limit or size_limit after
+  a storage class has been created, existing storage classes whose limits differ
+  from I(storage_classes) are reported as invalid.
+options:
+  storage_service:
+    description:
+    - Storage service to which the storage classes belong.
+    type: str
+    required: true
+  storage_classes:
+    description:
+    - Storage classes to create, update or delete.
+    type: list
+    elements: dict
+    required: true
+    suboptions:
+      name:
+        description:
+        - The name of the storage class.
+        type: str
+        required: true
+      display_name:
+        description:
+        - The human name of the storage class.
+        - If not provided, defaults to I(name) for new storage classes.
+        type: str
+      size_limit:
+        description:
+        - Volume size limit in M, G, T or P units.
+        - Must be between 1MB and 4PB.
+        - If not provided at creation, this will default to 4PB.
+        type: str
+      bw_limit:
+        description:
+        - The bandwidth limit in M or G units.
+          M will set MB/s.
+          G will set GB/s.
+        - Must be between 1MB/s and 512GB/s.
+        - If not provided at creation, this will default to 512GB/s.
+        type: str
+      iops_limit:
+        description:
+        - The IOPs limit - use value or K or M.
+          K will mean 1000.
+          M will mean 1000000.
+        - Must be between 100 and 100000000.
+        - If not provided at creation, this will default to 100000000.
+        type: str
+  state:
+    description:
+    - Define whether the storage classes should exist or not.
+    default: present
+    choices: [ present, absent ]
+    type: str
+  purge:
+    description:
+    - Delete all other storage classes of the storage service.
+    - Only used if I(state=present).
+    type: bool
+    default: false
+extends_documentation_fragment:
+- purestorage.fusion.purestorage.fusion
+- purestorage.fusion.purestorage.concurrency
+"""
+
+EXAMPLES = r"""
+- name: Make storage classes of service1 match the catalog
+  purestorage.fusion.fusion_scs:
+    storage_service: service1
+    storage_classes:
+      - name: gold
+        display_name: "Gold class"
+        size_limit: 4P
+        iops_limit: 100K
+        bw_limit: 1G
+      - name: silver
+        size_limit: 100T
+        iops_limit: 10K
+        bw_limit: 250M
+    purge: true
+    issuer_id: key_name
+    private_key_file: "az-admin-private-key.pem"
+
+- name: Delete storage classes
+  purestorage.fusion.fusion_scs:
+    storage_service: service1
+    storage_classes:
+      - name: gold
+      - name: silver
+    state: absent
+    issuer_id: key_name
+    private_key_file: "az-admin-private-key.pem"
+"""
+
+RETURN = r"""
+storage_classes:
+  description: Result for every created, updated or deleted storage class.
+  returned: always
+  type: list
+  elements: dict
+  contains:
+    name:
+      description: The name of the storage class.
+      type: str
+    action:
+      description: C(create), C(update) or C(delete).
+      type: str
+    error:
+      description: Error message if the action failed, null otherwise.
+      type: str
+"""
+
+try:
+    import fusion as purefusion
+except ImportError:
+    pass
+
+from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.purestorage.fusion.plugins.module_utils.fusion import (
+    fusion_argument_spec,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.operations import (
+    await_operation,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.parallel import (
+    DEFAULT_CONCURRENCY,
+    run_concurrently,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.parsing import (
+    parse_number_with_metric_suffix,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.startup import (
+    setup_fusion,
+)
+
+# option -> (storage class attribute, default, parsing factor, minimum, maximum)
+LIMITS = {
+    "size_limit": ("size_limit", "4P", 1024, 1048576, 4503599627370496),
+    "iops_limit": ("iops_limit", "100000000", 1000, 100, 100_000_000),
+    "bw_limit": ("bandwidth_limit", "512G", 1024, 1048576, 549755813888),
+}
+
+
+def parse_limits(module, spec):
+    """Returns limits of the storage class (defaults for the missing ones)
+    and the names of limits given explicitly, or problems if any limit is invalid
+    """
+    limits = {}
+    explicit = []
+    problems = []
+    for option, (attribute, default, factor, minimum, maximum) in LIMITS.items():
+        if spec[option]:
+            explicit.append(option)
+        value = parse_number_with_metric_suffix(
+            module, spec[option] or default, factor=factor
+        )
+        if value < minimum or value > maximum:
+            problems.append(
+                "{0} of '{1}' is not within the required range".format(
+                    option, spec["name"]
+                )
+            )
+        limits[attribute] = value
+    return limits, explicit, problems
+
+
+def plan_present(module, existing):
+    """Returns (classes to create, classes to update, names to delete),
+    fails on invalid storage classes
+    """
+    specs = module.params["storage_classes"]
+    problems = []
+    seen_names = set()
+    to_create = []
+    to_update = []
+    for spec in specs:
+        name = spec["name"]
+        if name in seen_names:
+            problems.append("'{0}' is specified more than once".format(name))
+            continue
+        seen_names.add(name)
+        limits, explicit, limit_problems = parse_limits(module, spec)
+        if limit_problems:
+            problems.extend(limit_problems)
+            continue
+
+        s_class = existing.get(name)
+        if s_class is None:
+            to_create.append((spec, limits))
+            continue
+        for option in explicit:
+            attribute = LIMITS[option][0]
+            if getattr(s_class, attribute) != limits[attribute]:
+                problems.append(
+                    "{0} of '{1}' cannot be changed from {2} to {3}".format(
+                        option, name, getattr(s_class, attribute), limits[attribute]
+                    )
+                )
+        if spec["display_name"] and spec["display_name"] != s_class.display_name:
+            to_update.append(spec)
+
+    if problems:
+        module.fail_json(msg="Invalid storage classes: {0}".format("; ".join(problems)))
+
+    to_delete = []
+    if module.params["purge"]:
+        to_delete = sorted(name for name in existing if name not in seen_names)
+    return to_create, to_update, to_delete
+
+
+def create_sc(module, fusion, spec, limits):
+    sc_api_instance = purefusion.StorageClassesApi(fusion)
+    s_class = purefusion.StorageClassPost(
+        name=spec["name"], display_name=spec["display_name"] or spec["name"], **limits
+    )
+    op = sc_api_instance.create_storage_class(
+        s_class, storage_service_name=module.params["storage_service"]
+    )
+    await_operation(fusion, op)
+
+
+def update_sc(module, fusion, spec):
+    sc_api_instance = purefusion.StorageClassesApi(fusion)
+    patch = purefusion.StorageClassPatch(
+        display_name=purefusion.NullableString(spec["display_name"])
+    )
+    op = sc_api_instance.update_storage_class(
+        patch,
+        storage_service_name=module.params["storage_service"],
+        storage_class_name=spec["name"],
+    )
+    await_operation(fusion, op)
+
+
+def delete_sc(module, fusion, name):
+    sc_api_instance = purefusion.StorageClassesApi(fusion)
+    op = sc_api_instance.delete_storage_class(
+        storage_class_name=name,
+        storage_service_name=module.params["storage_service"],
+    )
+    await_operation(fusion, op)
+
+
+def main():
+    """Main code"""
+    argument_spec = fusion_argument_spec()
+    argument_spec.update(
+        dict(
+            storage_service=dict(type="str", required=True),
+            storage_classes=dict(
+                type="list",
+                elements="dict",
+                required=True,
+                options=dict(
+                    name=dict(type="str", required=True),
+                    display_name=dict(type="str"),
+                    size_limit=dict(type="str"),
+                    bw_limit=dict(type="str"),
+                    iops_limit=dict(type="str"),
+                ),
+            ),
+            state=dict(type="str", default="present", choices=["present", "absent"]),
+            purge=dict(type="bool", default=False),
+            concurrency=dict(type="int", default=DEFAULT_CONCURRENCY),
+        )
+    )
+
+    module = AnsibleModule(argument_spec, supports_check_mode=True)
+    fusion = setup_fusion(module)
+
+    sc_api_instance = purefusion.StorageClassesApi(fusion)
+    existing = dict(
+        (s_class.name, s_class)
+        for s_class in sc_api_instance.list_storage_classes(
+            storage_service_name=module.params["storage_service"]
+        ).items
+    )
+
+    if module.params["state"] == "present":
+        to_create, to_update, to_delete = plan_present(module, existing)
+    else:
+        to_create = []
+        to_update = []
+        to_delete = []
+        for spec in module.params["storage_classes"]:
+            if spec["name"] in existing and spec["name"] not in to_delete:
+                to_delete.append(spec["name"])
+
+    changes = (
+        [("create", spec["name"], (spec, limits)) for spec, limits in to_create]
+        + [("update", spec["name"], spec) for spec in to_update]
+        + [("delete", name, name) for name in to_delete]
+    )
+
+    errors = {}
+    if not module.check_mode and changes:
+
+        def _apply(change):
+            action, _name, arg = change
+            if action == "create":
+                create_sc(module, fusion, *arg)
+            elif action == "update":
+                update_sc(module, fusion, arg)
+            else:
+                delete_sc(module, fusion, arg)
+
+        for result in run_concurrently(
+            fusion, _apply, changes, module.params["concurrency"]
+        ):
+            if not result.ok:
+                errors[result.item[:2]] = result.error_message
+
+    report = [
+        {"name": name, "action": action, "error": errors.get((action, name))}
+        for action, name, _arg in changes
+    ]
+    changed = len(report) - len(errors) != 0
+
+    if errors:
+        module.fail_json(
+            msg="{0} of {1} storage class changes failed, first error: {2}".format(
+                len(errors), len(report), next(iter(errors.values()))
+            ),
+            changed=changed,
+            storage_classes=report,
+        )
+    module.exit_json(changed=changed, storage_classes=report)
+
+
+if __name__ == "__main__":
+    main()
@@ -114,6 +114,7 @@ options:
 
 extends_documentation_fragment:
 - purestorage.fusion.purestorage.fusion
+- purestorage.fusion.purestorage.optimistic_create
 """
 
 EXAMPLES = r"""
@@ -198,6 +199,8 @@ from ansible_collections.purestorage.fusion.plugins.module_utils.startup import
 )
 from ansible_collections.purestorage.fusion.plugins.module_utils.operations import (
     await_operation,
+    create_optimistically,
+    should_create_optimistically,
 )
 
 
@@ -266,6 +269,13 @@ def get_se(module, fusion):
         return None
 
 
+def fail_on_missing_endpoint(module):
+    if module.params["iscsi"] is None and module.params["cbs_azure_iscsi"] is None:
+        module.fail_json(
+            msg="either 'iscsi' or `cbs_azure_iscsi` parameter is required when creating storage endpoint"
+        )
+
+
 def create_se(module, fusion):
     """Create Storage Endpoint"""
     se_api_instance = purefusion.StorageEndpointsApi(fusion)
@@ -381,6 +391,7 @@ def main():
                 ),
             ),
             state=dict(type="str", default="present", choices=["absent", "present"]),
+            optimistic_create=dict(type="bool", default=False),
             # deprecated, will be removed in 2.0.0
             endpoint_type=dict(
                 type="str",
@@ -484,16 +495,15 @@ def main():
                         msg=f"'{address}' is not a valid IPv4 address notation"
                     )
 
+        if should_create_optimistically(module):
+            fail_on_missing_endpoint(module)
+            # exits the module unless the storage endpoint already exists
+            create_optimistically(create_se, module, fusion)
+
         sendp = get_se(module, fusion)
 
         if state == "present" and not sendp:
-            if (
-                module.params["iscsi"] is None
-                and module.params["cbs_azure_iscsi"] is None
-            ):
-                module.fail_json(
-                    msg="either 'iscsi' or `cbs_azure_iscsi` parameter is required when creating storage endpoint"
-                )
+            fail_on_missing_endpoint(module)
             create_se(module, fusion)
         elif state == "present" and sendp:
             update_se(module, fusion, sendp)
@@ -44,6 +44,7 @@ options:
     choices: [ flash-array-x, flash-array-c, flash-array-x-optane, flash-array-xl ]
 extends_documentation_fragment:
 - purestorage.fusion.purestorage.fusion
+- purestorage.fusion.purestorage.optimistic_create
 """
 
 EXAMPLES = r"""
@@ -92,6 +93,8 @@ from ansible_collections.purestorage.fusion.plugins.module_utils.startup import
 from ansible_collections.purestorage.fusion.plugins.module_utils import getters
 from ansible_collections.purestorage.fusion.plugins.module_utils.operations import (
     await_operation,
+    create_optimistically,
+    should_create_optimistically,
 )
 
 
@@ -182,6 +185,7 @@ def main():
                 ],
             ),
             state=dict(type="str", default="present", choices=["present", "absent"]),
+            optimistic_create=dict(type="bool", default=False),
         )
     )
 
@@ -189,6 +193,11 @@ def main():
     fusion = setup_fusion(module)
 
     state = module.params["state"]
+    if should_create_optimistically(module):
+        module.fail_on_missing_params(["hardware_types"])
+        # exits the module unless the storage service already exists
+        create_optimistically(create_ss, module, fusion)
+
     s_service = get_ss(module, fusion)
 
     if not s_service and state == "present":
@@ -0,0 +1,1394 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# (c) 2023, Pure Storage, Inc.
+# GNU General Public License v3.0+ (see COPYING.GPLv3 or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+DOCUMENTATION = r"""
+---
+module: fusion_state
+version_added: '1.6.0'
+short_description: Reconcile a whole Pure Storage Fusion topology in one task
+description:
+- Bring regions, availability zones, network interface groups, storage endpoints,
+  arrays, storage services, storage classes, protection policies, tenants,
+  tenant spaces, placement groups, host access policies and volumes
+  to the state described by a single document.
+- All existing resources the document refers to are listed at once,
+  every listing in its own request running concurrently.
+- A minimal plan of creations and updates is computed in memory and applied
+  as a dependency graph, for example a tenant space is created only after
+  its tenant. Independent changes are applied concurrently.
+- Resources which are not in the document are never changed or deleted.
+author:
+- Pure Storage Ansible Team (@sdodsley) <pure-ansible-team@purestorage.com>
+notes:
+- Supports C(check mode), the plan is returned without applying it.
+- Only display names of existing resources are updated, with the exception
+  of volumes whose size and host access policies are updated as well.
+  Protection policies and host access policies cannot be updated.
+- Use the single-resource modules to delete resources.
+options:
+  regions:
+    description:
+    - Regions.
+    type: list
+    elements: dict
+    default: []
+    suboptions:
+      name:
+        description:
+        - The name of the region.
+        type: str
+        required: true
+      display_name:
+        description:
+        - The human name of the region.
+        - If not provided, defaults to I(name) on creation.
+        type: str
+  availability_zones:
+    description:
+    - Availability zones.
+    type: list
+    elements: dict
+    default: []
+    suboptions:
+      name:
+        description:
+        - The name of the availability zone.
+        type: str
+        required: true
+      region:
+        description:
+        - The region the availability zone is in.
+        type: str
+        required: true
+      display_name:
+        description:
+        - The human name of the availability zone.
+        - If not provided, defaults to I(name) on creation.
+        type: str
+  network_interface_groups:
+    description:
+    - Network interface groups.
+    type: list
+    elements: dict
+    default: []
+    suboptions:
+      name:
+        description:
+        - The name of the network interface group.
+        type: str
+        required: true
+      region:
+        description:
+        - The region the availability zone is in.
+        type: str
+        required: true
+      availability_zone:
+        description:
+        - The availability zone the network interface group is in.
+        type: str
+        required: true
+        aliases: [ az ]
+      display_name:
+        description:
+        - The human name of the network interface group.
+        - If not provided, defaults to I(name) on creation.
+        type: str
+      group_type:
+        description:
+        - The type of the network interface group.
+        type: str
+        default: eth
+        choices: [ eth ]
+      prefix:
+        description:
+        - Network prefix in CIDR notation.
+        - Required when creating the network interface group.
+        type: str
+      gateway:
+        description:
+        - Address of the subnet gateway, must be an address in I(prefix).
+        type: str
+      mtu:
+        description:
+        - MTU setting for the subnet.
+        type: int
+        default: 1500
+  storage_endpoints:
+    description:
+    - Storage endpoints of the C(iscsi) type.
+    type: list
+    elements: dict
+    default: []
+    suboptions:
+      name:
+        description:
+        - The name of the storage endpoint.
+        type: str
+        required: true
+      region:
+        description:
+        - The region the availability zone is in.
+        type: str
+        required: true
+      availability_zone:
+        description:
+        - The availability zone the storage endpoint is in.
+        type: str
+        required: true
+        aliases: [ az ]
+      display_name:
+        description:
+        - The human name of the storage endpoint.
+        - If not provided, defaults to I(name) on creation.
+        type: str
+      iscsi:
+        description:
+        - List of discovery interfaces.
+        - Required when creating the storage endpoint.
+        type: list
+        elements: dict
+        suboptions:
+          address:
+            description:
+            - IP address to be used in the subnet of the storage endpoint.
+            - IP address must include a CIDR notation.
+            type: str
+            required: true
+          gateway:
+            description:
+            - Address of the subnet gateway.
+            type: str
+          network_interface_groups:
+            description:
+            - List of network interface groups to assign to the address.
+            type: list
+            elements: str
+  arrays:
+    description:
+    - Arrays.
+    type: list
+    elements: dict
+    default: []
+    suboptions:
+      name:
+        description:
+        - The name of the array.
+        type: str
+        required: true
+      region:
+        description:
+        - The region the availability zone is in.
+        type: str
+        required: true
+      availability_zone:
+        description:
+        - The availability zone the array is located in.
+        type: str
+        required: true
+        aliases: [ az ]
+      display_name:
+        description:
+        - The human name of the array.
+        - If not provided, defaults to I(name) on creation.
+        type: str
+      hardware_type:
+        description:
+        - Hardware type to which the array belongs.
+        - Required when creating the array.
+        type: str
+        choices: [ flash-array-x, flash-array-c, flash-array-x-optane, flash-array-xl ]
+      appliance_id:
+        description:
+        - Appliance ID of the array.
+        - Required when creating the array.
+        type: str
+      host_name:
+        description:
+        - Management IP address of the array, or FQDN.
+        - Required when creating the array.
+        type: str
+      apartment_id:
+        description:
+        - The Apartment ID of the array.
+        type: str
+  storage_services:
+    description:
+    - Storage services.
+    type: list
+    elements: dict
+    default: []
+    suboptions:
+      name:
+        description:
+        - The name of the storage service.
+        type: str
+        required: true
+      display_name:
+        description:
+        - The human name of the storage service.
+        - If not provided, defaults to I(name) on creation.
+        type: str
+      hardware_types:
+        description:
+        - Hardware types to which the storage service applies.
+        - Required when creating the storage service.
+        type: list
+        elements: str
+        choices: [ flash-array-x, flash-array-c, flash-array-x-optane, flash-array-xl ]
+  storage_classes:
+    description:
+    - Storage classes.
+    type: list
+    elements: dict
+    default: []
+    suboptions:
+      name:
+        description:
+        - The name of the storage class.
+        type: str
+        required: true
+      storage_service:
+        description:
+        - Storage service to which the storage class belongs.
+        type: str
+        required: true
+      display_name:
+        description:
+        - The human name of the storage class.
+        - If not provided, defaults to I(name) on creation.
+        type: str
+      size_limit:
+        description:
+        - Volume size limit in M, G, T or P units, defaults to C(4P) on creation.
+        type: str
+      iops_limit:
+        description:
+        - The IOPs limit - use value or K or M, defaults to C(100M) on creation.
+        type: str
+      bw_limit:
+        description:
+        - The bandwidth limit in M or G units, defaults to C(512G) on creation.
+        type: str
+  protection_policies:
+    description:
+    - Protection policies.
+    type: list
+    elements: dict
+    default: []
+    suboptions:
+      name:
+        description:
+        - The name of the protection policy.
+        type: str
+        required: true
+      display_name:
+        description:
+        - The human name of the protection policy.
+        - If not provided, defaults to I(name) on creation.
+        type: str
+      local_rpo:
+        description:
+        - Recovery Point Objective for snapshots, minimum value is 10 minutes.
+        - Required when creating the protection policy.
+        type: str
+      local_retention:
+        description:
+        - Retention Duration for periodic snapshots, minimum value is 1 minute.
+        - Required when creating the protection policy.
+        type: str
+  tenants:
+    description:
+    - Tenants.
+    type: list
+    elements: dict
+    default: []
+    suboptions:
+      name:
+        description:
+        - The name of the tenant.
+        type: str
+        required: true
+      display_name:
+        description:
+        - The human name of the tenant.
+        - If not provided, defaults to I(name) on creation.
+        type: str
+  tenant_spaces:
+    description:
+    - Tenant spaces.
+    type: list
+    elements: dict
+    default: []
+    suboptions:
+      name:
+        description:
+        - The name of the tenant space.
+        type: str
+        required: true
+      tenant:
+        description:
+        - The name of the tenant.
+        type: str
+        required: true
+      display_name:
+        description:
+        - The human name of the tenant space.
+        - If not provided, defaults to I(name) on creation.
+        type: str
+  placement_groups:
+    description:
+    - Placement groups.
+    type: list
+    elements: dict
+    default: []
+    suboptions:
+      name:
+        description:
+        - The name of the placement group.
+        type: str
+        required: true
+      tenant:
+        description:
+        - The name of the tenant.
+        type: str
+        required: true
+      tenant_space:
+        description:
+        - The name of the tenant space.
+        type: str
+        required: true
+      display_name:
+        description:
+        - The human name of the placement group.
+        - If not provided, defaults to I(name) on creation.
+        type: str
+      region:
+        description:
+        - The name of the region the availability zone is in.
+        - Required when creating the placement group.
+        type: str
+      availability_zone:
+        description:
+        - The name of the availability zone the placement group is in.
+        - Required when creating the placement group.
+        type: str
+        aliases: [ az ]
+      storage_service:
+        description:
+        - The name of the storage service to create the placement group for.
+        - Required when creating the placement group.
+        type: str
+  host_access_policies:
+    description:
+    - Host access policies.
+    type: list
+    elements: dict
+    default: []
+    suboptions:
+      name:
+        description:
+        - The name of the host access policy.
+        type: str
+        required: true
+      display_name:
+        description:
+        - The human name of the host access policy.
+        - If not provided, defaults to I(name) on creation.
+        type: str
+      iqn:
+        description:
+        - IQN for the host access policy.
+        - Required when creating the host access policy.
+        type: str
+      personality:
+        description:
+        - Define which operating system the host is.
+        type: str
+        default: linux
+        choices: ['linux', 'windows', 'hpux', 'vms', 'aix', 'esxi', 'solaris', 'hitachi-vsp', 'oracle-vm-server']
+  volumes:
+    description:
+    - Volumes.
+    type: list
+    elements: dict
+    default: []
+    suboptions:
+      name:
+        description:
+        - The name of the volume.
+        type: str
+        required: true
+      tenant:
+        description:
+        - The name of the tenant.
+        type: str
+        required: true
+      tenant_space:
+        description:
+        - The name of the tenant space.
+        type: str
+        required: true
+      display_name:
+        description:
+        - The human name of the volume.
+        - If not provided, defaults to I(name) on creation.
+        type: str
+      size:
+        description:
+        - Volume size in M, G, T or P units.
+        - Required when creating the volume.
+        type: str
+      storage_class:
+        description:
+        - The name of the storage class.
+        - Required when creating the volume.
+        type: str
+      placement_group:
+        description:
+        - The name of the placement group.
+        - Required when creating the volume.
+        type: str
+      protection_policy:
+        description:
+        - The name of the protection policy, used only when creating the volume.
+        type: str
+      host_access_policies:
+        description:
+        - Host access policies to connect the volume to.
+        - To clear, assign empty list.
+        type: list
+        elements: str
+extends_documentation_fragment:
+- purestorage.fusion.purestorage.fusion
+- purestorage.fusion.purestorage.concurrency
+"""
+
+EXAMPLES = r"""
+- name: Set up infrastructure and a workload
+  purestorage.fusion.fusion_state:
+    regions:
+      - name: region1
+    availability_zones:
+      - name: az1
+        region: region1
+    network_interface_groups:
+      - name: interface_group1
+        region: region1
+        availability_zone: az1
+        prefix: 172.17.1.0/24
+        gateway: 172.17.1.1
+    storage_endpoints:
+      - name: default
+        region: region1
+        availability_zone: az1
+        iscsi:
+          - address: 172.17.1.2/24
+            gateway: 172.17.1.1
+            network_interface_groups: [ interface_group1 ]
+    arrays:
+      - name: flasharray1
+        region: region1
+        availability_zone: az1
+        hardware_type: flash-array-x
+        appliance_id: 1187351-242133817-5976825671211737520
+        host_name: flasharray1
+    storage_services:
+      - name: db_high_performance
+        hardware_types: [ flash-array-x ]
+    storage_classes:
+      - name: db_high_performance
+        storage_service: db_high_performance
+        size_limit: 4T
+    tenants:
+      - name: db_tenant
+    tenant_spaces:
+      - name: oracle
+        tenant: db_tenant
+    placement_groups:
+      - name: pg1
+        tenant: db_tenant
+        tenant_space: oracle
+        region: region1
+        availability_zone: az1
+        storage_service: db_high_performance
+    host_access_policies:
+      - name: host1
+        iqn: iqn.2005-03.com.RedHat:linux-host1
+    volumes:
+      - name: data
+        tenant: db_tenant
+        tenant_space: oracle
+        storage_class: db_high_performance
+        placement_group: pg1
+        size: 1T
+        host_access_policies: [ host1 ]
+    issuer_id: key_name
+    private_key_file: "az-admin-private-key.pem"
+"""
+
+RETURN = r"""
+plan:
+  description:
+  - Changes needed to reach the described state, in the order of application levels.
+  - In check mode the changes are only planned.
+  returned: always
+  type: list
+  elements: dict
+  contains:
+    resource:
+      description: Path of the resource, for example C(tenant_space/db_tenant/oracle).
+      type: str
+    action:
+      description: Either C(create) or C(update).
+      type: str
+    changes:
+      description: Names of the changed fields of updated resources.
+      type: list
+      elements: str
+    depends_on:
+      description: Resources from the plan which are changed before this one.
+      type: list
+      elements: str
+    error:
+      description: Error message if the change failed or was skipped, null otherwise.
+      type: str
+"""
+
+from functools import partial
+from http import HTTPStatus
+
+try:
+    import fusion as purefusion
+except ImportError:
+    pass
+
+from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.purestorage.fusion.plugins.module_utils.fusion import (
+    fusion_argument_spec,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.getters import (
+    list_all,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.haps import (
+    PERSONALITIES,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.networking import (
+    is_address_in_network,
+    is_valid_network,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.operations import (
+    await_operation,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.parallel import (
+    DEFAULT_CONCURRENCY,
+    get_levels,
+    run_concurrently,
+    run_graph,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.parsing import (
+    parse_minutes,
+    parse_number_with_metric_suffix,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.startup import (
+    setup_fusion,
+)
+
+HARDWARE_TYPES = [
+    "flash-array-x",
+    "flash-array-c",
+    "flash-array-x-optane",
+    "flash-array-xl",
+]
+
+
+class ResourceKind:
+    """
+    Describes resources of one kind: `option` of the module listing them,
+    names of the parents locating them and how to create and update them.
+    Names of API classes, methods and their arguments are derived from `name`.
+    Only `paginated` kinds are listed page by page, list methods of the other
+    kinds do not accept `offset` and return all resources at once.
+    """
+
+    def __init__(
+        self,
+        name,
+        option,
+        api,
+        parents=(),
+        paginated=False,
+        required=(),
+        build_post=None,
+        references=None,
+        updatable=True,
+        extra_patches=None,
+    ):
+        self.name = name
+        self.option = option
+        self.api = api
+        self.parents = parents
+        self.paginated = paginated
+        self.required = required
+        self.build_post = build_post
+        self.references = references or (lambda spec: [])
+        self.updatable = updatable
+        self.extra_patches = extra_patches or (lambda module, spec, current: [])
+
+    def location(self, spec):
+        """API arguments locating the resource"""
+        return dict((parent + "_name", spec[parent]) for parent in self.parents)
+
+    def key(self, spec):
+        return "/".join([self.name] + [spec[parent] for parent in self.parents])
+
+    def resource(self, spec):
+        return self.key(spec) + "/" + spec["name"]
+
+    def parent_resource(self, spec):
+        """Resource of the closest parent or None"""
+        if not self.parents:
+            return None
+        return "/".join([self.parents[-1]] + [spec[parent] for parent in self.parents])
+
+    def list_existing(self, fusion, spec):
+        api_instance = getattr(purefusion, self.api)(fusion)
+        list_method = getattr(api_instance, "list_" + self.option)
+        if self.paginated:
+            return list_all(list_method, **self.location(spec))
+        return list_method(**self.location(spec)).items
+
+    def create(self, fusion, spec, post):
+        api_instance = getattr(purefusion, self.api)(fusion)
+        op = getattr(api_instance, "create_" + self.name)(post, **self.location(spec))
+        await_operation(fusion, op)
+
+    def update(self, fusion, spec, patch):
+        api_instance = getattr(purefusion, self.api)(fusion)
+        kwargs = self.location(spec)
+        kwargs[self.name + "_name"] = spec["name"]
+        op = getattr(api_instance, "update_" + self.name)(patch, **kwargs)
+        await_operation(fusion, op)
+
+    def display_name_patch(self, display_name):
+        patch_model = "".join(word.capitalize() for word in self.name.split("_"))
+        return getattr(purefusion, patch_model + "Patch")(
+            display_name=purefusion.NullableString(display_name)
+        )
+
+
+def _display_name(spec):
+    return spec["display_name"] or spec["name"]
+
+
+def _region_post(module, spec):
+    return purefusion.RegionPost(name=spec["name"], display_name=_display_name(spec))
+
+
+def _az_post(module, spec):
+    return purefusion.AvailabilityZonePost(
+        name=spec["name"], display_name=_display_name(spec)
+    )
+
+
+def _nig_post(module, spec):
+    if not is_valid_network(spec["prefix"]):
+        module.fail_json(
+            msg="`prefix` '{0}' of network interface group '{1}' is not a valid address in CIDR notation".format(
+                spec["prefix"], spec["name"]
+            )
+        )
+    if spec["gateway"] and not is_address_in_network(spec["gateway"], spec["prefix"]):
+        module.fail_json(
+            msg="`gateway` of network interface group '{0}' must be an address in subnet `prefix`".format(
+                spec["name"]
+            )
+        )
+    return purefusion.NetworkInterfaceGroupPost(
+        group_type=spec["group_type"],
+        eth=purefusion.NetworkInterfaceGroupEthPost(
+            prefix=spec["prefix"], gateway=spec["gateway"], mtu=spec["mtu"]
+        ),
+        name=spec["name"],
+        display_name=_display_name(spec),
+    )
+
+
+def _se_post(module, spec):
+    return purefusion.StorageEndpointPost(
+        endpoint_type="iscsi",
+        iscsi=purefusion.StorageEndpointIscsiPost(
+            discovery_interfaces=[
+                purefusion.StorageEndpointIscsiDiscoveryInterfacePost(**iface)
+                for iface in spec["iscsi"]
+            ]
+        ),
+        name=spec["name"],
+        display_name=_display_name(spec),
+    )
+
+
+def _se_references(spec):
+    return [
+        ("network_interface_group", nig)
+        for iface in spec["iscsi"] or []
+        for nig in iface["network_interface_groups"] or []
+    ]
+
+
+def _array_post(module, spec):
+    return purefusion.ArrayPost(
+        hardware_type=spec["hardware_type"],
+        display_name=_display_name(spec),
+        host_name=spec["host_name"],
+        name=spec["name"],
+        appliance_id=spec["appliance_id"],
+        apartment_id=spec["apartment_id"],
+    )
+
+
+def _ss_post(module, spec):
+    return purefusion.StorageServicePost(
+        name=spec["name"],
+        display_name=_display_name(spec),
+        hardware_types=spec["hardware_types"],
+    )
+
+
+def _sc_post(module, spec):
+    # same defaults and ranges as in fusion_sc
+    size_limit = parse_number_with_metric_suffix(module, spec["size_limit"] or "4P")
+    iops_limit = int(
+        parse_number_with_metric_suffix(
+            module, spec["iops_limit"] or "100000000", factor=1000
+        )
+    )
+    bw_limit = parse_number_with_metric_suffix(module, spec["bw_limit"] or "512G")
+    if bw_limit < 1048576 or bw_limit > 549755813888:  # 1MB/s to 512GB/s
+        module.fail_json(
+            msg="Bandwidth limit of storage class '{0}' is not within the required range".format(
+                spec["name"]
+            )
+        )
+    if iops_limit < 100 or iops_limit > 100_000_000:
+        module.fail_json(
+            msg="IOPs limit of storage class '{0}' is not within the required range".format(
+                spec["name"]
+            )
+        )
+    if size_limit < 1048576 or size_limit > 4503599627370496:  # 1MB to 4PB
+        module.fail_json(
+            msg="Size limit of storage class '{0}' is not within the required range".format(
+                spec["name"]
+            )
+        )
+    return purefusion.StorageClassPost(
+        name=spec["name"],
+        size_limit=size_limit,
+        iops_limit=iops_limit,
+        bandwidth_limit=bw_limit,
+        display_name=_display_name(spec),
+    )
+
+
+def _pp_post(module, spec):
+    local_rpo = parse_minutes(module, spec["local_rpo"])
+    local_retention = parse_minutes(module, spec["local_retention"])
+    if local_retention < 1:
+        module.fail_json(
+            msg="Local Retention of protection policy '{0}' must be a minimum of 1 minutes".format(
+                spec["name"]
+            )
+        )
+    if local_rpo < 10:
+        module.fail_json(
+            msg="Local RPO of protection policy '{0}' must be a minimum of 10 minutes".format(
+                spec["name"]
+            )
+        )
+    return purefusion.ProtectionPolicyPost(
+        name=spec["name"],
+        display_name=_display_name(spec),
+        objectives=[
+            purefusion.RPO(type="RPO", rpo="PT" + str(local_rpo) + "M"),
+            purefusion.Retention(
+                type="Retention", after="PT" + str(local_retention) + "M"
+            ),
+        ],
+    )
+
+
+def _tenant_post(module, spec):
+    return purefusion.TenantPost(name=spec["name"], display_name=_display_name(spec))
+
+
+def _ts_post(module, spec):
+    return purefusion.TenantSpacePost(
+        name=spec["name"], display_name=_display_name(spec)
+    )
+
+
+def _pg_post(module, spec):
+    return purefusion.PlacementGroupPost(
+        availability_zone=spec["availability_zone"],
+        name=spec["name"],
+        display_name=_display_name(spec),
+        region=spec["region"],
+        storage_service=spec["storage_service"],
+    )
+
+
+def _pg_references(spec):
+    return [
+        ("availability_zone", spec["availability_zone"]),
+        ("storage_service", spec["storage_service"]),
+    ]
+
+
+def _hap_post(module, spec):
+    return purefusion.HostAccessPoliciesPost(
+        iqn=spec["iqn"],
+        personality=spec["personality"],
+        name=spec["name"],
+        display_name=_display_name(spec),
+    )
+
+
+def _volume_size(module, spec):
+    size = parse_number_with_metric_suffix(module, spec["size"])
+    if size < 1048576 or size > 4503599627370496:  # 1MB to 4PB
+        module.fail_json(
+            msg="Size of volume '{0}' is not within the required range, size must be between 1MB and 4PB".format(
+                spec["name"]
+            )
+        )
+    return size
+
+
+def _volume_post(module, spec):
+    return purefusion.VolumePost(
+        size=_volume_size(module, spec),
+        storage_class=spec["storage_class"],
+        placement_group=spec["placement_group"],
+        name=spec["name"],
+        display_name=_display_name(spec),
+        protection_policy=spec["protection_policy"],
+    )
+
+
+def _volume_references(spec):
+    references = [
+        ("storage_class", spec["storage_class"]),
+        ("placement_group", spec["placement_group"]),
+        ("protection_policy", spec["protection_policy"]),
+    ]
+    references.extend(
+        ("host_access_policy", hap) for hap in spec["host_access_policies"] or []
+    )
+    return references
+
+
+def _volume_patches(module, spec, current):
+    patches = []
+    if spec["size"] is not None and current is not None:
+        size = _volume_size(module, spec)
+        if size != current.size:
+            patches.append(
+                ("size", purefusion.VolumePatch(size=purefusion.NullableSize(size)))
+            )
+    # host access policies cannot be set on creation
+    if spec["host_access_policies"] is not None:
+        wanted = sorted(set(hap.strip() for hap in spec["host_access_policies"]))
+        current_haps = sorted(
+            hap.name for hap in (current and current.host_access_policies) or []
+        )
+        if wanted != current_haps:
+            patches.append(
+                (
+                    "host_access_policies",
+                    purefusion.VolumePatch(
+                        host_access_policies=purefusion.NullableString(",".join(wanted))
+                    ),
+                )
+            )
+    return patches
+
+
+# in the order of dependencies, parents are always before their children
+KINDS = [
+    ResourceKind(
+        "region", "regions", "RegionsApi", paginated=True, build_post=_region_post
+    ),
+    ResourceKind(
+        "availability_zone",
+        "availability_zones",
+        "AvailabilityZonesApi",
+        parents=("region",),
+        build_post=_az_post,
+        updatable=False,
+    ),
+    ResourceKind(
+        "network_interface_group",
+        "network_interface_groups",
+        "NetworkInterfaceGroupsApi",
+        parents=("region", "availability_zone"),
+        required=("prefix",),
+        build_post=_nig_post,
+    ),
+    ResourceKind(
+        "storage_endpoint",
+        "storage_endpoints",
+        "StorageEndpointsApi",
+        parents=("region", "availability_zone"),
+        required=("iscsi",),
+        build_post=_se_post,
+        references=_se_references,
+    ),
+    ResourceKind(
+        "array",
+        "arrays",
+        "ArraysApi",
+        parents=("region", "availability_zone"),
+        required=("hardware_type", "appliance_id", "host_name"),
+        build_post=_array_post,
+    ),
+    ResourceKind(
+        "storage_service",
+        "storage_services",
+        "StorageServicesApi",
+        required=("hardware_types",),
+        build_post=_ss_post,
+    ),
+    ResourceKind(
+        "storage_class",
+        "storage_classes",
+        "StorageClassesApi",
+        parents=("storage_service",),
+        build_post=_sc_post,
+    ),
+    ResourceKind(
+        "protection_policy",
+        "protection_policies",
+        "ProtectionPoliciesApi",
+        required=("local_rpo", "local_retention"),
+        build_post=_pp_post,
+        updatable=False,
+    ),
+    ResourceKind(
+        "tenant", "tenants", "TenantsApi", paginated=True, build_post=_tenant_post
+    ),
+    ResourceKind(
+        "tenant_space",
+        "tenant_spaces",
+        "TenantSpacesApi",
+        parents=("tenant",),
+        paginated=True,
+        build_post=_ts_post,
+    ),
+    ResourceKind(
+        "placement_group",
+        "placement_groups",
+        "PlacementGroupsApi",
+        parents=("tenant", "tenant_space"),
+        paginated=True,
+        required=("region", "availability_zone", "storage_service"),
+        build_post=_pg_post,
+        references=_pg_references,
+    ),
+    ResourceKind(
+        "host_access_policy",
+        "host_access_policies",
+        "HostAccessPoliciesApi",
+        required=("iqn",),
+        build_post=_hap_post,
+        updatable=False,
+    ),
+    ResourceKind(
+        "volume",
+        "volumes",
+        "VolumesApi",
+        parents=("tenant", "tenant_space"),
+        paginated=True,
+        required=("size", "storage_class", "placement_group"),
+        build_post=_volume_post,
+        references=_volume_references,
+        extra_patches=_volume_patches,
+    ),
+]
+
+
+class Change:
+    """Requests needed to bring a single resource to the wanted state."""
+
+    def __init__(self, kind, spec):
+        self.kind = kind
+        self.spec = spec
+        self.resource = kind.resource(spec)
+        self.post = None
+        # list of (changed field, patch)
+        self.patches = []
+        self.depends_on = []
+
+    @property
+    def changed(self):
+        return self.post is not None or len(self.patches) != 0
+
+    @property
+    def action(self):
+        return "create" if self.post is not None else "update"
+
+    def apply(self, fusion):
+        if self.post is not None:
+            self.kind.create(fusion, self.spec, self.post)
+        for _field, patch in self.patches:
+            self.kind.update(fusion, self.spec, patch)
+
+
+def get_specs(module):
+    """Returns list of (kind, spec) for all resources of the document"""
+    specs = []
+    seen = set()
+    for kind in KINDS:
+        for spec in module.params[kind.option]:
+            resource = kind.resource(spec)
+            if resource in seen:
+                module.fail_json(
+                    msg="Resource '{0}' is specified more than once".format(resource)
+                )
+            seen.add(resource)
+            specs.append((kind, spec))
+    return specs
+
+
+def _list_or_empty(fusion, kind, spec):
+    try:
+        return kind.list_existing(fusion, spec)
+    except purefusion.rest.ApiException as err:
+        # parent does not exist (yet), so there are no children either
+        if err.status == HTTPStatus.NOT_FOUND:
+            return []
+        raise
+
+
+def read_state(module, fusion, specs):
+    """
+    Lists existing resources of all kinds and parents used by `specs`
+    concurrently, returns them keyed by resource path
+    """
+    listings = {}
+    for kind, spec in specs:
+        listings.setdefault((kind.name, kind.key(spec)), (kind, spec))
+
+    results = run_concurrently(
+        fusion,
+        lambda listing: _list_or_empty(fusion, *listing),
+        listings.values(),
+        module.params["concurrency"],
+    )
+
+    existing = {}
+    for result in results:
+        kind, spec = result.item
+        if not result.ok:
+            module.fail_json(
+                msg="Listing {0} of '{1}' failed: {2}".format(
+                    kind.option, kind.key(spec), result.error_message
+                )
+            )
+        for resource in result.result:
+            existing[kind.key(spec) + "/" + resource.name] = resource
+    return existing
+
+
+def plan_change(module, kind, spec, current):
+    """Returns `Change` for the resource spec and the current resource or None"""
+    change = Change(kind, spec)
+    if current is None:
+        for param in kind.required:
+            if spec[param] is None:
+                module.fail_json(
+                    msg="`{0}` is required when creating {1} '{2}'".format(
+                        param, kind.name.replace("_", " "), change.resource
+                    )
+                )
+        change.post = kind.build_post(module, spec)
+    elif (
+        kind.updatable
+        and spec["display_name"]
+        and spec["display_name"] != current.display_name
+    ):
+        change.patches.append(
+            ("display_name", kind.display_name_patch(spec["display_name"]))
+        )
+    change.patches.extend(kind.extra_patches(module, spec, current))
+    return change
+
+
+def plan_state(module, specs, existing):
+    """Returns list of `Change` of all changed resources with their dependencies"""
+    changes = []
+    for kind, spec in specs:
+        change = plan_change(module, kind, spec, existing.get(kind.resource(spec)))
+        if change.changed:
+            changes.append(change)
+
+    by_name = {}
+    for change in changes:
+        by_name.setdefault((change.kind.name, change.spec["name"]), []).append(
+            change.resource
+        )
+    resources = set(change.resource for change in changes)
+    for change in changes:
+        parent = change.kind.parent_resource(change.spec)
+        depends_on = [parent] if parent in resources else []
+        # references are by name only, so depend on all resources of that name
+        for reference in change.kind.references(change.spec):
+            depends_on.extend(by_name.get(reference, []))
+        change.depends_on = sorted(set(depends_on))
+    return changes
+
+
+def main():
+    """Main code"""
+    argument_spec = fusion_argument_spec()
+    argument_spec.update(
+        dict(
+            regions=dict(
+                type="list",
+                elements="dict",
+                default=[],
+                options=dict(
+                    name=dict(type="str", required=True),
+                    display_name=dict(type="str"),
+                ),
+            ),
+            availability_zones=dict(
+                type="list",
+                elements="dict",
+                default=[],
+                options=dict(
+                    name=dict(type="str", required=True),
+                    region=dict(type="str", required=True),
+                    display_name=dict(type="str"),
+                ),
+            ),
+            network_interface_groups=dict(
+                type="list",
+                elements="dict",
+                default=[],
+                options=dict(
+                    name=dict(type="str", required=True),
+                    region=dict(type="str", required=True),
+                    availability_zone=dict(type="str", required=True, aliases=["az"]),
+                    display_name=dict(type="str"),
+                    group_type=dict(type="str", default="eth", choices=["eth"]),
+                    prefix=dict(type="str"),
+                    gateway=dict(type="str"),
+                    mtu=dict(type="int", default=1500),
+                ),
+            ),
+            storage_endpoints=dict(
+                type="list",
+                elements="dict",
+                default=[],
+                options=dict(
+                    name=dict(type="str", required=True),
+                    region=dict(type="str", required=True),
+                    availability_zone=dict(type="str", required=True, aliases=["az"]),
+                    display_name=dict(type="str"),
+                    iscsi=dict(
+                        type="list",
+                        elements="dict",
+                        options=dict(
+                            address=dict(type="str", required=True),
+                            gateway=dict(type="str"),
+                            network_interface_groups=dict(type="list", elements="str"),
+                        ),
+                    ),
+                ),
+            ),
+            arrays=dict(
+                type="list",
+                elements="dict",
+                default=[],
+                options=dict(
+                    name=dict(type="str", required=True),
+                    region=dict(type="str", required=True),
+                    availability_zone=dict(type="str", required=True, aliases=["az"]),
+                    display_name=dict(type="str"),
+                    hardware_type=dict(type="str", choices=HARDWARE_TYPES),
+                    appliance_id=dict(type="str"),
+                    host_name=dict(type="str"),
+                    apartment_id=dict(type="str"),
+                ),
+            ),
+            storage_services=dict(
+                type="list",
+                elements="dict",
+                default=[],
+                options=dict(
+                    name=dict(type="str", required=True),
+                    display_name=dict(type="str"),
+                    hardware_types=dict(
+                        type="list", elements="str", choices=HARDWARE_TYPES
+                    ),
+                ),
+            ),
+            storage_classes=dict(
+                type="list",
+                elements="dict",
+                default=[],
+                options=dict(
+                    name=dict(type="str", required=True),
+                    storage_service=dict(type="str", required=True),
+                    display_name=dict(type="str"),
+                    size_limit=dict(type="str"),
+                    iops_limit=dict(type="str"),
+                    bw_limit=dict(type="str"),
+                ),
+            ),
+            protection_policies=dict(
+                type="list",
+                elements="dict",
+                default=[],
+                options=dict(
+                    name=dict(type="str", required=True),
+                    display_name=dict(type="str"),
+                    local_rpo=dict(type="str"),
+                    local_retention=dict(type="str"),
+                ),
+            ),
+            tenants=dict(
+                type="list",
+                elements="dict",
+                default=[],
+                options=dict(
+                    name=dict(type="str", required=True),
+                    display_name=dict(type="str"),
+                ),
+            ),
+            tenant_spaces=dict(
+                type="list",
+                elements="dict",
+                default=[],
+                options=dict(
+                    name=dict(type="str", required=True),
+                    tenant=dict(type="str", required=True),
+                    display_name=dict(type="str"),
+                ),
+            ),
+            placement_groups=dict(
+                type="list",
+                elements="dict",
+                default=[],
+                options=dict(
+                    name=dict(type="str", required=True),
+                    tenant=dict(type="str", required=True),
+                    tenant_space=dict(type="str", required=True),
+                    display_name=dict(type="str"),
+                    region=dict(type="str"),
+                    availability_zone=dict(type="str", aliases=["az"]),
+                    storage_service=dict(type="str"),
+                ),
+            ),
+            host_access_policies=dict(
+                type="list",
+                elements="dict",
+                default=[],
+                options=dict(
+                    name=dict(type="str", required=True),
+                    display_name=dict(type="str"),
+                    iqn=dict(type="str"),
+                    personality=dict(
+                        type="str", default="linux", choices=PERSONALITIES
+                    ),
+                ),
+            ),
+            volumes=dict(
+                type="list",
+                elements="dict",
+                default=[],
+                options=dict(
+                    name=dict(type="str", required=True),
+                    tenant=dict(type="str", required=True),
+                    tenant_space=dict(type="str", required=True),
+                    display_name=dict(type="str"),
+                    size=dict(type="str"),
+                    storage_class=dict(type="str"),
+                    placement_group=dict(type="str"),
+                    protection_policy=dict(type="str"),
+                    host_access_policies=dict(type="list", elements="str"),
+                ),
+            ),
+            concurrency=dict(type="int", default=DEFAULT_CONCURRENCY),
+        )
+    )
+
+    module = AnsibleModule(argument_spec, supports_check_mode=True)
+    fusion = setup_fusion(module)
+
+    specs = get_specs(module)
+    existing = read_state(module, fusion, specs)
+    changes = plan_state(module, specs, existing)
+
+    by_resource = dict((change.resource, change) for change in changes)
+    dependencies = dict((change.resource, change.depends_on) for change in changes)
+    ordered = [
+        by_resource[resource]
+        for level in get_levels(dependencies)
+        for resource in level
+    ]
+
+    errors = {}
+    if not module.check_mode:
+        results = run_graph(
+            fusion,
+            dict(
+                (change.resource, partial(change.apply, fusion)) for change in changes
+            ),
+            dependencies,
+            module.params["concurrency"],
+        )
+        errors = dict(
+            (resource, result.error_message)
+            for resource, result in results.items()
+            if not result.ok
+        )
+
+    plan = [
+        {
+            "resource": change.resource,
+            "action": change.action,
+            "changes": [field for field, _patch in change.patches],
+            "depends_on": change.depends_on,
+            "error": errors.get(change.resource),
+        }
+        for change in ordered
+    ]
+    changed = len(changes) != 0
+
+    if errors:
+        module.fail_json(
+            msg="{0} of {1} changes failed, first error: {2}".format(
+                len(errors),
+                len(changes),
+                next(
+                    errors[change.resource]
+                    for change in ordered
+                    if change.resource in errors
+                ),
+            ),
+            changed=len(errors) != len(changes),
+            plan=plan,
+        )
+    module.exit_json(changed=changed, plan=plan)
+
+
+if __name__ == "__main__":
+    main()
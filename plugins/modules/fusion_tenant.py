@@ -38,6 +38,7 @@ options:
     type: str
 extends_documentation_fragment:
 - purestorage.fusion.purestorage.fusion
+- purestorage.fusion.purestorage.optimistic_create
 """
 
 EXAMPLES = r"""
@@ -74,6 +75,8 @@ from ansible_collections.purestorage.fusion.plugins.module_utils.startup import
 from ansible_collections.purestorage.fusion.plugins.module_utils import getters
 from ansible_collections.purestorage.fusion.plugins.module_utils.operations import (
     await_operation,
+    create_optimistically,
+    should_create_optimistically,
 )
 
 
@@ -144,6 +147,7 @@ def main():
             name=dict(type="str", required=True),
             display_name=dict(type="str"),
             state=dict(type="str", default="present", choices=["present", "absent"]),
+            optimistic_create=dict(type="bool", default=False),
         )
     )
 
@@ -151,6 +155,10 @@ def main():
     fusion = setup_fusion(module)
 
     state = module.params["state"]
+    if should_create_optimistically(module):
+        # exits the module unless the tenant already exists
+        create_optimistically(create_tenant, module, fusion)
+
     tenant = get_tenant(module, fusion)
 
     if not tenant and state == "present":
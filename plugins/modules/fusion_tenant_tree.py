@@ -0,0 +1,375 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# (c) 2023, Pure Storage, Inc.
+# GNU General Public License v3.0+ (see COPYING.GPLv3 or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+DOCUMENTATION = r"""
+---
+module: fusion_tenant_tree
+version_added: '1.6.0'
+short_description: Onboard a tenant with its tenant spaces and placement groups in Pure Storage Fusion
+description:
+- Create a tenant, its tenant spaces and their placement groups from a single tree.
+- Existing tenant spaces are found with one listing of the tenant and existing placement
+  groups with one listing per tenant space, all listings of placement groups run concurrently.
+- Missing resources are created level by level, the tenant first, then all its tenant
+  spaces and finally all placement groups. Resources of the same level are created concurrently.
+author:
+- Pure Storage Ansible Team (@sdodsley) <pure-ansible-team@purestorage.com>
+notes:
+- Supports C(check mode).
+- Existing resources are not modified and resources which are not in the tree are not deleted.
+- Children of a resource which failed to be created are not created.
+options:
+  name:
+    description:
+    - The name of the tenant.
+    type: str
+    required: true
+  display_name:
+    description:
+    - The human name of the tenant.
+    - If not provided, defaults to I(name).
+    type: str
+  region:
+    description:
+    - The region of placement groups which do not set their own.
+    type: str
+  availability_zone:
+    aliases: [ az ]
+    description:
+    - The availability zone of placement groups which do not set their own.
+    type: str
+  storage_service:
+    description:
+    - The storage service of placement groups which do not set their own.
+    type: str
+  tenant_spaces:
+    description:
+    - Tenant spaces of the tenant.
+    type: list
+    elements: dict
+    default: []
+    suboptions:
+      name:
+        description:
+        - The name of the tenant space.
+        type: str
+        required: true
+      display_name:
+        description:
+        - The human name of the tenant space.
+        - If not provided, defaults to I(name).
+        type: str
+      placement_groups:
+        description:
+        - Placement groups of the tenant space.
+        type: list
+        elements: dict
+        default: []
+        suboptions:
+          name:
+            description:
+            - The name of the placement group.
+            type: str
+            required: true
+          display_name:
+            description:
+            - The human name of the placement group.
+            - If not provided, defaults to I(name).
+            type: str
+          region:
+            description:
+            - The name of the region the availability zone is in.
+            - Defaults to the module-level I(region).
+            type: str
+          availability_zone:
+            aliases: [ az ]
+            description:
+            - The name of the availability zone the placement group is in.
+            - Defaults to the module-level I(availability_zone).
+            type: str
+          storage_service:
+            description:
+            - The name of the storage service to create the placement group for.
+            - Defaults to the module-level I(storage_service).
+            type: str
+extends_documentation_fragment:
+- purestorage.fusion.purestorage.fusion
+- purestorage.fusion.purestorage.concurrency
+"""
+
+EXAMPLES = r"""
+- name: Onboard business unit
+  purestorage.fusion.fusion_tenant_tree:
+    name: finance
+    display_name: "Finance"
+    region: pure-us-west
+    availability_zone: az1
+    storage_service: db-service
+    tenant_spaces:
+      - name: payroll
+        placement_groups:
+          - name: payroll-db
+          - name: payroll-logs
+            storage_service: log-service
+      - name: billing
+        placement_groups:
+          - name: billing-db
+    issuer_id: key_name
+    private_key_file: "az-admin-private-key.pem"
+"""
+
+RETURN = r"""
+created:
+  description: Result for every created resource, parents are listed before their children.
+  returned: always
+  type: list
+  elements: dict
+  contains:
+    kind:
+      description: C(tenant), C(tenant_space) or C(placement_group).
+      type: str
+    path:
+      description: The path of the resource, e.g. C(tenant/tenant_space/placement_group).
+      type: str
+    error:
+      description: Error message if creating the resource failed (or was skipped), null otherwise.
+      type: str
+"""
+
+from http import HTTPStatus
+
+try:
+    import fusion as purefusion
+except ImportError:
+    pass
+
+from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.purestorage.fusion.plugins.module_utils.fusion import (
+    fusion_argument_spec,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.getters import (
+    list_all,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.operations import (
+    await_operation,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.parallel import (
+    DEFAULT_CONCURRENCY,
+    run_concurrently,
+    run_graph,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.startup import (
+    setup_fusion,
+)
+
+PG_LOCATION = ("region", "availability_zone", "storage_service")
+
+
+def get_tenant(fusion, name):
+    """Return Tenant or None"""
+    tenant_api_instance = purefusion.TenantsApi(fusion)
+    try:
+        return tenant_api_instance.get_tenant(tenant_name=name)
+    except purefusion.rest.ApiException as err:
+        if err.status == HTTPStatus.NOT_FOUND:
+            return None
+        raise
+
+
+def read_tree(module, fusion):
+    """Returns paths of all existing resources of the tree"""
+    tenant = module.params["name"]
+    if get_tenant(fusion, tenant) is None:
+        return set()
+    existing = set([tenant])
+
+    ts_api_instance = purefusion.TenantSpacesApi(fusion)
+    for ts in list_all(ts_api_instance.list_tenant_spaces, tenant_name=tenant):
+        existing.add(tenant + "/" + ts.name)
+
+    pg_api_instance = purefusion.PlacementGroupsApi(fusion)
+    tenant_spaces = [
+        spec["name"]
+        for spec in module.params["tenant_spaces"]
+        if tenant + "/" + spec["name"] in existing and spec["placement_groups"]
+    ]
+    for result in run_concurrently(
+        fusion,
+        lambda ts: list_all(
+            pg_api_instance.list_placement_groups,
+            tenant_name=tenant,
+            tenant_space_name=ts,
+        ),
+        tenant_spaces,
+        module.params["concurrency"],
+    ):
+        if not result.ok:
+            module.fail_json(
+                msg="Listing placement groups of '{0}/{1}' failed: {2}".format(
+                    tenant, result.item, result.error_message
+                )
+            )
+        existing.update(
+            "{0}/{1}/{2}".format(tenant, result.item, pg.name) for pg in result.result
+        )
+    return existing
+
+
+def plan_tree(module, existing):
+    """Returns list of (kind, path, spec) to create, parents before children,
+    fails on invalid tree
+    """
+    tenant = module.params["name"]
+    problems = []
+    to_create = []
+    if tenant not in existing:
+        to_create.append(("tenant", tenant, module.params))
+
+    seen = set()
+    for ts_spec in module.params["tenant_spaces"]:
+        ts_path = tenant + "/" + ts_spec["name"]
+        if ts_path in seen:
+            problems.append("'{0}' is specified more than once".format(ts_path))
+            continue
+        seen.add(ts_path)
+        if ts_path not in existing:
+            to_create.append(("tenant_space", ts_path, ts_spec))
+
+        for pg_spec in ts_spec["placement_groups"]:
+            pg_path = ts_path + "/" + pg_spec["name"]
+            if pg_path in seen:
+                problems.append("'{0}' is specified more than once".format(pg_path))
+                continue
+            seen.add(pg_path)
+            if pg_path in existing:
+                continue
+            pg_spec = dict(pg_spec)
+            for param in PG_LOCATION:
+                pg_spec[param] = pg_spec[param] or module.params[param]
+            missing = [param for param in PG_LOCATION if not pg_spec[param]]
+            if missing:
+                problems.append(
+                    "'{0}' is missing {1}".format(pg_path, ", ".join(missing))
+                )
+                continue
+            to_create.append(("placement_group", pg_path, pg_spec))
+
+    if problems:
+        module.fail_json(msg="Invalid tenant tree: {0}".format("; ".join(problems)))
+    return to_create
+
+
+def create_node(fusion, kind, path, spec):
+    names = path.split("/")
+    display_name = spec["display_name"] or spec["name"]
+    if kind == "tenant":
+        tenant_api_instance = purefusion.TenantsApi(fusion)
+        op = tenant_api_instance.create_tenant(
+            purefusion.TenantPost(name=spec["name"], display_name=display_name)
+        )
+    elif kind == "tenant_space":
+        ts_api_instance = purefusion.TenantSpacesApi(fusion)
+        op = ts_api_instance.create_tenant_space(
+            purefusion.TenantSpacePost(name=spec["name"], display_name=display_name),
+            tenant_name=names[0],
+        )
+    else:
+        pg_api_instance = purefusion.PlacementGroupsApi(fusion)
+        op = pg_api_instance.create_placement_group(
+            purefusion.PlacementGroupPost(
+                name=spec["name"],
+                display_name=display_name,
+                region=spec["region"],
+                availability_zone=spec["availability_zone"],
+                storage_service=spec["storage_service"],
+            ),
+            tenant_name=names[0],
+            tenant_space_name=names[1],
+        )
+    await_operation(fusion, op)
+
+
+def main():
+    """Main code"""
+    argument_spec = fusion_argument_spec()
+    argument_spec.update(
+        dict(
+            name=dict(type="str", required=True),
+            display_name=dict(type="str"),
+            region=dict(type="str"),
+            availability_zone=dict(type="str", aliases=["az"]),
+            storage_service=dict(type="str"),
+            tenant_spaces=dict(
+                type="list",
+                elements="dict",
+                default=[],
+                options=dict(
+                    name=dict(type="str", required=True),
+                    display_name=dict(type="str"),
+                    placement_groups=dict(
+                        type="list",
+                        elements="dict",
+                        default=[],
+                        options=dict(
+                            name=dict(type="str", required=True),
+                            display_name=dict(type="str"),
+                            region=dict(type="str"),
+                            availability_zone=dict(type="str", aliases=["az"]),
+                            storage_service=dict(type="str"),
+                        ),
+                    ),
+                ),
+            ),
+            concurrency=dict(type="int", default=DEFAULT_CONCURRENCY),
+        )
+    )
+
+    module = AnsibleModule(argument_spec, supports_check_mode=True)
+    fusion = setup_fusion(module)
+
+    existing = read_tree(module, fusion)
+    to_create = plan_tree(module, existing)
+
+    errors = {}
+    if not module.check_mode and to_create:
+        tasks = dict(
+            (node[1], lambda node=node: create_node(fusion, *node))
+            for node in to_create
+        )
+        # every resource depends on its parent, existing parents are ignored
+        dependencies = dict(
+            (path, [path.rsplit("/", 1)[0]] if "/" in path else []) for path in tasks
+        )
+        results = run_graph(fusion, tasks, dependencies, module.params["concurrency"])
+        errors = dict(
+            (path, result.error_message)
+            for path, result in results.items()
+            if not result.ok
+        )
+
+    created = [
+        {"kind": kind, "path": path, "error": errors.get(path)}
+        for kind, path, _spec in to_create
+    ]
+    changed = len(created) - len(errors) != 0
+
+    if errors:
+        module.fail_json(
+            msg="{0} of {1} resources of the tenant tree failed, first error: {2}".format(
+                len(errors), len(created), next(iter(errors.values()))
+            ),
+            changed=changed,
+            created=created,
+        )
+    module.exit_json(changed=changed, created=created)
+
+
+if __name__ == "__main__":
+    main()
@@ -41,8 +41,22 @@ options:
     - The name of the tenant.
     type: str
     required: true
+  cascade:
+    description:
+    - When deleting the tenant space, delete all its volumes, snapshots
+      and placement groups first.
+    - Volumes are detached from host access policies, destroyed and eradicated,
+      so their data cannot be recovered.
+    - Deletions are run level by level, every level with at most
+      I(concurrency) requests at once. A resource is not deleted if
+      deleting anything it depends on failed.
+    type: bool
+    default: false
+    version_added: '1.6.0'
 extends_documentation_fragment:
 - purestorage.fusion.purestorage.fusion
+- purestorage.fusion.purestorage.optimistic_create
+- purestorage.fusion.purestorage.concurrency
 """
 
 EXAMPLES = r"""
@@ -61,11 +75,44 @@ EXAMPLES = r"""
     state: absent
     issuer_id: key_name
     private_key_file: "az-admin-private-key.pem"
+
+- name: Delete tenant space foo in tenant bar with everything in it
+  purestorage.fusion.fusion_ts:
+    name: foo
+    tenant: bar
+    state: absent
+    cascade: true
+    issuer_id: key_name
+    private_key_file: "az-admin-private-key.pem"
 """
 
 RETURN = r"""
+cascade:
+  description:
+  - Resources of the tenant space deleted (or to be deleted in check mode)
+    with I(cascade).
+  returned: when I(cascade) is set and the tenant space is deleted
+  type: dict
+  contains:
+    volumes:
+      description: Names of the deleted volumes.
+      type: list
+      elements: str
+    snapshots:
+      description: Names of the deleted snapshots.
+      type: list
+      elements: str
+    placement_groups:
+      description: Names of the deleted placement groups.
+      type: list
+      elements: str
+    errors:
+      description: Error messages of the failed deletions keyed by C(kind/name).
+      type: dict
 """
 
+from functools import partial
+
 try:
     import fusion as purefusion
 except ImportError:
@@ -81,6 +128,12 @@ from ansible_collections.purestorage.fusion.plugins.module_utils.startup import
 from ansible_collections.purestorage.fusion.plugins.module_utils import getters
 from ansible_collections.purestorage.fusion.plugins.module_utils.operations import (
     await_operation,
+    create_optimistically,
+    should_create_optimistically,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.parallel import (
+    DEFAULT_CONCURRENCY,
+    run_graph,
 )
 
 
@@ -141,10 +194,140 @@ def update_ts(module, fusion, ts):
     module.exit_json(changed=changed)
 
 
+def plan_cascade(module, fusion):
+    """
+    Lists volumes, snapshots and placement groups of the tenant space and
+    returns (tasks, dependencies) deleting them for `run_graph()`.
+    """
+    tenant = module.params["tenant"]
+    tenant_space = module.params["name"]
+    volume_api_instance = purefusion.VolumesApi(fusion)
+    snapshots_api_instance = purefusion.SnapshotsApi(fusion)
+    pg_api_instance = purefusion.PlacementGroupsApi(fusion)
+    location = dict(tenant_name=tenant, tenant_space_name=tenant_space)
+
+    volumes = getters.list_all(volume_api_instance.list_volumes, **location)
+    snapshots = getters.list_all(snapshots_api_instance.list_snapshots, **location)
+    placement_groups = getters.list_all(
+        pg_api_instance.list_placement_groups, **location
+    )
+
+    tasks = {}
+    dependencies = {}
+
+    def _destroy_volume(volume):
+        # volumes attached to hosts cannot be destroyed
+        if volume.host_access_policies:
+            op = volume_api_instance.update_volume(
+                purefusion.VolumePatch(
+                    host_access_policies=purefusion.NullableString("")
+                ),
+                volume_name=volume.name,
+                **location
+            )
+            await_operation(fusion, op)
+        if not volume.destroyed:
+            op = volume_api_instance.update_volume(
+                purefusion.VolumePatch(destroyed=purefusion.NullableBoolean(True)),
+                volume_name=volume.name,
+                **location
+            )
+            await_operation(fusion, op)
+
+    def _eradicate_volume(volume):
+        op = volume_api_instance.delete_volume(volume_name=volume.name, **location)
+        await_operation(fusion, op)
+
+    def _destroy_snapshot(snapshot):
+        if not snapshot.destroyed:
+            op = snapshots_api_instance.update_snapshot(
+                purefusion.SnapshotPatch(destroyed=purefusion.NullableBoolean(True)),
+                snapshot_name=snapshot.name,
+                **location
+            )
+            await_operation(fusion, op)
+
+    def _delete_snapshot(snapshot):
+        op = snapshots_api_instance.delete_snapshot(
+            snapshot_name=snapshot.name, **location
+        )
+        await_operation(fusion, op)
+
+    def _delete_pg(placement_group):
+        op = pg_api_instance.delete_placement_group(
+            placement_group_name=placement_group.name, **location
+        )
+        await_operation(fusion, op)
+
+    for volume in volumes:
+        key = "volume/" + volume.name
+        tasks[key + "/destroy"] = partial(_destroy_volume, volume)
+        tasks[key] = partial(_eradicate_volume, volume)
+        dependencies[key] = [key + "/destroy"]
+    for snapshot in snapshots:
+        key = "snapshot/" + snapshot.name
+        tasks[key + "/destroy"] = partial(_destroy_snapshot, snapshot)
+        tasks[key] = partial(_delete_snapshot, snapshot)
+        dependencies[key] = [key + "/destroy"]
+    for placement_group in placement_groups:
+        key = "placement_group/" + placement_group.name
+        tasks[key] = partial(_delete_pg, placement_group)
+        # snapshots do not reference their placement group, so every
+        # placement group waits for all of them
+        dependencies[key] = [
+            "volume/" + volume.name
+            for volume in volumes
+            if volume.placement_group
+            and volume.placement_group.name == placement_group.name
+        ] + ["snapshot/" + snapshot.name for snapshot in snapshots]
+
+    return tasks, dependencies
+
+
+def delete_cascade(module, fusion):
+    """
+    Deletes everything in the tenant space and returns the report of
+    deleted resources, fails the module if any deletion failed
+    """
+    tasks, dependencies = plan_cascade(module, fusion)
+    # keys of the deleted resources are 'kind/name', other tasks are their steps
+    resources = [key for key in tasks if key.count("/") == 1]
+
+    errors = {}
+    if not module.check_mode:
+        results = run_graph(fusion, tasks, dependencies, module.params["concurrency"])
+        for key in tasks:
+            resource = "/".join(key.split("/")[:2])
+            if not results[key].ok and resource not in errors:
+                errors[resource] = results[key].error_message
+
+    report = {"volumes": [], "snapshots": [], "placement_groups": [], "errors": errors}
+    for resource in resources:
+        if resource not in errors:
+            kind, name = resource.split("/")
+            report[kind + "s"].append(name)
+
+    if errors:
+        module.fail_json(
+            msg="Failed to delete {0} of {1} resources of tenant space {2}, first error: {3}".format(
+                len(errors),
+                len(resources),
+                module.params["name"],
+                next(iter(errors.values())),
+            ),
+            changed=len(errors) != len(resources),
+            cascade=report,
+        )
+    return report
+
+
 def delete_ts(module, fusion):
     """Delete Tenant Space"""
     changed = True
+    result = {}
     ts_api_instance = purefusion.TenantSpacesApi(fusion)
+    if module.params["cascade"]:
+        result["cascade"] = delete_cascade(module, fusion)
     if not module.check_mode:
         op = ts_api_instance.delete_tenant_space(
             tenant_name=module.params["tenant"],
@@ -152,7 +335,7 @@ def delete_ts(module, fusion):
         )
         await_operation(fusion, op)
 
-    module.exit_json(changed=changed)
+    module.exit_json(changed=changed, **result)
 
 
 def main():
@@ -164,6 +347,9 @@ def main():
             display_name=dict(type="str"),
             tenant=dict(type="str", required=True),
             state=dict(type="str", default="present", choices=["absent", "present"]),
+            optimistic_create=dict(type="bool", default=False),
+            cascade=dict(type="bool", default=False),
+            concurrency=dict(type="int", default=DEFAULT_CONCURRENCY),
         )
     )
 
@@ -171,6 +357,10 @@ def main():
     fusion = setup_fusion(module)
 
     state = module.params["state"]
+    if should_create_optimistically(module):
+        # exits the module unless the tenant space already exists
+        create_optimistically(create_ts, module, fusion)
+
     tspace = get_ts(module, fusion)
 
     if state == "present" and not tspace:
@@ -92,8 +92,27 @@ options:
     description:
     - New name for volume.
     type: str
+  clones:
+    description:
+    - Number of clones to create from the source given by I(source_volume) or
+      I(source_snapshot) and I(source_volume_snapshot).
+    - Names of the clones are given by I(clone_name_template), clones which already
+      exist are left untouched. I(name) is only used in the template.
+    - All clones are created concurrently, at most I(concurrency) at once.
+    type: int
+    version_added: '1.6.0'
+  clone_name_template:
+    description:
+    - Template of the names of the clones created with I(clones).
+    - C({name}) is replaced by I(name) and C({index}) by the number of the clone
+      starting from 1, for example C({name}-{index:03d}).
+    type: str
+    default: "{name}-{index}"
+    version_added: '1.6.0'
 extends_documentation_fragment:
 - purestorage.fusion.purestorage.fusion
+- purestorage.fusion.purestorage.optimistic_create
+- purestorage.fusion.purestorage.concurrency
 """
 
 EXAMPLES = r"""
@@ -134,6 +153,20 @@ EXAMPLES = r"""
     issuer_id: key_name
     private_key_file: "az-admin-private-key.pem"
 
+- name: Create 200 clones named ci-db-1 ... ci-db-200 of a volume snapshot
+  purestorage.fusion.fusion_volume:
+    name: ci-db
+    clones: 200
+    storage_class: fred
+    placement_group: pg
+    tenant: test
+    tenant_space: space_1
+    source_snapshot: "snap"
+    source_volume_snapshot: "vol_snap"
+    host_access_policies: [ ci-host ]
+    issuer_id: key_name
+    private_key_file: "az-admin-private-key.pem"
+
 - name: Extend the size of an existing volume named foo
   purestorage.fusion.fusion_volume:
     name: foo
@@ -155,6 +188,24 @@ EXAMPLES = r"""
 """
 
 RETURN = r"""
+clones:
+  description: Clones created (or to be created in check mode) with I(clones).
+  returned: when I(clones) is set
+  type: list
+  elements: dict
+  contains:
+    name:
+      description: The name of the clone.
+      type: str
+    serial_number:
+      description: Serial number of the clone, null in check mode or if creating the clone failed.
+      type: str
+    changed:
+      description: Whether the clone was (or would be in check mode) created.
+      type: bool
+    error:
+      description: Error message if creating the clone failed, null otherwise.
+      type: str
 """
 
 try:
@@ -172,37 +223,48 @@ from ansible_collections.purestorage.fusion.plugins.module_utils.parsing import
 from ansible_collections.purestorage.fusion.plugins.module_utils.startup import (
     setup_fusion,
 )
+from ansible_collections.purestorage.fusion.plugins.module_utils.getters import (
+    get_cached,
+    list_all,
+)
 from ansible_collections.purestorage.fusion.plugins.module_utils.operations import (
     await_operation,
+    create_optimistically,
+    should_create_optimistically,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.parallel import (
+    DEFAULT_CONCURRENCY,
+    run_concurrently,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.volumes import (
+    get_source_link,
+    get_volume_patches,
+    get_wanted_haps,
+    validate_volume,
 )
 
 
 def get_volume(module, fusion):
     """Return Volume or None"""
-    volume_api_instance = purefusion.VolumesApi(fusion)
-    try:
-        return volume_api_instance.get_volume(
-            tenant_name=module.params["tenant"],
-            tenant_space_name=module.params["tenant_space"],
-            volume_name=module.params["name"],
-        )
-    except purefusion.rest.ApiException:
-        return None
-
-
-def get_wanted_haps(module):
-    """Return set of host access policies to assign"""
-    if not module.params["host_access_policies"]:
-        return set()
-    # looks like yaml parsing can leave in some spaces if coma-delimited .so strip() the names
-    return set([hap.strip() for hap in module.params["host_access_policies"]])
-
 
-def extract_current_haps(volume):
-    """Return set of host access policies that volume currently has"""
-    if not volume.host_access_policies:
-        return set()
-    return set([hap.name for hap in volume.host_access_policies])
+    def _fetch():
+        volume_api_instance = purefusion.VolumesApi(fusion)
+        try:
+            return volume_api_instance.get_volume(
+                tenant_name=module.params["tenant"],
+                tenant_space_name=module.params["tenant_space"],
+                volume_name=module.params["name"],
+            )
+        except purefusion.rest.ApiException:
+            return None
+
+    key = (
+        "volume",
+        module.params["tenant"],
+        module.params["tenant_space"],
+        module.params["name"],
+    )
+    return get_cached(module, key, _fetch)
 
 
 def create_volume(module, fusion):
@@ -211,11 +273,13 @@ def create_volume(module, fusion):
     if not module.check_mode:
         display_name = module.params["display_name"] or module.params["name"]
         volume_api_instance = purefusion.VolumesApi(fusion)
-        source_link = get_source_link_from_parameters(module.params)
+        source_link = get_source_link(module.params)
         volume = purefusion.VolumePost(
-            size=None  # when cloning a volume, size is not required
-            if source_link
-            else parse_number_with_metric_suffix(module, module.params["size"]),
+            size=(
+                None  # when cloning a volume, size is not required
+                if source_link
+                else parse_number_with_metric_suffix(module, module.params["size"])
+            ),
             storage_class=module.params["storage_class"],
             placement_group=module.params["placement_group"],
             name=module.params["name"],
@@ -233,100 +297,6 @@ def create_volume(module, fusion):
     return True
 
 
-def update_host_access_policies(module, current, patches):
-    wanted = module.params
-    # 'wanted[...] is not None' to differentiate between empty list and no list
-    if wanted["host_access_policies"] is not None:
-        current_haps = extract_current_haps(current)
-        wanted_haps = get_wanted_haps(module)
-        if wanted_haps != current_haps:
-            patch = purefusion.VolumePatch(
-                host_access_policies=purefusion.NullableString(",".join(wanted_haps))
-            )
-            patches.append(patch)
-
-
-def update_destroyed(module, current, patches):
-    wanted = module.params
-    destroyed = wanted["state"] != "present"
-    if destroyed != current.destroyed:
-        patch = purefusion.VolumePatch(destroyed=purefusion.NullableBoolean(destroyed))
-        patches.append(patch)
-        if destroyed and not module.params["eradicate"]:
-            module.warn(
-                (
-                    "Volume '{0}' is being soft deleted to prevent data loss, "
-                    "if you want to wipe it immediately to reclaim used space, add 'eradicate: true'"
-                ).format(current.name)
-            )
-
-
-def update_display_name(module, current, patches):
-    wanted = module.params
-    if wanted["display_name"] and wanted["display_name"] != current.display_name:
-        patch = purefusion.VolumePatch(
-            display_name=purefusion.NullableString(wanted["display_name"])
-        )
-        patches.append(patch)
-
-
-def update_storage_class(module, current, patches):
-    wanted = module.params
-    if (
-        wanted["storage_class"]
-        and wanted["storage_class"] != current.storage_class.name
-    ):
-        patch = purefusion.VolumePatch(
-            storage_class=purefusion.NullableString(wanted["storage_class"])
-        )
-        patches.append(patch)
-
-
-def update_placement_group(module, current, patches):
-    wanted = module.params
-    if (
-        wanted["placement_group"]
-        and wanted["placement_group"] != current.placement_group.name
-    ):
-        patch = purefusion.VolumePatch(
-            placement_group=purefusion.NullableString(wanted["placement_group"])
-        )
-        patches.append(patch)
-
-
-def update_size(module, current, patches):
-    wanted = module.params
-    if wanted["size"]:
-        wanted_size = parse_number_with_metric_suffix(module, wanted["size"])
-        if wanted_size != current.size:
-            patch = purefusion.VolumePatch(size=purefusion.NullableSize(wanted_size))
-            patches.append(patch)
-
-
-def update_protection_policy(module, current, patches):
-    wanted = module.params
-    current_policy = current.protection_policy.name if current.protection_policy else ""
-    if (
-        wanted["protection_policy"] is not None
-        and wanted["protection_policy"] != current_policy
-    ):
-        patch = purefusion.VolumePatch(
-            protection_policy=purefusion.NullableString(wanted["protection_policy"])
-        )
-        patches.append(patch)
-
-
-def update_source_link(module, fusion, current, patches):
-    source_link = get_source_link_from_parameters(module.params)
-    if source_link is not None and (
-        current.source is None or current.source.self_link != source_link
-    ):
-        patch = purefusion.VolumePatch(
-            source_link=purefusion.NullableString(source_link)
-        )
-        patches.append(patch)
-
-
 def apply_patches(module, fusion, patches):
     volume_api_instance = purefusion.VolumesApi(fusion)
     for patch in patches:
@@ -342,13 +312,12 @@ def apply_patches(module, fusion, patches):
 def update_volume(module, fusion):
     """Update Volume size, placement group, protection policy, storage class, HAPs"""
     current = get_volume(module, fusion)
-    patches = []
 
     if not current:
         # cannot update nonexistent volume
         # Note for check mode: the reasons this codepath is ran in check mode
         # is to catch any argument errors and to compute 'changed'. Basically
-        # all argument checks are kept in validate_arguments() to filter the
+        # all argument checks are kept in validate_volume() to filter the
         # first part. The second part MAY diverge flow from the real run here if
         # create_volume() created the volume and update was then run to update
         # its properties. HOWEVER we don't really care in that case because
@@ -356,27 +325,7 @@ def update_volume(module, fusion):
         # result from update_volume() would not change it.
         return False
 
-    # volumes with 'destroyed' flag are kinda special because we can't change
-    # most of their properties while in this state, so we need to set it last
-    # and unset it first if changed, respectively
-    if module.params["state"] == "present":
-        update_destroyed(module, current, patches)
-        update_size(module, current, patches)
-        update_protection_policy(module, current, patches)
-        update_display_name(module, current, patches)
-        update_storage_class(module, current, patches)
-        update_placement_group(module, current, patches)
-        update_host_access_policies(module, current, patches)
-        update_source_link(module, fusion, current, patches)
-    elif module.params["state"] == "absent" and not current.destroyed:
-        update_size(module, current, patches)
-        update_protection_policy(module, current, patches)
-        update_display_name(module, current, patches)
-        update_storage_class(module, current, patches)
-        update_placement_group(module, current, patches)
-        update_host_access_policies(module, current, patches)
-        update_source_link(module, fusion, current, patches)
-        update_destroyed(module, current, patches)
+    patches = get_volume_patches(module, module.params, current)
 
     if not module.check_mode:
         apply_patches(module, fusion, patches)
@@ -411,61 +360,117 @@ def eradicate_volume(module, fusion):
     return True
 
 
-def get_source_link_from_parameters(params):
-    tenant = params["tenant"]
-    tenant_space = params["tenant_space"]
-    volume = params["source_volume"]
-    snapshot = params["source_snapshot"]
-    volume_snapshot = params["source_volume_snapshot"]
-    if (
-        tenant is None or tenant_space is None
-    ):  # should not happen as those parameters are always required by the ansible module
-        return None
-    if volume is not None:
-        return f"/tenants/{tenant}/tenant-spaces/{tenant_space}/volumes/{volume}"
-    if snapshot is not None and volume_snapshot is not None:
-        return f"/tenants/{tenant}/tenant-spaces/{tenant_space}/snapshots/{snapshot}/volume-snapshots/{volume_snapshot}"
-    return None
-
-
-def validate_arguments(module, volume):
-    """Validates most argument conditions and possible unacceptable argument combinations"""
-    state = module.params["state"]
-
-    if state == "present" and not volume:
-        module.fail_on_missing_params(["placement_group", "storage_class"])
-
-        if (
-            module.params["size"] is None
-            and module.params["source_volume"] is None
-            and module.params["source_snapshot"] is None
-        ):
-            module.fail_json(
-                msg="Either `size`, `source_volume` or `source_snapshot` parameter is required when creating a volume."
+def get_clone_names(module):
+    """Returns names of the clones given by `clone_name_template`"""
+    try:
+        names = [
+            module.params["clone_name_template"].format(
+                name=module.params["name"], index=index
             )
-
-    if module.params["state"] == "absent" and (
-        module.params["host_access_policies"]
-        or (volume and volume.host_access_policies)
-    ):
+            for index in range(1, module.params["clones"] + 1)
+        ]
+    except (KeyError, IndexError, ValueError) as err:
         module.fail_json(
-            msg=(
-                "Volume must have no host access policies when destroyed, either revert the delete "
-                "by setting 'state: present' or remove all HAPs by 'host_access_policies: []'"
-            )
+            msg="Invalid `clone_name_template`: {0}".format(err.__class__.__name__)
+        )
+    if len(set(names)) != len(names):
+        module.fail_json(msg="`clone_name_template` must contain `{index}`")
+    return names
+
+
+def create_clone(module, fusion, name, source_link):
+    """Create a single clone and attach it to host access policies"""
+    volume_api_instance = purefusion.VolumesApi(fusion)
+    volume = purefusion.VolumePost(
+        storage_class=module.params["storage_class"],
+        placement_group=module.params["placement_group"],
+        name=name,
+        display_name=name,
+        protection_policy=module.params["protection_policy"],
+        source_link=source_link,
+    )
+    op = volume_api_instance.create_volume(
+        volume,
+        tenant_name=module.params["tenant"],
+        tenant_space_name=module.params["tenant_space"],
+    )
+    await_operation(fusion, op)
+    # host access policies cannot be set on creation
+    wanted_haps = get_wanted_haps(module.params)
+    if wanted_haps:
+        op = volume_api_instance.update_volume(
+            purefusion.VolumePatch(
+                host_access_policies=purefusion.NullableString(
+                    ",".join(sorted(wanted_haps))
+                )
+            ),
+            volume_name=name,
+            tenant_name=module.params["tenant"],
+            tenant_space_name=module.params["tenant_space"],
         )
+        await_operation(fusion, op)
+
 
-    if state == "present" and module.params["eradicate"]:
+def create_clones(module, fusion):
+    """Create `clones` volumes from the source concurrently, exits the module"""
+    source_link = get_source_link(module.params)
+    if module.params["state"] != "present" or source_link is None:
         module.fail_json(
-            msg="'eradicate: true' cannot be used together with 'state: present'"
+            msg="`clones` requires 'state: present' and either `source_volume` or `source_snapshot`"
         )
+    if module.params["clones"] < 1:
+        module.fail_json(msg="`clones` must be at least 1")
+    validate_volume(module, module.params, None)
+    names = get_clone_names(module)
 
-    if module.params["size"] is not None:
-        size = parse_number_with_metric_suffix(module, module.params["size"])
-        if size < 1048576 or size > 4503599627370496:  # 1MB to 4PB
-            module.fail_json(
-                msg="Size is not within the required range, size must be between 1MB and 4PB"
+    volume_api_instance = purefusion.VolumesApi(fusion)
+
+    def _list_volumes():
+        return dict(
+            (volume.name, volume)
+            for volume in list_all(
+                volume_api_instance.list_volumes,
+                tenant_name=module.params["tenant"],
+                tenant_space_name=module.params["tenant_space"],
             )
+        )
+
+    existing = _list_volumes()
+    missing = [name for name in names if name not in existing]
+
+    errors = {}
+    if missing and not module.check_mode:
+        results = run_concurrently(
+            fusion,
+            lambda name: create_clone(module, fusion, name, source_link),
+            missing,
+            module.params["concurrency"],
+        )
+        errors = dict(
+            (result.item, result.error_message) for result in results if not result.ok
+        )
+        # serial numbers are assigned on creation
+        existing = _list_volumes()
+
+    clones = [
+        {
+            "name": name,
+            "serial_number": existing[name].serial_number if name in existing else None,
+            "changed": name in missing,
+            "error": errors.get(name),
+        }
+        for name in names
+    ]
+    changed = len(missing) != 0
+    if errors:
+        module.fail_json(
+            msg="{0} of {1} clones failed, first error: {2}".format(
+                len(errors), len(missing), next(iter(errors.values()))
+            ),
+            changed=len(errors) != len(missing),
+            clones=clones,
+        )
+    module.exit_json(changed=changed, clones=clones)
 
 
 def main():
@@ -493,10 +498,14 @@ def main():
             ),
             eradicate=dict(type="bool", default=False),
             state=dict(type="str", default="present", choices=["absent", "present"]),
+            optimistic_create=dict(type="bool", default=False),
             size=dict(type="str"),
             source_volume=dict(type="str"),
             source_snapshot=dict(type="str"),
             source_volume_snapshot=dict(type="str"),
+            clones=dict(type="int"),
+            clone_name_template=dict(type="str", default="{name}-{index}"),
+            concurrency=dict(type="int", default=DEFAULT_CONCURRENCY),
         )
     )
 
@@ -526,9 +535,20 @@ def main():
 
     state = module.params["state"]
 
+    if module.params["clones"] is not None:
+        create_clones(module, fusion)
+
+    if should_create_optimistically(module):
+        validate_volume(module, module.params, None)
+        if create_optimistically(create_volume, module, fusion):
+            # host access policies cannot be set on creation
+            if module.params["host_access_policies"] is not None:
+                update_volume(module, fusion)
+            module.exit_json(changed=True)
+
     volume = get_volume(module, fusion)
 
-    validate_arguments(module, volume)
+    validate_volume(module, module.params, volume)
 
     if state == "absent" and not volume:
         module.exit_json(changed=False)
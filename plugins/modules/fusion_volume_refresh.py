@@ -0,0 +1,268 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# (c) 2023, Pure Storage, Inc.
+# GNU General Public License v3.0+ (see COPYING.GPLv3 or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+DOCUMENTATION = r"""
+---
+module: fusion_volume_refresh
+version_added: '1.6.0'
+short_description: Refresh many volumes from a snapshot in Pure Storage Fusion
+description:
+- Overwrite the data of many volumes of a tenant space with volume snapshots
+  of a single snapshot.
+- Volumes and volume snapshots are listed once and the whole mapping is validated
+  before any volume is changed. All volumes are then refreshed concurrently.
+author:
+- Pure Storage Ansible Team (@sdodsley) <pure-ansible-team@purestorage.com>
+notes:
+- Supports C(check mode).
+- Current data of the refreshed volumes is lost.
+options:
+  tenant:
+    description:
+    - The name of the tenant.
+    type: str
+    required: true
+  tenant_space:
+    description:
+    - The name of the tenant space of the volumes and the snapshot.
+    type: str
+    required: true
+  snapshot:
+    description:
+    - The name of the snapshot to refresh the volumes from.
+    type: str
+    required: true
+  volumes:
+    description:
+    - Mapping of the name of the refreshed volume to the name of the volume snapshot
+      of I(snapshot) it is refreshed from.
+    type: dict
+    required: true
+  force:
+    description:
+    - Refresh also volumes which were already refreshed from the same volume snapshot.
+    - By default such volumes are left untouched, which keeps the module idempotent.
+    type: bool
+    default: false
+extends_documentation_fragment:
+- purestorage.fusion.purestorage.fusion
+- purestorage.fusion.purestorage.concurrency
+"""
+
+EXAMPLES = r"""
+- name: Refresh reporting volumes from the nightly snapshot
+  purestorage.fusion.fusion_volume_refresh:
+    tenant: test
+    tenant_space: space_1
+    snapshot: nightly
+    volumes:
+      report-1: db-1
+      report-2: db-2
+    force: true
+    issuer_id: key_name
+    private_key_file: "az-admin-private-key.pem"
+"""
+
+RETURN = r"""
+summary:
+  description: Number of volumes by result.
+  returned: always
+  type: dict
+  contains:
+    total:
+      description: Number of volumes in I(volumes).
+      type: int
+    refreshed:
+      description: Number of volumes refreshed (or to be refreshed in check mode).
+      type: int
+    unchanged:
+      description: Number of volumes already refreshed from their volume snapshot.
+      type: int
+    failed:
+      description: Number of volumes which could not be refreshed.
+      type: int
+volumes:
+  description: Result for every volume.
+  returned: always
+  type: list
+  elements: dict
+  contains:
+    name:
+      description: The name of the volume.
+      type: str
+    volume_snapshot:
+      description: The name of the volume snapshot the volume is refreshed from.
+      type: str
+    changed:
+      description: Whether the volume was (or would be in check mode) refreshed.
+      type: bool
+    error:
+      description: Error message if refreshing the volume failed, null otherwise.
+      type: str
+"""
+
+try:
+    import fusion as purefusion
+except ImportError:
+    pass
+
+from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.purestorage.fusion.plugins.module_utils.fusion import (
+    fusion_argument_spec,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.getters import (
+    list_all,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.operations import (
+    await_operation,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.parallel import (
+    DEFAULT_CONCURRENCY,
+    run_concurrently,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.startup import (
+    setup_fusion,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.volumes import (
+    volume_snapshot_link,
+)
+
+
+def validate_mapping(module, volumes, volume_snapshots):
+    """Fails the module unless all volumes and volume snapshots of the mapping exist"""
+    problems = []
+    for name, volume_snapshot in module.params["volumes"].items():
+        if name not in volumes:
+            problems.append("volume '{0}' does not exist".format(name))
+        elif volumes[name].destroyed:
+            problems.append("volume '{0}' is destroyed".format(name))
+        if volume_snapshot not in volume_snapshots:
+            problems.append(
+                "volume snapshot '{0}' does not exist in snapshot '{1}'".format(
+                    volume_snapshot, module.params["snapshot"]
+                )
+            )
+    if problems:
+        module.fail_json(msg="Cannot refresh volumes: {0}".format(", ".join(problems)))
+
+
+def needs_refresh(module, volume, source_link):
+    if module.params["force"]:
+        return True
+    return volume.source is None or volume.source.self_link != source_link
+
+
+def refresh_volume(module, fusion, name, source_link):
+    volume_api_instance = purefusion.VolumesApi(fusion)
+    patch = purefusion.VolumePatch(source_link=purefusion.NullableString(source_link))
+    op = volume_api_instance.update_volume(
+        patch,
+        volume_name=name,
+        tenant_name=module.params["tenant"],
+        tenant_space_name=module.params["tenant_space"],
+    )
+    await_operation(fusion, op)
+
+
+def main():
+    """Main code"""
+    argument_spec = fusion_argument_spec()
+    argument_spec.update(
+        dict(
+            tenant=dict(type="str", required=True),
+            tenant_space=dict(type="str", required=True),
+            snapshot=dict(type="str", required=True),
+            volumes=dict(type="dict", required=True),
+            force=dict(type="bool", default=False),
+            concurrency=dict(type="int", default=DEFAULT_CONCURRENCY),
+        )
+    )
+
+    module = AnsibleModule(argument_spec, supports_check_mode=True)
+    fusion = setup_fusion(module)
+
+    volume_api_instance = purefusion.VolumesApi(fusion)
+    volume_snapshots_api_instance = purefusion.VolumeSnapshotsApi(fusion)
+    volumes = dict(
+        (volume.name, volume)
+        for volume in list_all(
+            volume_api_instance.list_volumes,
+            tenant_name=module.params["tenant"],
+            tenant_space_name=module.params["tenant_space"],
+        )
+    )
+    volume_snapshots = set(
+        volume_snapshot.name
+        for volume_snapshot in list_all(
+            volume_snapshots_api_instance.list_volume_snapshots,
+            tenant_name=module.params["tenant"],
+            tenant_space_name=module.params["tenant_space"],
+            snapshot_name=module.params["snapshot"],
+        )
+    )
+    validate_mapping(module, volumes, volume_snapshots)
+
+    refreshes = []
+    for name, volume_snapshot in module.params["volumes"].items():
+        source_link = volume_snapshot_link(
+            module.params["tenant"],
+            module.params["tenant_space"],
+            module.params["snapshot"],
+            volume_snapshot,
+        )
+        if needs_refresh(module, volumes[name], source_link):
+            refreshes.append((name, source_link))
+
+    errors = {}
+    if not module.check_mode:
+        results = run_concurrently(
+            fusion,
+            lambda refresh: refresh_volume(module, fusion, *refresh),
+            refreshes,
+            module.params["concurrency"],
+        )
+        errors = dict(
+            (result.item[0], result.error_message)
+            for result in results
+            if not result.ok
+        )
+
+    refreshed_names = set(name for name, _ in refreshes)
+    report = [
+        {
+            "name": name,
+            "volume_snapshot": volume_snapshot,
+            "changed": name in refreshed_names and name not in errors,
+            "error": errors.get(name),
+        }
+        for name, volume_snapshot in module.params["volumes"].items()
+    ]
+    summary = {
+        "total": len(report),
+        "refreshed": len(refreshes) - len(errors),
+        "unchanged": len(report) - len(refreshes),
+        "failed": len(errors),
+    }
+    changed = summary["refreshed"] != 0
+
+    if errors:
+        module.fail_json(
+            msg="{0} of {1} volumes failed to refresh, first error: {2}".format(
+                len(errors), len(refreshes), next(iter(errors.values()))
+            ),
+            changed=changed,
+            summary=summary,
+            volumes=report,
+        )
+    module.exit_json(changed=changed, summary=summary, volumes=report)
+
+
+if __name__ == "__main__":
+    main()
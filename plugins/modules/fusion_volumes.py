@@ -0,0 +1,435 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# (c) 2023, Pure Storage, Inc.
+# GNU General Public License v3.0+ (see COPYING.GPLv3 or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+DOCUMENTATION = r"""
+---
+module: fusion_volumes
+version_added: '1.6.0'
+short_description:  Manage many volumes in Pure Storage Fusion at once
+description:
+- Create, update or delete many volumes in Pure Storage Fusion in a single task.
+- Every volume is handled the same way as by M(purestorage.fusion.fusion_volume).
+- Existing volumes are listed once per tenant space, all changes are computed
+  upfront and then submitted concurrently.
+author:
+- Pure Storage Ansible Team (@sdodsley) <pure-ansible-team@purestorage.com>
+notes:
+- Supports C(check mode).
+- All volumes are validated before any change is made. If a change of some volume fails,
+  changes of the other volumes are still applied and the module fails afterwards.
+options:
+  tenant:
+    description:
+    - The name of the tenant of volumes which do not specify it.
+    type: str
+  tenant_space:
+    description:
+    - The name of the tenant space of volumes which do not specify it.
+    type: str
+  volumes:
+    description:
+    - List of volumes to manage.
+    type: list
+    elements: dict
+    required: true
+    suboptions:
+      name:
+        description:
+        - The name of the volume.
+        type: str
+        required: true
+      display_name:
+        description:
+        - The human name of the volume.
+        - If not provided, defaults to I(name).
+        type: str
+      state:
+        description:
+        - Define whether the volume should exist or not.
+        type: str
+        default: present
+        choices: [ absent, present ]
+      tenant:
+        description:
+        - The name of the tenant.
+        - Defaults to the module level I(tenant).
+        type: str
+      tenant_space:
+        description:
+        - The name of the tenant space.
+        - Defaults to the module level I(tenant_space).
+        type: str
+      eradicate:
+        description:
+        - "Wipes the volume instead of a soft delete if true. Must be used with `state: absent`."
+        type: bool
+        default: false
+      size:
+        description:
+        - Volume size in M, G, T or P units.
+        type: str
+      storage_class:
+        description:
+        - The name of the storage class.
+        type: str
+      placement_group:
+        description:
+        - The name of the placement group.
+        type: str
+      protection_policy:
+        description:
+        - The name of the protection policy.
+        type: str
+      host_access_policies:
+        description:
+        - 'A list of host access policies to connect the volume to.
+            To clear, assign empty list: host_access_policies: []'
+        type: list
+        elements: str
+      source_volume:
+        description:
+        - The source volume name. It must live within the same tenant space.
+            Cannot be used together with `source_snapshot` or `source_volume_snapshot`.
+        type: str
+      source_snapshot:
+        description:
+        - The source snapshot name. It must live within the same tenant space.
+            Cannot be used together with `source_volume`.
+        type: str
+      source_volume_snapshot:
+        description:
+        - The source volume snapshot name. It must live within the same tenant space.
+            Cannot be used together with `source_volume`.
+        type: str
+extends_documentation_fragment:
+- purestorage.fusion.purestorage.fusion
+- purestorage.fusion.purestorage.concurrency
+"""
+
+EXAMPLES = r"""
+- name: Create volumes foo1 and foo2, extend volume bar and delete volume baz
+  purestorage.fusion.fusion_volumes:
+    tenant: test
+    tenant_space: space_1
+    volumes:
+      - name: foo1
+        storage_class: fred
+        placement_group: pg
+        size: 1T
+        host_access_policies:
+          - host1
+      - name: foo2
+        storage_class: fred
+        placement_group: pg
+        source_volume: foo
+      - name: bar
+        size: 2T
+      - name: baz
+        state: absent
+        eradicate: true
+    concurrency: 16
+    issuer_id: key_name
+    private_key_file: "az-admin-private-key.pem"
+"""
+
+RETURN = r"""
+volumes:
+  description: Result for every volume, in the order of I(volumes).
+  returned: always
+  type: list
+  elements: dict
+  contains:
+    name:
+      description: The name of the volume.
+      type: str
+    tenant:
+      description: The name of the tenant.
+      type: str
+    tenant_space:
+      description: The name of the tenant space.
+      type: str
+    action:
+      description: What was done with the volume.
+      type: str
+      sample: created
+      choices: [ created, updated, deleted, none ]
+    changed:
+      description: Whether the volume was (or would be in check mode) changed.
+      type: bool
+    error:
+      description: Error message if changing the volume failed, null otherwise.
+      type: str
+"""
+
+try:
+    import fusion as purefusion
+except ImportError:
+    pass
+
+from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.purestorage.fusion.plugins.module_utils.fusion import (
+    fusion_argument_spec,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.getters import (
+    list_all,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.operations import (
+    await_operation,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.parallel import (
+    DEFAULT_CONCURRENCY,
+    run_concurrently,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.parsing import (
+    parse_number_with_metric_suffix,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.startup import (
+    setup_fusion,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.volumes import (
+    get_source_link,
+    get_volume_patches,
+    get_wanted_haps,
+    validate_volume,
+)
+
+
+class VolumePlan:
+    """Requests needed to bring a single volume to the wanted state."""
+
+    def __init__(self, spec):
+        self.spec = spec
+        self.post = None
+        self.patches = []
+        self.eradicate = False
+
+    @property
+    def changed(self):
+        return self.post is not None or len(self.patches) != 0 or self.eradicate
+
+    @property
+    def action(self):
+        if self.post is not None:
+            return "created"
+        if self.eradicate or (self.patches and self.spec["state"] == "absent"):
+            return "deleted"
+        if self.patches:
+            return "updated"
+        return "none"
+
+
+def fill_defaults(module):
+    """Returns volume specs with tenant and tenant space filled from module level parameters"""
+    specs = []
+    seen = set()
+    for volume in module.params["volumes"]:
+        spec = dict(volume)
+        for param in ("tenant", "tenant_space"):
+            if spec[param] is None:
+                spec[param] = module.params[param]
+            if spec[param] is None:
+                module.fail_json(
+                    msg="`{0}` is required for volume '{1}'".format(param, spec["name"])
+                )
+        key = (spec["tenant"], spec["tenant_space"], spec["name"])
+        if key in seen:
+            module.fail_json(
+                msg="Volume '{0}' in tenant space '{1}/{2}' is specified more than once".format(
+                    spec["name"], spec["tenant"], spec["tenant_space"]
+                )
+            )
+        seen.add(key)
+        specs.append(spec)
+    return specs
+
+
+def plan_create(module, plan):
+    spec = plan.spec
+    source_link = get_source_link(spec)
+    plan.post = purefusion.VolumePost(
+        size=(
+            None  # when cloning a volume, size is not required
+            if source_link
+            else parse_number_with_metric_suffix(module, spec["size"])
+        ),
+        storage_class=spec["storage_class"],
+        placement_group=spec["placement_group"],
+        name=spec["name"],
+        display_name=spec["display_name"] or spec["name"],
+        protection_policy=spec["protection_policy"],
+        source_link=source_link,
+    )
+    # host access policies cannot be set on creation
+    wanted_haps = get_wanted_haps(spec)
+    if wanted_haps:
+        plan.patches.append(
+            purefusion.VolumePatch(
+                host_access_policies=purefusion.NullableString(",".join(wanted_haps))
+            )
+        )
+
+
+def plan_update(module, plan, current):
+    spec = plan.spec
+    plan.patches.extend(get_volume_patches(module, spec, current))
+    plan.eradicate = spec["state"] == "absent" and spec["eradicate"]
+
+
+def plan_volume(module, spec, current):
+    """Returns `VolumePlan` for the volume spec and the current volume or None"""
+    plan = VolumePlan(spec)
+    if current:
+        plan_update(module, plan, current)
+    elif spec["state"] == "present":
+        plan_create(module, plan)
+    return plan
+
+
+def list_volumes(fusion, specs):
+    """Lists existing volumes of all tenant spaces used by `specs`, keyed by
+    (tenant, tenant space, name)"""
+    volume_api_instance = purefusion.VolumesApi(fusion)
+    tenant_spaces = sorted(set((s["tenant"], s["tenant_space"]) for s in specs))
+    volumes = {}
+    for tenant, tenant_space in tenant_spaces:
+        for volume in list_all(
+            volume_api_instance.list_volumes,
+            tenant_name=tenant,
+            tenant_space_name=tenant_space,
+        ):
+            volumes[(tenant, tenant_space, volume.name)] = volume
+    return volumes
+
+
+def apply_plan(fusion, plan):
+    """Submits all requests of the plan and awaits them"""
+    spec = plan.spec
+    volume_api_instance = purefusion.VolumesApi(fusion)
+    if plan.post is not None:
+        op = volume_api_instance.create_volume(
+            plan.post,
+            tenant_name=spec["tenant"],
+            tenant_space_name=spec["tenant_space"],
+        )
+        await_operation(fusion, op)
+    for patch in plan.patches:
+        op = volume_api_instance.update_volume(
+            patch,
+            volume_name=spec["name"],
+            tenant_name=spec["tenant"],
+            tenant_space_name=spec["tenant_space"],
+        )
+        await_operation(fusion, op)
+    if plan.eradicate:
+        op = volume_api_instance.delete_volume(
+            volume_name=spec["name"],
+            tenant_name=spec["tenant"],
+            tenant_space_name=spec["tenant_space"],
+        )
+        await_operation(fusion, op)
+
+
+def main():
+    """Main code"""
+    argument_spec = fusion_argument_spec()
+    argument_spec.update(
+        dict(
+            tenant=dict(type="str"),
+            tenant_space=dict(type="str"),
+            volumes=dict(
+                type="list",
+                elements="dict",
+                required=True,
+                options=dict(
+                    name=dict(type="str", required=True),
+                    display_name=dict(type="str"),
+                    state=dict(
+                        type="str", default="present", choices=["absent", "present"]
+                    ),
+                    tenant=dict(type="str"),
+                    tenant_space=dict(type="str"),
+                    eradicate=dict(type="bool", default=False),
+                    size=dict(type="str"),
+                    storage_class=dict(type="str"),
+                    placement_group=dict(type="str"),
+                    protection_policy=dict(type="str"),
+                    host_access_policies=dict(type="list", elements="str"),
+                    source_volume=dict(type="str"),
+                    source_snapshot=dict(type="str"),
+                    source_volume_snapshot=dict(type="str"),
+                ),
+                required_by={
+                    "placement_group": "storage_class",
+                },
+                mutually_exclusive=[
+                    ("source_volume", "source_snapshot", "size"),
+                ],
+                required_together=[
+                    ("source_snapshot", "source_volume_snapshot"),
+                ],
+            ),
+            concurrency=dict(type="int", default=DEFAULT_CONCURRENCY),
+        )
+    )
+
+    module = AnsibleModule(argument_spec, supports_check_mode=True)
+    fusion = setup_fusion(module)
+
+    specs = fill_defaults(module)
+    current_volumes = list_volumes(fusion, specs)
+
+    plans = []
+    for spec in specs:
+        current = current_volumes.get(
+            (spec["tenant"], spec["tenant_space"], spec["name"])
+        )
+        validate_volume(module, spec, current, spec["name"])
+        plans.append(plan_volume(module, spec, current))
+
+    errors = {}
+    if not module.check_mode:
+        results = run_concurrently(
+            fusion,
+            lambda plan: apply_plan(fusion, plan),
+            [plan for plan in plans if plan.changed],
+            module.params["concurrency"],
+        )
+        errors = dict(
+            (id(result.item), result.error_message)
+            for result in results
+            if not result.ok
+        )
+
+    report = [
+        {
+            "name": plan.spec["name"],
+            "tenant": plan.spec["tenant"],
+            "tenant_space": plan.spec["tenant_space"],
+            "action": plan.action,
+            "changed": plan.changed,
+            "error": errors.get(id(plan)),
+        }
+        for plan in plans
+    ]
+    changed = any(plan.changed for plan in plans)
+
+    if errors:
+        module.fail_json(
+            msg="{0} of {1} volumes failed, first error: {2}".format(
+                len(errors), len(plans), next(iter(errors.values()))
+            ),
+            changed=changed,
+            volumes=report,
+        )
+    module.exit_json(changed=changed, volumes=report)
+
+
+if __name__ == "__main__":
+    main()
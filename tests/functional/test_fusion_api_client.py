@@ -359,3 +359,194 @@ def test_api_client_delete_exception(
     api_obj.delete_api_client.assert_called_once_with(
         api_client_id=current_api_client.id
     )
+
+
+@patch("fusion.IdentityManagerApi")
+def test_api_client_fingerprint_index_cache(m_im_api, current_clients, tmp_path):
+    current_api_client = current_clients[0]
+    module_args = {
+        "state": "present",
+        "name": current_api_client.display_name,
+        "public_key": current_api_client.public_key,
+        "index_cache": str(tmp_path / "index.json"),
+        "app_id": "ABCD1234",
+        "key_file": "private-key.pem",
+    }
+
+    # mock api responses
+    api_obj = MagicMock()
+    api_obj.list_api_clients = MagicMock(return_value=current_clients)
+    api_obj.get_api_client = MagicMock(
+        return_value=purefusion.APIClient(**asdict(current_api_client))
+    )
+    api_obj.create_api_client = MagicMock()
+    m_im_api.return_value = api_obj
+
+    # clients are listed by the first run only, later runs confirm the cached one
+    for _ in range(3):
+        set_module_args(module_args)
+        with pytest.raises(AnsibleExitJson) as exc:
+            fusion_api_client.main()
+        assert exc.value.changed is False
+
+    api_obj.list_api_clients.assert_called_once_with()
+    api_obj.get_api_client.assert_called_with(api_client_id=current_api_client.id)
+    assert api_obj.get_api_client.call_count == 3
+
+    # cached client deleted meanwhile, the index is refreshed
+    api_obj.get_api_client = MagicMock(side_effect=purefusion.rest.ApiException)
+    api_obj.list_api_clients = MagicMock(return_value=current_clients[1:])
+    set_module_args(module_args)
+    with pytest.raises(AnsibleExitJson) as exc:
+        fusion_api_client.main()
+
+    assert exc.value.changed is True
+    api_obj.list_api_clients.assert_called_once_with()
+    api_obj.create_api_client.assert_called_once()
+
+
+def _fake_client(id, name, public_key):
+    return FakeApiClient(
+        id,
+        "self_link_value",
+        name,
+        name,
+        "pure1:apikey:{0}".format(id),
+        public_key,
+        12345,
+        12345,
+        "1234",
+    )
+
+
+@pytest.fixture
+def bulk_clients():
+    return [
+        _fake_client("1", "client1", "key1"),
+        _fake_client("2", "client2", "old-key2"),
+        _fake_client("3", "client3", "key3"),
+    ]
+
+
+@pytest.fixture
+def bulk_module_args():
+    return {
+        "clients": [
+            # exists
+            {"name": "client1", "public_key": "key1"},
+            # new key of an existing client
+            {"name": "client2", "public_key": "key2"},
+            # new client
+            {"name": "client4", "public_key": "key4"},
+        ],
+        "app_id": "ABCD1234",
+        "key_file": "private-key.pem",
+    }
+
+
+def _created(body):
+    return purefusion.APIClient(
+        **asdict(_fake_client(body.display_name, body.display_name, body.public_key))
+    )
+
+
+@patch("fusion.IdentityManagerApi")
+@pytest.mark.parametrize(
+    ("rotate", "expected_report"),
+    [
+        (False, [("client2", "create"), ("client4", "create")]),
+        (True, [("client2", "create"), ("client4", "create"), ("client2", "delete")]),
+    ],
+)
+def test_api_client_bulk_present(
+    m_im_api, bulk_clients, bulk_module_args, rotate, expected_report
+):
+    bulk_module_args["rotate"] = rotate
+    set_module_args(bulk_module_args)
+
+    api_obj = MagicMock()
+    api_obj.list_api_clients = MagicMock(return_value=bulk_clients)
+    api_obj.create_api_client = MagicMock(side_effect=_created)
+    api_obj.delete_api_client = MagicMock()
+    m_im_api.return_value = api_obj
+
+    with pytest.raises(AnsibleExitJson) as exc:
+        fusion_api_client.main()
+
+    assert exc.value.changed is True
+    assert [
+        (c["name"], c["action"]) for c in exc.value.kwargs["clients"]
+    ] == expected_report
+    assert exc.value.kwargs["clients"][0]["issuer"] == "pure1:apikey:client2"
+    api_obj.list_api_clients.assert_called_once_with()
+    assert api_obj.create_api_client.call_count == 2
+    if rotate:
+        api_obj.delete_api_client.assert_called_once_with(api_client_id="2")
+    else:
+        api_obj.delete_api_client.assert_not_called()
+
+
+@patch("fusion.IdentityManagerApi")
+def test_api_client_bulk_rotate_keeps_old_key_on_failure(
+    m_im_api, bulk_clients, bulk_module_args
+):
+    bulk_module_args["rotate"] = True
+    set_module_args(bulk_module_args)
+
+    def _create(body):
+        if body.display_name == "client2":
+            raise purefusion.rest.ApiException(status=400)
+        return _created(body)
+
+    api_obj = MagicMock()
+    api_obj.list_api_clients = MagicMock(return_value=bulk_clients)
+    api_obj.create_api_client = MagicMock(side_effect=_create)
+    api_obj.delete_api_client = MagicMock()
+    m_im_api.return_value = api_obj
+
+    with pytest.raises(AnsibleFailJson) as exc:
+        fusion_api_client.main()
+
+    assert "1 of 2 API client changes failed" in str(exc.value)
+    assert exc.value.kwargs["changed"] is True
+    api_obj.delete_api_client.assert_not_called()
+
+
+@patch("fusion.IdentityManagerApi")
+def test_api_client_bulk_absent(m_im_api, bulk_clients, bulk_module_args):
+    bulk_module_args["state"] = "absent"
+    set_module_args(bulk_module_args)
+
+    api_obj = MagicMock()
+    api_obj.list_api_clients = MagicMock(return_value=bulk_clients)
+    api_obj.create_api_client = MagicMock()
+    api_obj.delete_api_client = MagicMock()
+    m_im_api.return_value = api_obj
+
+    with pytest.raises(AnsibleExitJson) as exc:
+        fusion_api_client.main()
+
+    assert exc.value.changed is True
+    api_obj.delete_api_client.assert_called_once_with(api_client_id="1")
+    api_obj.create_api_client.assert_not_called()
+
+
+@patch("fusion.IdentityManagerApi")
+def test_api_client_bulk_check_mode(m_im_api, bulk_clients, bulk_module_args):
+    bulk_module_args["rotate"] = True
+    bulk_module_args["_ansible_check_mode"] = True
+    set_module_args(bulk_module_args)
+
+    api_obj = MagicMock()
+    api_obj.list_api_clients = MagicMock(return_value=bulk_clients)
+    api_obj.create_api_client = MagicMock()
+    api_obj.delete_api_client = MagicMock()
+    m_im_api.return_value = api_obj
+
+    with pytest.raises(AnsibleExitJson) as exc:
+        fusion_api_client.main()
+
+    assert exc.value.changed is True
+    assert len(exc.value.kwargs["clients"]) == 3
+    api_obj.create_api_client.assert_not_called()
+    api_obj.delete_api_client.assert_not_called()
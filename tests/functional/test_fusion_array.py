@@ -909,8 +909,8 @@ def test_array_update(m_array_api, m_op_api, module_args, current_array):
 
     assert exc.value.changed
 
-    # check api was called correctly
-    api_obj.get_array.assert_called_with(
+    # check api was called correctly, the array is fetched only once
+    api_obj.get_array.assert_called_once_with(
         array_name=module_args["name"],
         availability_zone_name=module_args["availability_zone"],
         region_name=module_args["region"],
@@ -0,0 +1,295 @@
+# -*- coding: utf-8 -*-
+
+# (c) 2023, Pure Storage, Inc.
+# GNU General Public License v3.0+ (see COPYING.GPLv3 or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+from unittest.mock import MagicMock, call, patch
+
+import fusion as purefusion
+import pytest
+from ansible.module_utils import basic
+from ansible_collections.purestorage.fusion.plugins.modules import (
+    fusion_array_maintenance,
+)
+from ansible_collections.purestorage.fusion.tests.functional.utils import (
+    AnsibleExitJson,
+    AnsibleFailJson,
+    OperationMock,
+    SuccessfulOperationMock,
+    exit_json,
+    fail_json,
+    set_module_args,
+)
+from ansible_collections.purestorage.fusion.tests.helpers import (
+    ApiExceptionsMockGenerator,
+)
+
+# GLOBAL MOCKS
+fusion_array_maintenance.setup_fusion = MagicMock(
+    return_value=purefusion.api_client.ApiClient()
+)
+purefusion.api_client.ApiClient.call_api = MagicMock(
+    side_effect=Exception("API call not mocked!")
+)
+basic.AnsibleModule.exit_json = exit_json
+basic.AnsibleModule.fail_json = fail_json
+
+
+@pytest.fixture
+def module_args():
+    return {
+        "region": "region1",
+        "arrays": [
+            {"name": "a0", "availability_zone": "az1"},
+            {"name": "a1", "availability_zone": "az1"},
+            {"name": "a3", "availability_zone": "az1"},
+            {"name": "b0", "availability_zone": "az2"},
+        ],
+        "issuer_id": "ABCD1234",
+        "private_key_file": "private-key.pem",
+    }
+
+
+def _array(name, maintenance_mode=False):
+    array = MagicMock(maintenance_mode=maintenance_mode)
+    array.name = name
+    return array
+
+
+@pytest.fixture
+def arrays_api():
+    arrays = {
+        "az1": [_array("a0"), _array("a1"), _array("a2"), _array("a3", True)],
+        "az2": [_array("b0")],
+    }
+    api = MagicMock()
+    api.list_arrays = MagicMock(
+        side_effect=lambda availability_zone_name, **kwargs: MagicMock(
+            items=arrays[availability_zone_name], more_items_remaining=False
+        )
+    )
+    api.get_array_performance = MagicMock(
+        return_value=MagicMock(read_latency_us=500, write_latency_us=700)
+    )
+    api.get_array_space = MagicMock(
+        return_value=MagicMock(total_physical_space=1024**4)
+    )
+    api.update_array = MagicMock(return_value=OperationMock(1))
+    return api
+
+
+@pytest.fixture
+def operations_api():
+    api = MagicMock()
+    api.list_operations = MagicMock(side_effect=purefusion.rest.ApiException)
+    api.get_operation = MagicMock(return_value=SuccessfulOperationMock)
+    return api
+
+
+def _update(az, name, maintenance_mode=True):
+    return call(
+        purefusion.ArrayPatch(
+            maintenance_mode=purefusion.NullableBoolean(maintenance_mode)
+        ),
+        region_name="region1",
+        availability_zone_name=az,
+        array_name=name,
+    )
+
+
+@patch("fusion.OperationsApi")
+@patch("fusion.ArraysApi")
+def test_maintenance_waves(
+    m_arrays_api, m_op_api, module_args, arrays_api, operations_api
+):
+    m_arrays_api.return_value = arrays_api
+    m_op_api.return_value = operations_api
+    set_module_args(module_args)
+
+    with pytest.raises(AnsibleExitJson) as exc:
+        fusion_array_maintenance.main()
+
+    assert exc.value.changed
+    assert exc.value.kwargs["waves"] == [
+        [
+            {"name": "a0", "availability_zone": "az1"},
+            {"name": "b0", "availability_zone": "az2"},
+        ],
+        [{"name": "a1", "availability_zone": "az1"}],
+    ]
+    assert [
+        (a["name"], a["wave"], a["status"]) for a in exc.value.kwargs["arrays"]
+    ] == [
+        ("a0", 1, "changed"),
+        ("a1", 2, "changed"),
+        ("a3", None, "unchanged"),
+        ("b0", 1, "changed"),
+    ]
+    assert arrays_api.list_arrays.call_count == 2
+    arrays_api.update_array.assert_has_calls(
+        [_update("az1", "a0"), _update("az2", "b0"), _update("az1", "a1")],
+        any_order=True,
+    )
+    assert arrays_api.update_array.call_count == 3
+    # without limits health is not read at all
+    arrays_api.get_array_performance.assert_not_called()
+    arrays_api.get_array_space.assert_not_called()
+
+
+@patch("fusion.OperationsApi")
+@patch("fusion.ArraysApi")
+def test_maintenance_leave(
+    m_arrays_api, m_op_api, module_args, arrays_api, operations_api
+):
+    m_arrays_api.return_value = arrays_api
+    m_op_api.return_value = operations_api
+    module_args["maintenance_mode"] = False
+    module_args["az_concurrency"] = 2
+    set_module_args(module_args)
+
+    with pytest.raises(AnsibleExitJson) as exc:
+        fusion_array_maintenance.main()
+
+    assert exc.value.changed
+    assert exc.value.kwargs["waves"] == [[{"name": "a3", "availability_zone": "az1"}]]
+    arrays_api.update_array.assert_called_once_with(
+        *_update("az1", "a3", False).args, **_update("az1", "a3", False).kwargs
+    )
+
+
+@patch("fusion.OperationsApi")
+@patch("fusion.ArraysApi")
+def test_maintenance_health_gate_passes(
+    m_arrays_api, m_op_api, module_args, arrays_api, operations_api
+):
+    m_arrays_api.return_value = arrays_api
+    m_op_api.return_value = operations_api
+    module_args.update(
+        {
+            "max_read_latency_us": 1000,
+            "max_write_latency_us": 1000,
+            "max_physical_space": "2T",
+        }
+    )
+    set_module_args(module_args)
+
+    with pytest.raises(AnsibleExitJson) as exc:
+        fusion_array_maintenance.main()
+
+    assert exc.value.changed
+    assert arrays_api.update_array.call_count == 3
+    # wave 1: a1 and a2 stay in service in az1, nothing in az2
+    # wave 2: only a2 stays in service in az1
+    arrays_api.get_array_performance.assert_has_calls(
+        [
+            call(region_name="region1", availability_zone_name="az1", array_name="a1"),
+            call(region_name="region1", availability_zone_name="az1", array_name="a2"),
+        ],
+        any_order=True,
+    )
+    assert arrays_api.get_array_performance.call_count == 3
+    assert arrays_api.get_array_space.call_count == 3
+
+
+@patch("fusion.OperationsApi")
+@patch("fusion.ArraysApi")
+def test_maintenance_health_gate_fails(
+    m_arrays_api, m_op_api, module_args, arrays_api, operations_api
+):
+    arrays_api.get_array_performance = MagicMock(
+        return_value=MagicMock(read_latency_us=5000, write_latency_us=700)
+    )
+    m_arrays_api.return_value = arrays_api
+    m_op_api.return_value = operations_api
+    module_args["max_read_latency_us"] = 1000
+    set_module_args(module_args)
+
+    with pytest.raises(AnsibleFailJson) as exc:
+        fusion_array_maintenance.main()
+
+    assert "Health gate failed before wave 1 of 2" in str(exc.value)
+    assert "read_latency_us of array 'a1' is 5000, limit is 1000" in str(exc.value)
+    assert not exc.value.kwargs["changed"]
+    assert [a["status"] for a in exc.value.kwargs["arrays"]] == [
+        "skipped",
+        "skipped",
+        "unchanged",
+        "skipped",
+    ]
+    arrays_api.update_array.assert_not_called()
+    arrays_api.get_array_space.assert_not_called()
+
+
+@patch("fusion.OperationsApi")
+@patch("fusion.ArraysApi")
+def test_maintenance_stops_after_failed_wave(
+    m_arrays_api, m_op_api, module_args, arrays_api, operations_api
+):
+    def _update_array(patch, array_name, **kwargs):
+        if array_name == "b0":
+            raise ApiExceptionsMockGenerator.create_permission_denied()
+        return OperationMock(1)
+
+    arrays_api.update_array = MagicMock(side_effect=_update_array)
+    m_arrays_api.return_value = arrays_api
+    m_op_api.return_value = operations_api
+    set_module_args(module_args)
+
+    with pytest.raises(AnsibleFailJson) as exc:
+        fusion_array_maintenance.main()
+
+    assert "1 of 2 arrays of wave 1 failed" in str(exc.value)
+    assert exc.value.kwargs["changed"]
+    report = dict((a["name"], a) for a in exc.value.kwargs["arrays"])
+    assert report["a0"]["status"] == "changed"
+    assert report["b0"]["status"] == "failed"
+    assert report["b0"]["error"] is not None
+    assert report["a1"]["status"] == "skipped"
+    assert arrays_api.update_array.call_count == 2
+
+
+@patch("fusion.OperationsApi")
+@patch("fusion.ArraysApi")
+def test_maintenance_check_mode(
+    m_arrays_api, m_op_api, module_args, arrays_api, operations_api
+):
+    m_arrays_api.return_value = arrays_api
+    m_op_api.return_value = operations_api
+    module_args["max_read_latency_us"] = 1000
+    module_args["_ansible_check_mode"] = True
+    set_module_args(module_args)
+
+    with pytest.raises(AnsibleExitJson) as exc:
+        fusion_array_maintenance.main()
+
+    assert exc.value.changed
+    assert exc.value.kwargs["waves"] == [
+        [
+            {"name": "a0", "availability_zone": "az1"},
+            {"name": "b0", "availability_zone": "az2"},
+        ],
+        [{"name": "a1", "availability_zone": "az1"}],
+    ]
+    arrays_api.update_array.assert_not_called()
+    arrays_api.get_array_performance.assert_not_called()
+
+
+@patch("fusion.OperationsApi")
+@patch("fusion.ArraysApi")
+def test_maintenance_missing_array(
+    m_arrays_api, m_op_api, module_args, arrays_api, operations_api
+):
+    m_arrays_api.return_value = arrays_api
+    m_op_api.return_value = operations_api
+    module_args["arrays"].append({"name": "a0", "availability_zone": "az2"})
+    set_module_args(module_args)
+
+    with pytest.raises(AnsibleFailJson) as exc:
+        fusion_array_maintenance.main()
+
+    assert "a0 (availability zone az2)" in str(exc.value)
+    arrays_api.update_array.assert_not_called()
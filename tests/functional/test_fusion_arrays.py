@@ -0,0 +1,291 @@
+# -*- coding: utf-8 -*-
+
+# (c) 2023, Pure Storage, Inc.
+# GNU General Public License v3.0+ (see COPYING.GPLv3 or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+from unittest.mock import MagicMock, call, patch
+
+import fusion as purefusion
+import pytest
+from ansible.module_utils import basic
+from ansible_collections.purestorage.fusion.plugins.modules import fusion_arrays
+from ansible_collections.purestorage.fusion.tests.functional.utils import (
+    AnsibleExitJson,
+    AnsibleFailJson,
+    OperationMock,
+    SuccessfulOperationMock,
+    exit_json,
+    fail_json,
+    set_module_args,
+)
+from ansible_collections.purestorage.fusion.tests.helpers import (
+    ApiExceptionsMockGenerator,
+)
+
+# GLOBAL MOCKS
+fusion_arrays.setup_fusion = MagicMock(return_value=purefusion.api_client.ApiClient())
+purefusion.api_client.ApiClient.call_api = MagicMock(
+    side_effect=Exception("API call not mocked!")
+)
+basic.AnsibleModule.exit_json = exit_json
+basic.AnsibleModule.fail_json = fail_json
+
+
+def _new(name, az):
+    return {
+        "name": name,
+        "availability_zone": az,
+        "hardware_type": "flash-array-x",
+        "host_name": "host-" + name,
+        "appliance_id": "appliance-" + name,
+        "maintenance_mode": True,
+    }
+
+
+@pytest.fixture
+def module_args():
+    return {
+        "region": "region1",
+        "arrays": [
+            # exists, in maintenance already
+            {"name": "a0", "availability_zone": "az1", "maintenance_mode": True},
+            # exists, different display name
+            {"name": "a1", "availability_zone": "az1", "display_name": "Array 1"},
+            _new("a2", "az1"),
+            _new("b0", "az2"),
+        ],
+        "issuer_id": "ABCD1234",
+        "private_key_file": "private-key.pem",
+    }
+
+
+def _array(name, maintenance_mode=False):
+    array = MagicMock(
+        display_name=name,
+        host_name="host-" + name,
+        maintenance_mode=maintenance_mode,
+        unavailable_mode=False,
+    )
+    array.name = name
+    return array
+
+
+@pytest.fixture
+def arrays_api():
+    arrays = {"az1": [_array("a0", True), _array("a1")], "az2": []}
+    api = MagicMock()
+    api.list_arrays = MagicMock(
+        side_effect=lambda availability_zone_name, **kwargs: MagicMock(
+            items=list(arrays[availability_zone_name]), more_items_remaining=False
+        )
+    )
+
+    def _create(array, availability_zone_name, **kwargs):
+        # new arrays are not in maintenance
+        arrays[availability_zone_name].append(_array(array.name))
+        return OperationMock(1)
+
+    api.create_array = MagicMock(side_effect=_create)
+    api.update_array = MagicMock(return_value=OperationMock(2))
+    return api
+
+
+@pytest.fixture
+def operations_api():
+    api = MagicMock()
+    api.list_operations = MagicMock(side_effect=purefusion.rest.ApiException)
+    api.get_operation = MagicMock(return_value=SuccessfulOperationMock)
+    return api
+
+
+def _post(name, az):
+    return call(
+        purefusion.ArrayPost(
+            hardware_type="flash-array-x",
+            display_name=name,
+            host_name="host-" + name,
+            name=name,
+            appliance_id="appliance-" + name,
+            apartment_id=None,
+        ),
+        availability_zone_name=az,
+        region_name="region1",
+    )
+
+
+def _maintenance(az, name):
+    return call(
+        purefusion.ArrayPatch(maintenance_mode=purefusion.NullableBoolean(True)),
+        availability_zone_name=az,
+        region_name="region1",
+        array_name=name,
+    )
+
+
+@patch("fusion.OperationsApi")
+@patch("fusion.ArraysApi")
+def test_arrays_register(
+    m_arrays_api, m_op_api, module_args, arrays_api, operations_api
+):
+    m_arrays_api.return_value = arrays_api
+    m_op_api.return_value = operations_api
+    set_module_args(module_args)
+
+    with pytest.raises(AnsibleExitJson) as exc:
+        fusion_arrays.main()
+
+    assert exc.value.changed
+    assert exc.value.kwargs["arrays"] == [
+        {
+            "name": "a1",
+            "availability_zone": "az1",
+            "created": False,
+            "updated": ["display_name"],
+            "error": None,
+        },
+        {
+            "name": "a2",
+            "availability_zone": "az1",
+            "created": True,
+            "updated": ["maintenance_mode"],
+            "error": None,
+        },
+        {
+            "name": "b0",
+            "availability_zone": "az2",
+            "created": True,
+            "updated": ["maintenance_mode"],
+            "error": None,
+        },
+    ]
+    # every availability zone is listed before creating and once more after it
+    assert arrays_api.list_arrays.call_count == 4
+    arrays_api.create_array.assert_has_calls(
+        [_post("a2", "az1"), _post("b0", "az2")], any_order=True
+    )
+    assert arrays_api.create_array.call_count == 2
+    arrays_api.update_array.assert_has_calls(
+        [
+            call(
+                purefusion.ArrayPatch(
+                    display_name=purefusion.NullableString("Array 1")
+                ),
+                availability_zone_name="az1",
+                region_name="region1",
+                array_name="a1",
+            ),
+            _maintenance("az1", "a2"),
+            _maintenance("az2", "b0"),
+        ],
+        any_order=True,
+    )
+    assert arrays_api.update_array.call_count == 3
+
+
+@patch("fusion.OperationsApi")
+@patch("fusion.ArraysApi")
+def test_arrays_unchanged(m_arrays_api, m_op_api, arrays_api, operations_api):
+    m_arrays_api.return_value = arrays_api
+    m_op_api.return_value = operations_api
+    set_module_args(
+        {
+            "region": "region1",
+            "arrays": [
+                {"name": "a0", "availability_zone": "az1", "maintenance_mode": True},
+                {"name": "a1", "availability_zone": "az1", "unavailable_mode": False},
+            ],
+            "issuer_id": "ABCD1234",
+            "private_key_file": "private-key.pem",
+        }
+    )
+
+    with pytest.raises(AnsibleExitJson) as exc:
+        fusion_arrays.main()
+
+    assert not exc.value.changed
+    assert exc.value.kwargs["arrays"] == []
+    arrays_api.list_arrays.assert_called_once_with(
+        region_name="region1", availability_zone_name="az1"
+    )
+    arrays_api.create_array.assert_not_called()
+    arrays_api.update_array.assert_not_called()
+
+
+@patch("fusion.OperationsApi")
+@patch("fusion.ArraysApi")
+def test_arrays_invalid(
+    m_arrays_api, m_op_api, module_args, arrays_api, operations_api
+):
+    m_arrays_api.return_value = arrays_api
+    m_op_api.return_value = operations_api
+    module_args["arrays"].append({"name": "b1", "availability_zone": "az2"})
+    set_module_args(module_args)
+
+    with pytest.raises(AnsibleFailJson) as exc:
+        fusion_arrays.main()
+
+    assert (
+        "b1 (availability zone az2) is missing hardware_type, host_name, appliance_id"
+        in str(exc.value)
+    )
+    arrays_api.create_array.assert_not_called()
+    arrays_api.update_array.assert_not_called()
+
+
+@patch("fusion.OperationsApi")
+@patch("fusion.ArraysApi")
+def test_arrays_create_failed(
+    m_arrays_api, m_op_api, module_args, arrays_api, operations_api
+):
+    m_arrays_api.return_value = arrays_api
+    m_op_api.return_value = operations_api
+    create = arrays_api.create_array.side_effect
+
+    def _create(array, **kwargs):
+        if array.name == "b0":
+            raise ApiExceptionsMockGenerator.create_conflict()
+        return create(array, **kwargs)
+
+    arrays_api.create_array = MagicMock(side_effect=_create)
+    set_module_args(module_args)
+
+    with pytest.raises(AnsibleFailJson) as exc:
+        fusion_arrays.main()
+
+    assert "1 of 3 arrays failed" in str(exc.value)
+    assert exc.value.kwargs["changed"]
+    report = dict((a["name"], a) for a in exc.value.kwargs["arrays"])
+    assert report["b0"]["error"] is not None
+    assert report["b0"]["updated"] == []
+    assert report["a2"]["error"] is None
+    # array which failed to be created is not updated
+    arrays_api.update_array.assert_has_calls([_maintenance("az1", "a2")])
+    assert arrays_api.update_array.call_count == 2
+
+
+@patch("fusion.OperationsApi")
+@patch("fusion.ArraysApi")
+def test_arrays_check_mode(
+    m_arrays_api, m_op_api, module_args, arrays_api, operations_api
+):
+    m_arrays_api.return_value = arrays_api
+    m_op_api.return_value = operations_api
+    module_args["_ansible_check_mode"] = True
+    set_module_args(module_args)
+
+    with pytest.raises(AnsibleExitJson) as exc:
+        fusion_arrays.main()
+
+    assert exc.value.changed
+    assert [(a["name"], a["created"]) for a in exc.value.kwargs["arrays"]] == [
+        ("a1", False),
+        ("a2", True),
+        ("b0", True),
+    ]
+    assert arrays_api.list_arrays.call_count == 2
+    arrays_api.create_array.assert_not_called()
+    arrays_api.update_array.assert_not_called()
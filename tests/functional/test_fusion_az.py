@@ -26,6 +26,9 @@ from ansible_collections.purestorage.fusion.tests.functional.utils import (
     fail_json,
     set_module_args,
 )
+from ansible_collections.purestorage.fusion.tests.helpers import (
+    ApiExceptionsMockGenerator,
+)
 from urllib3.exceptions import HTTPError
 
 # GLOBAL MOCKS
@@ -715,3 +718,101 @@ def test_az_delete_op_exception(m_az_api, m_op_api, exec_original, exec_catch):
         region_name=module_args["region"],
     )
     op_obj.get_operation.assert_called_once_with(3)
+
+
+@patch("fusion.OperationsApi")
+@patch("fusion.AvailabilityZonesApi")
+def test_az_optimistic_create(m_az_api, m_op_api):
+    module_args = {
+        "state": "present",
+        "name": "az1",
+        "region": "region1",
+        "display_name": "Availability Zone 1",
+        "optimistic_create": True,
+        "issuer_id": "ABCD1234",
+        "private_key_file": "private-key.pem",
+    }
+    set_module_args(module_args)
+
+    # mock api responses
+    api_obj = MagicMock()
+    api_obj.get_availability_zone = MagicMock(side_effect=purefusion.rest.ApiException)
+    api_obj.create_availability_zone = MagicMock(return_value=OperationMock(1))
+    m_az_api.return_value = api_obj
+
+    # mock operation results
+    op_obj = MagicMock()
+    op_obj.get_operation = MagicMock(return_value=SuccessfulOperationMock)
+    m_op_api.return_value = op_obj
+
+    # run module
+    with pytest.raises(AnsibleExitJson) as exc:
+        fusion_az.main()
+
+    assert exc.value.changed
+
+    # existence is not checked before creation
+    api_obj.get_availability_zone.assert_not_called()
+    api_obj.create_availability_zone.assert_called_once_with(
+        purefusion.AvailabilityZonePost(
+            name=module_args["name"],
+            display_name=module_args["display_name"],
+        ),
+        region_name=module_args["region"],
+    )
+    op_obj.get_operation.assert_called_once_with(1)
+
+
+@patch("fusion.OperationsApi")
+@patch("fusion.AvailabilityZonesApi")
+@pytest.mark.parametrize("already_exists_in", ["request", "operation"])
+def test_az_optimistic_create_already_exists(m_az_api, m_op_api, already_exists_in):
+    module_args = {
+        "state": "present",
+        "name": "az1",
+        "region": "region1",
+        "display_name": "Availability Zone 1",
+        "optimistic_create": True,
+        "issuer_id": "ABCD1234",
+        "private_key_file": "private-key.pem",
+    }
+    current_az = {
+        "id": 1,
+        "self_link": "self_link_value",
+        "name": module_args["name"],
+        "region": module_args["region"],
+        "display_name": module_args["display_name"],
+    }
+    set_module_args(module_args)
+
+    # mock api responses
+    api_obj = MagicMock()
+    api_obj.get_availability_zone = MagicMock(
+        return_value=purefusion.AvailabilityZone(**current_az)
+    )
+    op_obj = MagicMock()
+    if already_exists_in == "request":
+        api_obj.create_availability_zone = MagicMock(
+            side_effect=ApiExceptionsMockGenerator.create_conflict()
+        )
+    else:
+        api_obj.create_availability_zone = MagicMock(return_value=OperationMock(1))
+        failed_op = MagicMock()
+        failed_op.status = "Failed"
+        failed_op.error.pure_code = "ALREADY_EXISTS"
+        failed_op.error.http_code = 409
+        op_obj.get_operation = MagicMock(return_value=failed_op)
+    m_az_api.return_value = api_obj
+    m_op_api.return_value = op_obj
+
+    # run module
+    with pytest.raises(AnsibleExitJson) as exc:
+        fusion_az.main()
+
+    # falls back to reading the existing availability zone
+    assert not exc.value.changed
+    api_obj.create_availability_zone.assert_called_once()
+    api_obj.get_availability_zone.assert_called_once_with(
+        availability_zone_name=module_args["name"],
+        region_name=module_args["region"],
+    )
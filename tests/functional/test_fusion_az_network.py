@@ -0,0 +1,349 @@
+# -*- coding: utf-8 -*-
+
+# (c) 2023, Pure Storage, Inc.
+# GNU General Public License v3.0+ (see COPYING.GPLv3 or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+from unittest.mock import MagicMock, call, patch
+
+import fusion as purefusion
+import pytest
+from ansible.module_utils import basic
+from ansible_collections.purestorage.fusion.plugins.modules import fusion_az_network
+from ansible_collections.purestorage.fusion.tests.functional.utils import (
+    AnsibleExitJson,
+    AnsibleFailJson,
+    OperationMock,
+    SuccessfulOperationMock,
+    exit_json,
+    fail_json,
+    set_module_args,
+)
+from ansible_collections.purestorage.fusion.tests.helpers import (
+    ApiExceptionsMockGenerator,
+)
+
+# GLOBAL MOCKS
+fusion_az_network.setup_fusion = MagicMock(
+    return_value=purefusion.api_client.ApiClient()
+)
+purefusion.api_client.ApiClient.call_api = MagicMock(
+    side_effect=Exception("API call not mocked!")
+)
+basic.AnsibleModule.exit_json = exit_json
+basic.AnsibleModule.fail_json = fail_json
+
+
+@pytest.fixture
+def module_args():
+    return {
+        "region": "region1",
+        "availability_zone": "az1",
+        "network_interface_groups": [
+            # exists
+            {"name": "nig0", "prefix": "10.0.0.0/24"},
+            {"name": "nig1", "prefix": "10.0.1.0/24", "gateway": "10.0.1.1"},
+            {"name": "nig2", "prefix": "10.0.2.0/24", "mtu": 9000},
+        ],
+        "storage_endpoints": [
+            # exists
+            {
+                "name": "se0",
+                "iscsi": [
+                    {"address": "10.0.0.5/24", "network_interface_groups": ["nig0"]}
+                ],
+            },
+            {
+                "name": "se1",
+                "iscsi": [
+                    {
+                        "address": "10.0.1.5/24",
+                        "gateway": "10.0.1.1",
+                        "network_interface_groups": ["nig1"],
+                    },
+                    {"address": "10.0.0.6/24", "network_interface_groups": ["nig0"]},
+                ],
+            },
+            {
+                "name": "se2",
+                "iscsi": [
+                    {"address": "10.0.2.5/24", "network_interface_groups": ["nig2"]}
+                ],
+            },
+        ],
+        "issuer_id": "ABCD1234",
+        "private_key_file": "private-key.pem",
+    }
+
+
+def _list(cls, items):
+    return cls(count=len(items), more_items_remaining=False, items=items)
+
+
+@pytest.fixture
+def nig_api():
+    nig = purefusion.NetworkInterfaceGroup(
+        id="nig0_id",
+        self_link="self_link_value",
+        name="nig0",
+        display_name="nig0",
+        region=purefusion.RegionRef(
+            id="region1_id", name="region1", kind="Region", self_link="link"
+        ),
+        availability_zone=purefusion.AvailabilityZoneRef(
+            id="az1_id", name="az1", kind="AvailabilityZone", self_link="link"
+        ),
+        group_type="eth",
+        eth=purefusion.NetworkInterfaceGroupEth(
+            prefix="10.0.0.0/24", gateway="10.0.0.1", vlan=None, mtu=1500
+        ),
+    )
+    api = MagicMock()
+    api.list_network_interface_groups = MagicMock(
+        return_value=_list(purefusion.NetworkInterfaceGroupList, [nig])
+    )
+    api.create_network_interface_group = MagicMock(return_value=OperationMock(1))
+    return api
+
+
+@pytest.fixture
+def se_api():
+    se = MagicMock()
+    se.name = "se0"
+    api = MagicMock()
+    api.list_storage_endpoints = MagicMock(
+        return_value=purefusion.StorageEndpointList(
+            count=1, more_items_remaining=False, items=[se]
+        )
+    )
+    api.create_storage_endpoint = MagicMock(return_value=OperationMock(2))
+    return api
+
+
+@pytest.fixture
+def operations_api():
+    api = MagicMock()
+    api.list_operations = MagicMock(side_effect=purefusion.rest.ApiException)
+    api.get_operation = MagicMock(return_value=SuccessfulOperationMock)
+    return api
+
+
+def _se_post(name, *ifaces):
+    return call(
+        purefusion.StorageEndpointPost(
+            name=name,
+            display_name=name,
+            endpoint_type="iscsi",
+            iscsi=purefusion.StorageEndpointIscsiPost(
+                discovery_interfaces=[
+                    purefusion.StorageEndpointIscsiDiscoveryInterfacePost(**iface)
+                    for iface in ifaces
+                ]
+            ),
+        ),
+        region_name="region1",
+        availability_zone_name="az1",
+    )
+
+
+@patch("fusion.OperationsApi")
+@patch("fusion.StorageEndpointsApi")
+@patch("fusion.NetworkInterfaceGroupsApi")
+def test_az_network_create(
+    m_nig_api, m_se_api, m_op_api, module_args, nig_api, se_api, operations_api
+):
+    m_nig_api.return_value = nig_api
+    m_se_api.return_value = se_api
+    m_op_api.return_value = operations_api
+    set_module_args(module_args)
+
+    with pytest.raises(AnsibleExitJson) as exc:
+        fusion_az_network.main()
+
+    assert exc.value.changed
+    assert exc.value.kwargs["network_interface_groups"] == [
+        {"name": "nig1", "error": None},
+        {"name": "nig2", "error": None},
+    ]
+    assert exc.value.kwargs["storage_endpoints"] == [
+        {"name": "se1", "error": None},
+        {"name": "se2", "error": None},
+    ]
+    assert set(exc.value.kwargs["timing"]) == {
+        "discovery",
+        "validation",
+        "network_interface_groups",
+        "storage_endpoints",
+    }
+    nig_api.list_network_interface_groups.assert_called_once_with(
+        region_name="region1", availability_zone_name="az1"
+    )
+    se_api.list_storage_endpoints.assert_called_once_with(
+        region_name="region1", availability_zone_name="az1"
+    )
+    nig_api.create_network_interface_group.assert_has_calls(
+        [
+            call(
+                purefusion.NetworkInterfaceGroupPost(
+                    group_type="eth",
+                    eth=purefusion.NetworkInterfaceGroupEthPost(
+                        prefix="10.0.1.0/24", gateway="10.0.1.1", mtu=1500
+                    ),
+                    name="nig1",
+                    display_name="nig1",
+                ),
+                availability_zone_name="az1",
+                region_name="region1",
+            ),
+            call(
+                purefusion.NetworkInterfaceGroupPost(
+                    group_type="eth",
+                    eth=purefusion.NetworkInterfaceGroupEthPost(
+                        prefix="10.0.2.0/24", mtu=9000
+                    ),
+                    name="nig2",
+                    display_name="nig2",
+                ),
+                availability_zone_name="az1",
+                region_name="region1",
+            ),
+        ],
+        any_order=True,
+    )
+    assert nig_api.create_network_interface_group.call_count == 2
+    se_api.create_storage_endpoint.assert_has_calls(
+        [
+            _se_post(
+                "se1",
+                {
+                    "address": "10.0.1.5/24",
+                    "gateway": "10.0.1.1",
+                    "network_interface_groups": ["nig1"],
+                },
+                {
+                    "address": "10.0.0.6/24",
+                    "gateway": None,
+                    "network_interface_groups": ["nig0"],
+                },
+            ),
+            _se_post(
+                "se2",
+                {
+                    "address": "10.0.2.5/24",
+                    "gateway": None,
+                    "network_interface_groups": ["nig2"],
+                },
+            ),
+        ],
+        any_order=True,
+    )
+    assert se_api.create_storage_endpoint.call_count == 2
+
+
+@patch("fusion.OperationsApi")
+@patch("fusion.StorageEndpointsApi")
+@patch("fusion.NetworkInterfaceGroupsApi")
+def test_az_network_invalid(
+    m_nig_api, m_se_api, m_op_api, module_args, nig_api, se_api, operations_api
+):
+    m_nig_api.return_value = nig_api
+    m_se_api.return_value = se_api
+    m_op_api.return_value = operations_api
+    module_args["network_interface_groups"][0]["prefix"] = "10.0.9.0/24"
+    module_args["network_interface_groups"].extend(
+        [
+            {"name": "nig3", "prefix": "10.0.3.0/24", "gateway": "10.0.4.1"},
+            {"name": "nig4", "prefix": "10.0.4.0"},
+        ]
+    )
+    module_args["storage_endpoints"].append(
+        {
+            "name": "se3",
+            "iscsi": [
+                {"address": "10.0.1.5/24", "network_interface_groups": ["nig1"]},
+                {"address": "10.0.3.5/24", "network_interface_groups": ["nig2"]},
+                {"address": "10.0.5.5/24", "network_interface_groups": ["nig5"]},
+                {"address": "10.0.6.5/24", "gateway": "10.0.7.1"},
+            ],
+        }
+    )
+    set_module_args(module_args)
+
+    with pytest.raises(AnsibleFailJson) as exc:
+        fusion_az_network.main()
+
+    # all problems are reported at once
+    msg = str(exc.value)
+    assert (
+        "network interface group 'nig0' already exists with prefix 10.0.0.0/24" in msg
+    )
+    assert "gateway 10.0.4.1 of network interface group 'nig3' is not in subnet" in msg
+    assert "prefix 10.0.4.0 of network interface group 'nig4' is not a valid" in msg
+    assert (
+        "address 10.0.1.5/24 of storage endpoint 'se3' is already used by 'se1'" in msg
+    )
+    assert (
+        "address 10.0.3.5/24 of storage endpoint 'se3' is not in prefix 10.0.2.0/24"
+        in msg
+    )
+    assert "network interface group 'nig5' of address 10.0.5.5/24" in msg
+    assert "gateway 10.0.7.1 of address 10.0.6.5/24" in msg
+    nig_api.create_network_interface_group.assert_not_called()
+    se_api.create_storage_endpoint.assert_not_called()
+
+
+@patch("fusion.OperationsApi")
+@patch("fusion.StorageEndpointsApi")
+@patch("fusion.NetworkInterfaceGroupsApi")
+def test_az_network_nig_failed(
+    m_nig_api, m_se_api, m_op_api, module_args, nig_api, se_api, operations_api
+):
+    m_nig_api.return_value = nig_api
+    m_se_api.return_value = se_api
+    m_op_api.return_value = operations_api
+
+    def _create_nig(nig, **kwargs):
+        if nig.name == "nig1":
+            raise ApiExceptionsMockGenerator.create_conflict()
+        return OperationMock(1)
+
+    nig_api.create_network_interface_group = MagicMock(side_effect=_create_nig)
+    set_module_args(module_args)
+
+    with pytest.raises(AnsibleFailJson) as exc:
+        fusion_az_network.main()
+
+    assert "2 of 4 network resources failed" in str(exc.value)
+    assert exc.value.kwargs["changed"]
+    assert exc.value.kwargs["storage_endpoints"][0] == {
+        "name": "se1",
+        "error": "network interface group 'nig1' was not created",
+    }
+    # endpoint using only created groups is still created
+    se_api.create_storage_endpoint.assert_called_once()
+    assert se_api.create_storage_endpoint.call_args.args[0].name == "se2"
+
+
+@patch("fusion.OperationsApi")
+@patch("fusion.StorageEndpointsApi")
+@patch("fusion.NetworkInterfaceGroupsApi")
+def test_az_network_check_mode(
+    m_nig_api, m_se_api, m_op_api, module_args, nig_api, se_api, operations_api
+):
+    m_nig_api.return_value = nig_api
+    m_se_api.return_value = se_api
+    m_op_api.return_value = operations_api
+    module_args["_ansible_check_mode"] = True
+    set_module_args(module_args)
+
+    with pytest.raises(AnsibleExitJson) as exc:
+        fusion_az_network.main()
+
+    assert exc.value.changed
+    assert len(exc.value.kwargs["network_interface_groups"]) == 2
+    assert len(exc.value.kwargs["storage_endpoints"]) == 2
+    nig_api.create_network_interface_group.assert_not_called()
+    se_api.create_storage_endpoint.assert_not_called()
@@ -613,7 +613,7 @@ def test_hap_update(m_hap_api, m_op_api, module_args, current_hap_list):
     assert exc.value.changed is False
 
     # check api was called correctly
-    api_obj.list_host_access_policies.assert_called_once_with()
+    api_obj.list_host_access_policies.assert_not_called()
     api_obj.get_host_access_policy.assert_called_once_with(
         host_access_policy_name=module_args["name"]
     )
@@ -654,7 +654,7 @@ def test_hap_present_not_changed(m_hap_api, m_op_api, module_args, current_hap_l
     assert exc.value.changed is False
 
     # check api was called correctly
-    api_obj.list_host_access_policies.assert_called_once_with()
+    api_obj.list_host_access_policies.assert_not_called()
     api_obj.get_host_access_policy.assert_called_once_with(
         host_access_policy_name=module_args["name"]
     )
@@ -691,7 +691,7 @@ def test_hap_absent_not_changed(m_hap_api, m_op_api, module_args, current_hap_li
     assert exc.value.changed is False
 
     # check api was called correctly
-    api_obj.list_host_access_policies.assert_called_once_with()
+    api_obj.list_host_access_policies.assert_not_called()
     api_obj.get_host_access_policy.assert_called_once_with(
         host_access_policy_name=module_args["name"]
     )
@@ -733,7 +733,7 @@ def test_hap_delete(m_hap_api, m_op_api, module_args, current_hap_list):
     assert exc.value.changed is True
 
     # check api was called correctly
-    api_obj.list_host_access_policies.assert_called_once_with()
+    api_obj.list_host_access_policies.assert_not_called()
     api_obj.get_host_access_policy.assert_called_once_with(
         host_access_policy_name=module_args["name"]
     )
@@ -784,7 +784,7 @@ def test_hap_delete_exception(
         fusion_hap.main()
 
     # check api was called correctly
-    api_obj.list_host_access_policies.assert_called_once_with()
+    api_obj.list_host_access_policies.assert_not_called()
     api_obj.get_host_access_policy.assert_called_once_with(
         host_access_policy_name=module_args["name"]
     )
@@ -826,7 +826,7 @@ def test_hap_delete_op_fails(m_hap_api, m_op_api, module_args, current_hap_list)
         fusion_hap.main()
 
     # check api was called correctly
-    api_obj.list_host_access_policies.assert_called_once_with()
+    api_obj.list_host_access_policies.assert_not_called()
     api_obj.get_host_access_policy.assert_called_once_with(
         host_access_policy_name=module_args["name"]
     )
@@ -877,7 +877,7 @@ def test_hap_delete_op_exception(
         fusion_hap.main()
 
     # check api was called correctly
-    api_obj.list_host_access_policies.assert_called_once_with()
+    api_obj.list_host_access_policies.assert_not_called()
     api_obj.get_host_access_policy.assert_called_once_with(
         host_access_policy_name=module_args["name"]
     )
@@ -887,3 +887,99 @@ def test_hap_delete_op_exception(
         host_access_policy_name=module_args["name"]
     )
     op_obj.get_operation.assert_called_once_with(3)
+
+
+@patch("fusion.OperationsApi")
+@patch("fusion.HostAccessPoliciesApi")
+def test_hap_iqn_index_cache(
+    m_hap_api, m_op_api, module_args, current_hap_list, tmp_path
+):
+    current_hap = current_hap_list.items[0]
+    module_args["name"] = current_hap.name
+    module_args["iqn"] = current_hap.iqn
+    module_args["index_cache"] = str(tmp_path / "index.json")
+
+    # mock api responses
+    api_obj = MagicMock()
+    api_obj.list_host_access_policies = MagicMock(return_value=current_hap_list)
+    api_obj.get_host_access_policy = MagicMock(return_value=current_hap)
+    m_hap_api.return_value = api_obj
+
+    # existing host access policy is not checked against the index
+    set_module_args(module_args)
+    with pytest.raises(AnsibleExitJson) as exc:
+        fusion_hap.main()
+    assert exc.value.changed is False
+    api_obj.list_host_access_policies.assert_not_called()
+
+    # the index is built by the first run only
+    module_args["name"] = "hap_new"
+    module_args["iqn"] = "iqn.2023-05.com.purestorage:420qp2c0699"
+    api_obj.get_host_access_policy = MagicMock(side_effect=purefusion.rest.ApiException)
+    api_obj.create_host_access_policy = MagicMock(return_value=OperationMock(1))
+    for _ in range(3):
+        set_module_args(dict(module_args, _ansible_check_mode=True))
+        with pytest.raises(AnsibleExitJson) as exc:
+            fusion_hap.main()
+        assert exc.value.changed is True
+    api_obj.list_host_access_policies.assert_called_once_with()
+    api_obj.create_host_access_policy.assert_not_called()
+
+    # creation invalidates the cached index
+    set_module_args(module_args)
+    op_obj = MagicMock()
+    op_obj.get_operation = MagicMock(return_value=SuccessfulOperationMock)
+    m_op_api.return_value = op_obj
+    with pytest.raises(AnsibleExitJson) as exc:
+        fusion_hap.main()
+    assert exc.value.changed is True
+
+    set_module_args(module_args)
+    with pytest.raises(AnsibleExitJson):
+        fusion_hap.main()
+    assert api_obj.list_host_access_policies.call_count == 2
+
+
+@patch("fusion.OperationsApi")
+@patch("fusion.HostAccessPoliciesApi")
+def test_hap_iqn_index_cache_stale_conflict(
+    m_hap_api, m_op_api, module_args, current_hap_list, tmp_path
+):
+    module_args["iqn"] = current_hap_list.items[0].iqn
+    module_args["index_cache"] = str(tmp_path / "index.json")
+
+    # hap1 which used the IQN is deleted after the index was cached
+    api_obj = MagicMock()
+    api_obj.list_host_access_policies = MagicMock(
+        side_effect=[
+            current_hap_list,
+            fusion.HostAccessPolicyList(
+                count=2, more_items_remaining=False, items=current_hap_list.items[1:]
+            ),
+        ]
+    )
+    api_obj.get_host_access_policy = MagicMock(side_effect=purefusion.rest.ApiException)
+    api_obj.create_host_access_policy = MagicMock(return_value=OperationMock(1))
+    m_hap_api.return_value = api_obj
+    op_obj = MagicMock()
+    op_obj.get_operation = MagicMock(return_value=SuccessfulOperationMock)
+    m_op_api.return_value = op_obj
+
+    set_module_args(
+        dict(
+            module_args,
+            name="hap_other",
+            iqn="iqn.2023-05.com.purestorage:420qp2c0699",
+            _ansible_check_mode=True,
+        )
+    )
+    with pytest.raises(AnsibleExitJson):
+        fusion_hap.main()
+
+    set_module_args(module_args)
+    with pytest.raises(AnsibleExitJson) as exc:
+        fusion_hap.main()
+
+    assert exc.value.changed is True
+    assert api_obj.list_host_access_policies.call_count == 2
+    api_obj.create_host_access_policy.assert_called_once()
@@ -0,0 +1,304 @@
+# -*- coding: utf-8 -*-
+
+# (c) 2023, Pure Storage, Inc.
+# GNU General Public License v3.0+ (see COPYING.GPLv3 or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+from unittest.mock import MagicMock, call, patch
+
+import fusion as purefusion
+import pytest
+from ansible.module_utils import basic
+from ansible_collections.purestorage.fusion.plugins.modules import (
+    fusion_hap_volumes,
+)
+from ansible_collections.purestorage.fusion.tests.functional.utils import (
+    AnsibleExitJson,
+    AnsibleFailJson,
+    OperationMock,
+    SuccessfulOperationMock,
+    exit_json,
+    fail_json,
+    set_module_args,
+)
+from ansible_collections.purestorage.fusion.tests.helpers import (
+    ApiExceptionsMockGenerator,
+)
+
+# GLOBAL MOCKS
+fusion_hap_volumes.setup_fusion = MagicMock(
+    return_value=purefusion.api_client.ApiClient()
+)
+purefusion.api_client.ApiClient.call_api = MagicMock(
+    side_effect=Exception("API call not mocked!")
+)
+basic.AnsibleModule.exit_json = exit_json
+basic.AnsibleModule.fail_json = fail_json
+
+
+@pytest.fixture
+def module_args():
+    return {
+        "host_access_policy": "hap2",
+        "tenant": "t1",
+        "tenant_space": "ts1",
+        "issuer_id": "ABCD1234",
+        "private_key_file": "private-key.pem",
+    }
+
+
+def _volume(name, placement_group, haps, destroyed=False):
+    return purefusion.Volume(
+        id="{0}_id".format(name),
+        name=name,
+        display_name=name,
+        self_link="self_link",
+        size=1048576,
+        tenant=purefusion.TenantRef(
+            id="t1_id", name="t1", kind="Tenant", self_link="self_link"
+        ),
+        tenant_space=purefusion.TenantSpaceRef(
+            id="ts1_id", name="ts1", kind="TenantSpace", self_link="self_link"
+        ),
+        storage_class=purefusion.StorageClassRef(
+            id="sc1_id", name="sc1", kind="StorageClass", self_link="self_link"
+        ),
+        placement_group=purefusion.PlacementGroupRef(
+            id="pg_id", name=placement_group, kind="PlacementGroup", self_link="link"
+        ),
+        host_access_policies=[
+            purefusion.HostAccessPolicyRef(
+                id="hap_id", name=hap, kind="HostAccessPolicy", self_link="link"
+            )
+            for hap in haps
+        ],
+        serial_number="sn",
+        destroyed=destroyed,
+    )
+
+
+@pytest.fixture
+def volumes_api():
+    volumes = [
+        _volume("db-1", "pg1", ["hap1"]),
+        _volume("db-2", "pg1", ["hap1", "hap2"]),
+        _volume("web-1", "pg2", []),
+        _volume("db-3", "pg1", [], destroyed=True),
+    ]
+    api = MagicMock()
+    api.list_volumes = MagicMock(
+        return_value=purefusion.VolumeList(
+            count=len(volumes), more_items_remaining=False, items=volumes
+        )
+    )
+    api.update_volume = MagicMock(return_value=OperationMock(1))
+    return api
+
+
+@pytest.fixture
+def operations_api():
+    api = MagicMock()
+    api.list_operations = MagicMock(side_effect=purefusion.rest.ApiException)
+    api.get_operation = MagicMock(return_value=SuccessfulOperationMock)
+    return api
+
+
+def _hap_patch(haps):
+    return purefusion.VolumePatch(
+        host_access_policies=purefusion.NullableString(",".join(haps))
+    )
+
+
+@patch("fusion.OperationsApi")
+@patch("fusion.VolumesApi")
+@pytest.mark.parametrize(
+    ("selector", "expected_report", "expected_patches"),
+    [
+        # whole tenant space, destroyed volumes are skipped
+        (
+            {"name_pattern": "*"},
+            [("db-1", True), ("db-2", False), ("web-1", True)],
+            [("db-1", ["hap1", "hap2"]), ("web-1", ["hap2"])],
+        ),
+        # placement group
+        (
+            {"placement_group": "pg1"},
+            [("db-1", True), ("db-2", False)],
+            [("db-1", ["hap1", "hap2"])],
+        ),
+        # name pattern
+        (
+            {"name_pattern": "web-*"},
+            [("web-1", True)],
+            [("web-1", ["hap2"])],
+        ),
+        # explicit list
+        (
+            {"volumes": ["web-1", "db-2"]},
+            [("web-1", True), ("db-2", False)],
+            [("web-1", ["hap2"])],
+        ),
+    ],
+)
+def test_hap_attach(
+    m_volumes_api,
+    m_op_api,
+    module_args,
+    volumes_api,
+    operations_api,
+    selector,
+    expected_report,
+    expected_patches,
+):
+    m_volumes_api.return_value = volumes_api
+    m_op_api.return_value = operations_api
+    module_args.update(selector)
+    set_module_args(module_args)
+
+    with pytest.raises(AnsibleExitJson) as exc:
+        fusion_hap_volumes.main()
+
+    assert exc.value.changed
+    assert [
+        (v["name"], v["changed"]) for v in exc.value.kwargs["volumes"]
+    ] == expected_report
+    volumes_api.list_volumes.assert_called_once_with(
+        offset=0, tenant_name="t1", tenant_space_name="ts1"
+    )
+    volumes_api.update_volume.assert_has_calls(
+        [
+            call(
+                _hap_patch(haps),
+                volume_name=name,
+                tenant_name="t1",
+                tenant_space_name="ts1",
+            )
+            for name, haps in expected_patches
+        ],
+        any_order=True,
+    )
+    assert volumes_api.update_volume.call_count == len(expected_patches)
+
+
+@patch("fusion.OperationsApi")
+@patch("fusion.VolumesApi")
+def test_hap_detach(m_volumes_api, m_op_api, module_args, volumes_api, operations_api):
+    m_volumes_api.return_value = volumes_api
+    m_op_api.return_value = operations_api
+    module_args.update({"state": "absent", "name_pattern": "db-*"})
+    set_module_args(module_args)
+
+    with pytest.raises(AnsibleExitJson) as exc:
+        fusion_hap_volumes.main()
+
+    assert exc.value.changed
+    volumes_api.update_volume.assert_called_once_with(
+        _hap_patch(["hap1"]),
+        volume_name="db-2",
+        tenant_name="t1",
+        tenant_space_name="ts1",
+    )
+
+
+@patch("fusion.OperationsApi")
+@patch("fusion.VolumesApi")
+def test_hap_not_changed(
+    m_volumes_api, m_op_api, module_args, volumes_api, operations_api
+):
+    m_volumes_api.return_value = volumes_api
+    m_op_api.return_value = operations_api
+    module_args.update({"state": "absent", "placement_group": "pg2"})
+    set_module_args(module_args)
+
+    with pytest.raises(AnsibleExitJson) as exc:
+        fusion_hap_volumes.main()
+
+    assert not exc.value.changed
+    volumes_api.update_volume.assert_not_called()
+
+
+@patch("fusion.OperationsApi")
+@patch("fusion.VolumesApi")
+def test_hap_check_mode(
+    m_volumes_api, m_op_api, module_args, volumes_api, operations_api
+):
+    m_volumes_api.return_value = volumes_api
+    m_op_api.return_value = operations_api
+    module_args.update({"name_pattern": "*", "_ansible_check_mode": True})
+    set_module_args(module_args)
+
+    with pytest.raises(AnsibleExitJson) as exc:
+        fusion_hap_volumes.main()
+
+    assert exc.value.changed
+    volumes_api.update_volume.assert_not_called()
+
+
+@patch("fusion.OperationsApi")
+@patch("fusion.VolumesApi")
+def test_hap_no_selector(
+    m_volumes_api, m_op_api, module_args, volumes_api, operations_api
+):
+    m_volumes_api.return_value = volumes_api
+    m_op_api.return_value = operations_api
+    set_module_args(module_args)
+
+    with pytest.raises(AnsibleFailJson):
+        fusion_hap_volumes.main()
+
+    volumes_api.list_volumes.assert_not_called()
+    volumes_api.update_volume.assert_not_called()
+
+
+@patch("fusion.OperationsApi")
+@patch("fusion.VolumesApi")
+@pytest.mark.parametrize(
+    "volumes",
+    [
+        # nonexistent volume
+        ["db-1", "db-4"],
+        # destroyed volume
+        ["db-3"],
+    ],
+)
+def test_hap_wrong_volumes(
+    m_volumes_api, m_op_api, module_args, volumes_api, operations_api, volumes
+):
+    m_volumes_api.return_value = volumes_api
+    m_op_api.return_value = operations_api
+    module_args["volumes"] = volumes
+    set_module_args(module_args)
+
+    with pytest.raises(AnsibleFailJson):
+        fusion_hap_volumes.main()
+
+    volumes_api.update_volume.assert_not_called()
+
+
+@patch("fusion.OperationsApi")
+@patch("fusion.VolumesApi")
+def test_hap_partial_failure(
+    m_volumes_api, m_op_api, module_args, volumes_api, operations_api
+):
+    def _update_volume(patch, volume_name, **kwargs):
+        if volume_name == "web-1":
+            raise ApiExceptionsMockGenerator.create_permission_denied()
+        return OperationMock(1)
+
+    volumes_api.update_volume = MagicMock(side_effect=_update_volume)
+    m_volumes_api.return_value = volumes_api
+    m_op_api.return_value = operations_api
+    module_args["name_pattern"] = "*"
+    set_module_args(module_args)
+
+    with pytest.raises(AnsibleFailJson) as exc:
+        fusion_hap_volumes.main()
+
+    assert "1 of 2 volumes failed" in str(exc.value)
+    report = dict((v["name"], v["error"]) for v in exc.value.kwargs["volumes"])
+    assert report["web-1"] is not None
+    assert report["db-1"] is None
+    assert volumes_api.update_volume.call_count == 2
@@ -0,0 +1,264 @@
+# -*- coding: utf-8 -*-
+
+# (c) 2023, Pure Storage, Inc.
+# GNU General Public License v3.0+ (see COPYING.GPLv3 or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+from unittest.mock import MagicMock, call, patch
+
+import fusion as purefusion
+import pytest
+from ansible.module_utils import basic
+from ansible_collections.purestorage.fusion.plugins.modules import fusion_haps
+from ansible_collections.purestorage.fusion.tests.functional.utils import (
+    AnsibleExitJson,
+    AnsibleFailJson,
+    OperationMock,
+    SuccessfulOperationMock,
+    exit_json,
+    fail_json,
+    set_module_args,
+)
+from ansible_collections.purestorage.fusion.tests.helpers import (
+    ApiExceptionsMockGenerator,
+)
+
+# GLOBAL MOCKS
+fusion_haps.setup_fusion = MagicMock(return_value=purefusion.api_client.ApiClient())
+purefusion.api_client.ApiClient.call_api = MagicMock(
+    side_effect=Exception("API call not mocked!")
+)
+basic.AnsibleModule.exit_json = exit_json
+basic.AnsibleModule.fail_json = fail_json
+
+IQN = "iqn.2023-05.com.purestorage:host{0}"
+
+
+@pytest.fixture
+def module_args():
+    return {
+        "policies": [
+            # exists
+            {"name": "host1", "iqn": IQN.format(1), "personality": "aix"},
+            {"name": "host4", "iqn": IQN.format(4)},
+            {"name": "host5", "iqn": IQN.format(5), "display_name": "Host 5"},
+        ],
+        "issuer_id": "ABCD1234",
+        "private_key_file": "private-key.pem",
+    }
+
+
+def _hap(index, personality="linux"):
+    return purefusion.HostAccessPolicy(
+        id="{0}".format(index),
+        self_link="self_link_value",
+        name="host{0}".format(index),
+        display_name="host{0}".format(index),
+        iqn=IQN.format(index),
+        personality=personality,
+    )
+
+
+@pytest.fixture
+def haps_api():
+    haps = [_hap(1, "aix"), _hap(2), _hap(3)]
+    api = MagicMock()
+    api.list_host_access_policies = MagicMock(
+        return_value=purefusion.HostAccessPolicyList(
+            count=len(haps), more_items_remaining=False, items=haps
+        )
+    )
+    api.create_host_access_policy = MagicMock(return_value=OperationMock(1))
+    api.delete_host_access_policy = MagicMock(return_value=OperationMock(2))
+    return api
+
+
+@pytest.fixture
+def operations_api():
+    api = MagicMock()
+    api.list_operations = MagicMock(side_effect=purefusion.rest.ApiException)
+    api.get_operation = MagicMock(return_value=SuccessfulOperationMock)
+    return api
+
+
+def _post(index, display_name=None):
+    return call(
+        purefusion.HostAccessPoliciesPost(
+            iqn=IQN.format(index),
+            personality="linux",
+            name="host{0}".format(index),
+            display_name=display_name or "host{0}".format(index),
+        )
+    )
+
+
+@patch("fusion.OperationsApi")
+@patch("fusion.HostAccessPoliciesApi")
+def test_haps_create(m_haps_api, m_op_api, module_args, haps_api, operations_api):
+    m_haps_api.return_value = haps_api
+    m_op_api.return_value = operations_api
+    set_module_args(module_args)
+
+    with pytest.raises(AnsibleExitJson) as exc:
+        fusion_haps.main()
+
+    assert exc.value.changed
+    assert [(p["name"], p["action"]) for p in exc.value.kwargs["policies"]] == [
+        ("host4", "create"),
+        ("host5", "create"),
+    ]
+    haps_api.list_host_access_policies.assert_called_once_with()
+    haps_api.create_host_access_policy.assert_has_calls(
+        [_post(4), _post(5, "Host 5")], any_order=True
+    )
+    assert haps_api.create_host_access_policy.call_count == 2
+    haps_api.delete_host_access_policy.assert_not_called()
+
+
+@patch("fusion.OperationsApi")
+@patch("fusion.HostAccessPoliciesApi")
+def test_haps_purge_frees_iqn(
+    m_haps_api, m_op_api, module_args, haps_api, operations_api
+):
+    m_haps_api.return_value = haps_api
+    m_op_api.return_value = operations_api
+    # host2 is purged, so its IQN can be used by host4
+    module_args["policies"][1]["iqn"] = IQN.format(2)
+    module_args["purge"] = True
+    set_module_args(module_args)
+
+    with pytest.raises(AnsibleExitJson) as exc:
+        fusion_haps.main()
+
+    assert exc.value.changed
+    assert [(p["name"], p["action"]) for p in exc.value.kwargs["policies"]] == [
+        ("host2", "delete"),
+        ("host3", "delete"),
+        ("host4", "create"),
+        ("host5", "create"),
+    ]
+    haps_api.delete_host_access_policy.assert_has_calls(
+        [
+            call(host_access_policy_name="host2"),
+            call(host_access_policy_name="host3"),
+        ],
+        any_order=True,
+    )
+    assert haps_api.create_host_access_policy.call_count == 2
+
+
+@patch("fusion.OperationsApi")
+@patch("fusion.HostAccessPoliciesApi")
+def test_haps_delete(m_haps_api, m_op_api, module_args, haps_api, operations_api):
+    m_haps_api.return_value = haps_api
+    m_op_api.return_value = operations_api
+    module_args["state"] = "absent"
+    set_module_args(module_args)
+
+    with pytest.raises(AnsibleExitJson) as exc:
+        fusion_haps.main()
+
+    assert exc.value.changed
+    haps_api.delete_host_access_policy.assert_called_once_with(
+        host_access_policy_name="host1"
+    )
+    haps_api.create_host_access_policy.assert_not_called()
+
+
+@patch("fusion.OperationsApi")
+@patch("fusion.HostAccessPoliciesApi")
+def test_haps_not_changed(m_haps_api, m_op_api, haps_api, operations_api):
+    m_haps_api.return_value = haps_api
+    m_op_api.return_value = operations_api
+    set_module_args(
+        {
+            "policies": [{"name": "host2", "iqn": IQN.format(2)}],
+            "issuer_id": "ABCD1234",
+            "private_key_file": "private-key.pem",
+        }
+    )
+
+    with pytest.raises(AnsibleExitJson) as exc:
+        fusion_haps.main()
+
+    assert not exc.value.changed
+    assert exc.value.kwargs["policies"] == []
+    haps_api.create_host_access_policy.assert_not_called()
+
+
+@patch("fusion.OperationsApi")
+@patch("fusion.HostAccessPoliciesApi")
+def test_haps_check_mode(m_haps_api, m_op_api, module_args, haps_api, operations_api):
+    m_haps_api.return_value = haps_api
+    m_op_api.return_value = operations_api
+    module_args["_ansible_check_mode"] = True
+    set_module_args(module_args)
+
+    with pytest.raises(AnsibleExitJson) as exc:
+        fusion_haps.main()
+
+    assert exc.value.changed
+    assert len(exc.value.kwargs["policies"]) == 2
+    haps_api.create_host_access_policy.assert_not_called()
+
+
+@patch("fusion.OperationsApi")
+@patch("fusion.HostAccessPoliciesApi")
+def test_haps_invalid(m_haps_api, m_op_api, module_args, haps_api, operations_api):
+    m_haps_api.return_value = haps_api
+    m_op_api.return_value = operations_api
+    module_args["policies"] = [
+        # IQN of an existing policy
+        {"name": "host4", "iqn": IQN.format(2)},
+        # IQN of another new policy
+        {"name": "host5", "iqn": IQN.format(6)},
+        {"name": "host6", "iqn": IQN.format(6)},
+        # different personality than the existing policy
+        {"name": "host1", "iqn": IQN.format(1)},
+        {"name": "host7", "iqn": "not-an-iqn"},
+        {"name": "host8"},
+        {"name": "host8", "iqn": IQN.format(8)},
+    ]
+    set_module_args(module_args)
+
+    with pytest.raises(AnsibleFailJson) as exc:
+        fusion_haps.main()
+
+    for problem in [
+        "IQN {0} of 'host4' is already used by 'host2'".format(IQN.format(2)),
+        "IQN {0} of 'host6' is already used by 'host5'".format(IQN.format(6)),
+        "'host1' already exists with IQN {0} and personality aix".format(IQN.format(1)),
+        "IQN not-an-iqn of 'host7' is not a valid iSCSI IQN",
+        "'host8' is missing iqn",
+        "'host8' is specified more than once",
+    ]:
+        assert problem in str(exc.value)
+    haps_api.create_host_access_policy.assert_not_called()
+
+
+@patch("fusion.OperationsApi")
+@patch("fusion.HostAccessPoliciesApi")
+def test_haps_partial_failure(
+    m_haps_api, m_op_api, module_args, haps_api, operations_api
+):
+    def _create(body):
+        if body.name == "host5":
+            raise ApiExceptionsMockGenerator.create_conflict()
+        return OperationMock(1)
+
+    haps_api.create_host_access_policy = MagicMock(side_effect=_create)
+    m_haps_api.return_value = haps_api
+    m_op_api.return_value = operations_api
+    set_module_args(module_args)
+
+    with pytest.raises(AnsibleFailJson) as exc:
+        fusion_haps.main()
+
+    assert "1 of 2 host access policies failed" in str(exc.value)
+    assert exc.value.kwargs["changed"]
+    report = dict((p["name"], p["error"]) for p in exc.value.kwargs["policies"])
+    assert report["host4"] is None
+    assert report["host5"] is not None
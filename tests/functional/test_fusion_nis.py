@@ -0,0 +1,289 @@
+# -*- coding: utf-8 -*-
+
+# (c) 2023, Pure Storage, Inc.
+# GNU General Public License v3.0+ (see COPYING.GPLv3 or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+from unittest.mock import MagicMock, call, patch
+
+import fusion as purefusion
+import pytest
+from ansible.module_utils import basic
+from ansible_collections.purestorage.fusion.plugins.modules import fusion_nis
+from ansible_collections.purestorage.fusion.tests.functional.utils import (
+    AnsibleExitJson,
+    AnsibleFailJson,
+    OperationMock,
+    SuccessfulOperationMock,
+    exit_json,
+    fail_json,
+    set_module_args,
+)
+from ansible_collections.purestorage.fusion.tests.helpers import (
+    ApiExceptionsMockGenerator,
+)
+
+# GLOBAL MOCKS
+fusion_nis.setup_fusion = MagicMock(return_value=purefusion.api_client.ApiClient())
+purefusion.api_client.ApiClient.call_api = MagicMock(
+    side_effect=Exception("API call not mocked!")
+)
+basic.AnsibleModule.exit_json = exit_json
+basic.AnsibleModule.fail_json = fail_json
+
+
+@pytest.fixture
+def module_args():
+    return {
+        "region": "region1",
+        "availability_zone": "az1",
+        "array": "array1",
+        "interfaces": [
+            # new address and group
+            {
+                "name": "ct0.eth4",
+                "eth": "10.21.200.124/24",
+                "enabled": True,
+                "network_interface_group": "nig1",
+            },
+            # only enabled
+            {"name": "ct0.eth5", "enabled": True},
+            # without changes
+            {
+                "name": "ct1.eth4",
+                "eth": "10.21.200.125/24",
+                "network_interface_group": "nig1",
+            },
+        ],
+        "issuer_id": "ABCD1234",
+        "private_key_file": "private-key.pem",
+    }
+
+
+def _ni(name, enabled=False, eth=None, nig=None):
+    ni = MagicMock(enabled=enabled, display_name=name)
+    ni.name = name
+    ni.eth = purefusion.NetworkInterfaceEth(address=eth) if eth else None
+    ni.network_interface_group = (
+        purefusion.NetworkInterfaceGroupRef(
+            id=nig + "_id", name=nig, kind="NetworkInterfaceGroup", self_link="l"
+        )
+        if nig
+        else None
+    )
+    return ni
+
+
+def _nig(name, prefix):
+    nig = MagicMock()
+    nig.name = name
+    nig.eth = purefusion.NetworkInterfaceGroupEth(prefix=prefix, mtu=1500)
+    return nig
+
+
+def _list_of(items):
+    return MagicMock(items=items, count=len(items), more_items_remaining=False)
+
+
+@pytest.fixture
+def nis_api():
+    api = MagicMock()
+    api.list_network_interfaces = MagicMock(
+        return_value=_list_of(
+            [
+                _ni("ct0.eth4"),
+                _ni("ct0.eth5"),
+                _ni("ct1.eth4", True, "10.21.200.125/24", "nig1"),
+            ]
+        )
+    )
+    api.get_network_interface = MagicMock(side_effect=NotImplementedError())
+    api.update_network_interface = MagicMock(return_value=OperationMock(1))
+    return api
+
+
+@pytest.fixture
+def nigs_api():
+    api = MagicMock()
+    api.list_network_interface_groups = MagicMock(
+        return_value=_list_of(
+            [_nig("nig1", "10.21.200.0/24"), _nig("nig2", "10.21.201.0/24")]
+        )
+    )
+    return api
+
+
+@pytest.fixture
+def operations_api():
+    api = MagicMock()
+    api.list_operations = MagicMock(side_effect=purefusion.rest.ApiException)
+    api.get_operation = MagicMock(return_value=SuccessfulOperationMock)
+    return api
+
+
+def _location(name):
+    return dict(
+        region_name="region1",
+        availability_zone_name="az1",
+        array_name="array1",
+        net_intf_name=name,
+    )
+
+
+@patch("fusion.OperationsApi")
+@patch("fusion.NetworkInterfaceGroupsApi")
+@patch("fusion.NetworkInterfacesApi")
+def test_nis_update(
+    m_nis_api, m_nigs_api, m_op_api, module_args, nis_api, nigs_api, operations_api
+):
+    m_nis_api.return_value = nis_api
+    m_nigs_api.return_value = nigs_api
+    m_op_api.return_value = operations_api
+    set_module_args(module_args)
+
+    with pytest.raises(AnsibleExitJson) as exc:
+        fusion_nis.main()
+
+    assert exc.value.changed
+    assert [(i["name"], i["changed"]) for i in exc.value.kwargs["interfaces"]] == [
+        ("ct0.eth4", True),
+        ("ct0.eth5", True),
+        ("ct1.eth4", False),
+    ]
+    nis_api.list_network_interfaces.assert_called_once_with(
+        region_name="region1",
+        availability_zone_name="az1",
+        array_name="array1",
+    )
+    nis_api.get_network_interface.assert_not_called()
+    nigs_api.list_network_interface_groups.assert_called_once()
+    enable = purefusion.NetworkInterfacePatch(enabled=purefusion.NullableBoolean(True))
+    nis_api.update_network_interface.assert_has_calls(
+        [
+            call(enable, **_location("ct0.eth4")),
+            call(
+                purefusion.NetworkInterfacePatch(
+                    eth=purefusion.NetworkInterfacePatchEth(
+                        purefusion.NullableString("10.21.200.124/24")
+                    ),
+                    network_interface_group=purefusion.NullableString("nig1"),
+                ),
+                **_location("ct0.eth4")
+            ),
+            call(enable, **_location("ct0.eth5")),
+        ],
+        any_order=True,
+    )
+    assert nis_api.update_network_interface.call_count == 3
+
+
+@patch("fusion.OperationsApi")
+@patch("fusion.NetworkInterfaceGroupsApi")
+@patch("fusion.NetworkInterfacesApi")
+def test_nis_check_mode(
+    m_nis_api, m_nigs_api, m_op_api, module_args, nis_api, nigs_api, operations_api
+):
+    m_nis_api.return_value = nis_api
+    m_nigs_api.return_value = nigs_api
+    m_op_api.return_value = operations_api
+    module_args["_ansible_check_mode"] = True
+    set_module_args(module_args)
+
+    with pytest.raises(AnsibleExitJson) as exc:
+        fusion_nis.main()
+
+    assert exc.value.changed
+    nis_api.update_network_interface.assert_not_called()
+
+
+@patch("fusion.OperationsApi")
+@patch("fusion.NetworkInterfaceGroupsApi")
+@patch("fusion.NetworkInterfacesApi")
+@pytest.mark.parametrize(
+    ("interfaces", "problems"),
+    [
+        # nonexistent interface and group
+        (
+            [{"name": "ct9.eth1", "network_interface_group": "nig9"}],
+            ["'ct9.eth1' does not exist", "group 'nig9' of 'ct9.eth1' does not exist"],
+        ),
+        # invalid address, address out of prefix, duplicate address
+        (
+            [
+                {
+                    "name": "ct0.eth4",
+                    "eth": "10.21.200.300/24",
+                    "network_interface_group": "nig1",
+                },
+                {
+                    "name": "ct0.eth5",
+                    "eth": "10.21.200.125/24",
+                    "network_interface_group": "nig2",
+                },
+                {
+                    "name": "ct1.eth4",
+                    "eth": "10.21.200.125/24",
+                    "network_interface_group": "nig1",
+                },
+            ],
+            [
+                "'10.21.200.300/24' of 'ct0.eth4' is not a valid address",
+                "'10.21.200.125/24' of 'ct0.eth5' is not in prefix 10.21.201.0/24",
+                "address 10.21.200.125 is used by both 'ct0.eth5' and 'ct1.eth4'",
+            ],
+        ),
+    ],
+)
+def test_nis_invalid(
+    m_nis_api,
+    m_nigs_api,
+    m_op_api,
+    module_args,
+    nis_api,
+    nigs_api,
+    operations_api,
+    interfaces,
+    problems,
+):
+    m_nis_api.return_value = nis_api
+    m_nigs_api.return_value = nigs_api
+    m_op_api.return_value = operations_api
+    module_args["interfaces"] = interfaces
+    set_module_args(module_args)
+
+    with pytest.raises(AnsibleFailJson) as exc:
+        fusion_nis.main()
+
+    # all problems are reported at once
+    for problem in problems:
+        assert problem in str(exc.value)
+    nis_api.update_network_interface.assert_not_called()
+
+
+@patch("fusion.OperationsApi")
+@patch("fusion.NetworkInterfaceGroupsApi")
+@patch("fusion.NetworkInterfacesApi")
+def test_nis_partial_failure(
+    m_nis_api, m_nigs_api, m_op_api, module_args, nis_api, nigs_api, operations_api
+):
+    def _update(patch, net_intf_name, **kwargs):
+        if net_intf_name == "ct0.eth5":
+            raise ApiExceptionsMockGenerator.create_permission_denied()
+        return OperationMock(1)
+
+    nis_api.update_network_interface = MagicMock(side_effect=_update)
+    m_nis_api.return_value = nis_api
+    m_nigs_api.return_value = nigs_api
+    m_op_api.return_value = operations_api
+    set_module_args(module_args)
+
+    with pytest.raises(AnsibleFailJson) as exc:
+        fusion_nis.main()
+
+    assert "1 of 2 network interfaces failed" in str(exc.value)
+    report = dict((i["name"], i["error"]) for i in exc.value.kwargs["interfaces"])
+    assert report["ct0.eth5"] is not None
+    assert report["ct0.eth4"] is None
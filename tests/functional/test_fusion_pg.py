@@ -25,6 +25,9 @@ from ansible_collections.purestorage.fusion.tests.functional.utils import (
     set_module_args,
     side_effects_with_exceptions,
 )
+from ansible_collections.purestorage.fusion.tests.helpers import (
+    ApiExceptionsMockGenerator,
+)
 from urllib3.exceptions import HTTPError
 
 # GLOBAL MOCKS
@@ -243,6 +246,54 @@ def test_pg_create_ok(pg_api_init, op_api_init, module_args_present):
     op_mock.get_operation.assert_called_with("op1")
 
 
+@patch("fusion.OperationsApi")
+@patch("fusion.PlacementGroupsApi")
+def test_pg_optimistic_create_ok(pg_api_init, op_api_init, module_args_present):
+    module_args = module_args_present
+    module_args["optimistic_create"] = True
+    set_module_args(module_args)
+
+    pg_mock = MagicMock()
+    pg_mock.get_placement_group = MagicMock(side_effect=NotImplementedError())
+    pg_mock.create_placement_group = MagicMock(return_value=OperationMock("op1"))
+    pg_mock.update_placement_group = MagicMock(side_effect=NotImplementedError())
+    pg_mock.delete_placement_group = MagicMock(side_effect=NotImplementedError())
+    pg_api_init.return_value = pg_mock
+
+    op_mock = MagicMock()
+    op_mock.get_operation = MagicMock(return_value=OperationMock("op1", success=True))
+    op_api_init.return_value = op_mock
+
+    with pytest.raises(AnsibleExitJson) as excinfo:
+        fusion_pg.main()
+    assert excinfo.value.changed
+
+    pg_mock.get_placement_group.assert_not_called()
+    pg_mock.create_placement_group.assert_called_once()
+    op_mock.get_operation.assert_called_with("op1")
+
+
+@patch("fusion.OperationsApi")
+@patch("fusion.PlacementGroupsApi")
+def test_pg_optimistic_create_exception(pg_api_init, op_api_init, module_args_present):
+    module_args = module_args_present
+    module_args["optimistic_create"] = True
+    set_module_args(module_args)
+
+    pg_mock = MagicMock()
+    pg_mock.get_placement_group = MagicMock(side_effect=NotImplementedError())
+    pg_mock.create_placement_group = MagicMock(
+        side_effect=ApiExceptionsMockGenerator.create_permission_denied()
+    )
+    pg_api_init.return_value = pg_mock
+
+    # errors other than conflicts are not swallowed
+    with pytest.raises(purefusion.rest.ApiException):
+        fusion_pg.main()
+
+    pg_mock.get_placement_group.assert_not_called()
+
+
 @patch("fusion.OperationsApi")
 @patch("fusion.PlacementGroupsApi")
 def test_pg_create_without_display_name_ok(
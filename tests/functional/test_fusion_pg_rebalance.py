@@ -0,0 +1,277 @@
+# -*- coding: utf-8 -*-
+
+# (c) 2023, Pure Storage, Inc.
+# GNU General Public License v3.0+ (see COPYING.GPLv3 or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+from unittest.mock import MagicMock, call, patch
+
+import fusion as purefusion
+import pytest
+from ansible.module_utils import basic
+from ansible_collections.purestorage.fusion.plugins.modules import fusion_pg_rebalance
+from ansible_collections.purestorage.fusion.tests.functional.utils import (
+    AnsibleExitJson,
+    AnsibleFailJson,
+    OperationMock,
+    SuccessfulOperationMock,
+    exit_json,
+    fail_json,
+    set_module_args,
+)
+from ansible_collections.purestorage.fusion.tests.helpers import (
+    ApiExceptionsMockGenerator,
+)
+
+# GLOBAL MOCKS
+fusion_pg_rebalance.setup_fusion = MagicMock(
+    return_value=purefusion.api_client.ApiClient()
+)
+purefusion.api_client.ApiClient.call_api = MagicMock(
+    side_effect=Exception("API call not mocked!")
+)
+basic.AnsibleModule.exit_json = exit_json
+basic.AnsibleModule.fail_json = fail_json
+
+
+@pytest.fixture
+def module_args():
+    return {
+        "region": "region1",
+        "availability_zone": "az1",
+        "issuer_id": "ABCD1234",
+        "private_key_file": "private-key.pem",
+    }
+
+
+def _named(name, **kwargs):
+    obj = MagicMock(**kwargs)
+    obj.name = name
+    return obj
+
+
+def _array(name, hardware_type="flash-array-x", maintenance_mode=False):
+    return _named(
+        name,
+        hardware_type=_named(hardware_type),
+        maintenance_mode=maintenance_mode,
+        unavailable_mode=False,
+    )
+
+
+# array -> {placement group: used space}
+PGS = {"a0": {"pg1": 40, "pg2": 25, "pg3": 10}, "a1": {"pg4": 20}, "a2": {}}
+
+
+@pytest.fixture
+def telemetry():
+    # array -> (used space, read latency)
+    return {"a0": (100, 500), "a1": (20, 500), "a2": (30, 500)}
+
+
+@pytest.fixture
+def arrays_api(telemetry):
+    arrays = [_array("a0"), _array("a1"), _array("a2", "flash-array-c")]
+    api = MagicMock()
+    api.list_arrays = MagicMock(
+        return_value=MagicMock(items=arrays, more_items_remaining=False)
+    )
+    api.get_array_space = MagicMock(
+        side_effect=lambda array_name, **kwargs: MagicMock(
+            total_physical_space=telemetry[array_name][0]
+        )
+    )
+    api.get_array_performance = MagicMock(
+        side_effect=lambda array_name, **kwargs: MagicMock(
+            reads_per_sec=0,
+            writes_per_sec=0,
+            read_latency_us=telemetry[array_name][1],
+            write_latency_us=100,
+        )
+    )
+    return api
+
+
+@pytest.fixture
+def pgs_api():
+    api = MagicMock()
+    api.query_placement_groups = MagicMock(
+        side_effect=lambda array_name, **kwargs: MagicMock(
+            items=[
+                _named(
+                    name,
+                    tenant=_named("t1"),
+                    tenant_space=_named("ts1"),
+                    storage_service=_named("ss1"),
+                )
+                for name in PGS[array_name]
+            ],
+            more_items_remaining=False,
+        )
+    )
+    api.get_placement_groups_space = MagicMock(
+        side_effect=lambda placement_group_name, **kwargs: MagicMock(
+            total_physical_space=[
+                pgs[placement_group_name]
+                for pgs in PGS.values()
+                if placement_group_name in pgs
+            ][0]
+        )
+    )
+    api.update_placement_group = MagicMock(return_value=OperationMock(1))
+    return api
+
+
+@pytest.fixture
+def ss_api():
+    api = MagicMock()
+    api.get_storage_service = MagicMock(
+        return_value=MagicMock(
+            hardware_types=[_named("flash-array-x"), _named("flash-array-c")]
+        )
+    )
+    return api
+
+
+@pytest.fixture
+def operations_api():
+    api = MagicMock()
+    api.list_operations = MagicMock(side_effect=purefusion.rest.ApiException)
+    api.get_operation = MagicMock(return_value=SuccessfulOperationMock)
+    return api
+
+
+def _move(pg, target):
+    return call(
+        purefusion.PlacementGroupPatch(array=purefusion.NullableString(target)),
+        tenant_name="t1",
+        tenant_space_name="ts1",
+        placement_group_name=pg,
+    )
+
+
+def _run(module_args, arrays_api, pgs_api, ss_api, operations_api, exception):
+    with patch("fusion.ArraysApi", return_value=arrays_api), patch(
+        "fusion.PlacementGroupsApi", return_value=pgs_api
+    ), patch("fusion.StorageServicesApi", return_value=ss_api), patch(
+        "fusion.OperationsApi", return_value=operations_api
+    ):
+        set_module_args(module_args)
+        with pytest.raises(exception) as exc:
+            fusion_pg_rebalance.main()
+    return exc.value
+
+
+def test_rebalance(module_args, arrays_api, pgs_api, ss_api, operations_api):
+    result = _run(
+        module_args, arrays_api, pgs_api, ss_api, operations_api, AnsibleExitJson
+    )
+
+    # pg1 halves the 100 - 20 gap exactly, pg3 comes closest to halving 60 - 30
+    assert result.changed
+    assert [
+        (m["placement_group"], m["source"], m["target"]) for m in result.kwargs["moves"]
+    ] == [
+        ("pg1", "a0", "a1"),
+        ("pg3", "a0", "a2"),
+    ]
+    assert result.kwargs["arrays"] == [
+        {"name": "a0", "before": 100, "after": 50},
+        {"name": "a1", "before": 20, "after": 60},
+        {"name": "a2", "before": 30, "after": 40},
+    ]
+    assert all(m["error"] is None for m in result.kwargs["moves"])
+    assert pgs_api.update_placement_group.call_count == 2
+    pgs_api.update_placement_group.assert_has_calls(
+        [_move("pg1", "a1"), _move("pg3", "a2")], any_order=True
+    )
+    arrays_api.get_array_performance.assert_not_called()
+    arrays_api.list_arrays.assert_called_once_with(
+        region_name="region1", availability_zone_name="az1"
+    )
+
+
+def test_rebalance_check_mode(module_args, arrays_api, pgs_api, ss_api, operations_api):
+    module_args["_ansible_check_mode"] = True
+    result = _run(
+        module_args, arrays_api, pgs_api, ss_api, operations_api, AnsibleExitJson
+    )
+
+    assert result.changed
+    assert len(result.kwargs["moves"]) == 2
+    pgs_api.update_placement_group.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    "limits,expected",
+    [
+        ({"max_moves": 1}, ["pg1"]),
+        # a0 takes part in every move
+        ({"max_moves_per_array": 1}, ["pg1"]),
+        ({"max_moves": 0}, []),
+    ],
+)
+def test_rebalance_budget(
+    module_args, arrays_api, pgs_api, ss_api, operations_api, limits, expected
+):
+    module_args.update(limits)
+    result = _run(
+        module_args, arrays_api, pgs_api, ss_api, operations_api, AnsibleExitJson
+    )
+
+    assert result.changed == bool(expected)
+    assert [m["placement_group"] for m in result.kwargs["moves"]] == expected
+    assert pgs_api.update_placement_group.call_count == len(expected)
+
+
+def test_rebalance_excluded_targets(
+    module_args, telemetry, arrays_api, pgs_api, ss_api, operations_api
+):
+    # a1 is too slow and ss1 does not run on a2
+    module_args["max_latency_us"] = 1000
+    telemetry["a1"] = (20, 5000)
+    ss_api.get_storage_service.return_value = MagicMock(
+        hardware_types=[_named("flash-array-x")]
+    )
+    result = _run(
+        module_args, arrays_api, pgs_api, ss_api, operations_api, AnsibleExitJson
+    )
+
+    assert not result.changed
+    assert result.kwargs["moves"] == []
+    pgs_api.update_placement_group.assert_not_called()
+
+
+def test_rebalance_unknown_array(
+    module_args, arrays_api, pgs_api, ss_api, operations_api
+):
+    module_args["arrays"] = ["a0", "a9"]
+    result = _run(
+        module_args, arrays_api, pgs_api, ss_api, operations_api, AnsibleFailJson
+    )
+
+    assert "a9" in str(result)
+    pgs_api.query_placement_groups.assert_not_called()
+
+
+def test_rebalance_partial_failure(
+    module_args, arrays_api, pgs_api, ss_api, operations_api
+):
+    def _update(patch, placement_group_name, **kwargs):
+        if placement_group_name != "pg1":
+            raise ApiExceptionsMockGenerator.create_permission_denied()
+        return OperationMock(1)
+
+    pgs_api.update_placement_group = MagicMock(side_effect=_update)
+    result = _run(
+        module_args, arrays_api, pgs_api, ss_api, operations_api, AnsibleFailJson
+    )
+
+    assert result.kwargs["changed"]
+    assert "1 of 2 placement group moves failed" in str(result)
+    errors = dict((m["placement_group"], m["error"]) for m in result.kwargs["moves"])
+    assert errors["pg1"] is None
+    assert errors["pg3"] is not None
@@ -7,7 +7,7 @@ from __future__ import absolute_import, division, print_function
 
 __metaclass__ = type
 
-from unittest.mock import MagicMock, patch
+from unittest.mock import MagicMock, call, patch
 
 import fusion as purefusion
 import pytest
@@ -20,10 +20,14 @@ from ansible_collections.purestorage.fusion.tests.functional.utils import (
     AnsibleExitJson,
     AnsibleFailJson,
     OperationMock,
+    SuccessfulOperationMock,
     exit_json,
     fail_json,
     set_module_args,
 )
+from ansible_collections.purestorage.fusion.tests.helpers import (
+    ApiExceptionsMockGenerator,
+)
 from urllib3.exceptions import HTTPError
 
 # GLOBAL MOCKS
@@ -238,6 +242,160 @@ def test_pp_create_without_display_name_ok(
     op_mock.get_operation.assert_called_with("op1")
 
 
+def _snapshot(name, destroyed=False):
+    return purefusion.Snapshot(
+        id="{0}_id".format(name),
+        name=name,
+        display_name=name,
+        self_link="self_link",
+        tenant=purefusion.TenantRef(
+            id="t1_id", name="t1", kind="Tenant", self_link="self_link"
+        ),
+        tenant_space=purefusion.TenantSpaceRef(
+            id="ts1_id", name="ts1", kind="TenantSpace", self_link="self_link"
+        ),
+        volume_snapshots_link="volume_snapshots_link",
+        protection_policy=purefusion.ProtectionPolicyRef(
+            id="protection_policy1_id",
+            name="protection_policy1",
+            kind="ProtectionPolicy",
+            self_link="self_link",
+        ),
+        time_remaining=0,
+        destroyed=destroyed,
+    )
+
+
+@pytest.fixture
+def snapshots_api():
+    snapshots = [_snapshot("snap1"), _snapshot("snap2"), _snapshot("snap3", True)]
+    api = MagicMock()
+    api.query_snapshots = MagicMock(
+        return_value=purefusion.SnapshotList(
+            count=len(snapshots), more_items_remaining=False, items=snapshots
+        )
+    )
+    api.update_snapshot = MagicMock(return_value=OperationMock(id="op1"))
+    api.delete_snapshot = MagicMock(return_value=OperationMock(id="op2"))
+    return api
+
+
+def _pp_mock():
+    pp_mock = MagicMock()
+    pp_mock.get_protection_policy = MagicMock(
+        return_value=purefusion.ProtectionPolicy(
+            id="protection_policy1_id",
+            name="protection_policy1",
+            display_name="protection_policy1_display_name",
+            self_link="test_self_link",
+            objectives=[],
+        )
+    )
+    pp_mock.delete_protection_policy = MagicMock(return_value=OperationMock(id="op3"))
+    return pp_mock
+
+
+@patch("fusion.SnapshotsApi")
+@patch("fusion.OperationsApi")
+@patch("fusion.ProtectionPoliciesApi")
+def test_pp_delete_with_snapshots_ok(
+    pp_api_init, op_api_init, snapshots_api_init, module_args_absent, snapshots_api
+):
+    module_args = module_args_absent
+    module_args["destroy_snapshots_on_delete"] = True
+    set_module_args(module_args)
+
+    pp_mock = _pp_mock()
+    pp_api_init.return_value = pp_mock
+    snapshots_api_init.return_value = snapshots_api
+    op_mock = MagicMock()
+    op_mock.list_operations = MagicMock(side_effect=purefusion.rest.ApiException)
+    op_mock.get_operation = MagicMock(return_value=SuccessfulOperationMock)
+    op_api_init.return_value = op_mock
+
+    with pytest.raises(AnsibleExitJson) as excinfo:
+        fusion_pp.main()
+    assert excinfo.value.changed
+    assert excinfo.value.kwargs["snapshots"] == {
+        "total": 3,
+        "destroyed": 2,
+        "deleted": 3,
+        "failed": 0,
+        "errors": {},
+    }
+
+    snapshots_api.query_snapshots.assert_called_once_with(
+        offset=0, protection_policy_id="protection_policy1_id"
+    )
+    # already destroyed snapshot is not patched again
+    snapshots_api.update_snapshot.assert_has_calls(
+        [
+            call(
+                body=purefusion.SnapshotPatch(
+                    destroyed=purefusion.NullableBoolean(True)
+                ),
+                tenant_name="t1",
+                tenant_space_name="ts1",
+                snapshot_name=name,
+            )
+            for name in ["snap1", "snap2"]
+        ],
+        any_order=True,
+    )
+    assert snapshots_api.update_snapshot.call_count == 2
+    snapshots_api.delete_snapshot.assert_has_calls(
+        [
+            call(tenant_name="t1", tenant_space_name="ts1", snapshot_name=name)
+            for name in ["snap1", "snap2", "snap3"]
+        ],
+        any_order=True,
+    )
+    assert snapshots_api.delete_snapshot.call_count == 3
+    pp_mock.delete_protection_policy.assert_called_once_with(
+        protection_policy_name="protection_policy1"
+    )
+
+
+@patch("fusion.SnapshotsApi")
+@patch("fusion.OperationsApi")
+@patch("fusion.ProtectionPoliciesApi")
+def test_pp_delete_with_snapshots_partial_failure(
+    pp_api_init, op_api_init, snapshots_api_init, module_args_absent, snapshots_api
+):
+    module_args = module_args_absent
+    module_args["destroy_snapshots_on_delete"] = True
+    set_module_args(module_args)
+
+    def _update_snapshot(body, snapshot_name, **kwargs):
+        if snapshot_name == "snap1":
+            raise ApiExceptionsMockGenerator.create_permission_denied()
+        return OperationMock(id="op1")
+
+    snapshots_api.update_snapshot = MagicMock(side_effect=_update_snapshot)
+    pp_mock = _pp_mock()
+    pp_api_init.return_value = pp_mock
+    snapshots_api_init.return_value = snapshots_api
+    op_mock = MagicMock()
+    op_mock.list_operations = MagicMock(side_effect=purefusion.rest.ApiException)
+    op_mock.get_operation = MagicMock(return_value=SuccessfulOperationMock)
+    op_api_init.return_value = op_mock
+
+    with pytest.raises(AnsibleFailJson) as excinfo:
+        fusion_pp.main()
+    assert "Failed to delete 1 of 3 snapshots" in str(excinfo.value)
+    assert excinfo.value.kwargs["changed"]
+    progress = excinfo.value.kwargs["snapshots"]
+    # snap3 was already destroyed, snap1 could not be
+    assert progress["destroyed"] == 1
+    assert progress["deleted"] == 2
+    assert progress["failed"] == 1
+    assert list(progress["errors"]) == ["snap1"]
+
+    # snapshot that was not destroyed is not deleted
+    assert snapshots_api.delete_snapshot.call_count == 2
+    pp_mock.delete_protection_policy.assert_not_called()
+
+
 @patch("fusion.OperationsApi")
 @patch("fusion.ProtectionPoliciesApi")
 @pytest.mark.parametrize(
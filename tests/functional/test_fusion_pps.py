@@ -0,0 +1,368 @@
+# -*- coding: utf-8 -*-
+
+# (c) 2023, Pure Storage, Inc.
+# GNU General Public License v3.0+ (see COPYING.GPLv3 or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+from unittest.mock import MagicMock, call, patch
+
+import fusion as purefusion
+import pytest
+from ansible.module_utils import basic
+from ansible_collections.purestorage.fusion.plugins.modules import fusion_pps
+from ansible_collections.purestorage.fusion.tests.functional.utils import (
+    AnsibleExitJson,
+    AnsibleFailJson,
+    OperationMock,
+    SuccessfulOperationMock,
+    exit_json,
+    fail_json,
+    set_module_args,
+)
+from ansible_collections.purestorage.fusion.tests.helpers import (
+    ApiExceptionsMockGenerator,
+)
+
+# GLOBAL MOCKS
+fusion_pps.setup_fusion = MagicMock(return_value=purefusion.api_client.ApiClient())
+purefusion.api_client.ApiClient.call_api = MagicMock(
+    side_effect=Exception("API call not mocked!")
+)
+basic.AnsibleModule.exit_json = exit_json
+basic.AnsibleModule.fail_json = fail_json
+
+
+@pytest.fixture
+def module_args():
+    return {
+        "policies": [
+            # exists, unchanged
+            {"name": "gold", "local_rpo": "10M", "local_retention": "1D"},
+            # exists, different RPO
+            {"name": "silver", "local_rpo": "2H", "local_retention": "1W"},
+            # new
+            {
+                "name": "bronze",
+                "display_name": "Bronze",
+                "local_rpo": "1D",
+                "local_retention": "4W",
+            },
+        ],
+        "issuer_id": "ABCD1234",
+        "private_key_file": "private-key.pem",
+    }
+
+
+def _pp(name, rpo, retention):
+    return purefusion.ProtectionPolicy(
+        id="{0}_id".format(name),
+        self_link="self_link_value",
+        name=name,
+        display_name=name,
+        objectives=[
+            purefusion.RPO(type="RPO", rpo=rpo),
+            purefusion.Retention(type="Retention", after=retention),
+        ],
+    )
+
+
+def _post(name, display_name, rpo, retention):
+    return call(
+        purefusion.ProtectionPolicyPost(
+            name=name,
+            display_name=display_name,
+            objectives=[
+                purefusion.RPO(type="RPO", rpo=rpo),
+                purefusion.Retention(type="Retention", after=retention),
+            ],
+        )
+    )
+
+
+@pytest.fixture
+def pp_api():
+    policies = [
+        _pp("gold", "PT10M", "P1D"),
+        _pp("silver", "PT1H", "PT10080M"),
+        _pp("old", "PT10M", "PT10M"),
+    ]
+    api = MagicMock()
+    api.list_protection_policies = MagicMock(
+        return_value=purefusion.ProtectionPolicyList(
+            count=len(policies), more_items_remaining=False, items=policies
+        )
+    )
+    api.create_protection_policy = MagicMock(return_value=OperationMock(1))
+    api.delete_protection_policy = MagicMock(return_value=OperationMock(2))
+    return api
+
+
+def _snapshot(name):
+    return purefusion.Snapshot(
+        id="{0}_id".format(name),
+        name=name,
+        display_name=name,
+        self_link="self_link",
+        tenant=purefusion.TenantRef(
+            id="t1_id", name="t1", kind="Tenant", self_link="self_link"
+        ),
+        tenant_space=purefusion.TenantSpaceRef(
+            id="ts1_id", name="ts1", kind="TenantSpace", self_link="self_link"
+        ),
+        volume_snapshots_link="volume_snapshots_link",
+        protection_policy=purefusion.ProtectionPolicyRef(
+            id="silver_id", name="silver", kind="ProtectionPolicy", self_link="link"
+        ),
+        time_remaining=0,
+        destroyed=False,
+    )
+
+
+def _snapshots_api(policy_snapshots):
+    def _query(protection_policy_id, **kwargs):
+        items = policy_snapshots.get(protection_policy_id, [])
+        return purefusion.SnapshotList(
+            count=len(items), more_items_remaining=False, items=items
+        )
+
+    api = MagicMock()
+    api.query_snapshots = MagicMock(side_effect=_query)
+    api.update_snapshot = MagicMock(return_value=OperationMock(3))
+    api.delete_snapshot = MagicMock(return_value=OperationMock(4))
+    return api
+
+
+@pytest.fixture
+def operations_api():
+    api = MagicMock()
+    api.list_operations = MagicMock(side_effect=purefusion.rest.ApiException)
+    api.get_operation = MagicMock(return_value=SuccessfulOperationMock)
+    return api
+
+
+@patch("fusion.SnapshotsApi")
+@patch("fusion.OperationsApi")
+@patch("fusion.ProtectionPoliciesApi")
+@pytest.mark.parametrize(
+    ("purge", "expected_report"),
+    [
+        (False, [("bronze", "create"), ("silver", "replace")]),
+        (True, [("bronze", "create"), ("silver", "replace"), ("old", "delete")]),
+    ],
+)
+def test_pps_present(
+    m_pp_api,
+    m_op_api,
+    m_snapshots_api,
+    module_args,
+    pp_api,
+    operations_api,
+    purge,
+    expected_report,
+):
+    snapshots_api = _snapshots_api({})
+    m_pp_api.return_value = pp_api
+    m_op_api.return_value = operations_api
+    m_snapshots_api.return_value = snapshots_api
+    module_args["purge"] = purge
+    set_module_args(module_args)
+
+    with pytest.raises(AnsibleExitJson) as exc:
+        fusion_pps.main()
+
+    assert exc.value.changed
+    assert [(p["name"], p["action"]) for p in exc.value.kwargs["policies"]] == (
+        expected_report
+    )
+    pp_api.list_protection_policies.assert_called_once_with()
+    # safe mode only checks whether there are any snapshots
+    snapshots_api.query_snapshots.assert_any_call(
+        protection_policy_id="silver_id", limit=1
+    )
+    pp_api.create_protection_policy.assert_has_calls(
+        [
+            _post("bronze", "Bronze", "PT1440M", "PT40320M"),
+            _post("silver", "silver", "PT120M", "PT10080M"),
+        ],
+        any_order=True,
+    )
+    assert pp_api.create_protection_policy.call_count == 2
+    deleted = [c.kwargs for c in pp_api.delete_protection_policy.call_args_list]
+    assert sorted(d["protection_policy_name"] for d in deleted) == sorted(
+        name for name, action in expected_report if action != "create"
+    )
+
+
+@patch("fusion.SnapshotsApi")
+@patch("fusion.OperationsApi")
+@patch("fusion.ProtectionPoliciesApi")
+def test_pps_unparsed_objectives(
+    m_pp_api, m_op_api, m_snapshots_api, module_args, pp_api, operations_api
+):
+    m_pp_api.return_value = pp_api
+    m_op_api.return_value = operations_api
+    m_snapshots_api.return_value = _snapshots_api({})
+    pp_api.list_protection_policies.return_value.items[1] = _pp("silver", "PT1H", "P1Y")
+    set_module_args(module_args)
+
+    with patch.object(basic.AnsibleModule, "warn") as warn, pytest.raises(
+        AnsibleExitJson
+    ) as exc:
+        fusion_pps.main()
+
+    # silver is neither replaced nor considered in sync
+    assert [(p["name"], p["action"]) for p in exc.value.kwargs["policies"]] == [
+        ("bronze", "create"),
+    ]
+    warn.assert_called_once_with(
+        "Objectives of protection policies silver could not be parsed, "
+        "they were left unchanged"
+    )
+    pp_api.delete_protection_policy.assert_not_called()
+
+
+@patch("fusion.SnapshotsApi")
+@patch("fusion.OperationsApi")
+@patch("fusion.ProtectionPoliciesApi")
+def test_pps_preserve_snapshots(
+    m_pp_api, m_op_api, m_snapshots_api, module_args, pp_api, operations_api
+):
+    snapshots_api = _snapshots_api({"silver_id": [_snapshot("snap1")]})
+    m_pp_api.return_value = pp_api
+    m_op_api.return_value = operations_api
+    m_snapshots_api.return_value = snapshots_api
+    set_module_args(module_args)
+
+    with pytest.raises(AnsibleExitJson) as exc:
+        fusion_pps.main()
+
+    assert exc.value.changed
+    assert [(p["name"], p["action"]) for p in exc.value.kwargs["policies"]] == [
+        ("bronze", "create"),
+        ("silver", "preserve"),
+    ]
+    pp_api.create_protection_policy.assert_called_once_with(
+        purefusion.ProtectionPolicyPost(
+            name="bronze",
+            display_name="Bronze",
+            objectives=[
+                purefusion.RPO(type="RPO", rpo="PT1440M"),
+                purefusion.Retention(type="Retention", after="PT40320M"),
+            ],
+        )
+    )
+    pp_api.delete_protection_policy.assert_not_called()
+    snapshots_api.update_snapshot.assert_not_called()
+    snapshots_api.delete_snapshot.assert_not_called()
+
+
+@patch("fusion.SnapshotsApi")
+@patch("fusion.OperationsApi")
+@patch("fusion.ProtectionPoliciesApi")
+def test_pps_destroy_snapshots(
+    m_pp_api, m_op_api, m_snapshots_api, module_args, pp_api, operations_api
+):
+    snapshots_api = _snapshots_api({"silver_id": [_snapshot("snap1")]})
+    m_pp_api.return_value = pp_api
+    m_op_api.return_value = operations_api
+    m_snapshots_api.return_value = snapshots_api
+    module_args["destroy_snapshots_on_delete"] = True
+    set_module_args(module_args)
+
+    with pytest.raises(AnsibleExitJson) as exc:
+        fusion_pps.main()
+
+    assert exc.value.changed
+    assert exc.value.kwargs["snapshots"]["deleted"] == 1
+    snapshots_api.query_snapshots.assert_called_once_with(
+        offset=0, protection_policy_id="silver_id"
+    )
+    snapshots_api.delete_snapshot.assert_called_once_with(
+        tenant_name="t1", tenant_space_name="ts1", snapshot_name="snap1"
+    )
+    pp_api.delete_protection_policy.assert_called_once_with(
+        protection_policy_name="silver"
+    )
+    assert pp_api.create_protection_policy.call_count == 2
+
+
+@patch("fusion.SnapshotsApi")
+@patch("fusion.OperationsApi")
+@patch("fusion.ProtectionPoliciesApi")
+def test_pps_invalid(
+    m_pp_api, m_op_api, m_snapshots_api, module_args, pp_api, operations_api
+):
+    m_pp_api.return_value = pp_api
+    m_op_api.return_value = operations_api
+    m_snapshots_api.return_value = _snapshots_api({})
+    module_args["policies"].extend(
+        [
+            {"name": "gold", "local_rpo": "10M", "local_retention": "1D"},
+            {"name": "iron", "local_rpo": "5M", "local_retention": "0"},
+            {"name": "tin", "local_rpo": "1H"},
+        ]
+    )
+    set_module_args(module_args)
+
+    with pytest.raises(AnsibleFailJson) as exc:
+        fusion_pps.main()
+
+    # all problems are reported at once
+    assert "'gold' is specified more than once" in str(exc.value)
+    assert "local RPO of 'iron' must be a minimum of 10 minutes" in str(exc.value)
+    assert "local retention of 'iron' must be a minimum of 1 minutes" in str(exc.value)
+    assert "'tin' is missing local_rpo or local_retention" in str(exc.value)
+    pp_api.create_protection_policy.assert_not_called()
+    pp_api.delete_protection_policy.assert_not_called()
+
+
+@patch("fusion.SnapshotsApi")
+@patch("fusion.OperationsApi")
+@patch("fusion.ProtectionPoliciesApi")
+def test_pps_absent_check_mode(
+    m_pp_api, m_op_api, m_snapshots_api, module_args, pp_api, operations_api
+):
+    m_pp_api.return_value = pp_api
+    m_op_api.return_value = operations_api
+    m_snapshots_api.return_value = _snapshots_api({})
+    module_args["state"] = "absent"
+    module_args["_ansible_check_mode"] = True
+    set_module_args(module_args)
+
+    with pytest.raises(AnsibleExitJson) as exc:
+        fusion_pps.main()
+
+    assert exc.value.changed
+    assert [(p["name"], p["action"]) for p in exc.value.kwargs["policies"]] == [
+        ("gold", "delete"),
+        ("silver", "delete"),
+    ]
+    pp_api.create_protection_policy.assert_not_called()
+    pp_api.delete_protection_policy.assert_not_called()
+
+
+@patch("fusion.SnapshotsApi")
+@patch("fusion.OperationsApi")
+@patch("fusion.ProtectionPoliciesApi")
+def test_pps_replace_delete_failed(
+    m_pp_api, m_op_api, m_snapshots_api, module_args, pp_api, operations_api
+):
+    m_pp_api.return_value = pp_api
+    m_op_api.return_value = operations_api
+    m_snapshots_api.return_value = _snapshots_api({})
+    pp_api.delete_protection_policy = MagicMock(
+        side_effect=ApiExceptionsMockGenerator.create_conflict()
+    )
+    set_module_args(module_args)
+
+    with pytest.raises(AnsibleFailJson) as exc:
+        fusion_pps.main()
+
+    assert "1 of 2 protection policy changes failed" in str(exc.value)
+    assert exc.value.kwargs["changed"]
+    # policy which could not be deleted is not created again
+    pp_api.create_protection_policy.assert_called_once()
+    assert pp_api.create_protection_policy.call_args.args[0].name == "bronze"
@@ -12,6 +12,7 @@ from unittest.mock import MagicMock, patch
 import fusion as purefusion
 import pytest
 from ansible.module_utils import basic
+from ansible_collections.purestorage.fusion.plugins.module_utils import principals
 from ansible_collections.purestorage.fusion.plugins.module_utils.errors import (
     OperationException,
 )
@@ -35,6 +36,12 @@ basic.AnsibleModule.exit_json = exit_json
 basic.AnsibleModule.fail_json = fail_json
 
 
+@pytest.fixture(autouse=True)
+def forget_principals():
+    # resolved principals are remembered by the process
+    principals._principals.clear()
+
+
 @pytest.fixture
 def module_args_present():
     return {
@@ -811,3 +818,46 @@ def test_ra_absent_not_changed(
     ra_mock.create_role_assignment.assert_not_called()
     ra_mock.delete_role_assignment.assert_not_called()
     op_mock.get_operation.assert_not_called()
+
+
+@patch("fusion.OperationsApi")
+@patch("fusion.IdentityManagerApi")
+@patch("fusion.RoleAssignmentsApi")
+def test_ra_principal_index_cache(
+    ra_api_init, im_api_init, op_api_init, module_args_present, tmp_path
+):
+    module_args = module_args_present
+    module_args["index_cache"] = str(tmp_path / "index.json")
+
+    ra_mock = MagicMock()
+    ra_mock.list_role_assignments = MagicMock(return_value=[])
+    ra_mock.create_role_assignment = MagicMock(return_value=OperationMock("op1"))
+    ra_api_init.return_value = ra_mock
+
+    im_mock = MagicMock()
+    im_mock.list_users = MagicMock(
+        return_value=[
+            purefusion.User(
+                id="principal1",
+                self_link="test_value",
+                name="user1",
+                email="example@example.com",
+            )
+        ]
+    )
+    im_api_init.return_value = im_mock
+
+    op_mock = MagicMock()
+    op_mock.get_operation = MagicMock(return_value=OperationMock("op1", success=True))
+    op_api_init.return_value = op_mock
+
+    # users are listed by the first run only, every run is a new process
+    for _ in range(3):
+        principals._principals.clear()
+        set_module_args(module_args)
+        with pytest.raises(AnsibleExitJson) as excinfo:
+            fusion_ra.main()
+        assert excinfo.value.changed
+
+    im_mock.list_users.assert_called_once_with()
+    assert ra_mock.create_role_assignment.call_count == 3
@@ -0,0 +1,296 @@
+# -*- coding: utf-8 -*-
+
+# (c) 2023, Pure Storage, Inc.
+# GNU General Public License v3.0+ (see COPYING.GPLv3 or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+from unittest.mock import MagicMock, call, patch
+
+import fusion as purefusion
+import pytest
+from ansible.module_utils import basic
+from ansible_collections.purestorage.fusion.plugins.module_utils import principals
+from ansible_collections.purestorage.fusion.plugins.modules import fusion_ra_sync
+from ansible_collections.purestorage.fusion.tests.functional.utils import (
+    AnsibleExitJson,
+    AnsibleFailJson,
+    OperationMock,
+    SuccessfulOperationMock,
+    exit_json,
+    fail_json,
+    set_module_args,
+)
+from ansible_collections.purestorage.fusion.tests.helpers import (
+    ApiExceptionsMockGenerator,
+)
+
+# GLOBAL MOCKS
+fusion_ra_sync.setup_fusion = MagicMock(return_value=purefusion.api_client.ApiClient())
+purefusion.api_client.ApiClient.call_api = MagicMock(
+    side_effect=Exception("API call not mocked!")
+)
+basic.AnsibleModule.exit_json = exit_json
+basic.AnsibleModule.fail_json = fail_json
+
+
+@pytest.fixture
+def module_args():
+    return {
+        "assignments": [
+            # exists
+            {
+                "role": "tenant-admin",
+                "user": "alice",
+                "scope": "tenant",
+                "tenant": "t1",
+            },
+            # missing
+            {"role": "tenant-admin", "user": "bob", "scope": "tenant", "tenant": "t2"},
+            {
+                "role": "tenant-space-admin",
+                "api_client_key": "pure1:apikey:123",
+                "scope": "tenant_space",
+                "tenant": "t1",
+                "tenant_space": "ts1",
+            },
+        ],
+        "roles": ["az-admin"],
+        "issuer_id": "ABCD1234",
+        "private_key_file": "private-key.pem",
+    }
+
+
+def _user(name, id):
+    user = MagicMock(id=id)
+    user.name = name
+    return user
+
+
+def _assignment(name, principal, scope):
+    assignment = MagicMock(principal=principal)
+    assignment.name = name
+    assignment.scope.self_link = scope
+    return assignment
+
+
+@pytest.fixture(autouse=True)
+def forget_principals():
+    # resolved principals are remembered by the process
+    principals._principals.clear()
+
+
+@pytest.fixture
+def id_api():
+    users = [
+        _user("alice", "alice_id"),
+        _user("bob", "bob_id"),
+        _user("pure1:apikey:123", "client_id"),
+    ]
+    api = MagicMock()
+    api.list_users = MagicMock(
+        side_effect=lambda name=None: [
+            user for user in users if name is None or user.name == name
+        ]
+    )
+    return api
+
+
+@pytest.fixture
+def ra_api():
+    assignments = {
+        "tenant-admin": [
+            _assignment("ra1", "alice_id", "/tenants/t1"),
+            # superfluous
+            _assignment("ra2", "bob_id", "/tenants/t3"),
+        ],
+        "tenant-space-admin": [],
+        "az-admin": [_assignment("ra3", "alice_id", "/")],
+    }
+    api = MagicMock()
+    api.list_role_assignments = MagicMock(
+        side_effect=lambda role_name: assignments[role_name]
+    )
+    api.create_role_assignment = MagicMock(return_value=OperationMock(1))
+    api.delete_role_assignment = MagicMock(return_value=OperationMock(2))
+    return api
+
+
+@pytest.fixture
+def operations_api():
+    api = MagicMock()
+    api.list_operations = MagicMock(side_effect=purefusion.rest.ApiException)
+    api.get_operation = MagicMock(return_value=SuccessfulOperationMock)
+    return api
+
+
+@patch("fusion.OperationsApi")
+@patch("fusion.RoleAssignmentsApi")
+@patch("fusion.IdentityManagerApi")
+def test_ra_sync(
+    m_id_api, m_ra_api, m_op_api, module_args, id_api, ra_api, operations_api
+):
+    m_id_api.return_value = id_api
+    m_ra_api.return_value = ra_api
+    m_op_api.return_value = operations_api
+    set_module_args(module_args)
+
+    with pytest.raises(AnsibleExitJson) as exc:
+        fusion_ra_sync.main()
+
+    assert exc.value.changed
+    assert [(a["role"], a["principal"]) for a in exc.value.kwargs["added"]] == [
+        ("tenant-admin", "bob_id"),
+        ("tenant-space-admin", "client_id"),
+    ]
+    assert sorted((a["role"], a["scope"]) for a in exc.value.kwargs["removed"]) == [
+        ("az-admin", "/"),
+        ("tenant-admin", "/tenants/t3"),
+    ]
+    # principals and assignments are listed only once
+    id_api.list_users.assert_has_calls(
+        [call(), call(name="pure1:apikey:123")], any_order=True
+    )
+    assert id_api.list_users.call_count == 2
+    assert ra_api.list_role_assignments.call_count == 3
+    ra_api.create_role_assignment.assert_has_calls(
+        [
+            call(
+                purefusion.RoleAssignmentPost(scope="/tenants/t2", principal="bob_id"),
+                role_name="tenant-admin",
+            ),
+            call(
+                purefusion.RoleAssignmentPost(
+                    scope="/tenants/t1/tenant-spaces/ts1", principal="client_id"
+                ),
+                role_name="tenant-space-admin",
+            ),
+        ],
+        any_order=True,
+    )
+    ra_api.delete_role_assignment.assert_has_calls(
+        [
+            call(role_name="tenant-admin", role_assignment_name="ra2"),
+            call(role_name="az-admin", role_assignment_name="ra3"),
+        ],
+        any_order=True,
+    )
+    assert ra_api.delete_role_assignment.call_count == 2
+
+
+@patch("fusion.OperationsApi")
+@patch("fusion.RoleAssignmentsApi")
+@patch("fusion.IdentityManagerApi")
+def test_ra_sync_without_purge(
+    m_id_api, m_ra_api, m_op_api, module_args, id_api, ra_api, operations_api
+):
+    m_id_api.return_value = id_api
+    m_ra_api.return_value = ra_api
+    m_op_api.return_value = operations_api
+    module_args["purge"] = False
+    set_module_args(module_args)
+
+    with pytest.raises(AnsibleExitJson) as exc:
+        fusion_ra_sync.main()
+
+    assert exc.value.changed
+    assert exc.value.kwargs["removed"] == []
+    assert ra_api.create_role_assignment.call_count == 2
+    ra_api.delete_role_assignment.assert_not_called()
+
+
+@patch("fusion.OperationsApi")
+@patch("fusion.RoleAssignmentsApi")
+@patch("fusion.IdentityManagerApi")
+def test_ra_sync_check_mode(
+    m_id_api, m_ra_api, m_op_api, module_args, id_api, ra_api, operations_api
+):
+    m_id_api.return_value = id_api
+    m_ra_api.return_value = ra_api
+    m_op_api.return_value = operations_api
+    module_args["_ansible_check_mode"] = True
+    set_module_args(module_args)
+
+    with pytest.raises(AnsibleExitJson) as exc:
+        fusion_ra_sync.main()
+
+    assert exc.value.changed
+    assert len(exc.value.kwargs["added"]) == 2
+    assert len(exc.value.kwargs["removed"]) == 2
+    ra_api.create_role_assignment.assert_not_called()
+    ra_api.delete_role_assignment.assert_not_called()
+
+
+@patch("fusion.OperationsApi")
+@patch("fusion.RoleAssignmentsApi")
+@patch("fusion.IdentityManagerApi")
+def test_ra_sync_not_changed(
+    m_id_api, m_ra_api, m_op_api, id_api, ra_api, operations_api
+):
+    m_id_api.return_value = id_api
+    m_ra_api.return_value = ra_api
+    m_op_api.return_value = operations_api
+    set_module_args(
+        {
+            "assignments": [
+                {"role": "az-admin", "principal": "alice_id"},
+            ],
+            "issuer_id": "ABCD1234",
+            "private_key_file": "private-key.pem",
+        }
+    )
+
+    with pytest.raises(AnsibleExitJson) as exc:
+        fusion_ra_sync.main()
+
+    assert not exc.value.changed
+    # principal given by ID needs no lookup
+    id_api.list_users.assert_not_called()
+    ra_api.list_role_assignments.assert_called_once_with(role_name="az-admin")
+
+
+@patch("fusion.OperationsApi")
+@patch("fusion.RoleAssignmentsApi")
+@patch("fusion.IdentityManagerApi")
+def test_ra_sync_unknown_principals(
+    m_id_api, m_ra_api, m_op_api, module_args, id_api, ra_api, operations_api
+):
+    m_id_api.return_value = id_api
+    m_ra_api.return_value = ra_api
+    m_op_api.return_value = operations_api
+    module_args["assignments"][0]["user"] = "carol"
+    module_args["assignments"][2]["api_client_key"] = "pure1:apikey:456"
+    set_module_args(module_args)
+
+    with pytest.raises(AnsibleFailJson) as exc:
+        fusion_ra_sync.main()
+
+    assert "user carol does not exist" in str(exc.value)
+    assert "API client with key pure1:apikey:456 does not exist" in str(exc.value)
+    ra_api.create_role_assignment.assert_not_called()
+    ra_api.delete_role_assignment.assert_not_called()
+
+
+@patch("fusion.OperationsApi")
+@patch("fusion.RoleAssignmentsApi")
+@patch("fusion.IdentityManagerApi")
+def test_ra_sync_partial_failure(
+    m_id_api, m_ra_api, m_op_api, module_args, id_api, ra_api, operations_api
+):
+    ra_api.delete_role_assignment = MagicMock(
+        side_effect=ApiExceptionsMockGenerator.create_permission_denied()
+    )
+    m_id_api.return_value = id_api
+    m_ra_api.return_value = ra_api
+    m_op_api.return_value = operations_api
+    set_module_args(module_args)
+
+    with pytest.raises(AnsibleFailJson) as exc:
+        fusion_ra_sync.main()
+
+    assert "2 of 4 role assignment changes failed" in str(exc.value)
+    assert exc.value.kwargs["changed"]
+    assert all(a["error"] is None for a in exc.value.kwargs["added"])
+    assert all(a["error"] is not None for a in exc.value.kwargs["removed"])
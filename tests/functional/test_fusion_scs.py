@@ -0,0 +1,259 @@
+# -*- coding: utf-8 -*-
+
+# (c) 2023, Pure Storage, Inc.
+# GNU General Public License v3.0+ (see COPYING.GPLv3 or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+from unittest.mock import MagicMock, call, patch
+
+import fusion as purefusion
+import pytest
+from ansible.module_utils import basic
+from ansible_collections.purestorage.fusion.plugins.modules import fusion_scs
+from ansible_collections.purestorage.fusion.tests.functional.utils import (
+    AnsibleExitJson,
+    AnsibleFailJson,
+    OperationMock,
+    SuccessfulOperationMock,
+    exit_json,
+    fail_json,
+    set_module_args,
+)
+from ansible_collections.purestorage.fusion.tests.helpers import (
+    ApiExceptionsMockGenerator,
+)
+
+# GLOBAL MOCKS
+fusion_scs.setup_fusion = MagicMock(return_value=purefusion.api_client.ApiClient())
+purefusion.api_client.ApiClient.call_api = MagicMock(
+    side_effect=Exception("API call not mocked!")
+)
+basic.AnsibleModule.exit_json = exit_json
+basic.AnsibleModule.fail_json = fail_json
+
+
+@pytest.fixture
+def module_args():
+    return {
+        "storage_service": "ss1",
+        "storage_classes": [
+            # exists, unchanged
+            {"name": "sc1", "size_limit": "4P"},
+            # exists, new display name
+            {"name": "sc2", "display_name": "Silver", "iops_limit": "100K"},
+            # new
+            {"name": "sc4", "size_limit": "1T", "iops_limit": "10K", "bw_limit": "1G"},
+        ],
+        "issuer_id": "ABCD1234",
+        "private_key_file": "private-key.pem",
+    }
+
+
+def _sc(name, iops_limit=100_000_000):
+    return purefusion.StorageClass(
+        id=name,
+        self_link="self_link_value",
+        name=name,
+        display_name=name,
+        storage_service=purefusion.StorageServiceRef(
+            id="ss1", name="ss1", kind="StorageService", self_link="ss1"
+        ),
+        size_limit=4503599627370496,
+        iops_limit=iops_limit,
+        bandwidth_limit=549755813888,
+    )
+
+
+@pytest.fixture
+def sc_api():
+    classes = [_sc("sc1"), _sc("sc2", 100_000), _sc("sc3")]
+    api = MagicMock()
+    api.list_storage_classes = MagicMock(
+        return_value=purefusion.StorageClassList(
+            count=len(classes), more_items_remaining=False, items=classes
+        )
+    )
+    api.create_storage_class = MagicMock(return_value=OperationMock(1))
+    api.update_storage_class = MagicMock(return_value=OperationMock(2))
+    api.delete_storage_class = MagicMock(return_value=OperationMock(3))
+    return api
+
+
+@pytest.fixture
+def operations_api():
+    api = MagicMock()
+    api.list_operations = MagicMock(side_effect=purefusion.rest.ApiException)
+    api.get_operation = MagicMock(return_value=SuccessfulOperationMock)
+    return api
+
+
+@patch("fusion.OperationsApi")
+@patch("fusion.StorageClassesApi")
+@pytest.mark.parametrize(
+    ("purge", "expected_report"),
+    [
+        (False, [("sc4", "create"), ("sc2", "update")]),
+        (True, [("sc4", "create"), ("sc2", "update"), ("sc3", "delete")]),
+    ],
+)
+def test_scs_present(
+    m_sc_api, m_op_api, module_args, sc_api, operations_api, purge, expected_report
+):
+    m_sc_api.return_value = sc_api
+    m_op_api.return_value = operations_api
+    module_args["purge"] = purge
+    set_module_args(module_args)
+
+    with pytest.raises(AnsibleExitJson) as exc:
+        fusion_scs.main()
+
+    assert exc.value.changed
+    assert [
+        (c["name"], c["action"]) for c in exc.value.kwargs["storage_classes"]
+    ] == expected_report
+    sc_api.list_storage_classes.assert_called_once_with(storage_service_name="ss1")
+    sc_api.create_storage_class.assert_called_once_with(
+        purefusion.StorageClassPost(
+            name="sc4",
+            display_name="sc4",
+            size_limit=1099511627776,
+            iops_limit=10000,
+            bandwidth_limit=1073741824,
+        ),
+        storage_service_name="ss1",
+    )
+    sc_api.update_storage_class.assert_called_once_with(
+        purefusion.StorageClassPatch(display_name=purefusion.NullableString("Silver")),
+        storage_service_name="ss1",
+        storage_class_name="sc2",
+    )
+    if purge:
+        sc_api.delete_storage_class.assert_called_once_with(
+            storage_class_name="sc3", storage_service_name="ss1"
+        )
+    else:
+        sc_api.delete_storage_class.assert_not_called()
+
+
+@patch("fusion.OperationsApi")
+@patch("fusion.StorageClassesApi")
+def test_scs_unchanged(m_sc_api, m_op_api, sc_api, operations_api):
+    m_sc_api.return_value = sc_api
+    m_op_api.return_value = operations_api
+    set_module_args(
+        {
+            "storage_service": "ss1",
+            "storage_classes": [{"name": "sc1"}, {"name": "sc2", "iops_limit": "100K"}],
+            "issuer_id": "ABCD1234",
+            "private_key_file": "private-key.pem",
+        }
+    )
+
+    with pytest.raises(AnsibleExitJson) as exc:
+        fusion_scs.main()
+
+    assert not exc.value.changed
+    assert exc.value.kwargs["storage_classes"] == []
+    sc_api.create_storage_class.assert_not_called()
+    sc_api.update_storage_class.assert_not_called()
+    sc_api.delete_storage_class.assert_not_called()
+
+
+@patch("fusion.OperationsApi")
+@patch("fusion.StorageClassesApi")
+def test_scs_invalid(m_sc_api, m_op_api, module_args, sc_api, operations_api):
+    m_sc_api.return_value = sc_api
+    m_op_api.return_value = operations_api
+    module_args["storage_classes"].extend(
+        [
+            {"name": "sc1", "bw_limit": "1G"},
+            {"name": "sc3", "iops_limit": "1K"},
+            {"name": "sc5", "size_limit": "5P"},
+        ]
+    )
+    set_module_args(module_args)
+
+    with pytest.raises(AnsibleFailJson) as exc:
+        fusion_scs.main()
+
+    # all problems are reported at once
+    assert "'sc1' is specified more than once" in str(exc.value)
+    assert "iops_limit of 'sc3' cannot be changed from 100000000 to 1000" in str(
+        exc.value
+    )
+    assert "size_limit of 'sc5' is not within the required range" in str(exc.value)
+    sc_api.create_storage_class.assert_not_called()
+    sc_api.update_storage_class.assert_not_called()
+    sc_api.delete_storage_class.assert_not_called()
+
+
+@patch("fusion.OperationsApi")
+@patch("fusion.StorageClassesApi")
+def test_scs_absent(m_sc_api, m_op_api, module_args, sc_api, operations_api):
+    m_sc_api.return_value = sc_api
+    m_op_api.return_value = operations_api
+    module_args["state"] = "absent"
+    set_module_args(module_args)
+
+    with pytest.raises(AnsibleExitJson) as exc:
+        fusion_scs.main()
+
+    assert exc.value.changed
+    assert [(c["name"], c["action"]) for c in exc.value.kwargs["storage_classes"]] == [
+        ("sc1", "delete"),
+        ("sc2", "delete"),
+    ]
+    sc_api.delete_storage_class.assert_has_calls(
+        [
+            call(storage_class_name="sc1", storage_service_name="ss1"),
+            call(storage_class_name="sc2", storage_service_name="ss1"),
+        ],
+        any_order=True,
+    )
+    sc_api.create_storage_class.assert_not_called()
+
+
+@patch("fusion.OperationsApi")
+@patch("fusion.StorageClassesApi")
+def test_scs_check_mode(m_sc_api, m_op_api, module_args, sc_api, operations_api):
+    m_sc_api.return_value = sc_api
+    m_op_api.return_value = operations_api
+    module_args["purge"] = True
+    module_args["_ansible_check_mode"] = True
+    set_module_args(module_args)
+
+    with pytest.raises(AnsibleExitJson) as exc:
+        fusion_scs.main()
+
+    assert exc.value.changed
+    assert len(exc.value.kwargs["storage_classes"]) == 3
+    sc_api.create_storage_class.assert_not_called()
+    sc_api.update_storage_class.assert_not_called()
+    sc_api.delete_storage_class.assert_not_called()
+
+
+@patch("fusion.OperationsApi")
+@patch("fusion.StorageClassesApi")
+def test_scs_partial_failure(m_sc_api, m_op_api, module_args, sc_api, operations_api):
+    m_sc_api.return_value = sc_api
+    m_op_api.return_value = operations_api
+    sc_api.update_storage_class = MagicMock(
+        side_effect=ApiExceptionsMockGenerator.create_permission_denied()
+    )
+    set_module_args(module_args)
+
+    with pytest.raises(AnsibleFailJson) as exc:
+        fusion_scs.main()
+
+    assert "1 of 2 storage class changes failed" in str(exc.value)
+    assert exc.value.kwargs["changed"]
+    report = dict(
+        ((c["name"], c["action"]), c["error"])
+        for c in exc.value.kwargs["storage_classes"]
+    )
+    assert report[("sc4", "create")] is None
+    assert report[("sc2", "update")] is not None
+    sc_api.create_storage_class.assert_called_once()
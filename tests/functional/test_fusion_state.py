@@ -0,0 +1,327 @@
+# -*- coding: utf-8 -*-
+
+# (c) 2023, Pure Storage, Inc.
+# GNU General Public License v3.0+ (see COPYING.GPLv3 or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+from unittest.mock import MagicMock, patch
+
+import fusion as purefusion
+import pytest
+from ansible.module_utils import basic
+from ansible_collections.purestorage.fusion.plugins.modules import fusion_state
+from ansible_collections.purestorage.fusion.tests.functional.utils import (
+    AnsibleExitJson,
+    AnsibleFailJson,
+    OperationMock,
+    SuccessfulOperationMock,
+    exit_json,
+    fail_json,
+    set_module_args,
+)
+from ansible_collections.purestorage.fusion.tests.helpers import (
+    ApiExceptionsMockGenerator,
+)
+
+# GLOBAL MOCKS
+fusion_state.setup_fusion = MagicMock(return_value=purefusion.api_client.ApiClient())
+purefusion.api_client.ApiClient.call_api = MagicMock(
+    side_effect=Exception("API call not mocked!")
+)
+basic.AnsibleModule.exit_json = exit_json
+basic.AnsibleModule.fail_json = fail_json
+
+
+@pytest.fixture
+def module_args():
+    return {
+        "regions": [{"name": "region1"}],
+        "availability_zones": [{"name": "az1", "region": "region1"}],
+        "tenants": [
+            {"name": "tenant1", "display_name": "Tenant 1"},
+            {"name": "tenant2"},
+        ],
+        "tenant_spaces": [
+            {"name": "ts1", "tenant": "tenant1"},
+            {"name": "ts2", "tenant": "tenant2"},
+        ],
+        "host_access_policies": [
+            {"name": "hap1", "iqn": "iqn.2023-05.com.purestorage:host1"}
+        ],
+        "volumes": [
+            {
+                "name": "volume1",
+                "tenant": "tenant2",
+                "tenant_space": "ts2",
+                "storage_class": "sc1",
+                "placement_group": "pg1",
+                "size": "1M",
+                "host_access_policies": ["hap1"],
+            }
+        ],
+        "issuer_id": "ABCD1234",
+        "private_key_file": "private-key.pem",
+    }
+
+
+def _named(name, display_name=None):
+    resource = MagicMock()
+    resource.name = name
+    resource.display_name = display_name or name
+    return resource
+
+
+def _list_of(items):
+    return MagicMock(items=items, count=len(items), more_items_remaining=False)
+
+
+@pytest.fixture
+def apis():
+    """region1 and tenant1 with tenant space ts1 exist, tenant1 has different display name"""
+    calls = []
+
+    def _record(name):
+        def _call(*args, **kwargs):
+            calls.append(name)
+            return OperationMock(len(calls))
+
+        return _call
+
+    def _list_tenant_spaces(tenant_name, offset=0):
+        if tenant_name == "tenant2":
+            raise ApiExceptionsMockGenerator.create_not_found()
+        return _list_of([_named("ts1")])
+
+    regions = MagicMock()
+    regions.list_regions = MagicMock(return_value=_list_of([_named("region1")]))
+    regions.create_region = MagicMock(side_effect=_record("create_region"))
+    azs = MagicMock()
+    azs.list_availability_zones = MagicMock(return_value=_list_of([]))
+    azs.create_availability_zone = MagicMock(side_effect=_record("create_az"))
+    tenants = MagicMock()
+    tenants.list_tenants = MagicMock(
+        return_value=_list_of([_named("tenant1", "old name")])
+    )
+    tenants.create_tenant = MagicMock(side_effect=_record("create_tenant"))
+    tenants.update_tenant = MagicMock(side_effect=_record("update_tenant"))
+    tenant_spaces = MagicMock()
+    tenant_spaces.list_tenant_spaces = MagicMock(side_effect=_list_tenant_spaces)
+    tenant_spaces.create_tenant_space = MagicMock(side_effect=_record("create_ts"))
+    haps = MagicMock()
+    haps.list_host_access_policies = MagicMock(return_value=_list_of([]))
+    haps.create_host_access_policy = MagicMock(side_effect=_record("create_hap"))
+    volumes = MagicMock()
+    volumes.list_volumes = MagicMock(
+        side_effect=ApiExceptionsMockGenerator.create_not_found()
+    )
+    volumes.create_volume = MagicMock(side_effect=_record("create_volume"))
+    volumes.update_volume = MagicMock(side_effect=_record("update_volume"))
+    operations = MagicMock()
+    operations.list_operations = MagicMock(side_effect=purefusion.rest.ApiException)
+    operations.get_operation = MagicMock(return_value=SuccessfulOperationMock)
+    return {
+        "RegionsApi": regions,
+        "AvailabilityZonesApi": azs,
+        "TenantsApi": tenants,
+        "TenantSpacesApi": tenant_spaces,
+        "HostAccessPoliciesApi": haps,
+        "VolumesApi": volumes,
+        "OperationsApi": operations,
+        "calls": calls,
+    }
+
+
+@pytest.fixture
+def patched_apis(apis):
+    patchers = [
+        patch("fusion." + name, return_value=api)
+        for name, api in apis.items()
+        if name != "calls"
+    ]
+    for patcher in patchers:
+        patcher.start()
+    yield apis
+    for patcher in patchers:
+        patcher.stop()
+
+
+def test_state_applied(module_args, patched_apis):
+    set_module_args(module_args)
+
+    with pytest.raises(AnsibleExitJson) as exc:
+        fusion_state.main()
+
+    assert exc.value.changed
+    assert [
+        (c["resource"], c["action"], c["changes"], c["depends_on"], c["error"])
+        for c in exc.value.kwargs["plan"]
+    ] == [
+        ("availability_zone/region1/az1", "create", [], [], None),
+        ("tenant/tenant1", "update", ["display_name"], [], None),
+        ("tenant/tenant2", "create", [], [], None),
+        ("host_access_policy/hap1", "create", [], [], None),
+        ("tenant_space/tenant2/ts2", "create", [], ["tenant/tenant2"], None),
+        (
+            "volume/tenant2/ts2/volume1",
+            "create",
+            ["host_access_policies"],
+            ["host_access_policy/hap1", "tenant_space/tenant2/ts2"],
+            None,
+        ),
+    ]
+
+    # every listing is done once, even for parents which do not exist yet
+    patched_apis["RegionsApi"].list_regions.assert_called_once_with(offset=0)
+    patched_apis["TenantSpacesApi"].list_tenant_spaces.assert_any_call(
+        offset=0, tenant_name="tenant2"
+    )
+    assert patched_apis["TenantSpacesApi"].list_tenant_spaces.call_count == 2
+    patched_apis["RegionsApi"].create_region.assert_not_called()
+    patched_apis["TenantSpacesApi"].create_tenant_space.assert_called_once_with(
+        purefusion.TenantSpacePost(name="ts2", display_name="ts2"),
+        tenant_name="tenant2",
+    )
+    patched_apis["TenantsApi"].update_tenant.assert_called_once_with(
+        purefusion.TenantPatch(display_name=purefusion.NullableString("Tenant 1")),
+        tenant_name="tenant1",
+    )
+    patched_apis["VolumesApi"].create_volume.assert_called_once_with(
+        purefusion.VolumePost(
+            size=1048576,
+            storage_class="sc1",
+            placement_group="pg1",
+            name="volume1",
+            display_name="volume1",
+        ),
+        tenant_name="tenant2",
+        tenant_space_name="ts2",
+    )
+    patched_apis["VolumesApi"].update_volume.assert_called_once_with(
+        purefusion.VolumePatch(host_access_policies=purefusion.NullableString("hap1")),
+        tenant_name="tenant2",
+        tenant_space_name="ts2",
+        volume_name="volume1",
+    )
+
+    # dependencies are created before their dependents
+    calls = patched_apis["calls"]
+    assert calls.index("create_tenant") < calls.index("create_ts")
+    assert calls.index("create_ts") < calls.index("create_volume")
+    assert calls.index("create_hap") < calls.index("create_volume")
+    assert calls[-2:] == ["create_volume", "update_volume"]
+
+
+def test_state_check_mode(module_args, patched_apis):
+    module_args["_ansible_check_mode"] = True
+    set_module_args(module_args)
+
+    with pytest.raises(AnsibleExitJson) as exc:
+        fusion_state.main()
+
+    assert exc.value.changed
+    assert len(exc.value.kwargs["plan"]) == 6
+    assert patched_apis["calls"] == []
+
+
+def test_state_not_changed(patched_apis):
+    set_module_args(
+        {
+            "regions": [{"name": "region1"}],
+            "tenants": [{"name": "tenant1", "display_name": "old name"}],
+            "tenant_spaces": [{"name": "ts1", "tenant": "tenant1"}],
+            "issuer_id": "ABCD1234",
+            "private_key_file": "private-key.pem",
+        }
+    )
+
+    with pytest.raises(AnsibleExitJson) as exc:
+        fusion_state.main()
+
+    assert not exc.value.changed
+    assert exc.value.kwargs["plan"] == []
+    assert patched_apis["calls"] == []
+
+
+def test_state_dependents_skipped(module_args, patched_apis):
+    patched_apis["TenantsApi"].create_tenant = MagicMock(
+        side_effect=ApiExceptionsMockGenerator.create_permission_denied()
+    )
+    set_module_args(module_args)
+
+    with pytest.raises(AnsibleFailJson) as exc:
+        fusion_state.main()
+
+    assert "3 of 6 changes failed" in str(exc.value)
+    assert exc.value.kwargs["changed"]
+    errors = dict((c["resource"], c["error"]) for c in exc.value.kwargs["plan"])
+    assert errors["tenant/tenant2"] is not None
+    assert "tenant/tenant2" in errors["tenant_space/tenant2/ts2"]
+    assert errors["volume/tenant2/ts2/volume1"] is not None
+    assert errors["availability_zone/region1/az1"] is None
+    patched_apis["TenantSpacesApi"].create_tenant_space.assert_not_called()
+    patched_apis["VolumesApi"].create_volume.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    "module_args_update",
+    [
+        # volume without size cannot be created
+        {
+            "volumes": [
+                {
+                    "name": "volume1",
+                    "tenant": "tenant2",
+                    "tenant_space": "ts2",
+                    "storage_class": "sc1",
+                    "placement_group": "pg1",
+                }
+            ]
+        },
+        # duplicate resource
+        {
+            "tenant_spaces": [
+                {"name": "ts2", "tenant": "tenant2"},
+                {"name": "ts2", "tenant": "tenant2", "display_name": "TS 2"},
+            ]
+        },
+    ],
+)
+def test_state_invalid(module_args, patched_apis, module_args_update):
+    module_args.update(module_args_update)
+    set_module_args(module_args)
+
+    with pytest.raises(AnsibleFailJson):
+        fusion_state.main()
+
+    assert patched_apis["calls"] == []
+
+
+def test_state_listing_fails(module_args, patched_apis):
+    patched_apis["RegionsApi"].list_regions = MagicMock(
+        side_effect=ApiExceptionsMockGenerator.create_permission_denied()
+    )
+    set_module_args(module_args)
+
+    with pytest.raises(AnsibleFailJson) as exc:
+        fusion_state.main()
+
+    assert "Listing regions" in str(exc.value)
+    assert patched_apis["calls"] == []
+
+
+@pytest.mark.parametrize("kind", fusion_state.KINDS, ids=lambda kind: kind.name)
+def test_state_list_existing_with_sdk(kind):
+    # real SDK API classes reject arguments their endpoints do not take
+    fusion = purefusion.api_client.ApiClient()
+    fusion.call_api = MagicMock(
+        side_effect=lambda *args, **kwargs: getattr(
+            purefusion, kwargs["response_type"]
+        )(items=[_named("resource1")], count=1, more_items_remaining=False)
+    )
+    spec = dict((parent, parent + "1") for parent in kind.parents)
+
+    assert [r.name for r in kind.list_existing(fusion, spec)] == ["resource1"]
+    fusion.call_api.assert_called_once()
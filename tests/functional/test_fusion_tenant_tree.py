@@ -0,0 +1,315 @@
+# -*- coding: utf-8 -*-
+
+# (c) 2023, Pure Storage, Inc.
+# GNU General Public License v3.0+ (see COPYING.GPLv3 or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+from unittest.mock import MagicMock, call, patch
+
+import fusion as purefusion
+import pytest
+from ansible.module_utils import basic
+from ansible_collections.purestorage.fusion.plugins.modules import fusion_tenant_tree
+from ansible_collections.purestorage.fusion.tests.functional.utils import (
+    AnsibleExitJson,
+    AnsibleFailJson,
+    OperationMock,
+    SuccessfulOperationMock,
+    exit_json,
+    fail_json,
+    set_module_args,
+)
+from ansible_collections.purestorage.fusion.tests.helpers import (
+    ApiExceptionsMockGenerator,
+)
+
+# GLOBAL MOCKS
+fusion_tenant_tree.setup_fusion = MagicMock(
+    return_value=purefusion.api_client.ApiClient()
+)
+purefusion.api_client.ApiClient.call_api = MagicMock(
+    side_effect=Exception("API call not mocked!")
+)
+basic.AnsibleModule.exit_json = exit_json
+basic.AnsibleModule.fail_json = fail_json
+
+
+@pytest.fixture
+def module_args():
+    return {
+        "name": "tenant1",
+        "region": "region1",
+        "availability_zone": "az1",
+        "storage_service": "ss1",
+        "tenant_spaces": [
+            {
+                # exists
+                "name": "ts1",
+                "placement_groups": [
+                    # exists
+                    {"name": "pg1"},
+                    {"name": "pg2", "storage_service": "ss2"},
+                ],
+            },
+            {
+                "name": "ts2",
+                "display_name": "Tenant space 2",
+                "placement_groups": [{"name": "pg3"}],
+            },
+        ],
+        "issuer_id": "ABCD1234",
+        "private_key_file": "private-key.pem",
+    }
+
+
+def _named(name):
+    item = MagicMock()
+    item.name = name
+    return item
+
+
+def _list(*names):
+    items = [_named(name) for name in names]
+    page = MagicMock()
+    page.items = items
+    page.more_items_remaining = False
+    return page
+
+
+@pytest.fixture
+def tenant_api():
+    api = MagicMock()
+    api.get_tenant = MagicMock(return_value=_named("tenant1"))
+    api.create_tenant = MagicMock(return_value=OperationMock(1))
+    return api
+
+
+@pytest.fixture
+def ts_api():
+    api = MagicMock()
+    api.list_tenant_spaces = MagicMock(return_value=_list("ts1", "ts_other"))
+    api.create_tenant_space = MagicMock(return_value=OperationMock(2))
+    return api
+
+
+@pytest.fixture
+def pg_api():
+    api = MagicMock()
+    api.list_placement_groups = MagicMock(return_value=_list("pg1"))
+    api.create_placement_group = MagicMock(return_value=OperationMock(3))
+    return api
+
+
+@pytest.fixture
+def operations_api():
+    api = MagicMock()
+    api.list_operations = MagicMock(side_effect=purefusion.rest.ApiException)
+    api.get_operation = MagicMock(return_value=SuccessfulOperationMock)
+    return api
+
+
+def _pg_post(name, tenant_space, storage_service="ss1"):
+    return call(
+        purefusion.PlacementGroupPost(
+            name=name,
+            display_name=name,
+            region="region1",
+            availability_zone="az1",
+            storage_service=storage_service,
+        ),
+        tenant_name="tenant1",
+        tenant_space_name=tenant_space,
+    )
+
+
+@patch("fusion.OperationsApi")
+@patch("fusion.PlacementGroupsApi")
+@patch("fusion.TenantSpacesApi")
+@patch("fusion.TenantsApi")
+def test_tenant_tree_existing_tenant(
+    m_tenant_api,
+    m_ts_api,
+    m_pg_api,
+    m_op_api,
+    module_args,
+    tenant_api,
+    ts_api,
+    pg_api,
+    operations_api,
+):
+    m_tenant_api.return_value = tenant_api
+    m_ts_api.return_value = ts_api
+    m_pg_api.return_value = pg_api
+    m_op_api.return_value = operations_api
+    set_module_args(module_args)
+
+    with pytest.raises(AnsibleExitJson) as exc:
+        fusion_tenant_tree.main()
+
+    assert exc.value.changed
+    assert exc.value.kwargs["created"] == [
+        {"kind": "placement_group", "path": "tenant1/ts1/pg2", "error": None},
+        {"kind": "tenant_space", "path": "tenant1/ts2", "error": None},
+        {"kind": "placement_group", "path": "tenant1/ts2/pg3", "error": None},
+    ]
+    # one listing per parent, new tenant space has nothing to list
+    ts_api.list_tenant_spaces.assert_called_once_with(offset=0, tenant_name="tenant1")
+    pg_api.list_placement_groups.assert_called_once_with(
+        offset=0, tenant_name="tenant1", tenant_space_name="ts1"
+    )
+    tenant_api.create_tenant.assert_not_called()
+    ts_api.create_tenant_space.assert_called_once_with(
+        purefusion.TenantSpacePost(name="ts2", display_name="Tenant space 2"),
+        tenant_name="tenant1",
+    )
+    pg_api.create_placement_group.assert_has_calls(
+        [_pg_post("pg2", "ts1", "ss2"), _pg_post("pg3", "ts2")], any_order=True
+    )
+    assert pg_api.create_placement_group.call_count == 2
+
+
+@patch("fusion.OperationsApi")
+@patch("fusion.PlacementGroupsApi")
+@patch("fusion.TenantSpacesApi")
+@patch("fusion.TenantsApi")
+def test_tenant_tree_new_tenant(
+    m_tenant_api,
+    m_ts_api,
+    m_pg_api,
+    m_op_api,
+    module_args,
+    tenant_api,
+    ts_api,
+    pg_api,
+    operations_api,
+):
+    tenant_api.get_tenant = MagicMock(
+        side_effect=ApiExceptionsMockGenerator.create_not_found()
+    )
+    m_tenant_api.return_value = tenant_api
+    m_ts_api.return_value = ts_api
+    m_pg_api.return_value = pg_api
+    m_op_api.return_value = operations_api
+    set_module_args(module_args)
+
+    with pytest.raises(AnsibleExitJson) as exc:
+        fusion_tenant_tree.main()
+
+    assert exc.value.changed
+    assert [c["path"] for c in exc.value.kwargs["created"]] == [
+        "tenant1",
+        "tenant1/ts1",
+        "tenant1/ts1/pg1",
+        "tenant1/ts1/pg2",
+        "tenant1/ts2",
+        "tenant1/ts2/pg3",
+    ]
+    ts_api.list_tenant_spaces.assert_not_called()
+    pg_api.list_placement_groups.assert_not_called()
+    tenant_api.create_tenant.assert_called_once_with(
+        purefusion.TenantPost(name="tenant1", display_name="tenant1")
+    )
+    assert ts_api.create_tenant_space.call_count == 2
+    assert pg_api.create_placement_group.call_count == 3
+
+
+@patch("fusion.OperationsApi")
+@patch("fusion.PlacementGroupsApi")
+@patch("fusion.TenantSpacesApi")
+@patch("fusion.TenantsApi")
+def test_tenant_tree_failed_parent(
+    m_tenant_api,
+    m_ts_api,
+    m_pg_api,
+    m_op_api,
+    module_args,
+    tenant_api,
+    ts_api,
+    pg_api,
+    operations_api,
+):
+    ts_api.create_tenant_space = MagicMock(
+        side_effect=ApiExceptionsMockGenerator.create_permission_denied()
+    )
+    m_tenant_api.return_value = tenant_api
+    m_ts_api.return_value = ts_api
+    m_pg_api.return_value = pg_api
+    m_op_api.return_value = operations_api
+    set_module_args(module_args)
+
+    with pytest.raises(AnsibleFailJson) as exc:
+        fusion_tenant_tree.main()
+
+    assert "2 of 3 resources of the tenant tree failed" in str(exc.value)
+    assert exc.value.kwargs["changed"]
+    created = dict((c["path"], c["error"]) for c in exc.value.kwargs["created"])
+    assert created["tenant1/ts1/pg2"] is None
+    assert created["tenant1/ts2/pg3"] == "Skipped because 'tenant1/ts2' failed"
+    pg_api.create_placement_group.assert_called_once()
+    assert pg_api.create_placement_group.call_args == _pg_post("pg2", "ts1", "ss2")
+
+
+@patch("fusion.OperationsApi")
+@patch("fusion.PlacementGroupsApi")
+@patch("fusion.TenantSpacesApi")
+@patch("fusion.TenantsApi")
+def test_tenant_tree_invalid(
+    m_tenant_api,
+    m_ts_api,
+    m_pg_api,
+    m_op_api,
+    module_args,
+    tenant_api,
+    ts_api,
+    pg_api,
+    operations_api,
+):
+    m_tenant_api.return_value = tenant_api
+    m_ts_api.return_value = ts_api
+    m_pg_api.return_value = pg_api
+    m_op_api.return_value = operations_api
+    del module_args["storage_service"]
+    module_args["tenant_spaces"].append({"name": "ts2"})
+    set_module_args(module_args)
+
+    with pytest.raises(AnsibleFailJson) as exc:
+        fusion_tenant_tree.main()
+
+    assert "'tenant1/ts2' is specified more than once" in str(exc.value)
+    assert "'tenant1/ts2/pg3' is missing storage_service" in str(exc.value)
+    ts_api.create_tenant_space.assert_not_called()
+    pg_api.create_placement_group.assert_not_called()
+
+
+@patch("fusion.OperationsApi")
+@patch("fusion.PlacementGroupsApi")
+@patch("fusion.TenantSpacesApi")
+@patch("fusion.TenantsApi")
+def test_tenant_tree_check_mode(
+    m_tenant_api,
+    m_ts_api,
+    m_pg_api,
+    m_op_api,
+    module_args,
+    tenant_api,
+    ts_api,
+    pg_api,
+    operations_api,
+):
+    m_tenant_api.return_value = tenant_api
+    m_ts_api.return_value = ts_api
+    m_pg_api.return_value = pg_api
+    m_op_api.return_value = operations_api
+    module_args["_ansible_check_mode"] = True
+    set_module_args(module_args)
+
+    with pytest.raises(AnsibleExitJson) as exc:
+        fusion_tenant_tree.main()
+
+    assert exc.value.changed
+    assert len(exc.value.kwargs["created"]) == 3
+    ts_api.create_tenant_space.assert_not_called()
+    pg_api.create_placement_group.assert_not_called()
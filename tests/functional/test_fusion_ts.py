@@ -7,7 +7,7 @@ from __future__ import absolute_import, division, print_function
 
 __metaclass__ = type
 
-from unittest.mock import MagicMock, patch
+from unittest.mock import MagicMock, call, patch
 
 import fusion as purefusion
 import pytest
@@ -26,6 +26,9 @@ from ansible_collections.purestorage.fusion.tests.functional.utils import (
     fail_json,
     set_module_args,
 )
+from ansible_collections.purestorage.fusion.tests.helpers import (
+    ApiExceptionsMockGenerator,
+)
 from urllib3.exceptions import HTTPError
 
 # GLOBAL MOCKS
@@ -920,3 +923,292 @@ def test_ts_delete_op_exception(m_ts_api, m_op_api, exec_original, exec_catch):
         tenant_space_name=module_args["name"],
     )
     op_obj.get_operation.assert_called_once_with(3)
+
+
+def _ref(cls, kind, name):
+    return cls(id=name + "_id", name=name, kind=kind, self_link="self_link")
+
+
+def _cascade_volume(name, placement_group, haps, destroyed=False):
+    return purefusion.Volume(
+        id=name + "_id",
+        name=name,
+        display_name=name,
+        self_link="self_link",
+        size=1048576,
+        tenant=_ref(purefusion.TenantRef, "Tenant", "tenant1"),
+        tenant_space=_ref(purefusion.TenantSpaceRef, "TenantSpace", "tenantspace1"),
+        storage_class=_ref(purefusion.StorageClassRef, "StorageClass", "sc1"),
+        placement_group=_ref(
+            purefusion.PlacementGroupRef, "PlacementGroup", placement_group
+        ),
+        host_access_policies=[
+            _ref(purefusion.HostAccessPolicyRef, "HostAccessPolicy", hap)
+            for hap in haps
+        ],
+        serial_number="sn",
+        destroyed=destroyed,
+    )
+
+
+def _cascade_pg(name):
+    return purefusion.PlacementGroup(
+        id=name + "_id",
+        name=name,
+        display_name=name,
+        self_link="self_link",
+        tenant=_ref(purefusion.TenantRef, "Tenant", "tenant1"),
+        tenant_space=_ref(purefusion.TenantSpaceRef, "TenantSpace", "tenantspace1"),
+        availability_zone=_ref(
+            purefusion.AvailabilityZoneRef, "AvailabilityZone", "az1"
+        ),
+        placement_engine="heuristics",
+        protocols=[],
+        storage_service=_ref(purefusion.StorageServiceRef, "StorageService", "ss1"),
+    )
+
+
+def _cascade_snapshot(name):
+    return purefusion.Snapshot(
+        id=name + "_id",
+        name=name,
+        display_name=name,
+        self_link="self_link",
+        tenant=_ref(purefusion.TenantRef, "Tenant", "tenant1"),
+        tenant_space=_ref(purefusion.TenantSpaceRef, "TenantSpace", "tenantspace1"),
+        volume_snapshots_link="volume_snapshots_link",
+        time_remaining=0,
+        destroyed=False,
+    )
+
+
+def _list_of(items):
+    return MagicMock(
+        return_value=MagicMock(
+            items=items, count=len(items), more_items_remaining=False
+        )
+    )
+
+
+@pytest.fixture
+def cascade_apis():
+    """Tenant space with volume1 (attached, pg1), volume2 (destroyed, pg2) and snapshot1"""
+    calls = []
+
+    def _record(name, op_id):
+        def _call(*args, **kwargs):
+            calls.append(name)
+            return OperationMock(op_id)
+
+        return _call
+
+    volumes_api = MagicMock()
+    volumes_api.list_volumes = _list_of(
+        [
+            _cascade_volume("volume1", "pg1", ["hap1"]),
+            _cascade_volume("volume2", "pg2", [], destroyed=True),
+        ]
+    )
+    volumes_api.update_volume = MagicMock(side_effect=_record("update_volume", 4))
+    volumes_api.delete_volume = MagicMock(side_effect=_record("delete_volume", 5))
+    snapshots_api = MagicMock()
+    snapshots_api.list_snapshots = _list_of([_cascade_snapshot("snapshot1")])
+    snapshots_api.update_snapshot = MagicMock(side_effect=_record("update_snapshot", 6))
+    snapshots_api.delete_snapshot = MagicMock(side_effect=_record("delete_snapshot", 7))
+    pgs_api = MagicMock()
+    pgs_api.list_placement_groups = _list_of([_cascade_pg("pg1"), _cascade_pg("pg2")])
+    pgs_api.delete_placement_group = MagicMock(
+        side_effect=_record("delete_placement_group", 8)
+    )
+    ts_api = MagicMock()
+    ts_api.get_tenant_space = MagicMock(
+        return_value=purefusion.TenantSpace(
+            id=1, self_link="self_link", name="tenantspace1", display_name="ts"
+        )
+    )
+    ts_api.delete_tenant_space = MagicMock(side_effect=_record("delete_ts", 3))
+    op_api = MagicMock()
+    op_api.list_operations = MagicMock(side_effect=purefusion.rest.ApiException)
+    op_api.get_operation = MagicMock(return_value=SuccessfulOperationMock)
+    return {
+        "volumes": volumes_api,
+        "snapshots": snapshots_api,
+        "placement_groups": pgs_api,
+        "tenant_spaces": ts_api,
+        "operations": op_api,
+        "calls": calls,
+    }
+
+
+def _set_cascade_mocks(mocks, apis):
+    for mock, name in zip(
+        mocks,
+        ["operations", "tenant_spaces", "placement_groups", "snapshots", "volumes"],
+    ):
+        mock.return_value = apis[name]
+
+
+@pytest.fixture
+def module_args_cascade():
+    return {
+        "state": "absent",
+        "name": "tenantspace1",
+        "tenant": "tenant1",
+        "cascade": True,
+        "issuer_id": "ABCD1234",
+        "private_key_file": "private-key.pem",
+    }
+
+
+@patch("fusion.VolumesApi")
+@patch("fusion.SnapshotsApi")
+@patch("fusion.PlacementGroupsApi")
+@patch("fusion.TenantSpacesApi")
+@patch("fusion.OperationsApi")
+def test_ts_delete_cascade(
+    m_op_api,
+    m_ts_api,
+    m_pg_api,
+    m_snapshots_api,
+    m_volumes_api,
+    cascade_apis,
+    module_args_cascade,
+):
+    _set_cascade_mocks(
+        [m_op_api, m_ts_api, m_pg_api, m_snapshots_api, m_volumes_api], cascade_apis
+    )
+    set_module_args(module_args_cascade)
+
+    with pytest.raises(AnsibleExitJson) as exc:
+        fusion_ts.main()
+
+    assert exc.value.changed
+    assert exc.value.kwargs["cascade"] == {
+        "volumes": ["volume1", "volume2"],
+        "snapshots": ["snapshot1"],
+        "placement_groups": ["pg1", "pg2"],
+        "errors": {},
+    }
+
+    location = {"tenant_name": "tenant1", "tenant_space_name": "tenantspace1"}
+    volumes_api = cascade_apis["volumes"]
+    # volume1 is detached and destroyed, volume2 is already destroyed
+    volumes_api.update_volume.assert_has_calls(
+        [
+            call(
+                purefusion.VolumePatch(
+                    host_access_policies=purefusion.NullableString("")
+                ),
+                volume_name="volume1",
+                **location
+            ),
+            call(
+                purefusion.VolumePatch(destroyed=purefusion.NullableBoolean(True)),
+                volume_name="volume1",
+                **location
+            ),
+        ]
+    )
+    assert volumes_api.update_volume.call_count == 2
+    volumes_api.delete_volume.assert_has_calls(
+        [
+            call(volume_name="volume1", **location),
+            call(volume_name="volume2", **location),
+        ],
+        any_order=True,
+    )
+    cascade_apis["snapshots"].delete_snapshot.assert_called_once_with(
+        snapshot_name="snapshot1", **location
+    )
+    cascade_apis["placement_groups"].delete_placement_group.assert_has_calls(
+        [
+            call(placement_group_name="pg1", **location),
+            call(placement_group_name="pg2", **location),
+        ],
+        any_order=True,
+    )
+
+    # placement groups are deleted after all volumes and snapshots,
+    # tenant space is deleted last
+    calls = cascade_apis["calls"]
+    assert calls[-3:] == [
+        "delete_placement_group",
+        "delete_placement_group",
+        "delete_ts",
+    ]
+    assert sorted(calls[:-3]) == [
+        "delete_snapshot",
+        "delete_volume",
+        "delete_volume",
+        "update_snapshot",
+        "update_volume",
+        "update_volume",
+    ]
+
+
+@patch("fusion.VolumesApi")
+@patch("fusion.SnapshotsApi")
+@patch("fusion.PlacementGroupsApi")
+@patch("fusion.TenantSpacesApi")
+@patch("fusion.OperationsApi")
+def test_ts_delete_cascade_check_mode(
+    m_op_api,
+    m_ts_api,
+    m_pg_api,
+    m_snapshots_api,
+    m_volumes_api,
+    cascade_apis,
+    module_args_cascade,
+):
+    _set_cascade_mocks(
+        [m_op_api, m_ts_api, m_pg_api, m_snapshots_api, m_volumes_api], cascade_apis
+    )
+    module_args_cascade["_ansible_check_mode"] = True
+    set_module_args(module_args_cascade)
+
+    with pytest.raises(AnsibleExitJson) as exc:
+        fusion_ts.main()
+
+    assert exc.value.changed
+    assert exc.value.kwargs["cascade"]["volumes"] == ["volume1", "volume2"]
+    assert exc.value.kwargs["cascade"]["placement_groups"] == ["pg1", "pg2"]
+    assert cascade_apis["calls"] == []
+
+
+@patch("fusion.VolumesApi")
+@patch("fusion.SnapshotsApi")
+@patch("fusion.PlacementGroupsApi")
+@patch("fusion.TenantSpacesApi")
+@patch("fusion.OperationsApi")
+def test_ts_delete_cascade_partial_failure(
+    m_op_api,
+    m_ts_api,
+    m_pg_api,
+    m_snapshots_api,
+    m_volumes_api,
+    cascade_apis,
+    module_args_cascade,
+):
+    cascade_apis["volumes"].delete_volume = MagicMock(
+        side_effect=ApiExceptionsMockGenerator.create_permission_denied()
+    )
+    _set_cascade_mocks(
+        [m_op_api, m_ts_api, m_pg_api, m_snapshots_api, m_volumes_api], cascade_apis
+    )
+    set_module_args(module_args_cascade)
+
+    with pytest.raises(AnsibleFailJson) as exc:
+        fusion_ts.main()
+
+    assert "Failed to delete 4 of 5 resources" in str(exc.value)
+    report = exc.value.kwargs["cascade"]
+    assert report["snapshots"] == ["snapshot1"]
+    assert sorted(report["errors"]) == [
+        "placement_group/pg1",
+        "placement_group/pg2",
+        "volume/volume1",
+        "volume/volume2",
+    ]
+    # placement groups depending on failed volumes are not deleted
+    cascade_apis["placement_groups"].delete_placement_group.assert_not_called()
+    cascade_apis["tenant_spaces"].delete_tenant_space.assert_not_called()
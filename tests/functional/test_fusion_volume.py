@@ -27,6 +27,9 @@ from ansible_collections.purestorage.fusion.tests.functional.utils import (
     fail_json,
     set_module_args,
 )
+from ansible_collections.purestorage.fusion.tests.helpers import (
+    ApiExceptionsMockGenerator,
+)
 from urllib3.exceptions import HTTPError
 
 # GLOBAL MOCKS
@@ -248,6 +251,61 @@ def test_volume_create_successfully(mock_volumes_api, mock_operations_api, modul
     operations_api.get_operation.assert_called_once_with(1)
 
 
+@patch("fusion.OperationsApi")
+@patch("fusion.VolumesApi")
+def test_volume_optimistic_create_successfully(
+    mock_volumes_api, mock_operations_api, module_args
+):
+    module_args.update({"optimistic_create": True, "host_access_policies": None})
+    operations_api = purefusion.OperationsApi()
+    volumes_api = purefusion.VolumesApi()
+    volumes_api.get_volume = MagicMock(side_effect=purefusion.rest.ApiException)
+    volumes_api.create_volume = MagicMock(return_value=OperationMock(1))
+    operations_api.get_operation = MagicMock(return_value=SuccessfulOperationMock)
+    mock_volumes_api.return_value = volumes_api
+    mock_operations_api.return_value = operations_api
+    set_module_args(module_args)
+    # run module
+    with pytest.raises(AnsibleExitJson) as exception:
+        fusion_volume.main()
+    assert exception.value.changed is True
+    # no read is needed when creating a new volume without host access policies
+    volumes_api.get_volume.assert_not_called()
+    volumes_api.create_volume.assert_called_once()
+    operations_api.get_operation.assert_called_once_with(1)
+
+
+@patch("fusion.OperationsApi")
+@patch("fusion.VolumesApi")
+def test_volume_optimistic_create_already_exists(
+    mock_volumes_api, mock_operations_api, module_args, volume
+):
+    module_args.update({"optimistic_create": True})
+    operations_api = purefusion.OperationsApi()
+    volumes_api = purefusion.VolumesApi()
+    volumes_api.get_volume = MagicMock(return_value=purefusion.Volume(**volume))
+    volumes_api.create_volume = MagicMock(
+        side_effect=ApiExceptionsMockGenerator.create_conflict()
+    )
+    volumes_api.update_volume = MagicMock(return_value=OperationMock(2))
+    operations_api.get_operation = MagicMock(return_value=SuccessfulOperationMock)
+    mock_volumes_api.return_value = volumes_api
+    mock_operations_api.return_value = operations_api
+    set_module_args(module_args)
+    # run module
+    with pytest.raises(AnsibleExitJson) as exception:
+        fusion_volume.main()
+    assert exception.value.changed is False
+    volumes_api.create_volume.assert_called_once()
+    volumes_api.get_volume.assert_called_with(
+        volume_name=module_args["name"],
+        tenant_name=module_args["tenant"],
+        tenant_space_name=module_args["tenant_space"],
+    )
+    volumes_api.update_volume.assert_not_called()
+    operations_api.get_operation.assert_not_called()
+
+
 @patch("fusion.OperationsApi")
 @patch("fusion.VolumesApi")
 def test_volume_create_from_volume_successfully(
@@ -330,6 +388,197 @@ def test_volume_create_from_volume_snapshot_successfully(
     operations_api.get_operation.assert_called_once_with(1)
 
 
+@pytest.fixture
+def clone_module_args(module_args):
+    del module_args["size"]
+    module_args.update(
+        {
+            "name": "clone",
+            "clones": 3,
+            "source_snapshot": "snap",
+            "source_volume_snapshot": "vol_snap",
+        }
+    )
+    return module_args
+
+
+def _clone_list(volume, names):
+    volumes = []
+    for name in names:
+        clone = dict(volume, name=name, serial_number="sn-" + name)
+        volumes.append(purefusion.Volume(**clone))
+    return purefusion.VolumeList(
+        count=len(volumes), more_items_remaining=False, items=volumes
+    )
+
+
+@patch("fusion.OperationsApi")
+@patch("fusion.VolumesApi")
+def test_volume_create_clones_successfully(
+    mock_volumes_api, mock_operations_api, clone_module_args, volume
+):
+    operations_api = purefusion.OperationsApi()
+    operations_api.list_operations = MagicMock(side_effect=purefusion.rest.ApiException)
+    operations_api.get_operation = MagicMock(return_value=SuccessfulOperationMock)
+    volumes_api = purefusion.VolumesApi()
+    volumes_api.get_volume = MagicMock(side_effect=NotImplementedError())
+    # clone-2 already exists
+    volumes_api.list_volumes = MagicMock(
+        side_effect=[
+            _clone_list(volume, ["clone-2"]),
+            _clone_list(volume, ["clone-1", "clone-2", "clone-3"]),
+        ]
+    )
+    volumes_api.create_volume = MagicMock(return_value=OperationMock(1))
+    volumes_api.update_volume = MagicMock(return_value=OperationMock(2))
+    mock_volumes_api.return_value = volumes_api
+    mock_operations_api.return_value = operations_api
+    set_module_args(clone_module_args)
+
+    with pytest.raises(AnsibleExitJson) as exception:
+        fusion_volume.main()
+
+    assert exception.value.changed is True
+    assert exception.value.kwargs["clones"] == [
+        {
+            "name": "clone-1",
+            "serial_number": "sn-clone-1",
+            "changed": True,
+            "error": None,
+        },
+        {
+            "name": "clone-2",
+            "serial_number": "sn-clone-2",
+            "changed": False,
+            "error": None,
+        },
+        {
+            "name": "clone-3",
+            "serial_number": "sn-clone-3",
+            "changed": True,
+            "error": None,
+        },
+    ]
+    volumes_api.get_volume.assert_not_called()
+    assert volumes_api.list_volumes.call_count == 2
+    assert volumes_api.create_volume.call_count == 2
+    for name in ["clone-1", "clone-3"]:
+        volumes_api.create_volume.assert_any_call(
+            purefusion.VolumePost(
+                source_link="/tenants/t1/tenant-spaces/ts1/snapshots/snap/volume-snapshots/vol_snap",
+                storage_class="sc1",
+                placement_group="pg1",
+                name=name,
+                display_name=name,
+                protection_policy="pp1",
+            ),
+            tenant_name="t1",
+            tenant_space_name="ts1",
+        )
+        volumes_api.update_volume.assert_any_call(
+            purefusion.VolumePatch(
+                host_access_policies=purefusion.NullableString("hap1")
+            ),
+            volume_name=name,
+            tenant_name="t1",
+            tenant_space_name="ts1",
+        )
+    assert volumes_api.update_volume.call_count == 2
+
+
+@patch("fusion.OperationsApi")
+@patch("fusion.VolumesApi")
+def test_volume_create_clones_check_mode(
+    mock_volumes_api, mock_operations_api, clone_module_args, volume
+):
+    volumes_api = purefusion.VolumesApi()
+    volumes_api.list_volumes = MagicMock(return_value=_clone_list(volume, []))
+    volumes_api.create_volume = MagicMock(side_effect=NotImplementedError())
+    mock_volumes_api.return_value = volumes_api
+    clone_module_args["clone_name_template"] = "{name}{index:02d}"
+    clone_module_args["_ansible_check_mode"] = True
+    set_module_args(clone_module_args)
+
+    with pytest.raises(AnsibleExitJson) as exception:
+        fusion_volume.main()
+
+    assert exception.value.changed is True
+    assert [c["name"] for c in exception.value.kwargs["clones"]] == [
+        "clone01",
+        "clone02",
+        "clone03",
+    ]
+    volumes_api.list_volumes.assert_called_once()
+
+
+@patch("fusion.OperationsApi")
+@patch("fusion.VolumesApi")
+@pytest.mark.parametrize(
+    "args_update",
+    [
+        # no source
+        {"source_snapshot": None, "source_volume_snapshot": None, "size": "1M"},
+        # template without index
+        {"clone_name_template": "{name}"},
+        # unknown template field
+        {"clone_name_template": "{name}-{number}"},
+        # no clones
+        {"clones": 0},
+    ],
+)
+def test_volume_create_clones_invalid(
+    mock_volumes_api, mock_operations_api, clone_module_args, args_update
+):
+    volumes_api = purefusion.VolumesApi()
+    volumes_api.list_volumes = MagicMock(side_effect=NotImplementedError())
+    mock_volumes_api.return_value = volumes_api
+    clone_module_args.update(args_update)
+    set_module_args(clone_module_args)
+
+    with pytest.raises(AnsibleFailJson):
+        fusion_volume.main()
+
+    volumes_api.list_volumes.assert_not_called()
+
+
+@patch("fusion.OperationsApi")
+@patch("fusion.VolumesApi")
+def test_volume_create_clones_partial_failure(
+    mock_volumes_api, mock_operations_api, clone_module_args, volume
+):
+    def _create_volume(body, **kwargs):
+        if body.name == "clone-2":
+            raise ApiExceptionsMockGenerator.create_permission_denied()
+        return OperationMock(1)
+
+    operations_api = purefusion.OperationsApi()
+    operations_api.list_operations = MagicMock(side_effect=purefusion.rest.ApiException)
+    operations_api.get_operation = MagicMock(return_value=SuccessfulOperationMock)
+    volumes_api = purefusion.VolumesApi()
+    volumes_api.list_volumes = MagicMock(
+        side_effect=[
+            _clone_list(volume, []),
+            _clone_list(volume, ["clone-1", "clone-3"]),
+        ]
+    )
+    volumes_api.create_volume = MagicMock(side_effect=_create_volume)
+    volumes_api.update_volume = MagicMock(return_value=OperationMock(2))
+    mock_volumes_api.return_value = volumes_api
+    mock_operations_api.return_value = operations_api
+    set_module_args(clone_module_args)
+
+    with pytest.raises(AnsibleFailJson) as exception:
+        fusion_volume.main()
+
+    assert "1 of 3 clones failed" in str(exception.value)
+    clones = exception.value.kwargs["clones"]
+    assert clones[1]["error"] is not None
+    assert clones[1]["serial_number"] is None
+    assert clones[2]["serial_number"] == "sn-clone-3"
+    # failed clone is not attached
+    assert volumes_api.update_volume.call_count == 2
+
+
 @patch("fusion.OperationsApi")
 @patch("fusion.VolumesApi")
 def test_volume_create_without_display_name_successfully(
@@ -493,7 +742,8 @@ def test_volume_update_with_state_present_executed_correctly(
     with pytest.raises(AnsibleExitJson) as exception:
         fusion_volume.main()
     assert exception.value.changed is True
-    volumes_api.get_volume.assert_called_with(
+    # the volume fetched by main() is reused by update_volume()
+    volumes_api.get_volume.assert_called_once_with(
         volume_name=module_args["name"],
         tenant_name=module_args["tenant"],
         tenant_space_name=module_args["tenant_space"],
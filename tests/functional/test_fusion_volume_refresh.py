@@ -0,0 +1,278 @@
+# -*- coding: utf-8 -*-
+
+# (c) 2023, Pure Storage, Inc.
+# GNU General Public License v3.0+ (see COPYING.GPLv3 or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+from unittest.mock import MagicMock, call, patch
+
+import fusion as purefusion
+import pytest
+from ansible.module_utils import basic
+from ansible_collections.purestorage.fusion.plugins.modules import (
+    fusion_volume_refresh,
+)
+from ansible_collections.purestorage.fusion.tests.functional.utils import (
+    AnsibleExitJson,
+    AnsibleFailJson,
+    OperationMock,
+    SuccessfulOperationMock,
+    exit_json,
+    fail_json,
+    set_module_args,
+)
+from ansible_collections.purestorage.fusion.tests.helpers import (
+    ApiExceptionsMockGenerator,
+)
+
+# GLOBAL MOCKS
+fusion_volume_refresh.setup_fusion = MagicMock(
+    return_value=purefusion.api_client.ApiClient()
+)
+purefusion.api_client.ApiClient.call_api = MagicMock(
+    side_effect=Exception("API call not mocked!")
+)
+basic.AnsibleModule.exit_json = exit_json
+basic.AnsibleModule.fail_json = fail_json
+
+SNAPSHOT_LINK = "/tenants/t1/tenant-spaces/ts1/snapshots/nightly/volume-snapshots/{0}"
+
+
+@pytest.fixture
+def module_args():
+    return {
+        "tenant": "t1",
+        "tenant_space": "ts1",
+        "snapshot": "nightly",
+        "volumes": {"report-1": "db-1", "report-2": "db-2", "report-3": "db-1"},
+        "issuer_id": "ABCD1234",
+        "private_key_file": "private-key.pem",
+    }
+
+
+def _volume(name, source=None, destroyed=False):
+    volume = MagicMock(destroyed=destroyed)
+    volume.name = name
+    volume.source = (
+        purefusion.ResourceReference(
+            id="id", name="vs", kind="VolumeSnapshot", self_link=source
+        )
+        if source
+        else None
+    )
+    return volume
+
+
+def _named(name):
+    resource = MagicMock()
+    resource.name = name
+    return resource
+
+
+def _list_of(items):
+    return MagicMock(items=items, count=len(items), more_items_remaining=False)
+
+
+@pytest.fixture
+def volumes_api():
+    api = MagicMock()
+    api.list_volumes = MagicMock(
+        return_value=_list_of(
+            [
+                _volume("report-1"),
+                # already refreshed from db-2
+                _volume("report-2", source=SNAPSHOT_LINK.format("db-2")),
+                _volume("report-3", source=SNAPSHOT_LINK.format("db-2")),
+                _volume("report-4", destroyed=True),
+            ]
+        )
+    )
+    api.update_volume = MagicMock(return_value=OperationMock(1))
+    return api
+
+
+@pytest.fixture
+def volume_snapshots_api():
+    api = MagicMock()
+    api.list_volume_snapshots = MagicMock(
+        return_value=_list_of([_named("db-1"), _named("db-2")])
+    )
+    return api
+
+
+@pytest.fixture
+def operations_api():
+    api = MagicMock()
+    api.list_operations = MagicMock(side_effect=purefusion.rest.ApiException)
+    api.get_operation = MagicMock(return_value=SuccessfulOperationMock)
+    return api
+
+
+def _refresh_patch(volume_snapshot):
+    return purefusion.VolumePatch(
+        source_link=purefusion.NullableString(SNAPSHOT_LINK.format(volume_snapshot))
+    )
+
+
+@patch("fusion.OperationsApi")
+@patch("fusion.VolumeSnapshotsApi")
+@patch("fusion.VolumesApi")
+@pytest.mark.parametrize(
+    ("force", "expected_refreshed"),
+    [
+        (False, [("report-1", "db-1"), ("report-3", "db-1")]),
+        (True, [("report-1", "db-1"), ("report-2", "db-2"), ("report-3", "db-1")]),
+    ],
+)
+def test_refresh(
+    m_volumes_api,
+    m_volume_snapshots_api,
+    m_op_api,
+    module_args,
+    volumes_api,
+    volume_snapshots_api,
+    operations_api,
+    force,
+    expected_refreshed,
+):
+    m_volumes_api.return_value = volumes_api
+    m_volume_snapshots_api.return_value = volume_snapshots_api
+    m_op_api.return_value = operations_api
+    module_args["force"] = force
+    set_module_args(module_args)
+
+    with pytest.raises(AnsibleExitJson) as exc:
+        fusion_volume_refresh.main()
+
+    assert exc.value.changed
+    assert exc.value.kwargs["summary"] == {
+        "total": 3,
+        "refreshed": len(expected_refreshed),
+        "unchanged": 3 - len(expected_refreshed),
+        "failed": 0,
+    }
+    volumes_api.list_volumes.assert_called_once_with(
+        offset=0, tenant_name="t1", tenant_space_name="ts1"
+    )
+    volume_snapshots_api.list_volume_snapshots.assert_called_once_with(
+        offset=0, tenant_name="t1", tenant_space_name="ts1", snapshot_name="nightly"
+    )
+    volumes_api.update_volume.assert_has_calls(
+        [
+            call(
+                _refresh_patch(volume_snapshot),
+                volume_name=name,
+                tenant_name="t1",
+                tenant_space_name="ts1",
+            )
+            for name, volume_snapshot in expected_refreshed
+        ],
+        any_order=True,
+    )
+    assert volumes_api.update_volume.call_count == len(expected_refreshed)
+
+
+@patch("fusion.OperationsApi")
+@patch("fusion.VolumeSnapshotsApi")
+@patch("fusion.VolumesApi")
+def test_refresh_check_mode(
+    m_volumes_api,
+    m_volume_snapshots_api,
+    m_op_api,
+    module_args,
+    volumes_api,
+    volume_snapshots_api,
+    operations_api,
+):
+    m_volumes_api.return_value = volumes_api
+    m_volume_snapshots_api.return_value = volume_snapshots_api
+    m_op_api.return_value = operations_api
+    module_args["_ansible_check_mode"] = True
+    set_module_args(module_args)
+
+    with pytest.raises(AnsibleExitJson) as exc:
+        fusion_volume_refresh.main()
+
+    assert exc.value.changed
+    assert [v["changed"] for v in exc.value.kwargs["volumes"]] == [True, False, True]
+    volumes_api.update_volume.assert_not_called()
+
+
+@patch("fusion.OperationsApi")
+@patch("fusion.VolumeSnapshotsApi")
+@patch("fusion.VolumesApi")
+@pytest.mark.parametrize(
+    "volumes",
+    [
+        # nonexistent volume
+        {"report-1": "db-1", "report-5": "db-1"},
+        # destroyed volume
+        {"report-4": "db-1"},
+        # nonexistent volume snapshot
+        {"report-1": "db-1", "report-2": "db-3"},
+    ],
+)
+def test_refresh_invalid_mapping(
+    m_volumes_api,
+    m_volume_snapshots_api,
+    m_op_api,
+    module_args,
+    volumes_api,
+    volume_snapshots_api,
+    operations_api,
+    volumes,
+):
+    m_volumes_api.return_value = volumes_api
+    m_volume_snapshots_api.return_value = volume_snapshots_api
+    m_op_api.return_value = operations_api
+    module_args["volumes"] = volumes
+    set_module_args(module_args)
+
+    with pytest.raises(AnsibleFailJson):
+        fusion_volume_refresh.main()
+
+    # nothing is refreshed unless the whole mapping is valid
+    volumes_api.update_volume.assert_not_called()
+
+
+@patch("fusion.OperationsApi")
+@patch("fusion.VolumeSnapshotsApi")
+@patch("fusion.VolumesApi")
+def test_refresh_partial_failure(
+    m_volumes_api,
+    m_volume_snapshots_api,
+    m_op_api,
+    module_args,
+    volumes_api,
+    volume_snapshots_api,
+    operations_api,
+):
+    def _update_volume(patch, volume_name, **kwargs):
+        if volume_name == "report-1":
+            raise ApiExceptionsMockGenerator.create_permission_denied()
+        return OperationMock(1)
+
+    volumes_api.update_volume = MagicMock(side_effect=_update_volume)
+    m_volumes_api.return_value = volumes_api
+    m_volume_snapshots_api.return_value = volume_snapshots_api
+    m_op_api.return_value = operations_api
+    set_module_args(module_args)
+
+    with pytest.raises(AnsibleFailJson) as exc:
+        fusion_volume_refresh.main()
+
+    assert "1 of 2 volumes failed to refresh" in str(exc.value)
+    assert exc.value.kwargs["changed"]
+    assert exc.value.kwargs["summary"] == {
+        "total": 3,
+        "refreshed": 1,
+        "unchanged": 1,
+        "failed": 1,
+    }
+    report = dict((v["name"], v) for v in exc.value.kwargs["volumes"])
+    assert report["report-1"]["error"] is not None
+    assert not report["report-1"]["changed"]
+    assert report["report-3"]["changed"]
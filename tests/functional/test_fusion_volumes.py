@@ -0,0 +1,312 @@
+# -*- coding: utf-8 -*-
+
+# (c) 2023, Pure Storage, Inc.
+# GNU General Public License v3.0+ (see COPYING.GPLv3 or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+from unittest.mock import MagicMock, call, patch
+
+import fusion as purefusion
+import pytest
+from ansible.module_utils import basic
+from ansible_collections.purestorage.fusion.plugins.modules import (
+    fusion_volumes,
+)
+from ansible_collections.purestorage.fusion.tests.functional.utils import (
+    AnsibleExitJson,
+    AnsibleFailJson,
+    OperationMock,
+    SuccessfulOperationMock,
+    exit_json,
+    fail_json,
+    set_module_args,
+)
+from ansible_collections.purestorage.fusion.tests.helpers import (
+    ApiExceptionsMockGenerator,
+)
+
+# GLOBAL MOCKS
+fusion_volumes.setup_fusion = MagicMock(return_value=purefusion.api_client.ApiClient())
+purefusion.api_client.ApiClient.call_api = MagicMock(
+    side_effect=Exception("API call not mocked!")
+)
+basic.AnsibleModule.exit_json = exit_json
+basic.AnsibleModule.fail_json = fail_json
+
+
+@pytest.fixture
+def module_args():
+    return {
+        "tenant": "t1",
+        "tenant_space": "ts1",
+        "volumes": [
+            # new volume
+            {
+                "name": "volume_new",
+                "storage_class": "sc1",
+                "placement_group": "pg1",
+                "size": "1M",
+                "host_access_policies": ["hap1"],
+            },
+            # existing volume to be extended
+            {"name": "volume_1", "size": "2M"},
+            # existing volume to be deleted
+            {"name": "volume_2", "state": "absent", "eradicate": True},
+            # existing volume without changes
+            {"name": "volume_3", "tenant_space": "ts2", "size": "1M"},
+        ],
+        "issuer_id": "ABCD1234",
+        "private_key_file": "private-key.pem",
+    }
+
+
+def _volume(name, tenant_space="ts1", host_access_policies=None):
+    return purefusion.Volume(
+        id="{0}_id".format(name),
+        name=name,
+        display_name=name,
+        self_link="self_link",
+        size=1048576,
+        tenant=purefusion.TenantRef(
+            id="t1_id", name="t1", kind="Tenant", self_link="self_link"
+        ),
+        tenant_space=purefusion.TenantSpaceRef(
+            id="ts_id", name=tenant_space, kind="TenantSpace", self_link="self_link"
+        ),
+        storage_class=purefusion.StorageClassRef(
+            id="sc1_id", name="sc1", kind="StorageClass", self_link="self_link"
+        ),
+        placement_group=purefusion.PlacementGroupRef(
+            id="pg1_id", name="pg1", kind="PlacementGroup", self_link="self_link"
+        ),
+        host_access_policies=host_access_policies or [],
+        serial_number="sn",
+        destroyed=False,
+    )
+
+
+def _list_volumes(tenant_name, tenant_space_name, offset=0):
+    volumes = {
+        "ts1": [_volume("volume_1"), _volume("volume_2")],
+        "ts2": [_volume("volume_3", tenant_space="ts2")],
+    }
+    return purefusion.VolumeList(
+        count=len(volumes[tenant_space_name]),
+        more_items_remaining=False,
+        items=volumes[tenant_space_name],
+    )
+
+
+@pytest.fixture
+def volumes_api():
+    api = MagicMock()
+    api.list_volumes = MagicMock(side_effect=_list_volumes)
+    api.get_volume = MagicMock(side_effect=NotImplementedError())
+    api.create_volume = MagicMock(return_value=OperationMock(1))
+    api.update_volume = MagicMock(return_value=OperationMock(2))
+    api.delete_volume = MagicMock(return_value=OperationMock(3))
+    return api
+
+
+@pytest.fixture
+def operations_api():
+    api = MagicMock()
+    api.list_operations = MagicMock(side_effect=purefusion.rest.ApiException)
+    api.get_operation = MagicMock(return_value=SuccessfulOperationMock)
+    return api
+
+
+@patch("fusion.OperationsApi")
+@patch("fusion.VolumesApi")
+def test_volumes_applied(
+    m_volumes_api, m_op_api, module_args, volumes_api, operations_api
+):
+    m_volumes_api.return_value = volumes_api
+    m_op_api.return_value = operations_api
+    set_module_args(module_args)
+
+    with pytest.raises(AnsibleExitJson) as exc:
+        fusion_volumes.main()
+
+    assert exc.value.changed
+    assert [
+        (v["name"], v["action"], v["changed"], v["error"])
+        for v in exc.value.kwargs["volumes"]
+    ] == [
+        ("volume_new", "created", True, None),
+        ("volume_1", "updated", True, None),
+        ("volume_2", "deleted", True, None),
+        ("volume_3", "none", False, None),
+    ]
+
+    # volumes are listed once per tenant space and never fetched one by one
+    volumes_api.list_volumes.assert_has_calls(
+        [
+            call(offset=0, tenant_name="t1", tenant_space_name="ts1"),
+            call(offset=0, tenant_name="t1", tenant_space_name="ts2"),
+        ]
+    )
+    assert volumes_api.list_volumes.call_count == 2
+    volumes_api.get_volume.assert_not_called()
+
+    volumes_api.create_volume.assert_called_once_with(
+        purefusion.VolumePost(
+            size=1048576,
+            storage_class="sc1",
+            placement_group="pg1",
+            name="volume_new",
+            display_name="volume_new",
+        ),
+        tenant_name="t1",
+        tenant_space_name="ts1",
+    )
+    volumes_api.update_volume.assert_has_calls(
+        [
+            call(
+                purefusion.VolumePatch(
+                    host_access_policies=purefusion.NullableString("hap1")
+                ),
+                volume_name="volume_new",
+                tenant_name="t1",
+                tenant_space_name="ts1",
+            ),
+            call(
+                purefusion.VolumePatch(size=purefusion.NullableSize(2097152)),
+                volume_name="volume_1",
+                tenant_name="t1",
+                tenant_space_name="ts1",
+            ),
+            call(
+                purefusion.VolumePatch(destroyed=purefusion.NullableBoolean(True)),
+                volume_name="volume_2",
+                tenant_name="t1",
+                tenant_space_name="ts1",
+            ),
+        ],
+        any_order=True,
+    )
+    assert volumes_api.update_volume.call_count == 3
+    volumes_api.delete_volume.assert_called_once_with(
+        volume_name="volume_2",
+        tenant_name="t1",
+        tenant_space_name="ts1",
+    )
+
+
+@patch("fusion.OperationsApi")
+@patch("fusion.VolumesApi")
+def test_volumes_check_mode(
+    m_volumes_api, m_op_api, module_args, volumes_api, operations_api
+):
+    m_volumes_api.return_value = volumes_api
+    m_op_api.return_value = operations_api
+    module_args["_ansible_check_mode"] = True
+    set_module_args(module_args)
+
+    with pytest.raises(AnsibleExitJson) as exc:
+        fusion_volumes.main()
+
+    assert exc.value.changed
+    assert [v["action"] for v in exc.value.kwargs["volumes"]] == [
+        "created",
+        "updated",
+        "deleted",
+        "none",
+    ]
+    volumes_api.create_volume.assert_not_called()
+    volumes_api.update_volume.assert_not_called()
+    volumes_api.delete_volume.assert_not_called()
+
+
+@patch("fusion.OperationsApi")
+@patch("fusion.VolumesApi")
+@pytest.mark.parametrize(
+    "volume",
+    [
+        # new volume without storage class
+        {"name": "volume_new", "placement_group": "pg1", "size": "1M"},
+        # new volume without size or source
+        {"name": "volume_new", "storage_class": "sc1", "placement_group": "pg1"},
+        # eradicate with state present
+        {"name": "volume_1", "eradicate": True},
+        # too small
+        {"name": "volume_1", "size": "1K"},
+        # deleted volume with host access policies
+        {"name": "volume_1", "state": "absent", "host_access_policies": ["hap1"]},
+    ],
+)
+def test_volumes_invalid(
+    m_volumes_api, m_op_api, module_args, volumes_api, operations_api, volume
+):
+    m_volumes_api.return_value = volumes_api
+    m_op_api.return_value = operations_api
+    module_args["volumes"] = [volume]
+    set_module_args(module_args)
+
+    with pytest.raises(AnsibleFailJson):
+        fusion_volumes.main()
+
+    # nothing is changed if any of the volumes is invalid
+    volumes_api.create_volume.assert_not_called()
+    volumes_api.update_volume.assert_not_called()
+    volumes_api.delete_volume.assert_not_called()
+
+
+@patch("fusion.OperationsApi")
+@patch("fusion.VolumesApi")
+def test_volumes_missing_tenant_space(
+    m_volumes_api, m_op_api, module_args, volumes_api, operations_api
+):
+    m_volumes_api.return_value = volumes_api
+    m_op_api.return_value = operations_api
+    del module_args["tenant_space"]
+    set_module_args(module_args)
+
+    with pytest.raises(AnsibleFailJson):
+        fusion_volumes.main()
+
+    volumes_api.list_volumes.assert_not_called()
+
+
+@patch("fusion.OperationsApi")
+@patch("fusion.VolumesApi")
+def test_volumes_duplicate(
+    m_volumes_api, m_op_api, module_args, volumes_api, operations_api
+):
+    m_volumes_api.return_value = volumes_api
+    m_op_api.return_value = operations_api
+    module_args["volumes"].append({"name": "volume_1", "size": "3M"})
+    set_module_args(module_args)
+
+    with pytest.raises(AnsibleFailJson):
+        fusion_volumes.main()
+
+    volumes_api.list_volumes.assert_not_called()
+
+
+@patch("fusion.OperationsApi")
+@patch("fusion.VolumesApi")
+def test_volumes_partial_failure(
+    m_volumes_api, m_op_api, module_args, volumes_api, operations_api
+):
+    volumes_api.create_volume = MagicMock(
+        side_effect=ApiExceptionsMockGenerator.create_permission_denied()
+    )
+    m_volumes_api.return_value = volumes_api
+    m_op_api.return_value = operations_api
+    set_module_args(module_args)
+
+    with pytest.raises(AnsibleFailJson) as exc:
+        fusion_volumes.main()
+
+    assert "1 of 4 volumes failed" in str(exc.value)
+    assert exc.value.kwargs["changed"]
+    report = exc.value.kwargs["volumes"]
+    assert report[0]["error"] is not None
+    assert all(v["error"] is None for v in report[1:])
+    # other volumes are still processed
+    volumes_api.delete_volume.assert_called_once()
+    assert volumes_api.update_volume.call_count == 2
@@ -27,6 +27,7 @@ class ModuleMock(MagicMock):
 
         # mocking exit_json function, so we can check if it was successfully called
         self.exit_json = MagicMock()
+        self.warn = MagicMock()
 
     def fail_json(self, **kwargs):
         raise ModuleFailed(str(kwargs))
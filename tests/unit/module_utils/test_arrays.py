@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+
+# (c) 2023 Pure Storage, Inc.
+# GNU General Public License v3.0+ (see COPYING.GPLv3 or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+from unittest.mock import MagicMock, call, patch
+
+import pytest
+
+from ansible_collections.purestorage.fusion.plugins.module_utils.arrays import (
+    list_arrays,
+)
+from ansible_collections.purestorage.fusion.tests.helpers import (
+    ApiExceptionsMockGenerator,
+)
+from ansible_collections.purestorage.fusion.tests.unit.mocks.module_mock import (
+    ModuleFailed,
+    ModuleMock,
+)
+
+
+def _array(name):
+    array = MagicMock()
+    array.name = name
+    return array
+
+
+@patch("fusion.ArraysApi")
+def test_list_arrays(m_arrays_api):
+    arrays = {"az1": [_array("a1"), _array("a2")], "az2": [_array("a1")]}
+    api = MagicMock()
+    api.list_arrays = MagicMock(
+        side_effect=lambda region_name, availability_zone_name: MagicMock(
+            items=arrays[availability_zone_name]
+        )
+    )
+    m_arrays_api.return_value = api
+
+    result = list_arrays(ModuleMock({"region": "region1"}), MagicMock(), ["az1", "az2"])
+
+    assert sorted(result) == [("az1", "a1"), ("az1", "a2"), ("az2", "a1")]
+    assert result[("az2", "a1")] is arrays["az2"][0]
+    # arrays are not paginated, the listing rejects offset
+    api.list_arrays.assert_has_calls(
+        [
+            call(region_name="region1", availability_zone_name="az1"),
+            call(region_name="region1", availability_zone_name="az2"),
+        ],
+        any_order=True,
+    )
+
+
+@patch("fusion.ArraysApi")
+def test_list_arrays_failed(m_arrays_api):
+    api = MagicMock()
+    api.list_arrays = MagicMock(
+        side_effect=ApiExceptionsMockGenerator.create_permission_denied()
+    )
+    m_arrays_api.return_value = api
+
+    with pytest.raises(ModuleFailed) as exc:
+        list_arrays(ModuleMock({"region": "region1"}), MagicMock(), ["az1"])
+
+    assert "Listing arrays of availability zone 'az1' failed" in str(exc.value)
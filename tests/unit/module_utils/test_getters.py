@@ -0,0 +1,165 @@
+# -*- coding: utf-8 -*-
+
+# (c) 2023 Pure Storage, Inc.
+# GNU General Public License v3.0+ (see COPYING.GPLv3 or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+from unittest.mock import MagicMock, patch
+
+import fusion as purefusion
+import pytest
+
+from ansible_collections.purestorage.fusion.plugins.module_utils import (
+    getters,
+    operations,
+)
+from ansible_collections.purestorage.fusion.tests.unit.mocks.module_mock import (
+    ModuleMock,
+)
+from ansible_collections.purestorage.fusion.tests.unit.mocks.operation_mock import (
+    OperationMock,
+    OperationStatus,
+)
+
+current_module = (
+    "ansible_collections.purestorage.fusion.tests.unit.module_utils.test_getters"
+)
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    yield
+    getters.invalidate_cache()
+
+
+class TestGetCached:
+    def test_fetched_once(self):
+        module = ModuleMock({})
+        fetch = MagicMock(return_value="obj")
+
+        assert getters.get_cached(module, ("kind", "name"), fetch) == "obj"
+        assert getters.get_cached(module, ("kind", "name"), fetch) == "obj"
+        fetch.assert_called_once()
+
+    def test_not_found_is_cached(self):
+        module = ModuleMock({})
+        fetch = MagicMock(return_value=None)
+
+        assert getters.get_cached(module, ("kind", "name"), fetch) is None
+        assert getters.get_cached(module, ("kind", "name"), fetch) is None
+        fetch.assert_called_once()
+
+    def test_keys_and_modules_are_separate(self):
+        module = ModuleMock({})
+        fetch = MagicMock(side_effect=["obj1", "obj2", "obj3"])
+
+        assert getters.get_cached(module, ("kind", "name1"), fetch) == "obj1"
+        assert getters.get_cached(module, ("kind", "name2"), fetch) == "obj2"
+        assert getters.get_cached(ModuleMock({}), ("kind", "name1"), fetch) == "obj3"
+
+    def test_invalidated(self):
+        module = ModuleMock({})
+        fetch = MagicMock(side_effect=[None, "obj"])
+
+        assert getters.get_cached(module, ("kind", "name"), fetch) is None
+        getters.invalidate_cache()
+        assert getters.get_cached(module, ("kind", "name"), fetch) == "obj"
+
+    def test_fetch_racing_invalidation_not_cached(self):
+        module = ModuleMock({})
+
+        def _fetch_and_invalidate():
+            getters.invalidate_cache()
+            return "stale"
+
+        assert getters.get_cached(module, ("kind", "name"), _fetch_and_invalidate)
+        fetch = MagicMock(return_value="fresh")
+        assert getters.get_cached(module, ("kind", "name"), fetch) == "fresh"
+
+    @patch(f"{current_module}.operations.purefusion.OperationsApi.__new__")
+    def test_invalidated_by_operation(self, mock_op_api):
+        mock_op_api_obj = MagicMock()
+        mock_op_api.return_value = mock_op_api_obj
+        mock_op_api_obj.get_operation = MagicMock(
+            return_value=OperationMock("op1", OperationStatus.SUCCEDED)
+        )
+        module = ModuleMock({})
+        fetch = MagicMock(side_effect=[None, "obj"])
+
+        assert getters.get_cached(module, ("kind", "name"), fetch) is None
+        operations.await_operation(
+            MagicMock(), OperationMock("op1", OperationStatus.PENDING)
+        )
+        assert getters.get_cached(module, ("kind", "name"), fetch) == "obj"
+
+
+class TestGetters:
+    @patch(f"{current_module}.getters.purefusion.TenantsApi.__new__")
+    def test_get_tenant_cached(self, mock_api):
+        mock_api_obj = MagicMock()
+        mock_api.return_value = mock_api_obj
+        mock_api_obj.get_tenant = MagicMock(return_value="tenant1")
+        module = ModuleMock({"tenant": "t1"})
+
+        assert getters.get_tenant(module, MagicMock()) == "tenant1"
+        assert getters.get_tenant(module, MagicMock(), tenant_name="t1") == "tenant1"
+        mock_api_obj.get_tenant.assert_called_once_with(tenant_name="t1")
+
+    @patch(f"{current_module}.getters.purefusion.ArraysApi.__new__")
+    def test_get_array_not_found(self, mock_api):
+        mock_api_obj = MagicMock()
+        mock_api.return_value = mock_api_obj
+        mock_api_obj.get_array = MagicMock(side_effect=purefusion.rest.ApiException)
+        module = ModuleMock(
+            {"region": "r1", "availability_zone": "az1", "array": "array1"}
+        )
+
+        assert getters.get_array(module, MagicMock()) is None
+        assert getters.get_array(module, MagicMock(), array_name="array1") is None
+        mock_api_obj.get_array.assert_called_once()
+
+
+class TestListAll:
+    @staticmethod
+    def _api(api_class, pages):
+        # real SDK API classes validate their parameters before calling call_api
+        api = api_class()
+        api.api_client.call_api = MagicMock(side_effect=pages)
+        return api
+
+    def test_paginated(self):
+        api = self._api(
+            purefusion.TenantsApi,
+            [
+                purefusion.TenantList(
+                    count=3, more_items_remaining=True, items=["t1", "t2"]
+                ),
+                purefusion.TenantList(
+                    count=3, more_items_remaining=False, items=["t3"]
+                ),
+            ],
+        )
+
+        assert getters.list_all(api.list_tenants) == ["t1", "t2", "t3"]
+        assert [c.args[3] for c in api.api_client.call_api.call_args_list] == [
+            [("offset", 0)],
+            [("offset", 2)],
+        ]
+
+    def test_not_paginated(self):
+        api = self._api(
+            purefusion.ArraysApi,
+            [
+                purefusion.ArrayList(
+                    count=2, more_items_remaining=False, items=["a1", "a2"]
+                )
+            ],
+        )
+
+        assert getters.list_all(
+            api.list_arrays, region_name="r1", availability_zone_name="az1"
+        ) == ["a1", "a2"]
+        api.api_client.call_api.assert_called_once()
@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+
+# (c) 2023 Pure Storage, Inc.
+# GNU General Public License v3.0+ (see COPYING.GPLv3 or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import pytest
+
+from ansible_collections.purestorage.fusion.plugins.module_utils.haps import (
+    HAP_PATTERN,
+    IQN_PATTERN,
+)
+
+
+@pytest.mark.parametrize(
+    "name,valid",
+    [("hap1", True), ("hap-1_a", True), ("-hap", False), ("hap-", False)],
+)
+def test_hap_pattern(name, valid):
+    assert bool(HAP_PATTERN.match(name)) == valid
+
+
+@pytest.mark.parametrize(
+    "iqn,valid",
+    [
+        ("iqn.2023-05.com.purestorage:host1", True),
+        ("iqn.2023-05.com.purestorage", True),
+        ("iqn.2023-5.com.purestorage:host1", False),
+        ("iqn.2023-05.com.-purestorage:host1", False),
+        ("iqn.2023-05.com.purestorage:host 1", False),
+    ],
+)
+def test_iqn_pattern(iqn, valid):
+    assert bool(IQN_PATTERN.match(iqn)) == valid
@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+
+# (c) 2023 Pure Storage, Inc.
+# GNU General Public License v3.0+ (see COPYING.GPLv3 or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from ansible_collections.purestorage.fusion.plugins.module_utils.index_cache import (
+    IndexCache,
+    get_index,
+    invalidate_index,
+)
+from ansible_collections.purestorage.fusion.tests.unit.mocks.module_mock import (
+    ModuleMock,
+)
+
+
+@pytest.fixture
+def cache_path(tmp_path):
+    return str(tmp_path / "index.json")
+
+
+def _fusion(host="https://api.example.com"):
+    fusion = MagicMock()
+    fusion.configuration.host = host
+    return fusion
+
+
+class TestIndexCache:
+    def test_store_and_get(self, cache_path):
+        cache = IndexCache(cache_path)
+        assert cache.get("hosts", 60) is None
+        cache.store("hosts", {"iqn1": "hap1"})
+        assert cache.get("hosts", 60) == {"iqn1": "hap1"}
+        # shared by another process
+        assert IndexCache(cache_path).get("hosts", 60) == {"iqn1": "hap1"}
+
+    def test_stale_entry_is_ignored(self, cache_path):
+        cache = IndexCache(cache_path)
+        with patch("time.time", return_value=1000):
+            cache.store("hosts", {"iqn1": "hap1"})
+        with patch("time.time", return_value=1030):
+            assert cache.get("hosts", 60) == {"iqn1": "hap1"}
+        with patch("time.time", return_value=1061):
+            assert cache.get("hosts", 60) is None
+
+    def test_invalidate(self, cache_path):
+        cache = IndexCache(cache_path)
+        cache.store("hosts", {"iqn1": "hap1"})
+        cache.store("users", {"user1": "id1"})
+        cache.invalidate("hosts")
+        assert cache.get("hosts", 60) is None
+        assert cache.get("users", 60) == {"user1": "id1"}
+
+    @pytest.mark.parametrize(
+        "content", ["not json", json.dumps({"version": 999, "indexes": {}})]
+    )
+    def test_corrupted_cache_is_empty(self, cache_path, content):
+        with open(cache_path, "w") as f:
+            f.write(content)
+        cache = IndexCache(cache_path)
+        assert cache.get("hosts", 60) is None
+        cache.store("hosts", {"iqn1": "hap1"})
+        assert cache.get("hosts", 60) == {"iqn1": "hap1"}
+
+
+class TestGetIndex:
+    def test_without_cache_always_builds(self):
+        module = ModuleMock({"index_cache": None, "index_cache_ttl": 300})
+        build = MagicMock(return_value={"iqn1": "hap1"})
+        assert get_index(module, _fusion(), "hosts", build) == {"iqn1": "hap1"}
+        assert get_index(module, _fusion(), "hosts", build) == {"iqn1": "hap1"}
+        assert build.call_count == 2
+
+    def test_cached_index_is_reused(self, cache_path):
+        module = ModuleMock({"index_cache": cache_path, "index_cache_ttl": 300})
+        build = MagicMock(return_value={"iqn1": "hap1"})
+        get_index(module, _fusion(), "hosts", build)
+        assert get_index(module, _fusion(), "hosts", build) == {"iqn1": "hap1"}
+        build.assert_called_once_with()
+
+    def test_refresh_and_invalidate(self, cache_path):
+        module = ModuleMock({"index_cache": cache_path, "index_cache_ttl": 300})
+        build = MagicMock(return_value={"iqn1": "hap1"})
+        get_index(module, _fusion(), "hosts", build)
+        get_index(module, _fusion(), "hosts", build, refresh=True)
+        assert build.call_count == 2
+        invalidate_index(module, _fusion(), "hosts")
+        get_index(module, _fusion(), "hosts", build)
+        assert build.call_count == 3
+
+    def test_indexes_are_per_host(self, cache_path):
+        module = ModuleMock({"index_cache": cache_path, "index_cache_ttl": 300})
+        get_index(module, _fusion("https://a"), "hosts", lambda: {"iqn1": "hap1"})
+        assert get_index(
+            module, _fusion("https://b"), "hosts", lambda: {"iqn2": "hap2"}
+        ) == {"iqn2": "hap2"}
+
+    def test_cache_from_environment(self, cache_path, monkeypatch):
+        monkeypatch.setenv("FUSION_INDEX_CACHE", cache_path)
+        module = ModuleMock({"index_cache": None, "index_cache_ttl": 300})
+        build = MagicMock(return_value={"iqn1": "hap1"})
+        get_index(module, _fusion(), "hosts", build)
+        get_index(module, _fusion(), "hosts", build)
+        build.assert_called_once_with()
@@ -0,0 +1,242 @@
+# -*- coding: utf-8 -*-
+
+# (c) 2023 Pure Storage, Inc.
+# GNU General Public License v3.0+ (see COPYING.GPLv3 or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import json
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock, patch
+
+import fusion as purefusion
+import pytest
+
+from ansible_collections.purestorage.fusion.plugins.module_utils import journal
+from ansible_collections.purestorage.fusion.plugins.module_utils.journal import (
+    OperationJournal,
+    install_operation_journal,
+)
+from ansible_collections.purestorage.fusion.tests.unit.mocks.module_mock import (
+    ModuleMock,
+)
+from ansible_collections.purestorage.fusion.tests.unit.mocks.operation_mock import (
+    OperationMock,
+    OperationStatus,
+)
+
+current_module = (
+    "ansible_collections.purestorage.fusion.tests.unit.module_utils.test_journal"
+)
+
+
+@pytest.fixture
+def journal_path(tmp_path):
+    return str(tmp_path / "journal.json")
+
+
+def _create_volume_call(client):
+    return client.call_api(
+        "/tenants/{tenant_name}/tenant-spaces/{tenant_space_name}/volumes",
+        "POST",
+        {"tenant_name": "t1", "tenant_space_name": "ts1"},
+        [],
+        {},
+        body={"name": "volume1", "size": 1048576},
+        response_type="Operation",
+        _return_http_data_only=True,
+    )
+
+
+def _client_mock(call_api):
+    client = MagicMock()
+    client.call_api = call_api
+    client.sanitize_for_serialization = lambda obj: obj
+    return client
+
+
+class TestOperationJournal:
+    def test_fingerprint_is_stable(self):
+        a = OperationJournal.fingerprint(
+            "POST", "/volumes", {"a": "1", "b": "2"}, [("q", "1")], {"x": 1, "y": 2}
+        )
+        b = OperationJournal.fingerprint(
+            "POST", "/volumes", {"b": "2", "a": "1"}, [("q", "1")], {"y": 2, "x": 1}
+        )
+        assert a == b
+
+    def test_fingerprint_differs(self):
+        a = OperationJournal.fingerprint("POST", "/volumes", body={"size": 1})
+        assert a != OperationJournal.fingerprint("POST", "/volumes", body={"size": 2})
+        assert a != OperationJournal.fingerprint("PATCH", "/volumes", body={"size": 1})
+        assert a != OperationJournal.fingerprint("POST", "/other", body={"size": 1})
+
+    def test_record_lookup_compact(self, journal_path):
+        jrnl = OperationJournal(journal_path)
+        assert jrnl.lookup("fp1") is None
+
+        jrnl.record("fp1", "op1")
+        jrnl.record("fp2", "op2")
+        assert jrnl.lookup("fp1") == "op1"
+        assert jrnl.lookup("fp2") == "op2"
+
+        # the journal is shared between instances
+        assert OperationJournal(journal_path).lookup("fp1") == "op1"
+
+        jrnl.compact("op1")
+        assert jrnl.lookup("fp1") is None
+        assert jrnl.lookup("fp2") == "op2"
+
+    def test_compact_many(self, journal_path):
+        jrnl = OperationJournal(journal_path)
+        for i in range(3):
+            jrnl.record("fp{0}".format(i), "op{0}".format(i))
+
+        jrnl.compact("op0", "op2")
+        assert [e["id"] for e in jrnl._load()["operations"].values()] == ["op1"]
+
+    def test_concurrent_records_written(self, journal_path):
+        jrnl = OperationJournal(journal_path)
+        with patch.object(jrnl, "_store", wraps=jrnl._store) as store:
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                list(
+                    executor.map(
+                        lambda i: jrnl.record("fp{0}".format(i), "op{0}".format(i)),
+                        range(32),
+                    )
+                )
+
+        assert len(jrnl._load()["operations"]) == 32
+        assert store.call_count <= 32
+
+    def test_compact_removes_expired(self, journal_path):
+        jrnl = OperationJournal(journal_path)
+        jrnl.record("fp1", "op1")
+        with open(journal_path) as f:
+            content = json.load(f)
+        content["operations"]["fp1"]["submitted_at"] -= journal.JOURNAL_ENTRY_MAX_AGE
+        with open(journal_path, "w") as f:
+            json.dump(content, f)
+
+        jrnl.compact("unrelated")
+        assert jrnl.lookup("fp1") is None
+
+    def test_corrupted_journal_is_empty(self, journal_path):
+        with open(journal_path, "w") as f:
+            f.write("{not json")
+        jrnl = OperationJournal(journal_path)
+        assert jrnl.lookup("fp1") is None
+        jrnl.record("fp1", "op1")
+        assert jrnl.lookup("fp1") == "op1"
+
+
+class TestInstallOperationJournal:
+    def test_not_installed_by_default(self):
+        module = ModuleMock({"operation_journal": None})
+        call_api = MagicMock()
+        client = _client_mock(call_api)
+
+        assert install_operation_journal(module, client) is None
+        assert client.call_api is call_api
+
+    @patch(f"{current_module}.journal.purefusion.OperationsApi.__new__")
+    def test_operation_recorded(self, mock_op_api, journal_path):
+        module = ModuleMock({"operation_journal": journal_path})
+        op = OperationMock("op1", OperationStatus.PENDING)
+        client = _client_mock(MagicMock(return_value=op))
+
+        jrnl = install_operation_journal(module, client)
+
+        assert _create_volume_call(client) == op
+        assert [e["id"] for e in jrnl._load()["operations"].values()] == ["op1"]
+        mock_op_api.assert_not_called()
+
+    @patch(f"{current_module}.journal.purefusion.OperationsApi.__new__")
+    def test_terminal_poll_compacts(self, mock_op_api, journal_path):
+        module = ModuleMock({"operation_journal": journal_path})
+        pending = OperationMock("op1", OperationStatus.PENDING)
+        succeeded = OperationMock("op1", OperationStatus.SUCCEDED)
+        client = _client_mock(MagicMock(side_effect=[pending, succeeded]))
+
+        jrnl = install_operation_journal(module, client)
+        _create_volume_call(client)
+        client.call_api(
+            "/operations/{id}",
+            "GET",
+            {"id": "op1"},
+            response_type="Operation",
+            _return_http_data_only=True,
+        )
+        assert jrnl._load()["operations"] == {}
+        mock_op_api.assert_not_called()
+
+    @patch(f"{current_module}.journal.purefusion.OperationsApi.__new__")
+    def test_in_flight_operation_resumed(self, mock_op_api, journal_path):
+        # first run submits the operation and gets interrupted
+        first_call_api = MagicMock(
+            return_value=OperationMock("op1", OperationStatus.PENDING)
+        )
+        client = _client_mock(first_call_api)
+        install_operation_journal(
+            ModuleMock({"operation_journal": journal_path}), client
+        )
+        _create_volume_call(client)
+        first_call_api.assert_called_once()
+
+        # second run sends the same request and must not submit it again
+        second_call_api = MagicMock(side_effect=NotImplementedError())
+        client = _client_mock(second_call_api)
+        module = ModuleMock({"operation_journal": journal_path})
+        install_operation_journal(module, client)
+        running = OperationMock("op1", OperationStatus.PENDING)
+        mock_op_api_obj = MagicMock()
+        mock_op_api.return_value = mock_op_api_obj
+        mock_op_api_obj.get_operation = MagicMock(return_value=running)
+
+        assert _create_volume_call(client) == running
+        mock_op_api_obj.get_operation.assert_called_once_with("op1")
+        second_call_api.assert_not_called()
+        module.warn.assert_called_once()
+
+    @patch(f"{current_module}.journal.purefusion.OperationsApi.__new__")
+    @pytest.mark.parametrize(
+        "previous_result",
+        [
+            OperationMock("op1", OperationStatus.SUCCEDED),
+            OperationMock("op1", OperationStatus.FAILED),
+            purefusion.rest.ApiException(),
+        ],
+    )
+    def test_finished_operation_resubmitted(
+        self, mock_op_api, journal_path, previous_result
+    ):
+        OperationJournal(journal_path).record(
+            OperationJournal.fingerprint(
+                "POST",
+                "/tenants/{tenant_name}/tenant-spaces/{tenant_space_name}/volumes",
+                {"tenant_name": "t1", "tenant_space_name": "ts1"},
+                [],
+                {"name": "volume1", "size": 1048576},
+            ),
+            "op1",
+        )
+        mock_op_api_obj = MagicMock()
+        mock_op_api.return_value = mock_op_api_obj
+        if isinstance(previous_result, Exception):
+            mock_op_api_obj.get_operation = MagicMock(side_effect=previous_result)
+        else:
+            mock_op_api_obj.get_operation = MagicMock(return_value=previous_result)
+
+        new_op = OperationMock("op2", OperationStatus.PENDING)
+        call_api = MagicMock(return_value=new_op)
+        client = _client_mock(call_api)
+        jrnl = install_operation_journal(
+            ModuleMock({"operation_journal": journal_path}), client
+        )
+
+        assert _create_volume_call(client) == new_op
+        mock_op_api_obj.get_operation.assert_called_once_with("op1")
+        call_api.assert_called_once()
+        assert [e["id"] for e in jrnl._load()["operations"].values()] == ["op2"]
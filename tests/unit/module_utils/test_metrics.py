@@ -0,0 +1,177 @@
+# -*- coding: utf-8 -*-
+
+# (c) 2023 Pure Storage, Inc.
+# GNU General Public License v3.0+ (see COPYING.GPLv3 or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from ansible_collections.purestorage.fusion.plugins.module_utils import (
+    metrics,
+    operations,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.errors import (
+    OperationException,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.metrics import (
+    OperationMetrics,
+    get_collector,
+    install_operation_metrics,
+)
+from ansible_collections.purestorage.fusion.tests.unit.mocks.module_mock import (
+    ModuleMock,
+)
+from ansible_collections.purestorage.fusion.tests.unit.mocks.operation_mock import (
+    OperationMock,
+    OperationStatus,
+)
+
+current_module = (
+    "ansible_collections.purestorage.fusion.tests.unit.module_utils.test_metrics"
+)
+
+
+@pytest.fixture(autouse=True)
+def clear_collectors():
+    yield
+    metrics._active_collectors.clear()
+
+
+class TestOperationMetrics:
+    @patch(f"{current_module}.metrics.time.monotonic")
+    def test_summary(self, mock_monotonic):
+        collector = OperationMetrics()
+        # (start, first poll, end) for each operation
+        mock_monotonic.side_effect = [0, 0.5, 0.75, 10, 10.5, 45, 100]
+
+        timing = collector.start(OperationMock("op1", OperationStatus.PENDING))
+        timing.polled(OperationMock("op1", OperationStatus.PENDING))
+        timing.polled(OperationMock("op1", OperationStatus.SUCCEDED))
+        timing.finished()
+        timing = collector.start(OperationMock("op2", OperationStatus.PENDING))
+        timing.polled(OperationMock("op2", OperationStatus.FAILED))
+        timing.finished()
+        # still running, does not have latency yet
+        collector.start(OperationMock("op3", OperationStatus.PENDING))
+
+        summary = collector.summary()
+
+        assert summary["count"] == 2
+        assert summary["polls"] == 3
+        assert summary["latency_min"] == 0.75
+        assert summary["latency_max"] == 35
+        assert summary["latency_mean"] == 17.875
+        assert [op["id"] for op in summary["operations"]] == ["op1", "op2", "op3"]
+        assert summary["operations"][0]["time_to_first_poll"] == 0.5
+        assert summary["operations"][0]["polls"] == 2
+        assert summary["operations"][0]["status"] == OperationStatus.SUCCEDED
+        assert summary["operations"][1]["status"] == OperationStatus.FAILED
+        assert summary["operations"][2]["latency"] is None
+        histogram = dict((b["le"], b["count"]) for b in summary["latency_histogram"])
+        assert histogram[1] == 1
+        assert histogram[60] == 1
+        assert sum(histogram.values()) == 2
+        assert summary["latency_overflow"] == 0
+
+    @patch(f"{current_module}.metrics.time.monotonic")
+    def test_summary_overflow(self, mock_monotonic):
+        collector = OperationMetrics()
+        mock_monotonic.side_effect = [0, 1000]
+
+        collector.start(OperationMock("op1", OperationStatus.PENDING)).finished()
+
+        summary = collector.summary()
+        assert all(b["count"] == 0 for b in summary["latency_histogram"])
+        assert summary["latency_overflow"] == 1
+
+    def test_empty_summary(self):
+        summary = OperationMetrics().summary()
+        assert summary["count"] == 0
+        assert summary["latency_mean"] is None
+        assert all(b["count"] == 0 for b in summary["latency_histogram"])
+        assert summary["latency_overflow"] == 0
+
+
+class TestInstallOperationMetrics:
+    def test_not_installed_by_default(self):
+        module = ModuleMock({"operation_metrics": False})
+        exit_json = module.exit_json
+        fusion_mock = MagicMock()
+
+        assert install_operation_metrics(module, fusion_mock) is None
+        assert get_collector(fusion_mock) is None
+        assert module.exit_json is exit_json
+
+    @patch(f"{current_module}.operations.purefusion.OperationsApi.__new__")
+    def test_awaited_operations_reported(self, mock_op_api):
+        module = ModuleMock({"operation_metrics": True})
+        exit_json = module.exit_json
+        fusion_mock = MagicMock()
+        mock_op_api_obj = MagicMock()
+        mock_op_api.return_value = mock_op_api_obj
+        mock_op_api_obj.get_operation = MagicMock(
+            side_effect=[
+                OperationMock("op1", OperationStatus.PENDING, retry_in=0),
+                OperationMock("op1", OperationStatus.SUCCEDED),
+                OperationMock("op2", OperationStatus.FAILED),
+            ]
+        )
+
+        collector = install_operation_metrics(module, fusion_mock)
+        assert get_collector(fusion_mock) is collector
+
+        operations.await_operation(
+            fusion_mock, OperationMock("op1", OperationStatus.PENDING)
+        )
+        with pytest.raises(OperationException):
+            operations.await_operation(
+                fusion_mock, OperationMock("op2", OperationStatus.PENDING)
+            )
+        module.exit_json(changed=True)
+
+        exit_json.assert_called_once()
+        result = exit_json.call_args.kwargs
+        assert result["changed"]
+        assert result["operation_metrics"]["count"] == 2
+        assert result["operation_metrics"]["polls"] == 3
+        assert [
+            (op["id"], op["polls"], op["status"])
+            for op in result["operation_metrics"]["operations"]
+        ] == [("op1", 2, OperationStatus.SUCCEDED), ("op2", 1, OperationStatus.FAILED)]
+
+    @patch(f"{current_module}.operations.purefusion.OperationsApi.__new__")
+    @patch(f"{current_module}.metrics.time.monotonic")
+    def test_submission_latency_reported(self, mock_monotonic, mock_op_api):
+        module = ModuleMock({"operation_metrics": True})
+        exit_json = module.exit_json
+        fusion_mock = MagicMock()
+        fusion_mock.call_api = MagicMock(
+            return_value=OperationMock("op1", OperationStatus.PENDING)
+        )
+        mock_op_api_obj = MagicMock()
+        mock_op_api.return_value = mock_op_api_obj
+        mock_op_api_obj.get_operation = MagicMock(
+            return_value=OperationMock("op1", OperationStatus.SUCCEDED)
+        )
+        # submission, first poll, end
+        mock_monotonic.side_effect = [10, 12, 13]
+
+        install_operation_metrics(module, fusion_mock)
+        op = fusion_mock.call_api(
+            "/tenants",
+            "POST",
+            body={"name": "tenant1"},
+            response_type="Operation",
+            _return_http_data_only=True,
+        )
+        operations.await_operation(fusion_mock, op)
+        module.exit_json(changed=True)
+
+        timing = exit_json.call_args.kwargs["operation_metrics"]["operations"][0]
+        assert timing["time_to_first_poll"] == 2
+        assert timing["latency"] == 3
@@ -51,8 +51,10 @@ def test_invalid_network():
 def test_address_is_in_network():
     assert is_address_in_network("1.1.1.1", "1.1.0.0/16")
     assert is_address_in_network("1.1.1.1", "1.1.1.1/32")
+    assert is_address_in_network("1.1.1.1", "1.1.1.5/24")
 
 
 def test_address_is_not_in_network():
     assert not is_address_in_network("1.1.1.1", "1.2.0.0/16")
     assert not is_address_in_network("1.1.1.1", "1.1.1.2/32")
+    assert not is_address_in_network("1.1.2.1", "1.1.1.5/24")
@@ -228,3 +228,46 @@ class TestAwaitOperations:
         # Assertions
         assert op_res == op
         mock_op_api_obj.get_operation.assert_called_once_with(op.id)
+
+
+def _already_exists_exception():
+    error = purefusion.rest.ApiException(status=400, reason="Bad Request")
+    error.body = '{"error": {"pure_code": "ALREADY_EXISTS"}}'
+    return error
+
+
+class TestCreateOptimistically:
+    def test_created(self):
+        create = MagicMock()
+        assert operations.create_optimistically(create, "a", "b")
+        create.assert_called_once_with("a", "b")
+
+    @pytest.mark.parametrize(
+        "error",
+        [ApiExceptionsMockGenerator.create_conflict(), _already_exists_exception()],
+    )
+    def test_already_exists_request(self, error):
+        create = MagicMock(side_effect=error)
+        assert not operations.create_optimistically(create)
+
+    def test_already_exists_operation(self):
+        op = MagicMock()
+        op.error.pure_code = "ALREADY_EXISTS"
+        op.error.http_code = 400
+        create = MagicMock(side_effect=OperationException(op))
+        assert not operations.create_optimistically(create)
+
+    @pytest.mark.parametrize(
+        "error",
+        [
+            ApiExceptionsMockGenerator.create_permission_denied(),
+            OperationException(OperationMock("1", OperationStatus.FAILED)),
+            OperationException(
+                OperationMock("1", OperationStatus.PENDING), http_error=HTTPError()
+            ),
+        ],
+    )
+    def test_other_errors_raised(self, error):
+        create = MagicMock(side_effect=error)
+        with pytest.raises(type(error)):
+            operations.create_optimistically(create)
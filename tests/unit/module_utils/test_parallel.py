@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+
+# (c) 2023 Pure Storage, Inc.
+# GNU General Public License v3.0+ (see COPYING.GPLv3 or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import threading
+from unittest.mock import MagicMock
+
+import pytest
+
+from ansible_collections.purestorage.fusion.plugins.module_utils.errors import (
+    DependencyException,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.parallel import (
+    get_levels,
+    run_concurrently,
+    run_graph,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.watcher import (
+    OperationWatcher,
+    get_watcher,
+)
+
+
+class TestRunConcurrently:
+    def test_results_in_order(self):
+        results = run_concurrently(MagicMock(), lambda i: i * 2, [3, 1, 2])
+        assert [(r.item, r.result, r.ok) for r in results] == [
+            (3, 6, True),
+            (1, 2, True),
+            (2, 4, True),
+        ]
+
+    def test_errors_collected(self):
+        def _func(item):
+            if item == 2:
+                raise ValueError("bad item")
+            return item
+
+        results = run_concurrently(MagicMock(), _func, [1, 2, 3])
+        assert [r.ok for r in results] == [True, False, True]
+        assert isinstance(results[1].error, ValueError)
+        assert results[1].error_message == "bad item"
+        assert results[0].error_message is None
+
+    def test_concurrency_bounded(self):
+        lock = threading.Lock()
+        running = [0]
+        peak = [0]
+        barrier = threading.Barrier(2, timeout=5)
+
+        def _func(item):
+            with lock:
+                running[0] += 1
+                peak[0] = max(peak[0], running[0])
+            barrier.wait()
+            with lock:
+                running[0] -= 1
+
+        results = run_concurrently(MagicMock(), _func, range(6), concurrency=2)
+        assert all(r.ok for r in results)
+        assert peak[0] == 2
+
+    def test_watcher_running_while_called(self):
+        fusion_mock = MagicMock()
+        results = run_concurrently(
+            fusion_mock, lambda _: get_watcher(fusion_mock) is not None, [1, 2]
+        )
+        assert all(r.result for r in results)
+        assert get_watcher(fusion_mock) is None
+
+    def test_running_watcher_reused(self):
+        fusion_mock = MagicMock()
+        with OperationWatcher(fusion_mock) as op_watcher:
+            results = run_concurrently(
+                fusion_mock, lambda _: get_watcher(fusion_mock), [1]
+            )
+            assert results[0].result is op_watcher
+            assert get_watcher(fusion_mock) is op_watcher
+
+    def test_empty(self):
+        assert run_concurrently(MagicMock(), MagicMock(), []) == []
+
+
+class TestGetLevels:
+    def test_levels(self):
+        levels = get_levels(
+            {"ts": ["pg1", "pg2"], "pg1": ["vol1"], "pg2": [], "vol1": [], "x": ["y"]}
+        )
+        assert [sorted(level) for level in levels] == [
+            ["pg2", "vol1", "x"],
+            ["pg1"],
+            ["ts"],
+        ]
+
+    def test_cycle(self):
+        with pytest.raises(ValueError):
+            get_levels({"a": ["b"], "b": ["c"], "c": ["a"], "d": []})
+
+
+class TestRunGraph:
+    def test_order_and_skipped_dependents(self):
+        order = []
+
+        def _task(key, fail=False):
+            def _run():
+                order.append(key)
+                if fail:
+                    raise ValueError("{0} failed".format(key))
+                return key
+
+            return _run
+
+        results = run_graph(
+            MagicMock(),
+            {
+                "vol1": _task("vol1"),
+                "vol2": _task("vol2", fail=True),
+                "pg1": _task("pg1"),
+                "pg2": _task("pg2"),
+                "ts": _task("ts"),
+            },
+            {"pg1": ["vol1"], "pg2": ["vol2"], "ts": ["pg1", "pg2"]},
+        )
+
+        assert sorted(order[:2]) == ["vol1", "vol2"]
+        assert order[2:] == ["pg1"]
+        assert results["pg1"].result == "pg1"
+        assert results["vol2"].error_message == "vol2 failed"
+        assert isinstance(results["pg2"].error, DependencyException)
+        assert isinstance(results["ts"].error, DependencyException)
+        assert results["ts"].error.dependency == "pg2"
@@ -9,6 +9,7 @@ __metaclass__ = type
 
 import pytest
 from ansible_collections.purestorage.fusion.plugins.module_utils.parsing import (
+    parse_iso_minutes,
     parse_minutes,
     parse_number_with_metric_suffix,
 )
@@ -151,3 +152,20 @@ def test_parsing_invalid_time_period():
         assert parse_minutes(module, "10M2H")
     with pytest.raises(MockException):
         assert parse_minutes(module, "0H10M01Y")
+
+
+def test_parsing_iso_duration():
+    assert parse_iso_minutes("PT10M") == 10
+    assert parse_iso_minutes("PT103M") == 103
+    assert parse_iso_minutes("PT1H43M") == 103
+    assert parse_iso_minutes("PT2H") == 2 * 60
+    assert parse_iso_minutes("P14D") == 14 * 24 * 60
+    assert parse_iso_minutes("P1DT2H5M") == 24 * 60 + 2 * 60 + 5
+    assert parse_iso_minutes("P2W") == 2 * 7 * 24 * 60
+    assert parse_iso_minutes("PT1H0M0S") == 60
+    assert parse_iso_minutes("PT600S") == 10
+    assert parse_iso_minutes("P") is None
+    assert parse_iso_minutes("PT") is None
+    assert parse_iso_minutes("10M") is None
+    assert parse_iso_minutes("PT10S") is None
+    assert parse_iso_minutes(None) is None
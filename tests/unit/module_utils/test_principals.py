@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+
+# (c) 2023 Pure Storage, Inc.
+# GNU General Public License v3.0+ (see COPYING.GPLv3 or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+from unittest.mock import MagicMock, patch
+
+import fusion as purefusion
+import pytest
+
+from ansible_collections.purestorage.fusion.plugins.module_utils import principals
+from ansible_collections.purestorage.fusion.plugins.module_utils.principals import (
+    forget_api_client,
+    remember_users,
+    resolve_api_client,
+    resolve_user,
+)
+from ansible_collections.purestorage.fusion.tests.unit.mocks.module_mock import (
+    ModuleMock,
+)
+
+
+def _user(name, id):
+    return purefusion.User(id=id, self_link="self_link", name=name, email="e@x.com")
+
+
+@pytest.fixture(autouse=True)
+def forget_principals():
+    principals._principals.clear()
+
+
+def _fusion(host="https://api.example.com"):
+    client = MagicMock()
+    client.configuration.host = host
+    return client
+
+
+@pytest.fixture
+def fusion():
+    return _fusion()
+
+
+@pytest.fixture
+def id_api():
+    api = MagicMock()
+    api.list_users = MagicMock(
+        side_effect=lambda name=None: [
+            user
+            for user in [_user("user1", "id1"), _user("pure1:apikey:abc", "id2")]
+            if name is None or user.name == name
+        ]
+    )
+    return api
+
+
+def _module(cache_path=None):
+    return ModuleMock({"index_cache": cache_path, "index_cache_ttl": 300})
+
+
+@patch("fusion.IdentityManagerApi")
+class TestResolver:
+    def test_repeated_lookups_list_once(self, m_id_api, fusion, id_api):
+        m_id_api.return_value = id_api
+        module = _module()
+        assert resolve_user(module, fusion, "user1") == "id1"
+        assert resolve_user(module, fusion, "user1") == "id1"
+        assert resolve_api_client(module, fusion, "pure1:apikey:abc") == "id2"
+        assert resolve_api_client(module, fusion, "pure1:apikey:abc") == "id2"
+        assert resolve_user(module, fusion, "user2") is None
+        id_api.list_users.assert_any_call()
+        id_api.list_users.assert_any_call(name="pure1:apikey:abc")
+        # the miss is not remembered
+        assert id_api.list_users.call_count == 3
+
+    def test_lookups_shared_by_module_runs(self, m_id_api, fusion, id_api):
+        m_id_api.return_value = id_api
+        resolve_user(_module(), fusion, "user1")
+        resolve_user(_module(), fusion, "user1")
+        assert id_api.list_users.call_count == 1
+
+    def test_lookups_per_host(self, m_id_api, id_api):
+        m_id_api.return_value = id_api
+        resolve_user(_module(), _fusion("https://a.example.com"), "user1")
+        resolve_user(_module(), _fusion("https://b.example.com"), "user1")
+        assert id_api.list_users.call_count == 2
+
+    def test_cache_is_bounded(self, m_id_api, fusion, id_api):
+        m_id_api.return_value = id_api
+        module = _module()
+        with patch.object(principals, "PRINCIPAL_CACHE_SIZE", 1):
+            resolve_user(module, fusion, "user1")
+            resolve_api_client(module, fusion, "pure1:apikey:abc")
+            resolve_user(module, fusion, "user1")
+        assert id_api.list_users.call_count == 3
+
+    def test_disk_cache_shared_by_runs(self, m_id_api, fusion, id_api, tmp_path):
+        m_id_api.return_value = id_api
+        cache_path = str(tmp_path / "index.json")
+        for _ in range(3):
+            # every run is a new process
+            principals._principals.clear()
+            assert resolve_user(_module(cache_path), fusion, "user1") == "id1"
+            assert (
+                resolve_api_client(_module(cache_path), fusion, "pure1:apikey:abc")
+                == "id2"
+            )
+        assert id_api.list_users.call_count == 2
+
+    def test_disk_cache_miss_refreshes(self, m_id_api, fusion, id_api, tmp_path):
+        m_id_api.return_value = id_api
+        cache_path = str(tmp_path / "index.json")
+        resolve_user(_module(cache_path), fusion, "user1")
+        assert resolve_user(_module(cache_path), fusion, "user2") is None
+        assert id_api.list_users.call_count == 2
+
+    def test_remember_users(self, m_id_api, fusion, id_api, tmp_path):
+        m_id_api.return_value = id_api
+        cache_path = str(tmp_path / "index.json")
+        remember_users(_module(cache_path), fusion, [_user("user1", "id1")])
+        assert resolve_user(_module(cache_path), fusion, "user1") == "id1"
+        id_api.list_users.assert_not_called()
+
+    def test_forget_api_client(self, m_id_api, fusion, id_api, tmp_path):
+        m_id_api.return_value = id_api
+        module = _module(str(tmp_path / "index.json"))
+        resolve_api_client(module, fusion, "pure1:apikey:abc")
+        forget_api_client(module, fusion, "pure1:apikey:abc")
+        resolve_api_client(module, fusion, "pure1:apikey:abc")
+        assert id_api.list_users.call_count == 2
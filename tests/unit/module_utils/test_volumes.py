@@ -0,0 +1,174 @@
+# -*- coding: utf-8 -*-
+
+# (c) 2023 Pure Storage, Inc.
+# GNU General Public License v3.0+ (see COPYING.GPLv3 or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+from unittest.mock import MagicMock
+
+import fusion as purefusion
+import pytest
+
+from ansible_collections.purestorage.fusion.plugins.module_utils.volumes import (
+    extract_current_haps,
+    get_source_link,
+    get_volume_patches,
+    get_wanted_haps,
+    validate_volume,
+    volume_snapshot_link,
+)
+from ansible_collections.purestorage.fusion.tests.unit.mocks.module_mock import (
+    ModuleFailed,
+    ModuleMock,
+)
+
+
+def _params(**kwargs):
+    params = {
+        "tenant": "t1",
+        "tenant_space": "ts1",
+        "state": "present",
+        "eradicate": False,
+        "size": None,
+        "placement_group": "pg1",
+        "storage_class": "sc1",
+        "host_access_policies": None,
+        "source_volume": None,
+        "source_snapshot": None,
+        "source_volume_snapshot": None,
+    }
+    params.update(kwargs)
+    return params
+
+
+def _hap(name):
+    hap = MagicMock()
+    hap.name = name
+    return hap
+
+
+def test_haps():
+    assert get_wanted_haps(_params()) == set()
+    assert get_wanted_haps(_params(host_access_policies=["hap1", " hap2"])) == {
+        "hap1",
+        "hap2",
+    }
+    assert extract_current_haps(MagicMock(host_access_policies=None)) == set()
+    assert extract_current_haps(
+        MagicMock(host_access_policies=[_hap("hap1"), _hap("hap2")])
+    ) == {"hap1", "hap2"}
+
+
+@pytest.mark.parametrize(
+    "params,expected",
+    [
+        (_params(), None),
+        (_params(source_volume="v1"), "/tenants/t1/tenant-spaces/ts1/volumes/v1"),
+        (
+            _params(source_snapshot="s1", source_volume_snapshot="vs1"),
+            "/tenants/t1/tenant-spaces/ts1/snapshots/s1/volume-snapshots/vs1",
+        ),
+        (_params(source_snapshot="s1"), None),
+    ],
+)
+def test_get_source_link(params, expected):
+    assert get_source_link(params) == expected
+
+
+def test_volume_snapshot_link():
+    assert (
+        volume_snapshot_link("t1", "ts1", "s1", "vs1")
+        == "/tenants/t1/tenant-spaces/ts1/snapshots/s1/volume-snapshots/vs1"
+    )
+
+
+@pytest.mark.parametrize(
+    "params,volume",
+    [
+        (_params(size="1M"), None),
+        (_params(size="1M"), MagicMock(host_access_policies=None)),
+        (_params(state="absent", eradicate=True), MagicMock(host_access_policies=None)),
+    ],
+)
+def test_validate_volume_ok(params, volume):
+    validate_volume(ModuleMock(params), params, volume)
+
+
+@pytest.mark.parametrize(
+    "params,volume,message",
+    [
+        (
+            _params(size="1M", storage_class=None),
+            None,
+            "missing required arguments: storage_class",
+        ),
+        (_params(), None, "Either `size`"),
+        (
+            _params(state="absent"),
+            MagicMock(host_access_policies=[_hap("hap1")]),
+            "no host access policies",
+        ),
+        (_params(size="1M", eradicate=True), None, "'eradicate: true'"),
+        (_params(size="1K"), None, "between 1MB and 4PB"),
+    ],
+)
+@pytest.mark.parametrize("name", [None, "volume1"])
+def test_validate_volume_fails(params, volume, message, name):
+    with pytest.raises(ModuleFailed) as exc:
+        validate_volume(ModuleMock(params), params, volume, name)
+    assert message in str(exc.value)
+    assert ("volume1" in str(exc.value)) == (name is not None)
+
+
+def _volume(destroyed=False):
+    volume = MagicMock(
+        size=1048576,
+        display_name="volume1",
+        destroyed=destroyed,
+        protection_policy=None,
+        host_access_policies=None,
+        source=None,
+    )
+    volume.name = "volume1"
+    volume.storage_class.name = "sc1"
+    volume.placement_group.name = "pg1"
+    return volume
+
+
+def test_volume_patches_not_changed():
+    params = _params(size="1M", display_name=None, protection_policy=None)
+    assert get_volume_patches(ModuleMock(params), params, _volume()) == []
+
+
+def test_volume_patches_order():
+    params = _params(
+        size="2M",
+        display_name=None,
+        protection_policy=None,
+        host_access_policies=["hap1"],
+    )
+    expected = [
+        purefusion.VolumePatch(size=purefusion.NullableSize(2097152)),
+        purefusion.VolumePatch(host_access_policies=purefusion.NullableString("hap1")),
+    ]
+    destroy = purefusion.VolumePatch(destroyed=purefusion.NullableBoolean(True))
+    recover = purefusion.VolumePatch(destroyed=purefusion.NullableBoolean(False))
+
+    # destroyed volume is recovered before it is updated
+    assert (
+        get_volume_patches(ModuleMock(params), params, _volume(True))
+        == [recover] + expected
+    )
+
+    # volume is destroyed after it is updated
+    params.update(state="absent")
+    module = ModuleMock(params)
+    module.warn = MagicMock()
+    assert get_volume_patches(module, params, _volume()) == expected + [destroy]
+    module.warn.assert_called_once()
+
+    # destroyed volume is left alone
+    assert get_volume_patches(module, params, _volume(True)) == []
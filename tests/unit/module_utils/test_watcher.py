@@ -0,0 +1,260 @@
+# -*- coding: utf-8 -*-
+
+# (c) 2023 Pure Storage, Inc.
+# GNU General Public License v3.0+ (see COPYING.GPLv3 or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock, patch
+
+import fusion as purefusion
+import pytest
+from urllib3.exceptions import HTTPError
+
+from ansible_collections.purestorage.fusion.plugins.module_utils import (
+    operations,
+    watcher,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.errors import (
+    OperationException,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.journal import (
+    install_operation_journal,
+)
+from ansible_collections.purestorage.fusion.plugins.module_utils.watcher import (
+    OperationWatcher,
+    get_watcher,
+)
+from ansible_collections.purestorage.fusion.tests.unit.mocks.module_mock import (
+    ModuleMock,
+)
+from ansible_collections.purestorage.fusion.tests.unit.mocks.operation_mock import (
+    OperationMock,
+    OperationStatus,
+)
+
+current_module = (
+    "ansible_collections.purestorage.fusion.tests.unit.module_utils.test_watcher"
+)
+
+
+class OperationListMock:
+    def __init__(self, items):
+        self.items = items
+
+
+def _list_side_effect(statuses):
+    """Returns side effect for `list_operations` which reports given status
+    sequences (dict id -> list of statuses), one status per call."""
+    statuses = dict((op_id, list(seq)) for op_id, seq in statuses.items())
+
+    def _list_operations(**kwargs):
+        items = []
+        for op_id, seq in statuses.items():
+            if op_id in kwargs["filter"]:
+                status = seq.pop(0) if len(seq) > 1 else seq[0]
+                items.append(OperationMock(op_id, status))
+        return OperationListMock(items)
+
+    return _list_operations
+
+
+class TestOperationWatcher:
+    @patch(f"{current_module}.watcher.purefusion.OperationsApi.__new__")
+    def test_batch_poll(self, mock_op_api):
+        mock_op_api_obj = MagicMock()
+        mock_op_api.return_value = mock_op_api_obj
+        mock_op_api_obj.list_operations = MagicMock(
+            side_effect=_list_side_effect(
+                {
+                    "op1": [OperationStatus.PENDING, OperationStatus.SUCCEDED],
+                    "op2": [
+                        OperationStatus.PENDING,
+                        OperationStatus.PENDING,
+                        OperationStatus.SUCCEDED,
+                    ],
+                }
+            )
+        )
+        mock_op_api_obj.get_operation = MagicMock(side_effect=NotImplementedError())
+        fusion_mock = MagicMock()
+        ops = [
+            OperationMock("op1", OperationStatus.PENDING),
+            OperationMock("op2", OperationStatus.PENDING),
+        ]
+
+        with OperationWatcher(fusion_mock, poll_interval=0) as op_watcher:
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                results = list(executor.map(op_watcher.wait, ops))
+
+        assert [op.id for op in results] == ["op1", "op2"]
+        assert all(op.status == OperationStatus.SUCCEDED for op in results)
+        mock_op_api_obj.get_operation.assert_not_called()
+        assert mock_op_api_obj.list_operations.called
+
+    @patch(f"{current_module}.watcher.purefusion.OperationsApi.__new__")
+    def test_failed_operation(self, mock_op_api):
+        mock_op_api_obj = MagicMock()
+        mock_op_api.return_value = mock_op_api_obj
+        mock_op_api_obj.list_operations = MagicMock(
+            side_effect=_list_side_effect({"op1": [OperationStatus.FAILED]})
+        )
+        fusion_mock = MagicMock()
+        op = OperationMock("op1", OperationStatus.PENDING)
+
+        with OperationWatcher(fusion_mock, poll_interval=0) as op_watcher:
+            with pytest.raises(OperationException):
+                op_watcher.wait(op)
+            res = op_watcher.wait(op, fail_playbook_if_operation_fails=False)
+
+        assert res.status == OperationStatus.FAILED
+
+    @patch(f"{current_module}.watcher.purefusion.OperationsApi.__new__")
+    def test_fallback_to_single_polls(self, mock_op_api):
+        mock_op_api_obj = MagicMock()
+        mock_op_api.return_value = mock_op_api_obj
+        mock_op_api_obj.list_operations = MagicMock(
+            side_effect=purefusion.rest.ApiException()
+        )
+        mock_op_api_obj.get_operation = MagicMock(
+            side_effect=[
+                OperationMock("op1", OperationStatus.PENDING),
+                OperationMock("op1", OperationStatus.SUCCEDED),
+            ]
+        )
+        fusion_mock = MagicMock()
+
+        with OperationWatcher(fusion_mock, poll_interval=0) as op_watcher:
+            res = op_watcher.wait(OperationMock("op1", OperationStatus.PENDING))
+
+        assert res.status == OperationStatus.SUCCEDED
+        # a failed batch query might be transient, it is tried again on every tick
+        assert mock_op_api_obj.list_operations.call_count == 2
+        assert mock_op_api_obj.get_operation.call_count == 2
+
+    @patch(f"{current_module}.watcher.purefusion.OperationsApi.__new__")
+    def test_batch_poll_per_request_collection(self, mock_op_api):
+        mock_op_api_obj = MagicMock()
+        mock_op_api.return_value = mock_op_api_obj
+        list_side_effect = _list_side_effect(
+            {
+                "op1": [OperationStatus.SUCCEDED],
+                "op2": [OperationStatus.SUCCEDED],
+            }
+        )
+        mock_op_api_obj.list_operations = MagicMock(
+            # op3 is missing from the listing
+            side_effect=lambda **kwargs: list_side_effect(**kwargs)
+        )
+        mock_op_api_obj.get_operation = MagicMock(
+            return_value=OperationMock("op3", OperationStatus.SUCCEDED)
+        )
+        fusion_mock = MagicMock()
+        ops = [
+            OperationMock("op1", OperationStatus.PENDING),
+            OperationMock("op2", OperationStatus.PENDING),
+            OperationMock("op3", OperationStatus.PENDING),
+        ]
+        ops[1].request_collection = "/tenants/t1/tenant-spaces/ts1"
+        ops[2].request_collection = "/tenants/t1/tenant-spaces/ts1"
+
+        waiters = [watcher._Waiter(op, None) for op in ops]
+        with OperationWatcher(fusion_mock, poll_interval=0) as op_watcher:
+            # all operations are outstanding in the first poll
+            with op_watcher._lock:
+                for waiter in waiters:
+                    op_watcher._waiters[waiter.operation.id] = [waiter]
+            op_watcher._wakeup.set()
+            for waiter in waiters:
+                waiter.done.wait()
+
+        assert [w.result.id for w in waiters] == ["op1", "op2", "op3"]
+        collections = sorted(
+            (c.kwargs["request_collection"], c.kwargs["filter"])
+            for c in mock_op_api_obj.list_operations.call_args_list
+        )
+        assert collections == [
+            ("/", "id in ('op1')"),
+            ("/tenants/t1/tenant-spaces/ts1", "id in ('op2','op3')"),
+        ]
+        mock_op_api_obj.get_operation.assert_called_once_with("op3")
+
+    @patch(f"{current_module}.watcher.purefusion.OperationsApi.__new__")
+    def test_http_error(self, mock_op_api):
+        mock_op_api_obj = MagicMock()
+        mock_op_api.return_value = mock_op_api_obj
+        mock_op_api_obj.list_operations = MagicMock(side_effect=HTTPError())
+        fusion_mock = MagicMock()
+        op = OperationMock("op1", OperationStatus.PENDING)
+
+        with OperationWatcher(fusion_mock, poll_interval=0) as op_watcher:
+            with pytest.raises(OperationException) as exception:
+                op_watcher.wait(op)
+
+        assert exception.value.op == op
+        assert isinstance(exception.value.http_error, HTTPError)
+
+    def test_registration(self):
+        fusion_mock = MagicMock()
+        assert get_watcher(fusion_mock) is None
+        with OperationWatcher(fusion_mock) as op_watcher:
+            assert get_watcher(fusion_mock) is op_watcher
+            assert get_watcher(MagicMock()) is None
+            with pytest.raises(RuntimeError):
+                OperationWatcher(fusion_mock).start()
+        assert get_watcher(fusion_mock) is None
+
+    @patch(f"{current_module}.watcher.purefusion.OperationsApi.__new__")
+    def test_await_operation_uses_watcher(self, mock_op_api):
+        mock_op_api_obj = MagicMock()
+        mock_op_api.return_value = mock_op_api_obj
+        mock_op_api_obj.list_operations = MagicMock(
+            side_effect=_list_side_effect({"op1": [OperationStatus.SUCCEDED]})
+        )
+        mock_op_api_obj.get_operation = MagicMock(side_effect=NotImplementedError())
+        fusion_mock = MagicMock()
+
+        with OperationWatcher(fusion_mock, poll_interval=0):
+            res = operations.await_operation(
+                fusion_mock, OperationMock("op1", OperationStatus.PENDING)
+            )
+
+        assert res.status == OperationStatus.SUCCEDED
+        mock_op_api_obj.list_operations.assert_called_once()
+        mock_op_api_obj.get_operation.assert_not_called()
+
+    @patch(f"{current_module}.watcher.purefusion.OperationsApi.__new__")
+    def test_finished_operation_compacted(self, mock_op_api, tmp_path):
+        mock_op_api_obj = MagicMock()
+        mock_op_api.return_value = mock_op_api_obj
+        mock_op_api_obj.list_operations = MagicMock(
+            side_effect=_list_side_effect({"op1": [OperationStatus.SUCCEDED]})
+        )
+        fusion_mock = MagicMock()
+        fusion_mock.call_api = MagicMock(
+            return_value=OperationMock("op1", OperationStatus.PENDING)
+        )
+        fusion_mock.sanitize_for_serialization = lambda obj: obj
+        jrnl = install_operation_journal(
+            ModuleMock({"operation_journal": str(tmp_path / "journal.json")}),
+            fusion_mock,
+        )
+        op = fusion_mock.call_api(
+            "/tenants",
+            "POST",
+            body={"name": "tenant1"},
+            response_type="Operation",
+            _return_http_data_only=True,
+        )
+        assert len(jrnl._load()["operations"]) == 1
+
+        with OperationWatcher(fusion_mock, poll_interval=0) as op_watcher:
+            op_watcher.wait(op)
+
+        assert jrnl._load()["operations"] == {}
+
+    def test_build_filter(self):
+        assert watcher._build_filter(["op1", "op2"]) == "id in ('op1','op2')"